@@ -1,7 +1,9 @@
+import argparse
 import glob
 import json
 import os
 import re
+import sys
 from typing import Any, Dict, List, Optional, Tuple
 from datetime import date
 import unicodedata
@@ -20,6 +22,25 @@ except ImportError:
     print("Execute: pip install google-genai")
     exit(1)
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from scripts.llm_cache import ResponseCache, make_key as make_cache_key  # noqa: E402
+from scripts.llm_clients import (  # noqa: E402
+    configure_pool_from_config,
+    get_client,
+    get_generate_config,
+)
+from scripts.llm_context_cache import (  # noqa: E402
+    PREFIX_SEPARATOR,
+    LazyPrefixCache,
+)
+from scripts.llm_dispatch import (  # noqa: E402
+    RateLimiter,
+    call_with_retry,
+    dispatch_ordered,
+)
+from scripts.markdown_chunks import merge_partials, split_at_folhas  # noqa: E402
+from scripts.ptbr_parse import parse_data, parse_valor  # noqa: E402
+
 # --- UTILS BÁSICAS ---
 
 
@@ -65,26 +86,15 @@ def extract_json_from_text(text: str) -> str:
 
 def parse_monetary_value(val_str: str):
     """
-    Estilo parse_valor_brl (monetary_core):
+    Estilo parse_valor_brl (monetary_core), via scripts/ptbr_parse.py:
     - Extrai o PRIMEIRO valor no padrão pt-BR (ex.: 93.354,27 ou 93354,27)
     - Ignora o restante do texto (ex.: "-(noventa e três mil, ...)")
     - Retorna None se não encontrar valor (não retorna 0.0)
     """
     if not val_str:
         return None
-
-    s = str(val_str)
-
-    # Primeiro valor pt-BR com vírgula decimal (com ou sem milhar)
-    m = re.search(r"(\d{1,3}(?:\.\d{3})+,\d{2}|\d+,\d{2})", s)
-    if not m:
-        return None
-
-    num_str = m.group(1)
-    try:
-        return float(num_str.replace(".", "").replace(",", "."))
-    except ValueError:
-        return None
+    valor = parse_valor(str(val_str), so_brl=True)
+    return float(valor) if valor is not None else None
 
 
 def format_currency(val_float: float) -> str:
@@ -100,16 +110,6 @@ def format_currency(val_float: float) -> str:
 # Histórico de titularidade (ESCRITURA_IMOVEL): rebuild determinístico por datas
 # =========================
 
-_PT_MONTHS = {
-    "janeiro": 1, "fevereiro": 2, "marco": 3, "março": 3, "abril": 4, "maio": 5, "junho": 6,
-    "julho": 7, "agosto": 8, "setembro": 9, "outubro": 10, "novembro": 11, "dezembro": 12,
-}
-
-_DATE_RE = re.compile(
-    r"(\d{1,2})\s+de\s+([A-Za-z\u00C0-\u017F]+)\s+de\s+(\d{1,4}(?:\.\d{3})?)",
-    flags=re.IGNORECASE
-)
-
 def _norm_txt(s: str) -> str:
     s = (s or "").strip().lower()
     s = unicodedata.normalize("NFD", s)
@@ -117,25 +117,7 @@ def _norm_txt(s: str) -> str:
 
 def parse_date_ptbr(value: Any) -> Optional[date]:
     """Converte '14 de Março de 2.001' -> date(2001, 3, 14). Retorna None se não parseável."""
-    if not isinstance(value, str):
-        return None
-    m = _DATE_RE.search(value)
-    if not m:
-        return None
-    dd = int(m.group(1))
-    mm_name = _norm_txt(m.group(2))
-    yyyy_raw = m.group(3).replace(".", "")
-    if not yyyy_raw.isdigit():
-        return None
-    yyyy = int(yyyy_raw)
-    mm = _PT_MONTHS.get(mm_name)
-    if not mm:
-        return None
-    try:
-        return date(yyyy, mm, dd)
-    except ValueError:
-        return None
-
+    return parse_data(value)
 
 
 def corrigir_historico_titularidade_por_transacoes_venda(data: Dict[str, Any]) -> Dict[str, Any]:
@@ -621,43 +603,97 @@ def post_process_data(data: Dict) -> Dict:
 # --- INTEGRAÇÃO COM IA ---
 
 
-def call_llm_provider(prompt_text: str, config: Dict) -> str:
-    api_key = os.environ.get("GOOGLE_API_KEY", "")
-    if not api_key:
-        raise ValueError("GOOGLE_API_KEY não definida.")
+# Cache de respostas (scripts/llm_cache.py); aberto em main(), None com --no-cache
+_RESPONSE_CACHE: Optional[ResponseCache] = None
 
-    model_name = "gemini-2.5-flash"
 
-    client = genai.Client(api_key=api_key)
-    generate_config = types.GenerateContentConfig(
+MODEL_NAME = "gemini-2.5-flash"
+
+# Listas mescladas por registro quando um documento é extraído em trechos
+CHUNK_KEYED_LISTS = {
+    "hipotecas_onus": ("registro_ou_averbacao",),
+    "transacoes_venda": ("registro", "registro_ou_averbacao"),
+}
+
+# (arquivo de saída, índice do trecho, total de trechos, texto do documento)
+ChunkUnit = Tuple[str, int, int, str]
+
+
+def call_llm_provider(
+    prompt_text: str,
+    config: Dict,
+    prefix_cache: Optional[LazyPrefixCache] = None,
+    limiter: Optional[RateLimiter] = None,
+) -> str:
+    """
+    Com `prefix_cache`, envia só o documento e referencia o prefixo estático
+    já registrado no provedor. O cache de respostas é sempre pelo prompt
+    completo, então as entradas valem com ou sem cache de contexto.
+    `limiter` (RPM/TPM) só é consumido quando a chamada vai ao provedor, a
+    cada tentativa e pelo conteúdo enviado: hits do cache de respostas não
+    gastam orçamento.
+    """
+    model_name = MODEL_NAME
+    gen_params = dict(
         temperature=0.0,
         max_output_tokens=65536,
         response_mime_type="application/json",
-        safety_settings=[
-            types.SafetySetting(
-                category=types.HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT,
-                threshold=types.HarmBlockThreshold.BLOCK_NONE,
-            ),
-            types.SafetySetting(
-                category=types.HarmCategory.HARM_CATEGORY_HATE_SPEECH,
-                threshold=types.HarmBlockThreshold.BLOCK_NONE,
-            ),
-            types.SafetySetting(
-                category=types.HarmCategory.HARM_CATEGORY_HARASSMENT,
-                threshold=types.HarmBlockThreshold.BLOCK_NONE,
+        block_none_safety=True,
+    )
+
+    cache_key = None
+    if _RESPONSE_CACHE is not None:
+        cache_key = make_cache_key(model_name, gen_params, prompt_text)
+        hit = _RESPONSE_CACHE.get(cache_key)
+        if hit is not None:
+            return hit[0]
+
+    # Cliente e config compartilhados (scripts/llm_clients.py): sem novo
+    # handshake TLS nem nova montagem dos SafetySetting a cada documento. A
+    # exigência de chave fica com o provedor (o stand-in não usa).
+    client = get_client(os.environ.get("GOOGLE_API_KEY"))
+    generate_config = get_generate_config(**gen_params)
+
+    contents = prompt_text
+    ctx = prefix_cache.get() if prefix_cache is not None else None
+    doc_only = ctx.split(prompt_text) if ctx is not None else None
+    if ctx is not None and doc_only is not None:
+        contents = doc_only
+        generate_config = get_generate_config(cached_content=ctx.name, **gen_params)
+
+    # 429/5xx do provedor: novas tentativas com espera exponencial
+    dispatch_conf = config.get("dispatch") or {}
+    max_retries = int(dispatch_conf.get("max_retries") or 0)
+    backoff = float(dispatch_conf.get("retry_backoff_seconds") or 2.0)
+
+    def generate(contents_: str, config_: Any) -> Any:
+        # RPM/TPM a cada tentativa, pelos tokens realmente enviados (só o
+        # documento quando o prefixo está no cache de contexto)
+        return call_with_retry(
+            lambda: client.models.generate_content(
+                model=model_name, contents=contents_, config=config_
             ),
-            types.SafetySetting(
-                category=types.HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT,
-                threshold=types.HarmBlockThreshold.BLOCK_NONE,
+            max_retries=max_retries,
+            backoff_seconds=backoff,
+            before_attempt=(
+                (lambda: limiter.acquire(contents_)) if limiter is not None else None
             ),
-        ],
-    )
+        )
 
     try:
-        response = client.models.generate_content(
-            model=model_name, contents=prompt_text, config=generate_config
-        )
-        return response.text or ""
+        try:
+            response = generate(contents, generate_config)
+        except Exception as e:
+            if contents is prompt_text:
+                raise
+            # cache de contexto expirado/removido: desiste dele no job
+            print(f"   [AVISO] Cache de contexto indisponível ({e}); prompt completo.")
+            prefix_cache.invalidate()
+            response = generate(prompt_text, get_generate_config(**gen_params))
+        text = response.text or ""
+        if cache_key is not None:
+            _RESPONSE_CACHE.put(cache_key, text, model=model_name)
+        return text
     except Exception as e:
         print(f"   [ERRO API] {e}")
         return json.dumps({"error": str(e)}, ensure_ascii=False)
@@ -666,9 +702,8 @@ def call_llm_provider(prompt_text: str, config: Dict) -> str:
 # --- LÓGICA DO AGENTE ---
 
 
-def assemble_prompt(
-    base_prompt: str, skill_content: str, schema_content: str, doc_content: str
-) -> str:
+def assemble_prefix(base_prompt: str, skill_content: str, schema_content: str) -> str:
+    """Parte estática do prompt (igual para todos os arquivos do job)."""
     parts = [
         base_prompt,
         "\n---\n# 1. SCHEMA DE SAÍDA",
@@ -678,11 +713,20 @@ def assemble_prompt(
         "\n---\n# 2. REGRAS",
         skill_content,
         "\n---\n# 3. DOCUMENTO",
-        doc_content,
     ]
     return "\n".join(parts)
 
 
+def assemble_prompt(
+    base_prompt: str, skill_content: str, schema_content: str, doc_content: str
+) -> str:
+    return (
+        assemble_prefix(base_prompt, skill_content, schema_content)
+        + PREFIX_SEPARATOR
+        + doc_content
+    )
+
+
 def process_job(job: Dict, global_config: Dict, project_root: str):
     print(f"\n--- Job: {job.get('name')} ---")
     input_dir = os.path.join(project_root, job["input_dir"])
@@ -704,7 +748,8 @@ def process_job(job: Dict, global_config: Dict, project_root: str):
     skill_content = read_file(skill_file)
     schema_content = read_file(schema_file)
 
-    md_files = glob.glob(os.path.join(input_dir, "*.md"))
+    # Ordenado: a ordem de gravação/log não depende do sistema de arquivos
+    md_files = sorted(glob.glob(os.path.join(input_dir, "*.md")))
     if not md_files:
         print(f"   [AVISO] Sem arquivos .md em {input_dir}")
         return
@@ -738,15 +783,57 @@ def process_job(job: Dict, global_config: Dict, project_root: str):
                 os.path.join(output_dir, f"{prefix}{file_base_name}.error.json"),
             )
 
+    def handle_chunks(responses: List[str], file_base_name: str) -> None:
+        # reduce: parciais na ordem dos trechos -> um JSON, antes do pós-processamento
+        partials = []
+        for raw in responses:
+            try:
+                part = json.loads(extract_json_from_text(raw))
+            except json.JSONDecodeError:
+                part = None
+            # {"error": ...} de call_llm_provider: chamada que falhou, não parcial
+            if not isinstance(part, dict) or "error" in part:
+                motivo = "falha da API" if isinstance(part, dict) else "JSON inválido"
+                print(f"   [ERRO] {motivo} em um dos trechos.")
+                save_json(
+                    {"raw_chunks": responses},
+                    os.path.join(output_dir, f"{prefix}{file_base_name}.error.json"),
+                )
+                return
+            partials.append(part)
+        merged = merge_partials(partials, CHUNK_KEYED_LISTS)
+        handle_response(json.dumps(merged, ensure_ascii=False), file_base_name)
+
+    dispatch_conf = global_config.get("dispatch") or {}
+    limiter = RateLimiter.from_config(dispatch_conf)
+    concurrency = int(dispatch_conf.get("concurrency") or 1)
+
+    chunk_conf = global_config.get("chunking") or {}
+    max_chars = int(chunk_conf.get("max_chars") or 0)
+
+    def split(name: str, content: str) -> List[ChunkUnit]:
+        chunks = [content]
+        if chunk_conf.get("enabled") and max_chars > 0:
+            chunks = split_at_folhas(content, max_chars)
+        n = len(chunks)
+        if n == 1:
+            return [(name, 0, 1, content)]
+        return [
+            (
+                name,
+                i,
+                n,
+                f"[Trecho {i + 1}/{n} de {name}: extraia apenas o que consta "
+                f"neste trecho.]\n\n{chunk}",
+            )
+            for i, chunk in enumerate(chunks)
+        ]
+
+    # Unidades de chamada: (arquivo de saída, trecho, total de trechos, texto)
+    units: List[ChunkUnit] = []
     if mode == "individual":
         for fpath in md_files:
-            fname = os.path.basename(fpath)
-            print(f"   Processando: {fname}")
-            full_prompt = assemble_prompt(
-                base_prompt, skill_content, schema_content, read_file(fpath)
-            )
-            resp = call_llm_provider(full_prompt, global_config)
-            handle_response(resp, fname)
+            units.extend(split(os.path.basename(fpath), read_file(fpath)))
 
     elif mode == "consolidated":
         print(f"   Modo Consolidado ({len(md_files)} arqs)...")
@@ -755,25 +842,80 @@ def process_job(job: Dict, global_config: Dict, project_root: str):
             all_content += (
                 f"\n\n--- DOC: {os.path.basename(fpath)} ---\n{read_file(fpath)}\n"
             )
-
-        full_prompt = assemble_prompt(
-            base_prompt, skill_content, schema_content, all_content
-        )
-        resp = call_llm_provider(full_prompt, global_config)
         out_name = job.get("output_filename", "consolidated.json").replace(
             ".json", ".md"
         )
-        handle_response(resp, out_name)
+        units.extend(split(out_name, all_content))
+
+    if not units:
+        return
+
+    # Prefixo estático (base + schema + SKILL) registrado uma vez por job no
+    # provedor; só vale a pena com mais de uma chamada.
+    prefix_cache: Optional[LazyPrefixCache] = None
+    cc_conf = global_config.get("context_cache") or {}
+    if cc_conf.get("enabled") and len(units) > 1:
+        prefix_cache = LazyPrefixCache(
+            lambda: get_client(os.environ.get("GOOGLE_API_KEY")),
+            MODEL_NAME,
+            assemble_prefix(base_prompt, skill_content, schema_content),
+            ttl_seconds=int(cc_conf.get("ttl_seconds") or 3600),
+            min_tokens=int(cc_conf.get("min_tokens") or 1024),
+            display_name=job.get("id"),
+        )
+
+    def request(unit: ChunkUnit) -> str:
+        full_prompt = assemble_prompt(
+            base_prompt, skill_content, schema_content, unit[3]
+        )
+        return call_llm_provider(full_prompt, global_config, prefix_cache, limiter)
+
+    if concurrency > 1 and len(units) > 1:
+        print(f"   Despacho concorrente: {concurrency} chamadas simultâneas")
+
+    # Chamadas em paralelo (arquivos e trechos); respostas tratadas e salvas
+    # na ordem dos arquivos, com os trechos de cada um mesclados em ordem.
+    parts: List[str] = []
+    try:
+        for (name, i, n, _), resp in dispatch_ordered(units, request, concurrency):
+            if n == 1:
+                print(f"   Processando: {name}")
+                handle_response(resp, name)
+                continue
+            parts.append(resp)
+            if i + 1 == n:
+                print(f"   Processando: {name} ({n} trechos)")
+                handle_chunks(parts, name)
+                parts = []
+    finally:
+        if prefix_cache is not None:
+            prefix_cache.close()
 
 
 def main():
+    global _RESPONSE_CACHE
+
+    ap = argparse.ArgumentParser(description="Collector CAD_OBR (markdown -> JSON via LLM).")
+    ap.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignora o cache de respostas do LLM (sempre chama a API).",
+    )
+    args = ap.parse_args()
+
     try:
         config = load_config()
         project_root = get_project_root()
         agent_name = config.get("runtime", {}).get("agent_name", "Collector")
+        configure_pool_from_config(config.get("http_pool"))
+        _RESPONSE_CACHE = ResponseCache.from_config(
+            config.get("cache"), project_root, disabled=args.no_cache
+        )
         print(f"=== {agent_name} Iniciado ===")
         for job in config.get("jobs", []):
             process_job(job, config, project_root)
+        if _RESPONSE_CACHE is not None:
+            print(f"   [INFO] {_RESPONSE_CACHE.stats_line()}")
         print(f"=== {agent_name} Finalizado ===")
     except Exception as e:
         print(f"ERRO FATAL: {e}")
@@ -1,8 +1,10 @@
+import argparse
 import glob
 import json
 import os
 import re
-from typing import Any, Dict
+import sys
+from typing import Any, Dict, Optional
 
 import yaml
 from dotenv import load_dotenv  # <--- ADICIONAR ESTA LINHA
@@ -19,6 +21,15 @@ except ImportError:
     print("Execute: pip install google-genai")
     exit(1)
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from scripts.llm_cache import ResponseCache, make_key as make_cache_key  # noqa: E402
+from scripts.llm_clients import (  # noqa: E402
+    configure_pool_from_config,
+    get_client,
+    get_generate_config,
+)
+from scripts.ptbr_parse import parse_valor  # noqa: E402
+
 # --- UTILS BÁSICAS ---
 
 
@@ -63,17 +74,11 @@ def extract_json_from_text(text: str) -> str:
 
 
 def parse_monetary_value(val_str: str) -> float:
+    """Primeiro valor do texto (scripts/ptbr_parse.py); 0.0 se não houver."""
     if not val_str:
         return 0.0
-    clean = re.sub(r"[^\d,.]", "", val_str)
-    if "," in clean and "." in clean:
-        clean = clean.replace(".", "").replace(",", ".")
-    elif "," in clean:
-        clean = clean.replace(",", ".")
-    try:
-        return float(clean)
-    except ValueError:
-        return 0.0
+    valor = parse_valor(val_str)
+    return float(valor) if valor is not None else 0.0
 
 
 def format_currency(val_float: float) -> str:
@@ -237,43 +242,40 @@ def post_process_data(data: Dict) -> Dict:
 # --- INTEGRAÇÃO COM IA ---
 
 
-def call_llm_provider(prompt_text: str, config: Dict) -> str:
-    api_key = os.environ.get("GOOGLE_API_KEY", "")
-    if not api_key:
-        raise ValueError("GOOGLE_API_KEY não definida.")
+# Cache de respostas (scripts/llm_cache.py); aberto em main(), None com --no-cache
+_RESPONSE_CACHE: Optional[ResponseCache] = None
 
-    model_name = "gemini-2.5-flash"
 
-    client = genai.Client(api_key=api_key)
-    generate_config = types.GenerateContentConfig(
+def call_llm_provider(prompt_text: str, config: Dict) -> str:
+    model_name = "gemini-2.5-flash"
+    gen_params = dict(
         temperature=0.0,
         max_output_tokens=65536,
         response_mime_type="application/json",
-        safety_settings=[
-            types.SafetySetting(
-                category=types.HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT,
-                threshold=types.HarmBlockThreshold.BLOCK_NONE,
-            ),
-            types.SafetySetting(
-                category=types.HarmCategory.HARM_CATEGORY_HATE_SPEECH,
-                threshold=types.HarmBlockThreshold.BLOCK_NONE,
-            ),
-            types.SafetySetting(
-                category=types.HarmCategory.HARM_CATEGORY_HARASSMENT,
-                threshold=types.HarmBlockThreshold.BLOCK_NONE,
-            ),
-            types.SafetySetting(
-                category=types.HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT,
-                threshold=types.HarmBlockThreshold.BLOCK_NONE,
-            ),
-        ],
+        block_none_safety=True,
     )
 
+    cache_key = None
+    if _RESPONSE_CACHE is not None:
+        cache_key = make_cache_key(model_name, gen_params, prompt_text)
+        hit = _RESPONSE_CACHE.get(cache_key)
+        if hit is not None:
+            return hit[0]
+
+    # Cliente e config compartilhados (scripts/llm_clients.py): sem novo
+    # handshake TLS nem nova montagem dos SafetySetting a cada documento. A
+    # exigência de chave fica com o provedor (o stand-in não usa).
+    client = get_client(os.environ.get("GOOGLE_API_KEY"))
+    generate_config = get_generate_config(**gen_params)
+
     try:
         response = client.models.generate_content(
             model=model_name, contents=prompt_text, config=generate_config
         )
-        return response.text or ""
+        text = response.text or ""
+        if cache_key is not None:
+            _RESPONSE_CACHE.put(cache_key, text, model=model_name)
+        return text
     except Exception as e:
         print(f"   [ERRO API] {e}")
         return json.dumps({"error": str(e)}, ensure_ascii=False)
@@ -383,13 +385,29 @@ def process_job(job: Dict, global_config: Dict, project_root: str):
 
 
 def main():
+    global _RESPONSE_CACHE
+
+    ap = argparse.ArgumentParser(description="Collector de processos (markdown -> JSON via LLM).")
+    ap.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignora o cache de respostas do LLM (sempre chama a API).",
+    )
+    args = ap.parse_args()
+
     try:
         config = load_config()
         project_root = get_project_root()
         agent_name = config.get("runtime", {}).get("agent_name", "Collector")
+        configure_pool_from_config(config.get("http_pool"))
+        _RESPONSE_CACHE = ResponseCache.from_config(
+            config.get("cache"), project_root, disabled=args.no_cache
+        )
         print(f"=== {agent_name} Iniciado ===")
         for job in config.get("jobs", []):
             process_job(job, config, project_root)
+        if _RESPONSE_CACHE is not None:
+            print(f"   [INFO] {_RESPONSE_CACHE.stats_line()}")
         print(f"=== {agent_name} Finalizado ===")
     except Exception as e:
         print(f"ERRO FATAL: {e}")
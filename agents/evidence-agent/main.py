@@ -21,6 +21,9 @@ except Exception as e:  # pragma: no cover
         "Dependência ausente: jsonschema. Instale no seu venv (uv/pip)."
     ) from e
 
+_PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, _PROJECT_ROOT)
+
 
 def _read_text(path: str) -> str:
     with open(path, "r", encoding="utf-8") as f:
@@ -287,38 +290,41 @@ def _load_skill_text(skill_path: str) -> str:
 
 
 def _call_model(
-    runtime: Dict[str, Any], prompt: str, api_key_override: str | None = None
+    runtime: Dict[str, Any],
+    prompt: str,
+    api_key_override: str | None = None,
+    cache: Any = None,
 ) -> Tuple[str, str]:
-    api_key_env = runtime.get("api_key_env") or "GOOGLE_API_KEY"
-    api_key = (
-        api_key_override
-        or os.getenv(str(api_key_env))
-        or os.getenv("GEMINI_API_KEY")
-        or os.getenv("GOOGLE_API_KEY")
-    )
-    if not api_key:
-        raise RuntimeError(
-            "GOOGLE_API_KEY não está definido no ambiente (nem GEMINI_API_KEY)."
-        )
-
-    from google import genai  # type: ignore
-    from google.genai import types  # type: ignore
-
-    client = genai.Client(api_key=api_key)
-
     model = str(runtime.get("model") or "gemini-2.5-flash")
     temperature = float(runtime.get("temperature", 0.0))
     top_p = float(runtime.get("top_p", 0.95))
     max_output_tokens = int(runtime.get("max_output_tokens", 8192))
     response_mime_type = str(runtime.get("response_mime_type") or "application/json")
-
-    cfg = types.GenerateContentConfig(
+    gen_params = dict(
         temperature=temperature,
         top_p=top_p,
         max_output_tokens=max_output_tokens,
         response_mime_type=response_mime_type,
     )
 
+    # cache de respostas (scripts/llm_cache.py): mesmo modelo/config/prompt
+    cache_key = None
+    if cache is not None:
+        from scripts.llm_cache import make_key
+
+        cache_key = make_key(model, gen_params, prompt)
+        hit = cache.get(cache_key)
+        if hit is not None:
+            raw_hit, model_used_hit = hit
+            return raw_hit, model_used_hit or model
+
+    from scripts.llm_clients import get_client, get_generate_config, resolve_api_key
+
+    # a exigência de chave fica com o provedor (o stand-in não usa)
+    api_key_env = runtime.get("api_key_env") or "GOOGLE_API_KEY"
+    client = get_client(resolve_api_key(api_key_override, str(api_key_env)))
+    cfg = get_generate_config(**gen_params)
+
     resp = client.models.generate_content(
         model=model,
         contents=prompt,
@@ -334,6 +340,8 @@ def _call_model(
     except Exception:
         pass
 
+    if cache_key is not None:
+        cache.put(cache_key, raw, model=model, model_used=model_used)
     return raw, model_used
 
 
@@ -342,6 +350,7 @@ def main() -> int:
     ap.add_argument("--config", required=True)
     ap.add_argument("--job", default=None)
     ap.add_argument("--api-key", default=None)
+    ap.add_argument("--no-cache", action="store_true")
     ap.add_argument("--pack", default=None)
     args = ap.parse_args()
 
@@ -399,7 +408,14 @@ def main() -> int:
     os.makedirs(out_base, exist_ok=True)
     _write_text(os.path.join(out_base, last_prompt_name), prompt)
 
-    raw, model_used = _call_model(runtime, prompt, api_key_override=args.api_key)
+    from scripts.llm_cache import ResponseCache
+
+    cache = ResponseCache.from_config(
+        cfg.get("cache"), _PROJECT_ROOT, disabled=args.no_cache
+    )
+    raw, model_used = _call_model(
+        runtime, prompt, api_key_override=args.api_key, cache=cache
+    )
     _write_text(os.path.join(out_base, last_raw_name), raw)
 
     parsed = _extract_json_object(raw)
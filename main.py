@@ -1,5 +1,6 @@
 import os  # <--- Adicione
 from pathlib import Path
+from typing import Optional
 
 import typer
 from dotenv import load_dotenv  # <--- Adicione esta importação
@@ -11,7 +12,10 @@ from scripts.doc_collector import DocCollector
 
 # Importações dos scripts
 from scripts.setup_schemas import generate_schemas
-from scripts.transcriber_util import PDFTranscriber
+from scripts.transcriber_ocr import OcrSettings, ocr_available
+from scripts.transcriber_util import PDFTranscriber, default_workers, extractor_tag
+from scripts.transcription_cache import DEFAULT_PATH as PAGE_CACHE_PATH
+from scripts.transcription_cache import PageCache, sha256_file
 
 # --- CORREÇÃO AQUI ---
 # Carrega as variáveis de ambiente antes de qualquer comando
@@ -48,6 +52,23 @@ def transcrever(
     forcar: bool = typer.Option(
         False, help="Se True, reprocessa arquivos que já existem em Markdown."
     ),
+    processos: int = typer.Option(
+        0,
+        help="Processos para extrair páginas (0 = um por núcleo, 1 = serial).",
+    ),
+    cache: bool = typer.Option(
+        True,
+        "--cache/--sem-cache",
+        help="Reaproveita páginas já transcritas e retoma conversões interrompidas.",
+    ),
+    ocr: bool = typer.Option(
+        True,
+        "--ocr/--sem-ocr",
+        help="Lê por OCR (Tesseract) as páginas sem camada de texto.",
+    ),
+    processos_ocr: int = typer.Option(
+        2, help="Processos da faixa de OCR (separados dos de extração de texto)."
+    ),
 ):
     """
     [Passo 2] Converte PDFs da pasta de anexos para Markdown com numeração de folhas.
@@ -63,37 +84,101 @@ def transcrever(
         console.print(f"[red]Erro: A pasta '{pasta_entrada}' não existe.[/red]")
         raise typer.Exit(code=1)
 
+    ocr_settings = None
+    if ocr:
+        motivo = ocr_available()
+        if motivo:
+            console.print(f"[yellow]OCR desativado: {motivo}[/yellow]")
+        else:
+            ocr_settings = OcrSettings(workers=max(1, processos_ocr))
+
+    page_cache = (
+        PageCache(PAGE_CACHE_PATH, extractor=extractor_tag(ocr_settings))
+        if cache
+        else None
+    )
     transcriber = PDFTranscriber(
-        output_dir=str(path_entrada)
+        output_dir=str(path_entrada), cache=page_cache, ocr=ocr_settings
     )  # Salva o .md ao lado do .pdf ou em pasta específica
 
-    pdfs = list(path_entrada.glob("*.pdf"))
+    try:
+        _transcrever_pasta(path_entrada, transcriber, page_cache, forcar, processos)
+    finally:
+        if page_cache is not None:
+            page_cache.close()
+
+
+def _transcrever_pasta(
+    path_entrada: Path,
+    transcriber: PDFTranscriber,
+    page_cache: Optional[PageCache],
+    forcar: bool,
+    processos: int,
+):
+    pdfs = sorted(path_entrada.glob("*.pdf"))
     if not pdfs:
         console.print("[yellow]Nenhum arquivo PDF encontrado para processar.[/yellow]")
         return
 
+    pendentes = []
+    for pdf in pdfs:
+        nome_md = pdf.with_suffix(".md").name
+        caminho_md = path_entrada / nome_md
+        if caminho_md.exists() and not forcar:
+            # Com journal, um .md de outra versão do PDF não conta como pronto
+            if (
+                page_cache is not None
+                and page_cache.journal_entry(str(caminho_md)) is not None
+                and not page_cache.is_current(str(caminho_md), sha256_file(str(pdf)))
+            ):
+                console.print(f"[yellow]PDF alterado, retranscrevendo: {pdf.name}[/yellow]")
+            else:
+                console.print(f"[dim]Ignorado (já existe): {nome_md}[/dim]")
+                continue
+        pendentes.append(pdf)
+    if not pendentes:
+        return
+
+    workers = processos if processos > 0 else default_workers()
+
     with Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
         transient=True,
     ) as progress:
-        task = progress.add_task(description="Processando...", total=len(pdfs))
-
-        for pdf in pdfs:
-            nome_md = pdf.with_suffix(".md").name
-            caminho_md = path_entrada / nome_md
-
-            progress.update(task, description=f"Convertendo: {pdf.name}")
-
-            if caminho_md.exists() and not forcar:
-                console.print(f"[dim]Ignorado (já existe): {nome_md}[/dim]")
-                continue
-
-            try:
-                transcriber.convert(str(pdf))
-                console.print(f"[green]✔ Convertido: {nome_md}[/green]")
-            except Exception as e:
-                console.print(f"[red]✖ Falha em {pdf.name}: {e}[/red]")
+        task = progress.add_task(description="Processando...", total=len(pendentes))
+
+        if workers <= 1:
+            resultados = (
+                (str(pdf), _converter_um(transcriber, pdf)) for pdf in pendentes
+            )
+        else:
+            # Um único pool para as páginas de todos os PDFs; os .md saem na
+            # ordem da lista, cada um com as folhas na ordem original.
+            progress.update(
+                task, description=f"Convertendo {len(pendentes)} PDF(s) em {workers} processos"
+            )
+            resultados = transcriber.convert_many(
+                [str(pdf) for pdf in pendentes], workers
+            )
+
+        for pdf_path, resultado in resultados:
+            pdf = Path(pdf_path)
+            progress.advance(task)
+            if isinstance(resultado, Exception):
+                console.print(f"[red]✖ Falha em {pdf.name}: {resultado}[/red]")
+            else:
+                console.print(f"[green]✔ Convertido: {pdf.with_suffix('.md').name}[/green]")
+
+    if page_cache is not None:
+        console.print(f"[dim]{page_cache.stats_line()}[/dim]")
+
+
+def _converter_um(transcriber: PDFTranscriber, pdf: Path):
+    try:
+        return transcriber.convert(str(pdf))
+    except Exception as e:
+        return e
 
 
 @app.command()
@@ -12,21 +12,56 @@ Ordem por tipo de documento:
 3) normalize_partes.py        (in-place em 02_normalize)
 4) monetary_cli.py            (02_normalize -> 03_monetary)
 
+Modos de execução:
+- subprocess (default): um interpretador por passo, cada passo lê e grava
+  02_normalize em disco.
+- --in-process: importa as funções núcleo de cada estágio e passa o documento
+  em memória de um estágio para o outro (o normalize roda em passagem única,
+  via normalize/normalize_fused.py). Cada documento é lido uma vez de
+  01_collector e gravado uma vez em 02_normalize (saída final do normalize) e
+  uma vez em 03_monetary. Os bytes gravados são os mesmos do modo subprocess.
+  Diferença: só os documentos da execução corrente passam pelos estágios
+  (o modo subprocess reprocessa também JSONs antigos já presentes em 02).
+
 Uso:
   python3 pipelines/cad_obr.py
   python3 pipelines/cad_obr.py --dry-run
   python3 pipelines/cad_obr.py --types escritura_imovel
   python3 pipelines/cad_obr.py --skip-monetary
+  python3 pipelines/cad_obr.py --in-process
+  python3 pipelines/cad_obr.py --in-process --jobs 8
+  python3 pipelines/cad_obr.py --incremental
+
+--incremental (implica --in-process) grava um manifest por estágio e tipo em
+<base-out>/_build com sha256 da entrada, versão do código do estágio e
+parâmetros (ex.: hash da TR CSV). Documentos cuja entrada, código e parâmetros
+não mudaram são pulados e as saídas existentes são mantidas; alterar só a TR
+refaz apenas o monetary.
+
+--jobs N roda as cadeias de tipos independentes em paralelo (e, com
+--in-process, também os documentos de cada estágio), preservando a ordem dos
+estágios de cada cadeia. Sem --continue-on-error, a primeira falha impede o
+início de novos passos; as falhas são resumidas por tipo no final.
 """
 
 from __future__ import annotations
 
 import argparse
+import importlib
+import json
 import subprocess
 import sys
-from dataclasses import dataclass
+import threading
+from concurrent.futures import (
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
+from dataclasses import dataclass, field, fields, is_dataclass
 from pathlib import Path
-from typing import List
+from types import ModuleType
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 DEFAULT_TYPES = ["contrato_social", "escritura_imovel", "escritura_hipotecaria"]
 
@@ -38,6 +73,14 @@ class RunResult:
     returncode: int
 
 
+@dataclass
+class TypeDirs:
+    tipo: str
+    in_01: Path
+    out_02: Path
+    out_03: Path
+
+
 def _repo_root() -> Path:
     # Este arquivo está em <repo>/pipelines/cad_obr.py
     return Path(__file__).resolve().parents[1]
@@ -47,12 +90,28 @@ def _script_path(repo: Path, rel: str) -> Path:
     return (repo / rel).resolve()
 
 
-def _run(cmd: List[str], dry_run: bool) -> RunResult:
-    print("\n$ " + " ".join(cmd))
+def _emit(line: str, log: Optional[List[str]] = None) -> None:
+    """Imprime direto ou acumula no log da cadeia (execução paralela)."""
+    if log is None:
+        print(line)
+    else:
+        log.append(line)
+
+
+def _run(cmd: List[str], dry_run: bool, log: Optional[List[str]] = None) -> RunResult:
+    _emit("\n$ " + " ".join(cmd), log)
     if dry_run:
         return RunResult(ok=True, cmd=cmd, returncode=0)
 
-    p = subprocess.run(cmd, text=True)
+    if log is None:
+        p = subprocess.run(cmd, text=True)
+    else:
+        # Em paralelo, captura a saída para não intercalar cadeias no terminal.
+        p = subprocess.run(
+            cmd, text=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT
+        )
+        if p.stdout:
+            log.append(p.stdout.rstrip("\n"))
     return RunResult(ok=(p.returncode == 0), cmd=cmd, returncode=p.returncode)
 
 
@@ -60,6 +119,613 @@ def _ensure_dir(path: Path) -> None:
     path.mkdir(parents=True, exist_ok=True)
 
 
+# ------------------------------------------------------------
+# Execução via subprocess (um CLI por passo)
+# ------------------------------------------------------------
+
+
+@dataclass
+class ChainStep:
+    stage: str
+    cmd: List[str]
+
+
+def _subprocess_steps(
+    repo: Path,
+    in_01: Path,
+    out_02: Path,
+    out_03: Path,
+    args: argparse.Namespace,
+) -> List[ChainStep]:
+    """Monta a cadeia de comandos de um tipo, na ordem dos estágios."""
+    py = sys.executable  # garante o Python do seu venv/uv/ambiente atual
+    steps: List[ChainStep] = []
+
+    # 1) normalize_valores (01 -> 02)
+    if not args.skip_values:
+        script = _script_path(repo, "pipelines/cad_obr/normalize/normalize_valores.py")
+        cmd = [
+            py,
+            str(script),
+            "--input",
+            str(in_01),
+            "--output",
+            str(out_02),
+            "--pattern",
+            args.pattern,
+        ]
+        steps.append(ChainStep("normalize_valores", cmd))
+
+    # 2) normalize_titularidade (in-place em 02)
+    if not args.skip_titularidade:
+        script = _script_path(
+            repo, "pipelines/cad_obr/normalize/normalize_titularidade.py"
+        )
+        cmd = [
+            py,
+            str(script),
+            "--input",
+            str(out_02),
+            "--output",
+            str(out_02),
+            "--pattern",
+            "*.json",
+            "--inplace",
+        ]
+        steps.append(ChainStep("normalize_titularidade", cmd))
+
+    # 3) normalize_partes (in-place em 02)
+    if not args.skip_partes:
+        script = _script_path(repo, "pipelines/cad_obr/normalize/normalize_partes.py")
+        cmd = [
+            py,
+            str(script),
+            "--input",
+            str(out_02),
+            "--output",
+            str(out_02),
+            "--pattern",
+            "*.json",
+            "--inplace",
+        ]
+        steps.append(ChainStep("normalize_partes", cmd))
+
+    # 4) monetary_cli (02 -> 03)
+    if not args.skip_monetary:
+        script = _script_path(repo, "pipelines/cad_obr/monetary/monetary_cli.py")
+        cmd = [
+            py,
+            str(script),
+            "--input-dir",
+            str(out_02),
+            "--output-dir",
+            str(out_03),
+        ]
+        if args.monetary_exato:
+            cmd.append("--exato")
+        steps.append(ChainStep("monetary_cli", cmd))
+
+    return steps
+
+
+def _run_subprocess_chain(
+    t: str,
+    steps: List[ChainStep],
+    args: argparse.Namespace,
+    stop: Optional[threading.Event] = None,
+    log: Optional[List[str]] = None,
+) -> List[str]:
+    """
+    Executa os passos de um tipo em ordem. Sem --continue-on-error, para no
+    primeiro passo com falha e sinaliza `stop` para as demais cadeias.
+    """
+    failures: List[str] = []
+    for step in steps:
+        if stop is not None and stop.is_set():
+            break
+        r = _run(step.cmd, args.dry_run, log)
+        if not r.ok:
+            msg = f"[FAIL] {step.stage} ({t}) rc={r.returncode}"
+            _emit(msg, log)
+            failures.append(msg)
+            if not args.continue_on_error:
+                if stop is not None:
+                    stop.set()
+                break
+    return failures
+
+
+# ------------------------------------------------------------
+# Execução in-process
+# ------------------------------------------------------------
+
+# Diretórios dos estágios: os CLIs resolvem imports irmãos pelo diretório do
+# script (ex.: `from monetary_core import ...`), então fazemos o mesmo aqui.
+STAGE_DIRS = [
+    "pipelines/cad_obr/normalize",
+    "pipelines/cad_obr/monetary",
+    "pipelines/cad_obr/build",
+]
+
+STAGE_MODULES = [
+    "normalize_valores",
+    "normalize_titularidade",
+    "normalize_partes",
+    "normalize_fused",
+    "monetary_indices",
+    "monetary_core",
+    "monetary_cli",
+    "build_manifest",
+]
+
+STAGE_02 = "02_normalize"
+STAGE_03 = "03_monetary"
+
+
+@dataclass
+class BuildParams:
+    """Versões/parâmetros do build incremental (iguais para todos os documentos)."""
+
+    version_02: str
+    params_02: Dict[str, Any]
+    version_03: str
+    params_03: Dict[str, Any]
+
+
+@dataclass
+class ChainStats:
+    """Estatísticas agregadas de uma cadeia (tipo de documento) in-process."""
+
+    docs_in: int = 0
+    docs_read_fail: int = 0
+    docs_02_written: int = 0
+    docs_03_written: int = 0
+    valores: Any = None  # normalize_valores.NormalizeStats
+    titularidade: Any = None  # normalize_titularidade.Stats
+    partes: Any = None  # normalize_partes.Stats (agregado)
+    failures: List[str] = field(default_factory=list)
+    # build incremental: documentos pulados e entradas novas dos manifests
+    docs_02_skipped: int = 0
+    docs_03_skipped: int = 0
+    manifest_02: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    manifest_03: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # chaves das entradas presentes na varredura (as demais saem dos manifests)
+    manifest_keys: List[str] = field(default_factory=list)
+
+
+def _load_stage_modules(repo: Path) -> Dict[str, ModuleType]:
+    for rel in STAGE_DIRS:
+        p = str(_script_path(repo, rel))
+        if p not in sys.path:
+            sys.path.insert(0, p)
+    mods = {name: importlib.import_module(name) for name in STAGE_MODULES}
+    # parsing pt-BR compartilhado (scripts/ptbr_parse.py): entra na versão dos estágios
+    mods["ptbr_parse"] = importlib.import_module("scripts.ptbr_parse")
+    return mods
+
+
+def _new_chain_stats(mods: Dict[str, ModuleType]) -> ChainStats:
+    return ChainStats(
+        valores=mods["normalize_valores"].NormalizeStats(),
+        titularidade=mods["normalize_titularidade"].Stats(),
+        partes=mods["normalize_partes"].Stats(),
+    )
+
+
+def _merge_chain_stats(dst: ChainStats, src: ChainStats) -> None:
+    """Soma contadores de `src` em `dst` (inclusive os Stats de cada estágio)."""
+    for f in fields(dst):
+        a = getattr(dst, f.name)
+        b = getattr(src, f.name)
+        if isinstance(a, list):
+            a.extend(b)
+        elif isinstance(a, dict):
+            a.update(b)
+        elif is_dataclass(a):
+            for g in fields(a):
+                setattr(a, g.name, getattr(a, g.name) + getattr(b, g.name))
+        else:
+            setattr(dst, f.name, a + b)
+
+
+def _chain_sources(
+    in_01: Path, out_02: Path, args: argparse.Namespace, mods: Dict[str, ModuleType]
+) -> List[Path]:
+    """
+    Resolve os arquivos de entrada da cadeia conforme o primeiro estágio ativo,
+    espelhando o que cada CLI listaria no modo subprocess.
+    """
+    if not args.skip_values:
+        return sorted(in_01.glob(args.pattern))
+    if not (args.skip_titularidade and args.skip_partes):
+        return sorted(out_02.rglob("*.json"))
+    return [
+        Path(p) for p in mods["monetary_cli"]._listar_arquivos_entrada(str(out_02), None)
+    ]
+
+
+def _chain_base(dirs: TypeDirs, args: argparse.Namespace) -> Path:
+    return dirs.in_01 if not args.skip_values else dirs.out_02
+
+
+def _build_params(args: argparse.Namespace, mods: Dict[str, ModuleType]) -> BuildParams:
+    """
+    Versões de código e parâmetros que invalidam o manifest de cada estágio.
+    O normalize depende dos estágios ativos; o monetary, dos CSVs de índices
+    (TR, IPCA, ...) em uso.
+    """
+    bm = mods["build_manifest"]
+    mc = mods["monetary_core"]
+    mi = mods["monetary_indices"]
+    ativos = [
+        name
+        for name, skip in [
+            ("valores", args.skip_values),
+            ("titularidade", args.skip_titularidade),
+            ("partes", args.skip_partes),
+        ]
+        if not skip
+    ]
+    return BuildParams(
+        version_02=bm.code_version(
+            [
+                mods["normalize_valores"],
+                mods["normalize_titularidade"],
+                mods["normalize_partes"],
+                mods["normalize_fused"],
+                mods["ptbr_parse"],
+            ]
+        ),
+        params_02={"stages": ativos},
+        version_03=bm.code_version([mi, mc, mods["monetary_cli"], mods["ptbr_parse"]]),
+        params_03={
+            "indices_csv_sha256": {
+                nome: bm.sha256_file(Path(d.csv_path)) for nome, d in mi.INDICES.items()
+            },
+            "exato": bool(args.monetary_exato),
+        },
+    )
+
+
+def _process_document(
+    dirs: TypeDirs,
+    src: Path,
+    args: argparse.Namespace,
+    mods: Dict[str, ModuleType],
+    stats: ChainStats,
+    build: Optional[BuildParams] = None,
+    prev_02: Optional[Dict[str, Any]] = None,
+    prev_03: Optional[Dict[str, Any]] = None,
+) -> bool:
+    """
+    Executa valores -> titularidade -> partes (normalize_fused, uma passagem)
+    -> monetary para um documento, sem serializar entre estágios
+    intermediários. Retorna False em falha.
+
+    Com `build` (modo incremental), compara o sha256 da entrada com as entradas
+    anteriores do manifest (`prev_02`/`prev_03`) e pula os estágios cuja saída
+    já corresponde à entrada, versão de código e parâmetros atuais.
+    """
+    nv = mods["normalize_valores"]
+    nf = mods["normalize_fused"]
+    mc = mods["monetary_core"]
+    mcli = mods["monetary_cli"]
+    bm = mods["build_manifest"]
+
+    stats.docs_in += 1
+    key = str(src.relative_to(_chain_base(dirs, args)))
+    dst_02 = dirs.out_02 / key
+    stage = "normalize"
+    try:
+        raw = src.read_bytes()
+        doc = json.loads(raw.decode("utf-8"))
+    except Exception as e:
+        print(f"[WARN] Falha ao ler JSON: {src.name} ({e})")
+        stats.docs_read_fail += 1
+        return True
+
+    try:
+        sha_02: Optional[str] = None
+        fresh_02 = build is not None and bm.is_fresh(
+            prev_02, bm.sha256_bytes(raw), build.version_02, build.params_02, dirs.out_02
+        )
+
+        if fresh_02:
+            assert prev_02 is not None
+            stats.docs_02_skipped += 1
+            sha_02 = prev_02.get("output_sha256")
+        else:
+            # Passagem única (valores + titularidade + partes); o gravador é o
+            # do último estágio ativo, para manter os bytes do modo subprocess.
+            ativos = dict(
+                valores=not args.skip_values,
+                titularidade=not args.skip_titularidade,
+                partes=not args.skip_partes,
+            )
+            writer = nf.writer_for(**ativos)
+            fused = nf.FusedStats(
+                valores=stats.valores,
+                titularidade=stats.titularidade,
+                partes=stats.partes,
+            )
+            doc = nf.normalize_document(doc, fused, **ativos)
+
+            if writer is not None:
+                writer(dst_02, doc)
+                stats.docs_02_written += 1
+
+            if build is not None and writer is not None:
+                sha_02 = bm.sha256_file(dst_02)
+                stats.manifest_02[key] = bm.make_entry(
+                    bm.sha256_bytes(raw),
+                    build.version_02,
+                    build.params_02,
+                    key,
+                    sha_02,
+                )
+
+        if not args.skip_monetary:
+            stage = "monetary_cli"
+            if (
+                build is not None
+                and sha_02 is not None
+                and bm.is_fresh(
+                    prev_03, sha_02, build.version_03, build.params_03, dirs.out_03
+                )
+            ):
+                stats.docs_03_skipped += 1
+                return True
+
+            if fresh_02:
+                # normalize atualizado, monetary não: parte da saída já gravada
+                doc = nv.load_json(dst_02)
+            doc_out = mc.processar_documento_cad_obr(doc, exato=args.monetary_exato)
+            out_path = mcli.gravar_saida(str(dirs.out_03), str(dst_02), doc_out)
+            stats.docs_03_written += 1
+
+            if build is not None and sha_02 is not None:
+                stats.manifest_03[key] = bm.make_entry(
+                    sha_02,
+                    build.version_03,
+                    build.params_03,
+                    Path(out_path).name,
+                    bm.sha256_file(Path(out_path)),
+                )
+
+    except Exception as e:
+        msg = f"[FAIL] {stage} ({dirs.tipo}) {src.name}: {e}"
+        print(msg)
+        stats.failures.append(msg)
+        return False
+
+    return True
+
+
+def _run_chain_in_process(
+    dirs: TypeDirs,
+    args: argparse.Namespace,
+    mods: Dict[str, ModuleType],
+    build: Optional[BuildParams] = None,
+    prev: Optional[Tuple[Dict[str, Any], Dict[str, Any]]] = None,
+) -> ChainStats:
+    stats = _new_chain_stats(mods)
+    prev_02, prev_03 = prev or ({}, {})
+    base = _chain_base(dirs, args)
+    sources = _chain_sources(dirs.in_01, dirs.out_02, args, mods)
+    stats.manifest_keys = [str(src.relative_to(base)) for src in sources]
+    for src, key in zip(sources, stats.manifest_keys):
+        ok = _process_document(
+            dirs, src, args, mods, stats, build, prev_02.get(key), prev_03.get(key)
+        )
+        if not ok and not args.continue_on_error:
+            break
+    return stats
+
+
+def _print_chain_stats(stats: ChainStats, args: argparse.Namespace) -> None:
+    print(f"Documentos de entrada:  {stats.docs_in}")
+    print(f"Falhas de leitura:      {stats.docs_read_fail}")
+    if not args.skip_values:
+        v = stats.valores
+        print(
+            f"- valores: ônus {v.onus_normalized}/{v.onus_total}, "
+            f"vendas {v.vendas_normalized}/{v.vendas_total}"
+        )
+    if not args.skip_titularidade:
+        tt = stats.titularidade
+        print(
+            f"- titularidade: datas {tt.date_changed}, cpf {tt.cpf_changed}, "
+            f"cnpj {tt.cnpj_changed}, numeros {tt.num_changed}"
+        )
+    if not args.skip_partes:
+        pp = stats.partes
+        print(f"- partes: partes {pp.parties_found}, ids {pp.ids_written}")
+    print(f"Gravados em 02_normalize: {stats.docs_02_written}")
+    print(f"Gravados em 03_monetary:  {stats.docs_03_written}")
+    if args.incremental:
+        print(
+            f"Inalterados (pulados): 02 {stats.docs_02_skipped}, "
+            f"03 {stats.docs_03_skipped}"
+        )
+
+
+# ------------------------------------------------------------
+# Build incremental (--incremental)
+# ------------------------------------------------------------
+
+
+def _load_manifests(
+    base_out: Path, tipo: str, mods: Dict[str, ModuleType]
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    bm = mods["build_manifest"]
+    return (
+        bm.load_manifest(bm.manifest_path(base_out, STAGE_02, tipo)),
+        bm.load_manifest(bm.manifest_path(base_out, STAGE_03, tipo)),
+    )
+
+
+def _save_manifests(
+    base_out: Path,
+    tipo: str,
+    prev: Tuple[Dict[str, Any], Dict[str, Any]],
+    stats: ChainStats,
+    mods: Dict[str, ModuleType],
+) -> None:
+    """
+    Entradas anteriores + as desta execução. Documentos que falharam não têm
+    entrada nova e continuam desatualizados, então são refeitos na próxima vez.
+    Entradas cujo arquivo saiu da varredura atual são descartadas.
+    """
+    bm = mods["build_manifest"]
+    presentes = set(stats.manifest_keys)
+    for stage, old, new in [
+        (STAGE_02, prev[0], stats.manifest_02),
+        (STAGE_03, prev[1], stats.manifest_03),
+    ]:
+        entries = {k: v for k, v in old.items() if k in presentes}
+        entries.update(new)
+        bm.save_manifest(bm.manifest_path(base_out, stage, tipo), stage, tipo, entries)
+
+
+# ------------------------------------------------------------
+# Agendamento paralelo (--jobs N)
+# ------------------------------------------------------------
+#
+# Grafo de dependências: as cadeias de tipos diferentes são independentes; a
+# única aresta é a ordem dos estágios dentro de uma cadeia.
+# - subprocess: cada CLI processa um diretório inteiro, então a unidade
+#   agendável é a cadeia do tipo (passos em série, tipos em paralelo).
+# - in-process: cada documento percorre sozinho valores -> ... -> monetary,
+#   então a unidade agendável é o documento (todos os tipos no mesmo pool).
+
+# Módulos dos estágios carregados uma vez por worker do pool.
+_WORKER_MODS: Dict[str, ModuleType] = {}
+
+
+def _document_task(
+    repo: Path,
+    dirs: TypeDirs,
+    src: Path,
+    args: argparse.Namespace,
+    build: Optional[BuildParams] = None,
+    prev_02: Optional[Dict[str, Any]] = None,
+    prev_03: Optional[Dict[str, Any]] = None,
+) -> ChainStats:
+    if not _WORKER_MODS:
+        _WORKER_MODS.update(_load_stage_modules(repo))
+    stats = _new_chain_stats(_WORKER_MODS)
+    _process_document(dirs, src, args, _WORKER_MODS, stats, build, prev_02, prev_03)
+    return stats
+
+
+def _run_in_process_parallel(
+    repo: Path,
+    chains: List[TypeDirs],
+    args: argparse.Namespace,
+    mods: Dict[str, ModuleType],
+    build: Optional[BuildParams] = None,
+    prev_by_type: Optional[Dict[str, Tuple[Dict[str, Any], Dict[str, Any]]]] = None,
+) -> Dict[str, ChainStats]:
+    stats_by_type = {d.tipo: _new_chain_stats(mods) for d in chains}
+
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        futures: Dict[Future, TypeDirs] = {}
+        for d in chains:
+            prev_02, prev_03 = (prev_by_type or {}).get(d.tipo, ({}, {}))
+            base = _chain_base(d, args)
+            for src in _chain_sources(d.in_01, d.out_02, args, mods):
+                key = str(src.relative_to(base))
+                stats_by_type[d.tipo].manifest_keys.append(key)
+                fut = pool.submit(
+                    _document_task,
+                    repo,
+                    d,
+                    src,
+                    args,
+                    build,
+                    prev_02.get(key),
+                    prev_03.get(key),
+                )
+                futures[fut] = d
+
+        for fut in as_completed(futures):
+            if fut.cancelled():
+                continue
+            d = futures[fut]
+            try:
+                st = fut.result()
+            except Exception as e:
+                st = _new_chain_stats(mods)
+                st.failures.append(f"[FAIL] worker ({d.tipo}): {e}")
+            _merge_chain_stats(stats_by_type[d.tipo], st)
+            if st.failures and not args.continue_on_error:
+                # Documentos já em execução terminam; os pendentes são cancelados.
+                for other in futures:
+                    other.cancel()
+
+    return stats_by_type
+
+
+def _run_subprocess_parallel(
+    repo: Path, chains: List[TypeDirs], args: argparse.Namespace
+) -> Dict[str, List[str]]:
+    stop = threading.Event()
+    failures: Dict[str, List[str]] = {}
+
+    # Cada passo já roda em um processo filho; as threads só encadeiam os passos.
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        futures: Dict[Future, Tuple[TypeDirs, List[str]]] = {}
+        for d in chains:
+            log: List[str] = []
+            steps = _subprocess_steps(repo, d.in_01, d.out_02, d.out_03, args)
+            fut = pool.submit(_run_subprocess_chain, d.tipo, steps, args, stop, log)
+            futures[fut] = (d, log)
+
+        for fut in as_completed(futures):
+            d, log = futures[fut]
+            failures[d.tipo] = fut.result()
+            print("\n" + "-" * 72)
+            print(f"TIPO: {d.tipo} (log da cadeia)")
+            print("-" * 72)
+            for line in log:
+                print(line)
+
+    return failures
+
+
+# ------------------------------------------------------------
+# CLI
+# ------------------------------------------------------------
+
+
+def _print_type_header(d: TypeDirs) -> None:
+    print("\n" + "=" * 72)
+    print(f"TIPO: {d.tipo}")
+    print(f"01_collector: {d.in_01}")
+    print(f"02_normalize: {d.out_02}")
+    print(f"03_monetary:  {d.out_03}")
+    print("=" * 72)
+
+
+def _print_failure_summary(failures: Dict[str, List[str]]) -> None:
+    total = sum(len(v) for v in failures.values())
+    print(f"PIPELINE FINALIZADO COM FALHAS ({total}):")
+    for t, msgs in failures.items():
+        if not msgs:
+            continue
+        por_estagio: Dict[str, int] = {}
+        for m in msgs:
+            parts = m.split(" ", 2)
+            estagio = "entrada"
+            if m.startswith("[FAIL]") and len(parts) > 1:
+                estagio = parts[1]
+            por_estagio[estagio] = por_estagio.get(estagio, 0) + 1
+        resumo = ", ".join(f"{k}={v}" for k, v in por_estagio.items())
+        print(f"- {t}: {len(msgs)} falha(s) [{resumo}]")
+        for m in msgs:
+            print("    " + m)
+
+
 def main() -> int:
     repo = _repo_root()
 
@@ -97,8 +763,43 @@ def main() -> int:
     )
     ap.add_argument("--skip-partes", action="store_true", help="Pula normalize_partes.")
     ap.add_argument("--skip-monetary", action="store_true", help="Pula monetary_cli.")
+    ap.add_argument(
+        "--monetary-exato",
+        action="store_true",
+        help="monetary_cli com aritmética exata (centavos inteiros, fatores Decimal).",
+    )
+    ap.add_argument(
+        "--in-process",
+        action="store_true",
+        help="Executa os estágios no mesmo processo, passando documentos em memória.",
+    )
+    ap.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Workers em paralelo (tipos; e documentos com --in-process). Default: 1",
+    )
+    ap.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Pula documentos inalterados (manifest em <base-out>/_build). Implica --in-process.",
+    )
     args = ap.parse_args()
 
+    if args.jobs < 1:
+        print("ERRO: --jobs deve ser >= 1.")
+        return 2
+
+    if args.incremental:
+        if args.skip_values:
+            # Sem valores, o normalize reescreve 02 in-place: a entrada muda a
+            # cada execução e não há o que comparar.
+            print("[AVISO] --incremental ignorado com --skip-values.")
+            args.incremental = False
+        elif not args.in_process:
+            print("[AVISO] --incremental implica --in-process.")
+            args.in_process = True
+
     base_out = (repo / args.base_out).resolve()
     dir_01 = base_out / "01_collector"
     dir_02 = base_out / "02_normalize"
@@ -109,129 +810,78 @@ def main() -> int:
         print("ERRO: --types vazio.")
         return 2
 
-    normalize_valores_py = _script_path(
-        repo, "pipelines/cad_obr/normalize/normalize_valores.py"
-    )
-    normalize_titularidade_py = _script_path(
-        repo, "pipelines/cad_obr/normalize/normalize_titularidade.py"
-    )
-    normalize_partes_py = _script_path(
-        repo, "pipelines/cad_obr/normalize/normalize_partes.py"
-    )
-    monetary_cli_py = _script_path(repo, "pipelines/cad_obr/monetary/monetary_cli.py")
+    failures: Dict[str, List[str]] = {t: [] for t in types}
 
-    py = sys.executable  # garante o Python do seu venv/uv/ambiente atual
-
-    failures: List[str] = []
+    mods: Dict[str, ModuleType] = {}
+    build: Optional[BuildParams] = None
+    prev_by_type: Dict[str, Tuple[Dict[str, Any], Dict[str, Any]]] = {}
+    if args.in_process and not args.dry_run:
+        mods = _load_stage_modules(repo)
+        if args.incremental:
+            build = _build_params(args, mods)
+            prev_by_type = {t: _load_manifests(base_out, t, mods) for t in types}
 
+    chains: List[TypeDirs] = []
     for t in types:
-        in_01 = dir_01 / t
-        out_02 = dir_02 / t
-        out_03 = dir_03 / t
-
-        print("\n" + "=" * 72)
-        print(f"TIPO: {t}")
-        print(f"01_collector: {in_01}")
-        print(f"02_normalize: {out_02}")
-        print(f"03_monetary:  {out_03}")
-        print("=" * 72)
+        d = TypeDirs(tipo=t, in_01=dir_01 / t, out_02=dir_02 / t, out_03=dir_03 / t)
+        _print_type_header(d)
 
-        if not in_01.exists():
-            msg = f"[ERRO] Pasta de entrada não existe: {in_01}"
+        if not d.in_01.exists():
+            msg = f"[ERRO] Pasta de entrada não existe: {d.in_01}"
             print(msg)
-            failures.append(msg)
+            failures[t].append(msg)
             if not args.continue_on_error:
+                _print_failure_summary(failures)
                 return 1
             continue
 
-        _ensure_dir(out_02)
-        _ensure_dir(out_03)
-
-        # 1) normalize_valores (01 -> 02)
-        if not args.skip_values:
-            cmd = [
-                py,
-                str(normalize_valores_py),
-                "--input",
-                str(in_01),
-                "--output",
-                str(out_02),
-                "--pattern",
-                args.pattern,
-            ]
-            r = _run(cmd, args.dry_run)
-            if not r.ok:
-                msg = f"[FAIL] normalize_valores ({t}) rc={r.returncode}"
-                print(msg)
-                failures.append(msg)
-                if not args.continue_on_error:
-                    return 1
-
-        # 2) normalize_titularidade (in-place em 02)
-        if not args.skip_titularidade:
-            cmd = [
-                py,
-                str(normalize_titularidade_py),
-                "--input",
-                str(out_02),
-                "--output",
-                str(out_02),
-                "--pattern",
-                "*.json",
-                "--inplace",
-            ]
-            r = _run(cmd, args.dry_run)
-            if not r.ok:
-                msg = f"[FAIL] normalize_titularidade ({t}) rc={r.returncode}"
-                print(msg)
-                failures.append(msg)
-                if not args.continue_on_error:
-                    return 1
-
-        # 3) normalize_partes (in-place em 02)
-        if not args.skip_partes:
-            cmd = [
-                py,
-                str(normalize_partes_py),
-                "--input",
-                str(out_02),
-                "--output",
-                str(out_02),
-                "--pattern",
-                "*.json",
-                "--inplace",
-            ]
-            r = _run(cmd, args.dry_run)
-            if not r.ok:
-                msg = f"[FAIL] normalize_partes ({t}) rc={r.returncode}"
-                print(msg)
-                failures.append(msg)
-                if not args.continue_on_error:
-                    return 1
-
-        # 4) monetary_cli (02 -> 03)
-        if not args.skip_monetary:
-            cmd = [
-                py,
-                str(monetary_cli_py),
-                "--input-dir",
-                str(out_02),
-                "--output-dir",
-                str(out_03),
-            ]
-            r = _run(cmd, args.dry_run)
-            if not r.ok:
-                msg = f"[FAIL] monetary_cli ({t}) rc={r.returncode}"
-                print(msg)
-                failures.append(msg)
-                if not args.continue_on_error:
-                    return 1
+        _ensure_dir(d.out_02)
+        _ensure_dir(d.out_03)
+
+        if args.jobs > 1:
+            # Apenas planeja; a execução é agendada abaixo.
+            chains.append(d)
+            continue
+
+        if args.in_process:
+            print("\n[in-process] valores -> titularidade -> partes -> monetary")
+            if args.dry_run:
+                continue
+            stats = _run_chain_in_process(d, args, mods, build, prev_by_type.get(t))
+            _print_chain_stats(stats, args)
+            failures[t].extend(stats.failures)
+            if build is not None:
+                _save_manifests(base_out, t, prev_by_type[t], stats, mods)
+        else:
+            steps = _subprocess_steps(repo, d.in_01, d.out_02, d.out_03, args)
+            failures[t].extend(_run_subprocess_chain(t, steps, args))
+
+        if failures[t] and not args.continue_on_error:
+            _print_failure_summary(failures)
+            return 1
+
+    if chains:
+        print(f"\n[paralelo] {len(chains)} cadeia(s), jobs={args.jobs}")
+        if args.in_process:
+            if not args.dry_run:
+                stats_by_type = _run_in_process_parallel(
+                    repo, chains, args, mods, build, prev_by_type
+                )
+                for d in chains:
+                    _print_type_header(d)
+                    _print_chain_stats(stats_by_type[d.tipo], args)
+                    failures[d.tipo].extend(stats_by_type[d.tipo].failures)
+                    if build is not None:
+                        _save_manifests(
+                            base_out, d.tipo, prev_by_type[d.tipo], stats_by_type[d.tipo], mods
+                        )
+        else:
+            for t, msgs in _run_subprocess_parallel(repo, chains, args).items():
+                failures[t].extend(msgs)
 
     print("\n" + "=" * 72)
-    if failures:
-        print("PIPELINE FINALIZADO COM FALHAS:")
-        for f in failures:
-            print("- " + f)
+    if any(failures.values()):
+        _print_failure_summary(failures)
         print("=" * 72)
         return 1
 
@@ -0,0 +1,133 @@
+"""
+pipelines/cad_obr/build/build_manifest.py
+
+Manifest de build por estágio para execução incremental do pipeline CAD_OBR.
+
+Um manifest por (estágio, tipo) em <base_out>/_build/<estágio>/<tipo>.json,
+fora das pastas de dados (02_normalize/03_monetary são varridas por glob
+"*.json" pelos estágios seguintes e pelo reconciler).
+
+Cada entrada, indexada pelo caminho relativo do documento de entrada, registra:
+- input_sha256:   sha256 dos bytes de entrada do estágio
+- stage_version:  hash do código-fonte dos módulos do estágio
+- params:         parâmetros que afetam a saída (ex.: hash da TR CSV)
+- output:         nome do arquivo gerado
+- output_sha256:  sha256 dos bytes gerados (entrada do estágio seguinte)
+
+Um documento é considerado atualizado quando input/versão/params coincidem e o
+arquivo de saída ainda existe com o mesmo sha256.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Dict, Iterable, Optional
+
+MANIFEST_VERSION = "cad_obr.build_manifest.v1"
+MANIFEST_DIRNAME = "_build"
+
+
+def sha256_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def sha256_file(path: Path) -> Optional[str]:
+    """sha256 do arquivo, ou None se ele não existir."""
+    if not path.is_file():
+        return None
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def code_version(modules: Iterable[ModuleType]) -> str:
+    """
+    Versão de código de um estágio: hash do fonte dos módulos envolvidos.
+    Qualquer edição nas regras invalida as entradas geradas pela versão anterior.
+    """
+    h = hashlib.sha256()
+    for mod in modules:
+        src = getattr(mod, "__file__", None)
+        h.update(mod.__name__.encode("utf-8"))
+        if src and os.path.isfile(src):
+            h.update(Path(src).read_bytes())
+    return h.hexdigest()[:16]
+
+
+def manifest_path(base_out: Path, stage: str, tipo: str) -> Path:
+    return base_out / MANIFEST_DIRNAME / stage / f"{tipo}.json"
+
+
+def load_manifest(path: Path) -> Dict[str, Dict[str, Any]]:
+    """Carrega as entradas do manifest; ausente/inválido -> vazio (rebuild)."""
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception:
+        return {}
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+        return {}
+    entries = data.get("entries")
+    return entries if isinstance(entries, dict) else {}
+
+
+def save_manifest(
+    path: Path, stage: str, tipo: str, entries: Dict[str, Dict[str, Any]]
+) -> None:
+    """Grava o manifest de forma atômica (tmp + replace)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {
+        "version": MANIFEST_VERSION,
+        "stage": stage,
+        "tipo": tipo,
+        "entries": dict(sorted(entries.items())),
+    }
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+def make_entry(
+    input_sha256: str,
+    stage_version: str,
+    params: Dict[str, Any],
+    output: str,
+    output_sha256: Optional[str],
+) -> Dict[str, Any]:
+    return {
+        "input_sha256": input_sha256,
+        "stage_version": stage_version,
+        "params": params,
+        "output": output,
+        "output_sha256": output_sha256,
+    }
+
+
+def is_fresh(
+    entry: Optional[Dict[str, Any]],
+    input_sha256: str,
+    stage_version: str,
+    params: Dict[str, Any],
+    output_dir: Path,
+) -> bool:
+    if not entry:
+        return False
+    if entry.get("input_sha256") != input_sha256:
+        return False
+    if entry.get("stage_version") != stage_version:
+        return False
+    if entry.get("params") != params:
+        return False
+    out = entry.get("output")
+    if not out:
+        return False
+    # A saída pode ter sido regravada fora do modo incremental (ex.: subprocess).
+    return sha256_file(output_dir / str(out)) == entry.get("output_sha256")
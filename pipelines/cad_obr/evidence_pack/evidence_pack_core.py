@@ -35,6 +35,11 @@ def build_duckdb_views(dataset_dir: Path, duckdb_path: Path) -> Dict[str, Any]:
     """Cria/atualiza um arquivo DuckDB com views para cada *.jsonl do dataset.
 
     - Cada view tem o nome do arquivo sem extensão (stem).
+    - Tabelas já gravadas no arquivo pelo backend DuckDB do reconciler
+      (reconciler_duckdb.py, mesmos nomes) só são mantidas no lugar da view
+      se a procedência registrada por ele (__reconciler_tables) tiver o
+      sha256 do *.jsonl atual; senão (JSONL regenerado depois, ou backend
+      rodado sem --export-jsonl) a tabela é trocada pela view.
     - Também cria a tabela __dataset_files (hash/linhas) para rastreabilidade.
 
     Observação: se a lib duckdb não estiver instalada, retorna status=skipped.
@@ -46,17 +51,39 @@ def build_duckdb_views(dataset_dir: Path, duckdb_path: Path) -> Dict[str, Any]:
     duckdb_path.parent.mkdir(parents=True, exist_ok=True)
     con = duckdb.connect(str(duckdb_path))
 
+    tables = {
+        r[0]
+        for r in con.execute(
+            "SELECT table_name FROM duckdb_tables() WHERE schema_name = 'main';"
+        ).fetchall()
+    }
+    # procedência gravada pelo backend DuckDB (PROVENANCE_TABLE em reconciler_duckdb.py)
+    built_from: Dict[str, Optional[str]] = {}
+    if "__reconciler_tables" in tables:
+        built_from = dict(
+            con.execute("SELECT table_name, jsonl_sha256 FROM __reconciler_tables;").fetchall()
+        )
+
     files_meta = []
+    views, kept = [], []
     for f in sorted(dataset_dir.glob("*.jsonl")):
         view = f.stem
-        # read_json_auto detecta newline-delimited JSON
-        con.execute(
-            f"CREATE OR REPLACE VIEW {view} AS SELECT * FROM read_json_auto('{str(f)}');"
-        )
         # Usar helpers locais (definidos neste módulo)
         sha = sha256_file(f)
         lines = count_jsonl_lines(f)
         files_meta.append((f.name, str(f), sha, int(lines)))
+        if view in tables and built_from.get(view) == sha:
+            kept.append(view)
+            continue
+        views.append(view)
+        if view in tables:
+            con.execute(f"DROP TABLE {view};")
+            if built_from:
+                con.execute("DELETE FROM __reconciler_tables WHERE table_name = ?;", [view])
+        # read_json_auto detecta newline-delimited JSON
+        con.execute(
+            f"CREATE OR REPLACE VIEW {view} AS SELECT * FROM read_json_auto('{str(f)}');"
+        )
 
     con.execute(
         "CREATE TABLE IF NOT EXISTS __dataset_files (filename VARCHAR, path VARCHAR, sha256 VARCHAR, rows BIGINT);"
@@ -68,7 +95,8 @@ def build_duckdb_views(dataset_dir: Path, duckdb_path: Path) -> Dict[str, Any]:
     return {
         "status": "ok",
         "duckdb_path": str(duckdb_path),
-        "views": [x[0].replace(".jsonl", "") for x in files_meta],
+        "views": views,
+        "tables": kept,
         "files": len(files_meta),
     }
 
@@ -0,0 +1,308 @@
+"""
+Módulo: monetary_cenarios.py
+
+Simulação "e se" sobre o motor `monetary_core`: aplica um conjunto de
+alterações (taxa, regime da taxa, data de baixa, índice de correção) a ônus
+selecionados de documentos já carregados e recalcula só esses itens, com a
+TR/índices já em memória, devolvendo uma tabela de diferenças lado a lado.
+
+Os documentos de entrada não são alterados: cada cálculo usa uma cópia do
+ônus. Usado pelo modo de cenário do monetary_cli.py (--cenario-*).
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from monetary_core import (
+    IndexStore,
+    detectar_indice,
+    extrair_taxa_anual,
+    formatar_valor_brl,
+    parse_data_ptbr,
+    processar_onus_cad_obr,
+)
+from monetary_indices import INDICES
+
+SEM_INDICE = "nenhum"
+
+
+def _taxa_float(valor: Any) -> float:
+    """1.2, "1.2", "1,2" ou "1,2%" -> 1.2; outros valores: ValueError."""
+    if isinstance(valor, bool):
+        raise ValueError(f"taxa_percentual inválida: {valor!r}")
+    if isinstance(valor, (int, float)):
+        return float(valor)
+    if isinstance(valor, str):
+        txt = valor.strip().rstrip("%").strip().replace(",", ".")
+        try:
+            return float(txt)
+        except ValueError:
+            pass
+    raise ValueError(f"taxa_percentual inválida: {valor!r}")
+
+
+@dataclass
+class Cenario:
+    """
+    Alterações de um cenário. Campos None mantêm o que está no ônus.
+
+    - taxa_percentual: ex.: 1.2 ou "1,2" (= 1,2%), no regime do ônus ou de
+      `regime`;
+    - regime: "anual" ou "mensal" (como a taxa é lida);
+    - data_baixa: data final do cálculo (formatos de parse_data_ptbr);
+    - indice: chave de INDICES (TR, IPCA, ...) ou "nenhum";
+    - onus: seletores dos itens (registro, ex. "R.5", ou posição "#2");
+      vazio = todos os ônus do documento.
+    """
+
+    nome: str = "cenario"
+    taxa_percentual: Optional[float] = None
+    regime: Optional[str] = None
+    data_baixa: Optional[str] = None
+    indice: Optional[str] = None
+    onus: List[str] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        if self.taxa_percentual is not None:
+            self.taxa_percentual = _taxa_float(self.taxa_percentual)
+        if self.regime is not None and self.regime not in ("anual", "mensal"):
+            raise ValueError(f"regime inválido: {self.regime!r} (use anual ou mensal)")
+        if self.indice is not None:
+            self.indice = self.indice.upper().replace("-", "")
+            if self.indice != SEM_INDICE.upper() and self.indice not in INDICES:
+                raise ValueError(
+                    f"índice desconhecido: {self.indice!r} "
+                    f"(use {', '.join(INDICES)} ou {SEM_INDICE})"
+                )
+        if self.data_baixa is not None and parse_data_ptbr(self.data_baixa) is None:
+            raise ValueError(f"data_baixa inválida: {self.data_baixa!r}")
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "Cenario":
+        return cls(
+            nome=str(d.get("nome") or "cenario"),
+            taxa_percentual=d.get("taxa_percentual"),
+            regime=d.get("regime"),
+            data_baixa=d.get("data_baixa"),
+            indice=d.get("indice"),
+            onus=list(d.get("onus") or []),
+        )
+
+    def descricao(self) -> str:
+        partes = []
+        if self.taxa_percentual is not None:
+            partes.append(f"taxa={self.taxa_percentual}%")
+        if self.regime:
+            partes.append(f"regime={self.regime}")
+        if self.data_baixa:
+            partes.append(f"baixa={self.data_baixa}")
+        if self.indice:
+            partes.append(f"índice={self.indice}")
+        return ", ".join(partes) or "sem alterações"
+
+
+@dataclass
+class LinhaDelta:
+    documento: str
+    onus: str
+    cenario: str
+    valor_original_centavos: Optional[int]
+    valor_cenario_centavos: Optional[int]
+    motivo_original: Optional[str]
+    motivo_cenario: Optional[str]
+
+    @property
+    def delta_centavos(self) -> Optional[int]:
+        if self.valor_original_centavos is None or self.valor_cenario_centavos is None:
+            return None
+        return self.valor_cenario_centavos - self.valor_original_centavos
+
+    @property
+    def delta_percentual(self) -> Optional[float]:
+        delta = self.delta_centavos
+        if delta is None or not self.valor_original_centavos:
+            return None
+        return round(delta * 100.0 / self.valor_original_centavos, 4)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "documento": self.documento,
+            "onus": self.onus,
+            "cenario": self.cenario,
+            "valor_original_centavos": self.valor_original_centavos,
+            "valor_cenario_centavos": self.valor_cenario_centavos,
+            "delta_centavos": self.delta_centavos,
+            "delta_percentual": self.delta_percentual,
+            "motivo_original": self.motivo_original,
+            "motivo_cenario": self.motivo_cenario,
+        }
+
+
+def _rotulo_onus(onus: Dict[str, Any], pos: int) -> str:
+    reg = onus.get("registro_ou_averbacao") or onus.get("registro")
+    return str(reg).strip() if reg else f"#{pos}"
+
+
+def _seleciona(onus: Dict[str, Any], pos: int, seletores: List[str]) -> bool:
+    if not seletores:
+        return True
+    norm = _rotulo_onus(onus, pos).replace(" ", "").upper()
+    for sel in seletores:
+        sel = sel.strip()
+        if sel == f"#{pos}" or sel.replace(" ", "").upper() == norm:
+            return True
+    return False
+
+
+def _resultado(onus: Dict[str, Any]) -> Tuple[Optional[int], Optional[str]]:
+    """(valor_presente em centavos, motivo quando não calculado)."""
+    meta = onus.get("_monetary_meta") or {}
+    if meta.get("calculado"):
+        return onus.get("valor_presente_num"), None
+    return None, f"{meta.get('regra_aplicada')}: {meta.get('motivo')}"
+
+
+def recalcular_onus(
+    onus: Dict[str, Any],
+    cenario: Cenario,
+    tr_table: Optional[Dict[Tuple[int, int], float]] = None,
+    indices: Optional[IndexStore] = None,
+    exato: bool = False,
+) -> Dict[str, Any]:
+    """
+    Cópia de `onus` calculada com as alterações do cenário (o original não
+    muda). As alterações entram antes das regras de elegibilidade: uma nova
+    data de baixa, por exemplo, permite calcular uma dívida ainda em aberto.
+    `exato`: ver processar_onus_cad_obr.
+    """
+    item = copy.deepcopy(onus)
+    for chave in ("valor_presente", "valor_presente_num", "_monetary_meta"):
+        item.pop(chave, None)
+    if cenario.data_baixa is not None:
+        item["data_baixa"] = cenario.data_baixa
+
+    def extrair_taxa(txt: Optional[str]) -> Tuple[Optional[float], str]:
+        taxa, tipo = extrair_taxa_anual(txt)
+        if cenario.taxa_percentual is not None:
+            taxa = cenario.taxa_percentual / 100.0
+        if cenario.regime is not None:
+            tipo = cenario.regime
+        return taxa, tipo
+
+    def detectar(txt: Optional[str]) -> Optional[str]:
+        if cenario.indice is None:
+            return detectar_indice(txt)
+        return None if cenario.indice == SEM_INDICE.upper() else cenario.indice
+
+    return processar_onus_cad_obr(
+        item, tr_table, indices, exato, extrair_taxa=extrair_taxa, detectar=detectar
+    )
+
+
+def simular_documento(
+    doc: Dict[str, Any],
+    cenarios: List[Cenario],
+    tr_table: Optional[Dict[Tuple[int, int], float]] = None,
+    indices: Optional[IndexStore] = None,
+    nome_documento: str = "",
+    exato: bool = False,
+) -> List[LinhaDelta]:
+    """
+    Uma linha por (ônus selecionado, cenário): valor original (recalculado
+    com a mesma TR/índices e a mesma aritmética, para comparar com base
+    igual) e valor no cenário.
+    """
+    if indices is None:
+        indices = IndexStore()
+    linhas: List[LinhaDelta] = []
+    onus_list = doc.get("hipotecas_onus")
+    if not isinstance(onus_list, list):
+        return linhas
+
+    for pos, onus in enumerate(onus_list, start=1):
+        if not isinstance(onus, dict):
+            continue
+        selecionado = [c for c in cenarios if _seleciona(onus, pos, c.onus)]
+        if not selecionado:
+            continue
+
+        original = processar_onus_cad_obr(
+            copy.deepcopy(onus), tr_table=tr_table, indices=indices, exato=exato
+        )
+        valor_orig, motivo_orig = _resultado(original)
+        for cenario in selecionado:
+            valor_cen, motivo_cen = _resultado(
+                recalcular_onus(onus, cenario, tr_table, indices, exato)
+            )
+            linhas.append(
+                LinhaDelta(
+                    documento=nome_documento,
+                    onus=_rotulo_onus(onus, pos),
+                    cenario=cenario.nome,
+                    valor_original_centavos=valor_orig,
+                    valor_cenario_centavos=valor_cen,
+                    motivo_original=motivo_orig,
+                    motivo_cenario=motivo_cen,
+                )
+            )
+    return linhas
+
+
+def _fmt_centavos(valor: Optional[int], sinal: bool = False) -> str:
+    if valor is None:
+        return "-"
+    txt = formatar_valor_brl(valor / 100.0)
+    return f"+{txt}" if sinal and valor > 0 else txt
+
+
+def formatar_tabela(linhas: List[LinhaDelta]) -> str:
+    """Tabela de texto: original x cenário, diferença em R$ e em %."""
+    cab = ["Documento", "Ônus", "Cenário", "Original (R$)", "Cenário (R$)", "Δ (R$)", "Δ %"]
+    corpo = []
+    notas: List[str] = []
+    for ln in linhas:
+        pct = ln.delta_percentual
+        corpo.append(
+            [
+                ln.documento,
+                ln.onus,
+                ln.cenario,
+                _fmt_centavos(ln.valor_original_centavos),
+                _fmt_centavos(ln.valor_cenario_centavos),
+                _fmt_centavos(ln.delta_centavos, sinal=True),
+                "-" if pct is None else f"{pct:+.2f}%".replace(".", ","),
+            ]
+        )
+        for rotulo, motivo in (("original", ln.motivo_original), ("cenário", ln.motivo_cenario)):
+            if motivo:
+                notas.append(f"  {ln.documento} {ln.onus} [{ln.cenario}] {rotulo}: {motivo}")
+
+    larguras = [max(len(str(x)) for x in col) for col in zip(cab, *corpo)]
+    numericas = set(range(3, len(cab)))
+
+    def linha(campos: List[str]) -> str:
+        return "  ".join(
+            c.rjust(w) if i in numericas else c.ljust(w)
+            for i, (c, w) in enumerate(zip(campos, larguras))
+        ).rstrip()
+
+    out = [linha(cab), linha(["-" * w for w in larguras])]
+    out.extend(linha(r) for r in corpo)
+    if notas:
+        out.append("")
+        out.append("Sem cálculo:")
+        out.extend(notas)
+    return "\n".join(out)
+
+
+def carregar_cenarios(path: str) -> List[Cenario]:
+    """Lista de cenários de um JSON (lista de objetos com os campos de Cenario)."""
+    with open(path, "r", encoding="utf-8") as f:
+        dados = json.load(f)
+    if isinstance(dados, dict):
+        dados = [dados]
+    return [Cenario.from_dict(d) for d in dados]
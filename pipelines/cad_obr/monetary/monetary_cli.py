@@ -12,6 +12,14 @@ Uso típico:
 
 Para processar apenas um arquivo específico:
     python3 scripts/monetary_cli.py --file collector_out_cad_obr_escritura_matricula_7.546.json
+
+Para recalcular a carteira inteira em lote (ex.: após atualizar os índices):
+    python3 scripts/monetary_cli.py --lote
+
+Cenário "e se" (não grava saída; imprime a tabela original x cenário):
+    python3 scripts/monetary_cli.py --file <matricula>.json --onus R.5 \
+        --cenario-data-baixa 2010-01-31 --cenario-regime mensal
+    python3 scripts/monetary_cli.py --file <matricula>.json --cenarios cenarios.json
 """
 
 from __future__ import annotations
@@ -20,9 +28,15 @@ import argparse
 import glob
 import json
 import os
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
-from monetary_core import processar_documento_cad_obr
+from monetary_cenarios import Cenario, carregar_cenarios, formatar_tabela, simular_documento
+from monetary_core import (
+    IndexStore,
+    _carregar_tr,
+    processar_documento_cad_obr,
+    processar_lote_cad_obr,
+)
 
 
 def _listar_arquivos_entrada(input_dir: str, file_filter: str | None) -> List[str]:
@@ -70,6 +84,34 @@ def _nome_saida(output_dir: str, input_path: str) -> str:
     return os.path.join(output_dir, saida)
 
 
+def gravar_saida(output_dir: str, input_path: str, doc_out: Dict[str, Any]) -> str:
+    """
+    Grava o documento processado em `output_dir`, com o nome derivado de
+    `input_path` (ver `_nome_saida`). Retorna o caminho gravado.
+
+    Compartilhado com o orquestrador in-process (pipelines/cad_obr.py), para
+    que as duas formas de execução produzam exatamente os mesmos bytes.
+    """
+    out_path = _nome_saida(output_dir, input_path)
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(doc_out, f, ensure_ascii=False, indent=2)
+    return out_path
+
+
+def _ler_documento(path: str) -> Optional[Dict[str, Any]]:
+    """JSON de entrada, ou None (com aviso) se não for arquivo ou falhar a leitura."""
+    if not os.path.isfile(path):
+        print(f"[AVISO] Ignorando (não é arquivo): {path}")
+        return None
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"[ERRO] Falha ao ler JSON: {path} -> {e}")
+        return None
+
+
 def _contar_onus(doc: Dict[str, Any]) -> Tuple[int, int, int]:
     """
     Conta quantos itens de hipotecas_onus existem e quantos
@@ -102,6 +144,64 @@ def _contar_onus(doc: Dict[str, Any]) -> Tuple[int, int, int]:
     return total, calc_true, calc_false
 
 
+def _alteracoes_da_linha_de_comando(args: argparse.Namespace) -> Dict[str, Any]:
+    return {
+        "taxa_percentual": args.cenario_taxa,
+        "regime": args.cenario_regime,
+        "data_baixa": args.cenario_data_baixa,
+        "indice": args.cenario_indice,
+    }
+
+
+def _pede_cenario(args: argparse.Namespace) -> bool:
+    """--cenarios ou algum --cenario-*: modo cenário (não grava arquivos)."""
+    return bool(args.cenarios) or any(
+        v is not None for v in _alteracoes_da_linha_de_comando(args).values()
+    )
+
+
+def _cenarios_da_linha_de_comando(args: argparse.Namespace) -> List[Cenario]:
+    cenarios = carregar_cenarios(args.cenarios) if args.cenarios else []
+    alteracoes = _alteracoes_da_linha_de_comando(args)
+    if any(v is not None for v in alteracoes.values()):
+        cenarios.append(Cenario(nome="cli", **alteracoes))
+    if args.onus:
+        for c in cenarios:
+            c.onus = c.onus or list(args.onus)
+    return cenarios
+
+
+def _executar_cenarios(
+    arquivos: List[str], cenarios: List[Cenario], como_json: bool, exato: bool = False
+) -> None:
+    """Modo cenário: TR e índices carregados uma vez; só os ônus selecionados."""
+    tr_table = _carregar_tr(None)
+    indices = IndexStore()
+    linhas = []
+    for path in arquivos:
+        doc = _ler_documento(path)
+        if doc is None:
+            continue
+        linhas.extend(
+            simular_documento(
+                doc,
+                cenarios,
+                tr_table,
+                indices,
+                nome_documento=os.path.basename(path),
+                exato=exato,
+            )
+        )
+
+    if como_json:
+        print(json.dumps([ln.to_dict() for ln in linhas], ensure_ascii=False, indent=2))
+        return
+    for c in cenarios:
+        print(f"Cenário {c.nome}: {c.descricao()}")
+    print("")
+    print(formatar_tabela(linhas) if linhas else "[AVISO] Nenhum ônus selecionado.")
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         description="Aplica o motor monetary (cad_obr) aos arquivos JSON do collector."
@@ -125,7 +225,52 @@ def main() -> None:
         ),
     )
 
+    parser.add_argument(
+        "--lote",
+        action="store_true",
+        help=(
+            "Calcula todos os documentos de uma vez (processar_lote_cad_obr), "
+            "com os fatores em arrays numpy. Útil ao atualizar as tabelas de índices."
+        ),
+    )
+
+    parser.add_argument(
+        "--exato",
+        action="store_true",
+        help=(
+            "Aritmética exata: centavos inteiros e fatores Decimal em ponto fixo "
+            "(mesmo resultado, ao centavo, em qualquer máquina)."
+        ),
+    )
+
+    cen = parser.add_argument_group(
+        "cenário",
+        "Recalcula os ônus selecionados com alterações e imprime a diferença "
+        "(não grava arquivos).",
+    )
+    cen.add_argument("--cenario-taxa", type=float, help="Taxa em %% (ex.: 1.2).")
+    cen.add_argument("--cenario-regime", choices=["anual", "mensal"], help="Regime da taxa.")
+    cen.add_argument("--cenario-data-baixa", help="Data final do cálculo (ex.: 2010-01-31).")
+    cen.add_argument(
+        "--cenario-indice",
+        help="Índice de correção (TR, IPCA, IGPM, INPC, SELIC, POUPANCA ou nenhum).",
+    )
+    cen.add_argument(
+        "--cenarios",
+        help="JSON com uma lista de cenários (campos de monetary_cenarios.Cenario).",
+    )
+    cen.add_argument(
+        "--onus",
+        action="append",
+        default=[],
+        help="Ônus a recalcular: registro (ex.: R.5) ou posição (#2). Repetível.",
+    )
+    cen.add_argument("--json", action="store_true", help="Tabela do cenário em JSON.")
+
     args = parser.parse_args()
+    # sem cenário, o CLI faria o recálculo completo (grava arquivos)
+    if (args.onus or args.json) and not _pede_cenario(args):
+        parser.error("--onus/--json só valem com --cenarios ou algum --cenario-*")
 
     input_dir = os.path.abspath(args.input_dir)
     output_dir = os.path.abspath(args.output_dir)
@@ -134,13 +279,25 @@ def main() -> None:
         print(f"[ERRO] Diretório de entrada não existe: {input_dir}")
         return
 
-    os.makedirs(output_dir, exist_ok=True)
-
     arquivos = _listar_arquivos_entrada(input_dir, args.file)
     if not arquivos:
         print(f"[AVISO] Nenhum arquivo .json encontrado em: {input_dir}")
         return
 
+    if _pede_cenario(args):
+        try:
+            cenarios = _cenarios_da_linha_de_comando(args)
+        except (OSError, ValueError) as e:
+            print(f"[ERRO] Cenário inválido: {e}")
+            return
+        if not cenarios:
+            print(f"[ERRO] Nenhum cenário em: {args.cenarios}")
+            return
+        _executar_cenarios(arquivos, cenarios, args.json, args.exato)
+        return
+
+    os.makedirs(output_dir, exist_ok=True)
+
     print("=== monetary-cli (cad_obr) Iniciado ===")
     print(f"Entrada : {input_dir}")
     print(f"Saída   : {output_dir}")
@@ -153,27 +310,35 @@ def main() -> None:
     total_calc_true_global = 0
     total_calc_false_global = 0
 
-    for path in arquivos:
-        if not os.path.isfile(path):
-            print(f"[AVISO] Ignorando (não é arquivo): {path}")
-            continue
+    # --lote: lê tudo antes e calcula a carteira numa passada vetorizada
+    lote: Optional[Dict[str, Dict[str, Any]]] = None
+    if args.lote:
+        lote = {}
+        for path in arquivos:
+            doc = _ler_documento(path)
+            if doc is not None:
+                lote[path] = doc
+        processar_lote_cad_obr(list(lote.values()), exato=args.exato)
 
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                doc = json.load(f)
-        except Exception as e:
-            print(f"[ERRO] Falha ao ler JSON: {path} -> {e}")
+    for path in arquivos:
+        if lote is not None:
+            doc = lote.get(path)
+        else:
+            doc = _ler_documento(path)
+        if doc is None:
             continue
 
         total_docs += 1
         print(f"-> Processando documento: {os.path.basename(path)}")
 
-        doc_out = processar_documento_cad_obr(doc)
+        if lote is not None:
+            doc_out = doc
+        else:
+            doc_out = processar_documento_cad_obr(doc, exato=args.exato)
 
         out_path = _nome_saida(output_dir, path)
         try:
-            with open(out_path, "w", encoding="utf-8") as f:
-                json.dump(doc_out, f, ensure_ascii=False, indent=2)
+            out_path = gravar_saida(output_dir, path, doc_out)
         except Exception as e:
             print(f"   [ERRO] Falha ao gravar saída: {out_path} -> {e}")
             continue
@@ -0,0 +1,498 @@
+"""
+Módulo: monetary_indices.py
+
+Índices de correção monetária do motor cad_obr: TR, IPCA, IGP-M, INPC, SELIC
+e poupança, lidos de CSVs locais em data/indices/.
+
+Responsabilidades principais:
+- carregar_serie_mensal(csv_path, ...): lê um CSV de índice e devolve uma
+  SerieMensal (cache colunar por mês, com produto acumulado).
+- SerieMensal.fator_periodo(inicio, fim, pro_rata): fator acumulado de um
+  período em tempo constante, por meses cheios ou pro rata die.
+- detectar_indice(taxas): qual índice o texto de `taxas` cita.
+- IndexStore: carrega sob demanda as séries usadas por um lote de ônus.
+
+Formatos de CSV aceitos:
+- Bacen "tabela" (Tabela_bacen_TR.csv): uma linha por ano, colunas 01..12.
+- SGS (exportação de série): data;valor, com data em dd/mm/aaaa, mm/aaaa ou
+  aaaa-mm[-dd]. Séries diárias (ex.: SELIC diária) são compostas por mês.
+"""
+
+from __future__ import annotations
+
+import csv
+import operator
+import os
+import re
+from dataclasses import dataclass
+from datetime import date
+from decimal import Context, Decimal
+from functools import lru_cache
+from itertools import accumulate
+from typing import Dict, List, Optional, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # opcional: sem numpy, os prefixos ficam em listas
+    np = None
+
+
+# Aritmética do modo exato (ver monetary_core): libmpdec com precisão fixa dá
+# o mesmo resultado em qualquer máquina, ao contrário de pow() da libm.
+CONTEXTO_EXATO = Context(prec=34)
+
+Fator = Union[float, Decimal]
+
+
+def decimal_fator(variacao: float) -> Decimal:
+    """1 + variação em Decimal, a partir da representação curta do float."""
+    return CONTEXTO_EXATO.add(Decimal(1), Decimal(repr(variacao)))
+
+
+@lru_cache(maxsize=4096)
+def _ln_fator(variacao: float) -> Decimal:
+    return CONTEXTO_EXATO.ln(decimal_fator(variacao))
+
+
+def potencia_exata(variacao: float, expoente: Decimal) -> Decimal:
+    """
+    (1 + variação) ^ expoente como exp(expoente * ln(1 + variação)), com o ln
+    memorizado por variação (poucas taxas distintas numa carteira): uma exp
+    por cálculo, ~3x mais rápido que Context.power com expoente fracionário.
+    """
+    return CONTEXTO_EXATO.exp(CONTEXTO_EXATO.multiply(expoente, _ln_fator(variacao)))
+
+
+@dataclass(frozen=True)
+class IndiceDef:
+    nome: str
+    csv_path: str
+    # "auto" (heurística da TR: |v| > 0.02 => percentual), "percentual" ou "fracao"
+    escala: str
+    # regex procurada no texto de `taxas` (em minúsculas)
+    padrao: str
+    # fator pro rata die nos meses parciais (senão, meses cheios inclusive)
+    pro_rata: bool
+
+
+_DIR_INDICES = os.path.join("data", "indices")
+
+# Ordem = prioridade em empate de posição no texto.
+INDICES: Dict[str, IndiceDef] = {
+    d.nome: d
+    for d in [
+        # TR mantém a detecção e o regime (meses cheios) do motor original.
+        IndiceDef(
+            "TR",
+            os.path.join(_DIR_INDICES, "Tabela_bacen_TR.csv"),
+            "auto",
+            r" tr|taxa referencial|corre[çc][ãa]o pela tr",
+            False,
+        ),
+        IndiceDef(
+            "IPCA",
+            os.path.join(_DIR_INDICES, "Tabela_bacen_IPCA.csv"),
+            "percentual",
+            r"\bipca\b",
+            True,
+        ),
+        IndiceDef(
+            "IGPM",
+            os.path.join(_DIR_INDICES, "Tabela_bacen_IGPM.csv"),
+            "percentual",
+            r"\bigp[\s-]?m\b",
+            True,
+        ),
+        IndiceDef(
+            "INPC",
+            os.path.join(_DIR_INDICES, "Tabela_bacen_INPC.csv"),
+            "percentual",
+            r"\binpc\b",
+            True,
+        ),
+        IndiceDef(
+            "SELIC",
+            os.path.join(_DIR_INDICES, "Tabela_bacen_SELIC.csv"),
+            "percentual",
+            r"\bselic\b",
+            True,
+        ),
+        IndiceDef(
+            "POUPANCA",
+            os.path.join(_DIR_INDICES, "Tabela_bacen_POUPANCA.csv"),
+            "percentual",
+            r"poupan[çc]a",
+            True,
+        ),
+    ]
+}
+
+_PADROES = [(nome, re.compile(d.padrao)) for nome, d in INDICES.items()]
+
+
+def detectar_indice(taxas_str: Optional[str]) -> Optional[str]:
+    """
+    Nome do índice de correção citado em `taxas` (chave de INDICES), ou None.
+    Com mais de um índice no texto, vale o que aparece primeiro.
+    """
+    texto = (taxas_str or "").lower()
+    achado: Optional[Tuple[int, str]] = None
+    for nome, rx in _PADROES:
+        m = rx.search(texto)
+        if m and (achado is None or m.start() < achado[0]):
+            achado = (m.start(), nome)
+    return achado[1] if achado else None
+
+
+# ------------------------------------------------------------
+# Série mensal com índice acumulado
+# ------------------------------------------------------------
+
+
+def mes_ordinal(ano: int, mes: int) -> int:
+    return ano * 12 + mes - 1
+
+
+def _mes_rotulo(ordinal: int) -> str:
+    return f"{ordinal // 12}-{ordinal % 12 + 1:02d}"
+
+
+def _dias_no_mes(ordinal: int) -> int:
+    ano, mes = ordinal // 12, ordinal % 12 + 1
+    prox = date(ano + 1, 1, 1) if mes == 12 else date(ano, mes + 1, 1)
+    return (prox - date(ano, mes, 1)).days
+
+
+class SerieMensal(dict):
+    """
+    Série {(ano, mes): variacao_decimal} com índice por mês para consultas de
+    período em tempo constante.
+
+    Do primeiro ao último mês da série, guarda em colunas:
+      - produto acumulado de (1 + variação), com variação 0 nos meses sem dado;
+      - contagem acumulada de meses sem dado (máscara de lacunas).
+    O fator de um período é prefixo[fim] / prefixo[inicio - 1] e o número de
+    lacunas, a diferença das contagens; a lista de meses sem dado só é
+    montada quando há lacuna. Com numpy os prefixos são arrays; sem ele,
+    listas (mesmos valores: o produto acumulado é sequencial nos dois casos).
+    """
+
+    def __init__(self, tabela: Dict[Tuple[int, int], float], nome: str = "TR"):
+        super().__init__(tabela)
+        self.nome = nome
+        ordinais = [mes_ordinal(a, m) for a, m in self]
+        self.base = min(ordinais) if ordinais else 0
+        self.n_meses = max(ordinais) - self.base + 1 if ordinais else 0
+
+        fatores = [1.0] * self.n_meses
+        lacunas = [True] * self.n_meses
+        for (ano, mes), valor in self.items():
+            i = mes_ordinal(ano, mes) - self.base
+            fatores[i] = 1.0 + valor
+            lacunas[i] = False
+
+        if np is not None:
+            self._fator_mes = np.array(fatores, dtype=float)
+            self._lacuna = np.array(lacunas, dtype=bool)
+            self._prefixo = np.concatenate(([1.0], np.cumprod(fatores)))
+            self._sem_dado = np.concatenate(([0], np.cumsum(self._lacuna)))
+        else:
+            self._lacuna = lacunas
+            self._prefixo = list(accumulate(fatores, operator.mul, initial=1.0))
+            self._sem_dado = list(accumulate(map(int, lacunas), initial=0))
+        self._prefixo_dec: Optional[List[Decimal]] = None
+
+    def _prefixo_exato(self) -> List[Decimal]:
+        """Prefixos em Decimal (CONTEXTO_EXATO), montados na primeira consulta."""
+        if self._prefixo_dec is None:
+            fatores = [Decimal(1)] * self.n_meses
+            for (ano, mes), valor in self.items():
+                fatores[mes_ordinal(ano, mes) - self.base] = decimal_fator(valor)
+            self._prefixo_dec = list(
+                accumulate(fatores, CONTEXTO_EXATO.multiply, initial=Decimal(1))
+            )
+        return self._prefixo_dec
+
+    def _fator_meses(self, a: int, b: int, exato: bool = False) -> Tuple[Fator, List[str]]:
+        """Fator e meses sem dado dos ordinais a..b (inclusive), meses cheios."""
+        um: Fator = Decimal(1) if exato else 1.0
+        if b < a:
+            return um, []
+
+        lo = max(a, self.base)
+        hi = min(b, self.base + self.n_meses - 1)
+        if lo > hi:
+            return um, [_mes_rotulo(o) for o in range(a, b + 1)]
+
+        i, j = lo - self.base, hi - self.base + 1
+        if exato:
+            prefixo = self._prefixo_exato()
+            fator: Fator = CONTEXTO_EXATO.divide(prefixo[j], prefixo[i])
+        else:
+            fator = float(self._prefixo[j] / self._prefixo[i])
+
+        sem_dado = [_mes_rotulo(o) for o in range(a, lo)]
+        if self._sem_dado[j] - self._sem_dado[i]:
+            if np is not None:
+                idx = (np.flatnonzero(self._lacuna[i:j]) + lo).tolist()
+            else:
+                idx = [lo + k for k, v in enumerate(self._lacuna[i:j]) if v]
+            sem_dado.extend(_mes_rotulo(o) for o in idx)
+        sem_dado.extend(_mes_rotulo(o) for o in range(hi + 1, b + 1))
+        return fator, sem_dado
+
+    def _fator_parcial(
+        self, ordinal: int, dias: int, sem_dado: List[str], exato: bool = False
+    ) -> Fator:
+        """(1 + variação) ^ (dias / dias do mês); sem dado => 1."""
+        um: Fator = Decimal(1) if exato else 1.0
+        if dias <= 0:
+            return um
+        valor = self.get((ordinal // 12, ordinal % 12 + 1))
+        if valor is None:
+            sem_dado.append(_mes_rotulo(ordinal))
+            return um
+        if exato:
+            expoente = CONTEXTO_EXATO.divide(Decimal(dias), Decimal(_dias_no_mes(ordinal)))
+            return potencia_exata(valor, expoente)
+        return (1.0 + valor) ** (dias / _dias_no_mes(ordinal))
+
+    def fator_periodo(
+        self, inicio: date, fim: date, pro_rata: bool = False, exato: bool = False
+    ) -> Tuple[Fator, List[str]]:
+        """
+        (fator acumulado, meses sem dado ["AAAA-MM"]) entre `inicio` e `fim`.
+        Meses fora da série contam como sem dado (variação 0).
+
+        - pro_rata=False: meses cheios, do mês de `inicio` ao de `fim`, inclusive.
+        - pro_rata=True: pro rata die sobre [inicio, fim): os meses parciais
+          das pontas entram com expoente dias_no_período / dias_do_mês.
+        - exato=True: fator em Decimal (CONTEXTO_EXATO), igual em qualquer máquina.
+        """
+        a = mes_ordinal(inicio.year, inicio.month)
+        b = mes_ordinal(fim.year, fim.month)
+        if not pro_rata:
+            return self._fator_meses(a, b, exato)
+
+        sem_dado: List[str] = []
+        if fim <= inicio:
+            return (Decimal(1) if exato else 1.0), sem_dado
+        if a == b:
+            fator = self._fator_parcial(a, fim.day - inicio.day, sem_dado, exato)
+            return fator, sem_dado
+
+        fator = self._fator_parcial(a, _dias_no_mes(a) - inicio.day + 1, sem_dado, exato)
+        fator_meio, sem_dado_meio = self._fator_meses(a + 1, b - 1, exato)
+        sem_dado.extend(sem_dado_meio)
+        fator_b = self._fator_parcial(b, fim.day - 1, sem_dado, exato)
+        if exato:
+            fator = CONTEXTO_EXATO.multiply(CONTEXTO_EXATO.multiply(fator, fator_meio), fator_b)
+        else:
+            fator *= fator_meio
+            fator *= fator_b
+        return fator, sem_dado
+
+    # --- lote (numpy) ---
+
+    def _fatores_meses_lote(self, a: "np.ndarray", b: "np.ndarray"):
+        """_fator_meses vetorizado: (fatores, nº de meses sem dado)."""
+        vazio = b < a
+        lo = np.maximum(a, self.base)
+        hi = np.minimum(b, self.base + self.n_meses - 1)
+        dentro = ~vazio & (lo <= hi)
+        i = np.clip(lo - self.base, 0, self.n_meses)
+        j = np.clip(hi - self.base + 1, 0, self.n_meses)
+        fator = np.where(dentro, self._prefixo[j] / self._prefixo[i], 1.0)
+        sem_dado = np.where(
+            vazio,
+            0,
+            np.where(
+                dentro,
+                (lo - a) + (b - hi) + (self._sem_dado[j] - self._sem_dado[i]),
+                b - a + 1,
+            ),
+        )
+        return fator, sem_dado
+
+    def _fatores_parciais_lote(self, ordinais: "np.ndarray", dias: "np.ndarray"):
+        """_fator_parcial vetorizado: (fatores, 1 se o mês não tem dado)."""
+        if self.n_meses:
+            k = np.clip(ordinais - self.base, 0, self.n_meses - 1)
+            com_dado = (ordinais >= self.base) & (ordinais < self.base + self.n_meses)
+            com_dado &= ~self._lacuna[k]
+            fator_mes = self._fator_mes[k]
+        else:
+            com_dado = np.zeros(len(ordinais), dtype=bool)
+            fator_mes = np.ones(len(ordinais))
+        usa = dias > 0
+        expoente = dias / _dias_no_mes_lote(ordinais)
+        fator = np.where(usa & com_dado, np.power(fator_mes, expoente), 1.0)
+        return fator, (usa & ~com_dado).astype(np.int64)
+
+    def fatores_lote(
+        self,
+        inicio_ord: "np.ndarray",
+        inicio_dia: "np.ndarray",
+        fim_ord: "np.ndarray",
+        fim_dia: "np.ndarray",
+        pro_rata: bool = False,
+    ):
+        """
+        fator_periodo para vários períodos de uma vez (exige numpy). Recebe
+        arrays de ordinais de mês (mes_ordinal) e dias; devolve (fatores,
+        nº de meses sem dado) — a lista dos meses fica com fator_periodo,
+        só para quem tem lacuna.
+        """
+        if np is None:
+            raise RuntimeError("Dependência ausente: numpy. Execute: pip install numpy")
+        a, b = inicio_ord, fim_ord
+        if not pro_rata:
+            return self._fatores_meses_lote(a, b)
+
+        mesmo_mes = a == b
+        dias_a = np.where(
+            mesmo_mes, fim_dia - inicio_dia, _dias_no_mes_lote(a) - inicio_dia + 1
+        )
+        dias_b = np.where(mesmo_mes, 0, fim_dia - 1)
+        fator_a, sem_a = self._fatores_parciais_lote(a, dias_a)
+        fator_meio, sem_meio = self._fatores_meses_lote(a + 1, b - 1)
+        fator_b, sem_b = self._fatores_parciais_lote(b, dias_b)
+        fator = fator_a * np.where(mesmo_mes, 1.0, fator_meio) * fator_b
+        sem_dado = sem_a + np.where(mesmo_mes, 0, sem_meio) + sem_b
+        return fator, sem_dado
+
+
+def _dias_no_mes_lote(ordinais: "np.ndarray") -> "np.ndarray":
+    meses = (ordinais - 1970 * 12).astype("datetime64[M]")
+    prox = meses + np.timedelta64(1, "M")
+    dias = prox.astype("datetime64[D]") - meses.astype("datetime64[D]")
+    return dias.astype(np.int64)
+
+
+# ------------------------------------------------------------
+# Leitura dos CSVs
+# ------------------------------------------------------------
+
+
+def _parse_numero(txt: str) -> Optional[float]:
+    txt = (txt or "").strip().replace(" ", "")
+    if not txt:
+        return None
+    if "," in txt:
+        txt = txt.replace(".", "").replace(",", ".")
+    try:
+        return float(txt)
+    except ValueError:
+        return None
+
+
+def _aplicar_escala(valor: float, escala: str) -> float:
+    if escala == "percentual":
+        return valor / 100.0
+    if escala == "auto" and abs(valor) > 0.02:
+        # Heurística % -> fração (ex.: 0,07% => 0,0007)
+        return valor / 100.0
+    return valor
+
+
+def _parse_mes(txt: str) -> Optional[Tuple[int, int]]:
+    """(ano, mes) de dd/mm/aaaa, mm/aaaa ou aaaa-mm[-dd]."""
+    txt = (txt or "").strip().strip('"')
+    m = re.fullmatch(r"(?:\d{1,2}/)?(\d{1,2})/(\d{4})", txt)
+    if m:
+        ano, mes = int(m.group(2)), int(m.group(1))
+    else:
+        m = re.fullmatch(r"(\d{4})-(\d{1,2})(?:-\d{1,2})?", txt)
+        if not m:
+            return None
+        ano, mes = int(m.group(1)), int(m.group(2))
+    return (ano, mes) if 1 <= mes <= 12 else None
+
+
+@lru_cache(maxsize=16)
+def carregar_serie_mensal(
+    csv_path: str, nome: str = "TR", escala: str = "auto"
+) -> SerieMensal:
+    """
+    Carrega um CSV de índice (formato Bacen "tabela" ou SGS data;valor) e
+    devolve a SerieMensal com as variações em fração (ex.: 0,52% => 0.0052).
+    """
+    tabela: Dict[Tuple[int, int], float] = {}
+
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        primeira = f.readline()
+        f.seek(0)
+        delim = ";" if primeira.count(";") > primeira.count(",") else ","
+        reader = csv.reader(f, delimiter=delim)
+        header = next(reader, None)
+        if not header:
+            return SerieMensal(tabela, nome)
+
+        mes_cols = [
+            (k, int(c)) for k, c in enumerate(header) if k and c.strip().isdigit()
+        ]
+
+        for row in reader:
+            if not row:
+                continue
+
+            if mes_cols:
+                # Tabela Bacen: ano + colunas 01..12
+                ano_txt = row[0].strip()
+                if not ano_txt.isdigit():
+                    continue
+                ano = int(ano_txt)
+                for k, mes in mes_cols:
+                    valor = _parse_numero(row[k]) if k < len(row) else None
+                    if valor is None or not 1 <= mes <= 12:
+                        continue
+                    tabela[(ano, mes)] = _aplicar_escala(valor, escala)
+                continue
+
+            # SGS: data;valor (várias linhas no mês => compõe)
+            chave = _parse_mes(row[0])
+            valor = _parse_numero(row[1]) if len(row) > 1 else None
+            if chave is None or valor is None:
+                continue
+            valor = _aplicar_escala(valor, escala)
+            anterior = tabela.get(chave)
+            if anterior is not None:
+                valor = (1.0 + anterior) * (1.0 + valor) - 1.0
+            tabela[chave] = valor
+
+    return SerieMensal(tabela, nome)
+
+
+class IndexStore:
+    """
+    Séries de índices de um lote de cálculo, carregadas sob demanda (só as
+    que algum ônus cita). `caminhos` sobrepõe o CSV padrão de cada índice.
+    CSV ausente ou ilegível => get devolve None e motivo() explica.
+    """
+
+    def __init__(self, caminhos: Optional[Dict[str, str]] = None):
+        self.caminhos = {n: d.csv_path for n, d in INDICES.items()}
+        self.caminhos.update(caminhos or {})
+        self._series: Dict[str, Optional[SerieMensal]] = {}
+        self._motivos: Dict[str, str] = {}
+
+    def get(self, nome: str) -> Optional[SerieMensal]:
+        if nome in self._series:
+            return self._series[nome]
+        serie: Optional[SerieMensal] = None
+        defn = INDICES.get(nome)
+        path = self.caminhos.get(nome)
+        if defn is None or not path:
+            self._motivos[nome] = "indice_desconhecido"
+        elif not os.path.isfile(path):
+            self._motivos[nome] = "indice_csv_nao_encontrado"
+        else:
+            try:
+                serie = carregar_serie_mensal(os.path.abspath(path), nome, defn.escala)
+            except Exception:
+                self._motivos[nome] = "indice_csv_ilegivel"
+        self._series[nome] = serie
+        return serie
+
+    def motivo(self, nome: str) -> Optional[str]:
+        return self._motivos.get(nome)
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+pipelines/cad_obr/normalize/normalize_fused.py
+
+Normalize CAD_OBR em passagem única: valores + titularidade + partes.
+
+Equivale à cadeia do orquestrador (pipelines/cad_obr.py):
+  normalize_valores -> normalize_titularidade -> normalize_partes
+com saída byte a byte idêntica, mas:
+- o documento é lido e gravado uma única vez (sem tmp + shutil.move entre
+  estágios);
+- há uma única varredura recursiva da árvore: a de titularidade, feita
+  in-place (sem reconstruir dicts/listas). Os itens de hipotecas_onus e
+  transacoes_venda recebem as regras de valores quando a varredura passa
+  por eles; partes só acessa caminhos conhecidos e roda ao final (a ordem de
+  _partes_meta depende da ordem fixa das estruturas, não da ordem das chaves).
+
+As regras continuam nos módulos de cada estágio; aqui só muda a forma de
+percorrer o documento. As estatísticas são as mesmas de cada estágio.
+
+Uso:
+  python3 pipelines/cad_obr/normalize/normalize_fused.py \
+    --input outputs/cad_obr/01_collector/escritura_imovel \
+    --output outputs/cad_obr/02_normalize/escritura_imovel \
+    --pattern "*collector_out*.json"
+"""
+
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import normalize_partes as np_
+import normalize_titularidade as nt
+import normalize_valores as nv
+
+
+@dataclass
+class FusedStats:
+    files_total: int = 0
+    files_written: int = 0
+    valores: nv.NormalizeStats = field(default_factory=nv.NormalizeStats)
+    titularidade: nt.Stats = field(default_factory=nt.Stats)
+    partes: np_.Stats = field(default_factory=np_.Stats)
+
+
+def _titularidade_value(k: str, v: str, stats: nt.Stats) -> Optional[str]:
+    """
+    Regras escalares de normalize_titularidade.normalize_object, na mesma
+    ordem. Retorna o novo valor ou None se nada mudar.
+    """
+    kl = k.lower()
+
+    if k in nt.DATE_KEYS:
+        iso = nt.parse_date_to_iso(v)
+        if iso and iso != v:
+            stats.date_changed += 1
+            return iso
+
+    if kl in nt.CPF_KEYS:
+        nd = nt.normalize_digits_only(v)
+        if nd and nd != v:
+            stats.cpf_changed += 1
+            return nd
+
+    if kl in nt.CNPJ_KEYS:
+        nd = nt.normalize_digits_only(v)
+        if nd and nd != v:
+            stats.cnpj_changed += 1
+            return nd
+
+    if k in nt.NUM_KEYS and nt.should_normalize_num(v):
+        nd = nt.normalize_digits_only(v)
+        if nd and nd != v:
+            stats.num_changed += 1
+            return nd
+
+    return None
+
+
+def _walk_titularidade(obj: Any, stats: nt.Stats) -> None:
+    """normalize_titularidade.normalize_object, in-place."""
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            if isinstance(v, str):
+                new = _titularidade_value(k, v, stats)
+                if new is not None:
+                    obj[k] = new
+            elif isinstance(v, (dict, list)):
+                _walk_titularidade(v, stats)
+    elif isinstance(obj, list):
+        for x in obj:
+            if isinstance(x, (dict, list)):
+                _walk_titularidade(x, stats)
+
+
+def _valores_items(k: str, v: Any, stats: nv.NormalizeStats) -> None:
+    """Regras de normalize_valores.normalize_document para uma chave da raiz."""
+    if not isinstance(v, list):
+        return
+    if k == "hipotecas_onus":
+        nv.normalize_onus_list(v, stats)
+    elif k == "transacoes_venda":
+        nv.normalize_venda_list(v, stats)
+
+
+def normalize_document(
+    doc: Any,
+    stats: FusedStats,
+    valores: bool = True,
+    titularidade: bool = True,
+    partes: bool = True,
+) -> Any:
+    """
+    Aplica os estágios ativos ao documento (mutado in-place) e o retorna.
+    Com todos desligados, devolve o documento intacto.
+    """
+    if not isinstance(doc, dict):
+        if valores or partes:
+            raise TypeError(
+                f"documento deve ser um objeto JSON, não {type(doc).__name__}"
+            )
+        if titularidade:
+            _walk_titularidade(doc, stats.titularidade)
+        return doc
+
+    for k, v in doc.items():
+        if valores:
+            # valores antes de titularidade, como na cadeia
+            _valores_items(k, v, stats.valores)
+        if not titularidade:
+            continue
+        if isinstance(v, str):
+            new = _titularidade_value(k, v, stats.titularidade)
+            if new is not None:
+                doc[k] = new
+        elif isinstance(v, (dict, list)):
+            _walk_titularidade(v, stats.titularidade)
+
+    if partes:
+        doc, st = np_.normalize_document(doc)
+        stats.partes.parties_found += st.parties_found
+        stats.partes.ids_written += st.ids_written
+        stats.partes.docs_normalized += st.docs_normalized
+
+    return doc
+
+
+def writer_for(
+    valores: bool = True, titularidade: bool = True, partes: bool = True
+) -> Optional[Callable[[Path, Any], None]]:
+    """
+    Gravador do último estágio ativo (o formato difere: titularidade não
+    grava newline final), para manter os bytes da cadeia.
+    """
+    if partes:
+        return np_.save_json
+    if titularidade:
+        return nt.save_json
+    if valores:
+        return nv.save_json
+    return None
+
+
+def process_directory(
+    input_dir: Path,
+    output_dir: Path,
+    glob_pattern: str = "*.json",
+    valores: bool = True,
+    titularidade: bool = True,
+    partes: bool = True,
+) -> FusedStats:
+    stats = FusedStats()
+
+    if input_dir.resolve() == output_dir.resolve():
+        raise ValueError(
+            "input_dir e output_dir não podem ser o mesmo caminho (evita sobrescrita acidental)."
+        )
+
+    writer = writer_for(valores, titularidade, partes)
+    files = sorted(input_dir.glob(glob_pattern))
+    stats.files_total = len(files)
+
+    for in_path in files:
+        try:
+            doc = nv.load_json(in_path)
+        except Exception as e:
+            print(f"[WARN] Falha ao ler JSON: {in_path.name} ({e})")
+            continue
+
+        doc = normalize_document(doc, stats, valores, titularidade, partes)
+
+        if writer is not None:
+            writer(output_dir / in_path.name, doc)
+            stats.files_written += 1
+
+    return stats
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(
+        description="Normalize CAD_OBR em passagem única (valores + titularidade + partes)."
+    )
+    ap.add_argument(
+        "--input",
+        required=True,
+        help="Diretório de entrada com JSONs do Collector (ex.: outputs/cad_obr/01_collector/escritura_imovel)",
+    )
+    ap.add_argument(
+        "--output",
+        required=True,
+        help="Diretório de saída (ex.: outputs/cad_obr/02_normalize/escritura_imovel)",
+    )
+    ap.add_argument(
+        "--pattern", default="*.json", help="Glob de arquivos (default: *.json)"
+    )
+    ap.add_argument("--skip-values", action="store_true", help="Não aplica valores.")
+    ap.add_argument(
+        "--skip-titularidade", action="store_true", help="Não aplica titularidade."
+    )
+    ap.add_argument("--skip-partes", action="store_true", help="Não aplica partes.")
+    args = ap.parse_args()
+
+    input_dir = Path(args.input)
+    if not input_dir.is_dir():
+        raise SystemExit(f"ERRO: diretório de entrada não encontrado: {input_dir}")
+
+    stats = process_directory(
+        input_dir,
+        Path(args.output),
+        glob_pattern=args.pattern,
+        valores=not args.skip_values,
+        titularidade=not args.skip_titularidade,
+        partes=not args.skip_partes,
+    )
+
+    print("OK normalize_fused")
+    print(f"- arquivos_in:  {stats.files_total}")
+    print(f"- arquivos_out: {stats.files_written}")
+    if not args.skip_values:
+        v = stats.valores
+        print(
+            f"- valores: ônus {v.onus_normalized}/{v.onus_total} "
+            f"(sem valor {v.onus_skipped_no_value}, parse {v.onus_skipped_parse_fail}), "
+            f"vendas {v.vendas_normalized}/{v.vendas_total} "
+            f"(sem valor {v.vendas_skipped_no_value}, parse {v.vendas_skipped_parse_fail})"
+        )
+    if not args.skip_titularidade:
+        t = stats.titularidade
+        print(
+            f"- titularidade: datas {t.date_changed}, cpf {t.cpf_changed}, "
+            f"cnpj {t.cnpj_changed}, numeros {t.num_changed}"
+        )
+    if not args.skip_partes:
+        p = stats.partes
+        print(
+            f"- partes: docs {p.docs_normalized}, partes {p.parties_found}, "
+            f"ids {p.ids_written}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,32 +5,19 @@ import argparse
 import json
 import re
 import shutil
+import sys
 from dataclasses import dataclass
-from datetime import date
 from pathlib import Path
 from typing import Any, Dict, Iterable, Optional
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+from scripts.ptbr_parse import parse_data_iso  # noqa: E402
+
 
 # -----------------------------
 # Config de normalização
 # -----------------------------
 
-MONTHS_PT = {
-    "janeiro": 1,
-    "fevereiro": 2,
-    "marco": 3,
-    "março": 3,
-    "abril": 4,
-    "maio": 5,
-    "junho": 6,
-    "julho": 7,
-    "agosto": 8,
-    "setembro": 9,
-    "outubro": 10,
-    "novembro": 11,
-    "dezembro": 12,
-}
-
 # Chaves “explicitamente” de data (evita mexer em textos longos como detalhes_da_procuracao)
 DATE_KEYS = {
     "data_assinatura",
@@ -58,22 +45,6 @@ CNPJ_KEYS = {"cnpj"}
 NUM_KEYS = {"numero", "numero_contrato", "numero_documento"}
 
 
-ISO_DATE_RE = re.compile(r"^\s*(\d{4})-(\d{2})-(\d{2})\s*$")
-DMY_SLASH_RE = re.compile(r"^\s*(\d{1,2})[/-](\d{1,2})[/-](\d{2,4})\s*$")
-LONG_PT_RE = re.compile(
-    r"^\s*(\d{1,2})\s+de\s+([A-Za-zÀ-ÿçÇ]+)\s+de\s+([0-9\.\s]{2,6})\s*\.?\s*$",
-    re.IGNORECASE,
-)
-
-# Para ano com 2 dígitos: pivot 30 -> <=30 vira 20xx; >30 vira 19xx
-YY_PIVOT = 30
-
-
-def _safe_int(s: str) -> Optional[int]:
-    try:
-        return int(s)
-    except Exception:
-        return None
 
 
 def normalize_digits_only(s: str) -> str:
@@ -82,82 +53,15 @@ def normalize_digits_only(s: str) -> str:
 
 def parse_date_to_iso(raw: str) -> Optional[str]:
     """
-    Aceita:
+    Aceita (parser compartilhado, scripts/ptbr_parse.py):
       - YYYY-MM-DD
       - dd/mm/yyyy | dd-mm-yyyy
-      - dd/mm/yy   | dd-mm-yy
+      - dd/mm/yy   | dd-mm-yy (ano pelo pivot ptbr_parse.PIVO_ANO: <= 30 vira 20xx)
       - "dd de mês de yyyy" (pt-BR), incluindo anos como "1.994" ou "2.003"
       - tolera ponto final no fim ("2001.")
-    Retorna "YYYY-MM-DD" ou None se não parsear.
+    O texto inteiro deve ser a data. Retorna "YYYY-MM-DD" ou None se não parsear.
     """
-    if not raw or not isinstance(raw, str):
-        return None
-
-    s = raw.strip()
-
-    # 1) ISO
-    m = ISO_DATE_RE.match(s)
-    if m:
-        yyyy, mm, dd = map(int, m.groups())
-        try:
-            return date(yyyy, mm, dd).isoformat()
-        except Exception:
-            return None
-
-    # 2) dd/mm/yyyy ou dd/mm/yy
-    m = DMY_SLASH_RE.match(s)
-    if m:
-        dd_s, mm_s, yy_s = m.groups()
-        dd = _safe_int(dd_s)
-        mm = _safe_int(mm_s)
-        yy = _safe_int(yy_s)
-        if dd is None or mm is None or yy is None:
-            return None
-
-        if yy < 100:
-            yy = (2000 + yy) if yy <= YY_PIVOT else (1900 + yy)
-
-        try:
-            return date(yy, mm, dd).isoformat()
-        except Exception:
-            return None
-
-    # 3) "dd de mês de yyyy" (com ano possivelmente "1.994")
-    m = LONG_PT_RE.match(s)
-    if m:
-        dd_s, month_s, year_s = m.groups()
-        dd = _safe_int(dd_s)
-        if dd is None:
-            return None
-
-        month_key = month_s.strip().lower()
-        # normaliza cedilha/variações mínimas
-        month_key = month_key.replace("ç", "ç")  # noop, só para clareza
-        if month_key not in MONTHS_PT:
-            # tenta remover acentos básicos do "março"
-            month_key_alt = month_key.replace("março", "marco")
-            if month_key_alt in MONTHS_PT:
-                month_key = month_key_alt
-            else:
-                return None
-        mm = MONTHS_PT[month_key]
-
-        # ano: remove tudo que não é dígito (pega "1.994" -> "1994", "2.003" -> "2003")
-        year_digits = re.sub(r"\D+", "", year_s)
-        if not year_digits:
-            return None
-        yy = _safe_int(year_digits)
-        if yy is None:
-            return None
-        if yy < 100:
-            yy = (2000 + yy) if yy <= YY_PIVOT else (1900 + yy)
-
-        try:
-            return date(yy, mm, dd).isoformat()
-        except Exception:
-            return None
-
-    return None
+    return parse_data_iso(raw, busca=False)
 
 
 def should_normalize_num(value: str) -> bool:
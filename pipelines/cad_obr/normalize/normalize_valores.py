@@ -26,12 +26,15 @@ from __future__ import annotations
 
 import argparse
 import json
-import re
+import sys
 from dataclasses import dataclass
 from decimal import ROUND_HALF_UP, Decimal
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+from scripts.ptbr_parse import parse_valor, parse_valores  # noqa: E402
+
 CR_TO_R_FACTOR = Decimal("2750")  # 1 R$ = 2.750 CR$
 
 
@@ -67,50 +70,16 @@ def detect_currency(text: str) -> Optional[str]:
 
 def parse_monetary_value(value: Any) -> Optional[Decimal]:
     """
-    Extrai o PRIMEIRO valor monetário encontrado no texto e converte para Decimal.
+    Extrai o PRIMEIRO valor monetário encontrado no texto e converte para Decimal
+    (parser compartilhado, scripts/ptbr_parse.py).
 
     Suporta:
     - pt-BR: "93.354,27", "93354,27"
     - decimal por ponto: "93354.27", "93,354.27"
+    - inteiro simples (fallback): "600000"
     - ignora texto por extenso e demais ruídos: "R$93.354,27-(noventa e três mil, ...)"
     """
-    if value is None:
-        return None
-    if isinstance(value, (int, float)):
-        return Decimal(str(value))
-
-    s = str(value).strip()
-    if not s:
-        return None
-
-    # 1) pt-BR com vírgula decimal (com ou sem milhar)
-    m = re.search(r"(\d{1,3}(?:\.\d{3})+,\d{2}|\d+,\d{2})", s)
-    if m:
-        num_str = m.group(1)
-        num_str = num_str.replace(".", "").replace(",", ".")
-        try:
-            return Decimal(num_str)
-        except Exception:
-            return None
-
-    # 2) decimal por ponto (com ou sem milhar estilo US)
-    m = re.search(r"(\d{1,3}(?:,\d{3})+\.\d{2}|\d+\.\d{2})", s)
-    if m:
-        num_str = m.group(1).replace(",", "")
-        try:
-            return Decimal(num_str)
-        except Exception:
-            return None
-
-    # 3) inteiro simples (fallback)
-    m = re.search(r"(\d+)", s)
-    if m:
-        try:
-            return Decimal(m.group(1))
-        except Exception:
-            return None
-
-    return None
+    return parse_valor(value)
 
 
 def quantize_2(amount: Decimal) -> Decimal:
@@ -150,28 +119,32 @@ def format_brl_no_symbol(amount_reais: Decimal) -> str:
     return f"{sign}{integer_fmt},{frac}"
 
 
-def normalize_onus_item(item: Dict[str, Any], stats: NormalizeStats) -> bool:
-    """
-    Normaliza um item de hipotecas_onus:
-    - valor_divida (string BR sem símbolo)
-    - valor_divida_num (int centavos)
-    Fonte: valor_divida_original (prioridade) -> valor_divida
-    """
+def parse_monetary_values(values: List[Any]) -> List[Optional[Decimal]]:
+    """parse_monetary_value em lote: cada texto distinto é lido uma vez."""
+    return parse_valores(values)
+
+
+def _onus_source(item: Dict[str, Any]) -> str:
+    """Fonte do valor do ônus: valor_divida_original (prioridade) -> valor_divida."""
     val_orig = (item.get("valor_divida_original") or "").strip()
-    val_atual = (item.get("valor_divida") or "").strip()
+    return val_orig or (item.get("valor_divida") or "").strip()
+
 
-    source = val_orig if val_orig else val_atual
+def _normalize_onus(
+    item: Dict[str, Any], source: str, dec: Optional[Decimal], stats: NormalizeStats
+) -> bool:
     if not source:
         stats.onus_skipped_no_value += 1
         return False
 
+    val_orig = (item.get("valor_divida_original") or "").strip()
+    val_atual = (item.get("valor_divida") or "").strip()
     currency = (
         detect_currency(source)
         or detect_currency(val_orig)
         or detect_currency(val_atual)
     )
 
-    dec = parse_monetary_value(source)
     if dec is None:
         stats.onus_skipped_parse_fail += 1
         return False
@@ -186,19 +159,14 @@ def normalize_onus_item(item: Dict[str, Any], stats: NormalizeStats) -> bool:
     return True
 
 
-def normalize_venda_item(item: Dict[str, Any], stats: NormalizeStats) -> bool:
-    """
-    Normaliza transacoes_venda[*].valor:
-    - valor: string BR sem símbolo
-    - valor_num: int centavos
-    """
-    val = (item.get("valor") or "").strip()
+def _normalize_venda(
+    item: Dict[str, Any], val: str, dec: Optional[Decimal], stats: NormalizeStats
+) -> bool:
     if not val:
         stats.vendas_skipped_no_value += 1
         return False
 
     currency = detect_currency(val)
-    dec = parse_monetary_value(val)
     if dec is None:
         stats.vendas_skipped_parse_fail += 1
         return False
@@ -213,6 +181,51 @@ def normalize_venda_item(item: Dict[str, Any], stats: NormalizeStats) -> bool:
     return True
 
 
+def normalize_onus_item(item: Dict[str, Any], stats: NormalizeStats) -> bool:
+    """
+    Normaliza um item de hipotecas_onus:
+    - valor_divida (string BR sem símbolo)
+    - valor_divida_num (int centavos)
+    Fonte: valor_divida_original (prioridade) -> valor_divida
+    """
+    source = _onus_source(item)
+    dec = parse_monetary_value(source) if source else None
+    return _normalize_onus(item, source, dec, stats)
+
+
+def normalize_venda_item(item: Dict[str, Any], stats: NormalizeStats) -> bool:
+    """
+    Normaliza transacoes_venda[*].valor:
+    - valor: string BR sem símbolo
+    - valor_num: int centavos
+    """
+    val = (item.get("valor") or "").strip()
+    dec = parse_monetary_value(val) if val else None
+    return _normalize_venda(item, val, dec, stats)
+
+
+def normalize_onus_list(items: List[Any], stats: NormalizeStats) -> bool:
+    """normalize_onus_item para a lista inteira, com os valores lidos em lote."""
+    dicts = [it for it in items if isinstance(it, dict)]
+    stats.onus_total += len(dicts)
+    sources = [_onus_source(it) for it in dicts]
+    changed_any = False
+    for it, source, dec in zip(dicts, sources, parse_monetary_values(sources)):
+        changed_any = _normalize_onus(it, source, dec, stats) or changed_any
+    return changed_any
+
+
+def normalize_venda_list(items: List[Any], stats: NormalizeStats) -> bool:
+    """normalize_venda_item para a lista inteira, com os valores lidos em lote."""
+    dicts = [it for it in items if isinstance(it, dict)]
+    stats.vendas_total += len(dicts)
+    vals = [(it.get("valor") or "").strip() for it in dicts]
+    changed_any = False
+    for it, val, dec in zip(dicts, vals, parse_monetary_values(vals)):
+        changed_any = _normalize_venda(it, val, dec, stats) or changed_any
+    return changed_any
+
+
 def normalize_document(doc: Dict[str, Any], stats: NormalizeStats) -> bool:
     """
     Normaliza:
@@ -223,17 +236,11 @@ def normalize_document(doc: Dict[str, Any], stats: NormalizeStats) -> bool:
 
     onus = doc.get("hipotecas_onus")
     if isinstance(onus, list):
-        for it in onus:
-            if isinstance(it, dict):
-                stats.onus_total += 1
-                changed_any = normalize_onus_item(it, stats) or changed_any
+        changed_any = normalize_onus_list(onus, stats) or changed_any
 
     vendas = doc.get("transacoes_venda")
     if isinstance(vendas, list):
-        for it in vendas:
-            if isinstance(it, dict):
-                stats.vendas_total += 1
-                changed_any = normalize_venda_item(it, stats) or changed_any
+        changed_any = normalize_venda_list(vendas, stats) or changed_any
 
     return changed_any
 
@@ -57,6 +57,51 @@ def _parse_args() -> argparse.Namespace:
         choices=["A", "B", "C", "D", "E", "ALL"],
         help="Executa até a camada indicada (default: ALL). A=índices base, B=ônus, C=eventos, D=links/pendências, E=novações.",
     )
+    p.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Camadas A–C documento a documento, sem carregar todo o corpus em memória "
+        "(monetary indexado só por caminho). Mesmo dataset do modo padrão.",
+    )
+    p.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Leitores paralelos dos JSON de entrada (default: 1 = serial). "
+        "A ordem dos documentos (e o dataset) não muda.",
+    )
+    p.add_argument(
+        "--processes",
+        action="store_true",
+        help="Com --workers > 1, lê/parseia em processos em vez de threads.",
+    )
+    p.add_argument(
+        "--backend",
+        default="python",
+        choices=["python", "duckdb"],
+        help="python (padrão) ou duckdb: camadas B–E em SQL, dataset gravado em --duckdb "
+        "(JSONL só com --export-jsonl). Requer a lib duckdb.",
+    )
+    p.add_argument(
+        "--duckdb",
+        default="artifacts/db/cad_obr_dataset_v1.duckdb",
+        help="Arquivo DuckDB do backend duckdb (default: artifacts/db/cad_obr_dataset_v1.duckdb)",
+    )
+    p.add_argument(
+        "--export-jsonl",
+        action="store_true",
+        help=(
+            "Com --backend duckdb, grava também o dataset JSONL em --output/--dataset "
+            "(sem ele, o evidence_pack troca as tabelas por views do JSONL existente)."
+        ),
+    )
+    p.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Reprocessa só os documentos alterados desde a última execução (estado em "
+        "<output>/_build/<dataset>/) e recalcula as novações só dos imóveis afetados. "
+        "Mesmo dataset do modo padrão; não combina com --stop-after/--streaming.",
+    )
 
     return p.parse_args()
 
@@ -77,6 +122,14 @@ def main() -> int:
     output_root.mkdir(parents=True, exist_ok=True)
 
     err = _validate_dirs(input_normalize, input_monetary)
+    if not err and args.workers < 1:
+        err = "--workers deve ser >= 1"
+    if not err and args.incremental and (args.streaming or args.stop_after != "ALL"):
+        err = "--incremental não combina com --streaming nem com --stop-after"
+    if not err and args.backend == "duckdb" and (
+        args.incremental or args.streaming or args.stop_after != "ALL"
+    ):
+        err = "--backend duckdb não combina com --incremental, --streaming nem --stop-after"
     if err:
         print(f"ERRO: {err}", file=sys.stderr)
         return 2
@@ -92,28 +145,62 @@ def main() -> int:
         normalize_root=input_normalize,
         monetary_root=input_monetary,
         pattern=args.pattern,
+        load_workers=args.workers,
+        load_processes=args.processes,
     )
     outputs = ReconcilerOutputs(
         output_root=output_root,
         dataset_dirname=args.dataset,
     )
 
+    if args.backend == "duckdb":
+        import reconciler_duckdb
+
+        if reconciler_duckdb.duckdb is None:
+            print("ERRO: --backend duckdb requer a lib duckdb (uv sync)", file=sys.stderr)
+            return 2
+        backend = reconciler_duckdb.DuckDbReconciler(inputs, outputs, Path(args.duckdb))
+        db_path = backend.run(export_jsonl=args.export_jsonl)
+        resumo = ", ".join(f"{t}={n}" for t, n in backend.counts.items())
+        print(f"OK: backend duckdb. Tabelas em: {db_path} ({resumo})")
+        if args.export_jsonl:
+            print(f"OK: JSONL em: {output_root / args.dataset}")
+        return 0
+
     recon = CadObrReconciler(inputs, outputs)
 
-    # Execução por camadas (incremental)
-    recon.layer_a_load_and_index()
+    if args.incremental:
+        out_dir = recon.run_incremental()
+        st = recon.incremental_stats
+        print(
+            f"OK: incremental: {st['reprocessados']}/{st['documentos']} documentos reprocessados, "
+            f"{st['removidos']} removidos, {st['monetary_reprocessados']} do monetary, "
+            f"novações recalculadas em {st['properties_novacoes_recalculadas']} imóveis. "
+            f"Dataset em: {out_dir}"
+        )
+        return 0
+
+    # Execução por camadas (incremental); no streaming, A–C numa só passagem
+    if args.streaming:
+        recon.layers_abc_streaming(
+            stop_after=args.stop_after if args.stop_after in ("A", "B") else "C"
+        )
+    else:
+        recon.layer_a_load_and_index()
     if args.stop_after == "A":
         out_dir = recon.write_dataset()
         print(f"OK: Camada A concluída. Dataset parcial em: {out_dir}")
         return 0
 
-    recon.layer_b_build_onus_obrigacoes()
+    if not args.streaming:
+        recon.layer_b_build_onus_obrigacoes()
     if args.stop_after == "B":
         out_dir = recon.write_dataset()
         print(f"OK: Camadas A+B concluídas. Dataset parcial em: {out_dir}")
         return 0
 
-    recon.layer_c_build_property_events()
+    if not args.streaming:
+        recon.layer_c_build_property_events()
     if args.stop_after == "C":
         out_dir = recon.write_dataset()
         print(f"OK: Camadas A+B+C concluídas. Dataset parcial em: {out_dir}")
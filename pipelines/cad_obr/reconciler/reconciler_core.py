@@ -4,32 +4,50 @@ from __future__ import annotations
 import hashlib
 import json
 import re
+import shutil
+import sys
+import tempfile
+from bisect import bisect_right
+from collections import deque
+from contextlib import ExitStack
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import date, datetime
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    TextIO,
+    Tuple,
+    TypeVar,
+)
+
+try:
+    import orjson
+except ImportError:  # opcional: sem orjson, json da stdlib
+    orjson = None
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "build"))
+import build_manifest  # noqa: E402
+from scripts import ptbr_parse  # noqa: E402
+from scripts.ptbr_parse import (  # noqa: E402
+    parse_data_iso,
+    parse_iso,
+    parse_valor_centavos,
+)
 
 # -----------------------------
 # Utilitários determinísticos
 # -----------------------------
 
-_PT_MONTHS = {
-    "janeiro": 1,
-    "fevereiro": 2,
-    "marco": 3,
-    "março": 3,
-    "abril": 4,
-    "maio": 5,
-    "junho": 6,
-    "julho": 7,
-    "agosto": 8,
-    "setembro": 9,
-    "outubro": 10,
-    "novembro": 11,
-    "dezembro": 12,
-}
-
-
 def sha1_12(s: str) -> str:
     h = hashlib.sha1(s.encode("utf-8")).hexdigest()
     return h[:12]
@@ -117,60 +135,16 @@ def is_iso_date(s: str) -> bool:
 
 def parse_date_to_iso(raw: Optional[str]) -> Optional[str]:
     """
-    Converte:
-      - YYYY-MM-DD
-      - dd/mm/yyyy
+    Converte (parser compartilhado, scripts/ptbr_parse.py):
+      - YYYY-MM-DD (data válida)
+      - dd/mm/yyyy | dd-mm-yyyy
       - "24 de Abril de 1.991"
       - "10 de fevereiro de 2.001"
     em YYYY-MM-DD.
     """
     if not raw:
         return None
-    s = normalize_ws(str(raw))
-    if not s:
-        return None
-
-    if is_iso_date(s):
-        return s
-
-    # dd/mm/yyyy
-    m = re.match(r"^(\d{1,2})/(\d{1,2})/(\d{2,4})$", s)
-    if m:
-        d, mo, y = int(m.group(1)), int(m.group(2)), m.group(3)
-        y = int(re.sub(r"\D", "", y))
-        if y < 100:
-            y += 1900
-        try:
-            return date(y, mo, d).isoformat()
-        except ValueError:
-            return None
-
-    # "24 de Abril de 1.991" / "10 de fevereiro de 2.001"
-    m = re.search(
-        r"(\d{1,2})\s+de\s+([A-Za-zçÇáéíóúÁÉÍÓÚãõÃÕ]+)\s+de\s+([\d\.]{2,6})",
-        s,
-        re.IGNORECASE,
-    )
-    if m:
-        d = int(m.group(1))
-        mes_txt = m.group(2).lower()
-        mes_txt = mes_txt.replace("ç", "c")
-        y_txt = re.sub(r"\D", "", m.group(3))
-        if not y_txt:
-            return None
-        y = int(y_txt)
-        # "1991" pode vir como "1.991" => 1991 já ok
-        if y < 100:
-            y += 1900
-        mo = _PT_MONTHS.get(mes_txt)
-        if not mo:
-            return None
-        try:
-            return date(y, mo, d).isoformat()
-        except ValueError:
-            return None
-
-    return None
+    return parse_data_iso(normalize_ws(str(raw)))
 
 
 def extract_first_date_from_text(raw: Optional[str]) -> Optional[str]:
@@ -191,7 +165,7 @@ def extract_first_date_from_text(raw: Optional[str]) -> Optional[str]:
 
 def parse_brl_to_centavos(raw: Optional[str]) -> Optional[int]:
     """
-    Extrai o primeiro valor monetário da string.
+    Extrai o primeiro valor monetário da string (scripts/ptbr_parse.py).
     Aceita:
       - "R$60.000,00-(...)" -> 6000000
       - "CR$15.276.818,18" -> 1527681818
@@ -201,38 +175,7 @@ def parse_brl_to_centavos(raw: Optional[str]) -> Optional[int]:
     """
     if not raw:
         return None
-    s = str(raw)
-
-    # 1) padrão BR: 1.234,56 ou 123,45
-    m = re.search(r"(\d{1,3}(?:\.\d{3})*,\d{2}|\d+,\d{2})", s)
-    if m:
-        num = m.group(1)
-        num = num.replace(".", "").replace(",", ".")
-        try:
-            val = float(num)
-            return int(round(val * 100))
-        except ValueError:
-            return None
-
-    # 2) padrão US: 1234.56 (sem milhares)
-    m = re.search(r"(\d+\.\d{2})", s)
-    if m:
-        try:
-            val = float(m.group(1))
-            return int(round(val * 100))
-        except ValueError:
-            return None
-
-    # 3) inteiro puro
-    m = re.search(r"\b(\d+)\b", s)
-    if m:
-        try:
-            val = int(m.group(1))
-            return val * 100
-        except ValueError:
-            return None
-
-    return None
+    return parse_valor_centavos(str(raw))
 
 
 def format_centavos_to_brl(centavos: int) -> str:
@@ -286,6 +229,9 @@ class ReconcilerInputs:
     normalize_root: Path
     monetary_root: Path
     pattern: str = "*.json"
+    # leitura paralela dos JSON (1 = serial); processos em vez de threads
+    load_workers: int = 1
+    load_processes: bool = False
 
 
 @dataclass
@@ -359,29 +305,227 @@ def scan_json_files(root: Path, pattern: str) -> List[Path]:
     return sorted(root.rglob(pattern))
 
 
+# Tarefas pendentes por worker (mantém a ordem e limita a memória).
+FILES_IN_FLIGHT_PER_WORKER = 4
+# Com processos, cada tarefa leva um bloco de arquivos (amortiza o IPC).
+FILES_PER_PROCESS_TASK = 16
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def json_backend() -> str:
+    return "orjson" if orjson is not None else "json"
+
+
 def load_json(path: Path) -> Dict[str, Any]:
+    if orjson is not None:
+        raw = path.read_bytes()
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # o que o orjson recusa e a stdlib aceita (NaN, inteiros enormes)
+            return json.loads(raw.decode("utf-8"))
     with path.open("r", encoding="utf-8") as f:
         return json.load(f)
 
 
+def _load_json_or_none(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        data = load_json(path)
+    except Exception:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _apply_all(fn: Callable[[T], R], items: List[T]) -> List[R]:
+    return [fn(item) for item in items]
+
+
+def map_ordered(
+    fn: Callable[[T], R], items: List[T], workers: int = 1, processes: bool = False
+) -> Iterator[R]:
+    """
+    fn(item) para cada item, na ordem de `items`, com até `workers` em paralelo
+    (threads, ou processos com processes=True; `fn` precisa ser picklable).
+    Só FILES_IN_FLIGHT_PER_WORKER tarefas por worker ficam pendentes: quem
+    consome um resultado por vez (modo streaming) segue com memória limitada.
+    """
+    if workers <= 1 or len(items) < 2:
+        for item in items:
+            yield fn(item)
+        return
+
+    size = FILES_PER_PROCESS_TASK if processes else 1
+    blocks = [items[i : i + size] for i in range(0, len(items), size)]
+    window = workers * FILES_IN_FLIGHT_PER_WORKER
+    pool_cls = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    with pool_cls(max_workers=workers) as pool:
+        pending = iter(blocks)
+        in_flight: Deque[Future] = deque(
+            pool.submit(_apply_all, fn, block) for block in islice(pending, window)
+        )
+        while in_flight:
+            fut = in_flight.popleft()
+            for block in islice(pending, 1):
+                in_flight.append(pool.submit(_apply_all, fn, block))
+            yield from fut.result()
+
+
+def iter_loaded_docs(
+    root: Path, pattern: str, stage: str, workers: int = 1, processes: bool = False
+) -> Iterator[LoadedDoc]:
+    """
+    Documentos de `root`, um por vez (ordem de scan_json_files, com ou sem
+    leitura paralela). JSON ilegível é ignorado (vira pendência no reconciler).
+    """
+    paths = scan_json_files(root, pattern)
+    for p, data in zip(paths, map_ordered(_load_json_or_none, paths, workers, processes)):
+        if data is not None:
+            yield LoadedDoc(stage=stage, path=p, data=data)
+
+
 def load_inputs(inputs: ReconcilerInputs) -> Tuple[List[LoadedDoc], List[LoadedDoc]]:
-    norm_docs: List[LoadedDoc] = []
-    mon_docs: List[LoadedDoc] = []
+    def load(root: Path, stage: str) -> List[LoadedDoc]:
+        return list(
+            iter_loaded_docs(
+                root, inputs.pattern, stage, inputs.load_workers, inputs.load_processes
+            )
+        )
 
-    for p in scan_json_files(inputs.normalize_root, inputs.pattern):
-        try:
-            norm_docs.append(LoadedDoc(stage="02_normalize", path=p, data=load_json(p)))
-        except Exception:
-            # deixa para pendências no reconciler
-            continue
+    return (
+        load(inputs.normalize_root, "02_normalize"),
+        load(inputs.monetary_root, "03_monetary"),
+    )
 
-    for p in scan_json_files(inputs.monetary_root, inputs.pattern):
-        try:
-            mon_docs.append(LoadedDoc(stage="03_monetary", path=p, data=load_json(p)))
-        except Exception:
-            continue
 
-    return norm_docs, mon_docs
+def write_jsonl(path: Path, rows: Iterable[Dict[str, Any]]) -> None:
+    """Grava uma tabela do dataset (uma linha JSON por registro)."""
+    with path.open("w", encoding="utf-8") as f:
+        append_jsonl(f, rows)
+
+
+def append_jsonl(f: TextIO, rows: Iterable[Dict[str, Any]]) -> None:
+    """Acrescenta registros a uma tabela já aberta (mesmo formato de write_jsonl)."""
+    for r in rows:
+        # remove chaves None para reduzir ruído
+        clean = {k: v for k, v in r.items() if v is not None}
+        f.write(json.dumps(clean, ensure_ascii=False) + "\n")
+
+
+# -----------------------------
+# Modo incremental: estado por documento
+# -----------------------------
+
+# Estado em <output_root>/_build/<dataset>/, fora da pasta do dataset (lida
+# por glob "*.jsonl" no evidence_pack), em shards para que uma execução só
+# regrave o que mudou:
+#   index.json      meta + uma entrada por arquivo de entrada: sha256, mtime e
+#                   tamanho (arquivo intocado não é re-hasheado), matrícula; os
+#                   docs do normalize têm também monetary_sha256, as
+#                   property_ids das suas linhas e o nome do shard
+#   docs/<id>.json  linhas que o documento gerou em cada tabela
+#   novacoes.json   novações por property_id
+INCREMENTAL_STATE_VERSION = "cad_obr.reconciler_incremental.v2"
+
+
+def incremental_state_dir(outputs: ReconcilerOutputs) -> Path:
+    return outputs.output_root / build_manifest.MANIFEST_DIRNAME / outputs.dataset_dirname
+
+
+def incremental_meta(inputs: ReconcilerInputs) -> Dict[str, Any]:
+    """O que invalida o estado inteiro: versão do código e raízes/pattern de entrada."""
+    return {
+        "version": INCREMENTAL_STATE_VERSION,
+        "code_version": build_manifest.code_version(
+            [sys.modules[__name__], ptbr_parse]
+        ),
+        "normalize_root": str(inputs.normalize_root),
+        "monetary_root": str(inputs.monetary_root),
+        "pattern": inputs.pattern,
+    }
+
+
+def load_incremental_state(state_dir: Path, meta: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Índice anterior, ou None (ausente/inválido/meta diferente -> rebuild)."""
+    try:
+        data = load_json(state_dir / "index.json")
+    except Exception:
+        return None
+    if not isinstance(data, dict) or data.get("meta") != meta:
+        return None
+    if not all(isinstance(data.get(k), dict) for k in ("monetary", "docs")):
+        return None
+    return data
+
+
+def load_incremental_shard(state_dir: Path, name: str) -> Dict[str, Any]:
+    return load_json(state_dir / name)
+
+
+def save_incremental_shard(state_dir: Path, name: str, data: Any) -> None:
+    """Grava um arquivo do estado de forma atômica (tmp + replace)."""
+    path = state_dir / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    # json.dumps de uma vez usa o encoder em C (json.dump em arquivo não usa)
+    tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    tmp.replace(path)
+
+
+def doc_shard_name(key: str) -> str:
+    return f"docs/{hashlib.sha1(key.encode('utf-8')).hexdigest()}.json"
+
+
+def file_stat(path: Path) -> Dict[str, int]:
+    """mtime/tamanho gravados no índice; vazio se o arquivo sumiu."""
+    try:
+        st = path.stat()
+    except OSError:
+        return {}
+    return {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+
+def merge_index_fragment(
+    dst: Dict[str, Dict[str, Any]], frag: Dict[str, Dict[str, Any]]
+) -> None:
+    """
+    Funde o recorte de um documento num índice agregado (partes, imóveis,
+    operações) com as regras dos upserts da camada A: listas sem repetição,
+    anchors acumulam, demais campos ficam com o último valor.
+    """
+    for key, item in frag.items():
+        cur = dst.get(key)
+        if cur is None:
+            dst[key] = {k: list(v) if isinstance(v, list) else v for k, v in item.items()}
+            continue
+        for k, v in item.items():
+            if k == "anchors":
+                cur[k].extend(v)
+            elif isinstance(v, list):
+                cur[k].extend([x for x in v if x not in cur[k]])
+            else:
+                cur[k] = v
+
+
+# Campos que a camada E lê de ônus e eventos: no modo streaming, é o que fica
+# em memória depois que as linhas vão para o disco.
+NOVACAO_CAMPOS_ONUS = (
+    "onus_id",
+    "tipo_divida",
+    "credor_id",
+    "emitente_devedor_id",
+    "operation_id",
+    "anchors",
+)
+NOVACAO_CAMPOS_EVENTO = ("property_id", "event_type", "event_date", "onus_id")
+
+
+def _row_property_ids(contrib: Dict[str, Any]) -> List[str]:
+    out: List[str] = []
+    for table in ("onus_obrigacoes", "eventos_onus", "eventos_venda"):
+        out.extend(r["property_id"] for r in contrib.get(table) or [] if r.get("property_id"))
+    return out
 
 
 # -----------------------------
@@ -412,6 +556,16 @@ class CadObrReconciler:
         self.mon_by_matricula: Dict[str, LoadedDoc] = {}
         self.mon_by_operation: Dict[str, LoadedDoc] = {}
 
+        # modo streaming: só o caminho do doc monetary (relido sob demanda)
+        self.mon_path_by_matricula: Dict[str, Path] = {}
+        self.mon_path_by_operation: Dict[str, Path] = {}
+
+        # modo incremental: contagens da última execução (run_incremental)
+        self.incremental_stats: Dict[str, int] = {}
+
+        # modo streaming: tabelas já gravadas (write_dataset não as regrava)
+        self.streamed_tables: Set[str] = set()
+
     # ---------
     # Layer A: catálogo + índices base
     # ---------
@@ -421,57 +575,61 @@ class CadObrReconciler:
         self._index_monetary_docs()
 
         for ld in self.norm_docs:
-            folder = ld.path.parent.name
-            tipo = detect_doc_tipo(ld.data, fallback_folder=folder)
-            did = doc_id_for(ld.stage, tipo, ld.path)
-
-            # Indexa documento
-            doc_item: Dict[str, Any] = {
-                "doc_id": did,
-                "tipo_documento": tipo,
-                "source_path": str(ld.path),
-                "origin_stage": ld.stage,
-            }
-
-            # tenta extrair operation_id
-            op_id = self._extract_operation_id(ld.data)
-            if op_id:
-                doc_item["operation_id"] = op_id
-
-            # property_ids
-            prop_ids = self._extract_property_ids(ld.data)
-            if prop_ids:
-                doc_item["property_ids"] = prop_ids
-
-            # party_ids
-            party_ids = self._extract_party_ids(ld.data)
-            if party_ids:
-                doc_item["party_ids"] = party_ids
-
-            # datas (quando existirem)
-            datas: Dict[str, Any] = {}
-            for k in ["data_assinatura", "data_registro", "data_efetiva"]:
-                v = ld.data.get(k)
-                iso = parse_date_to_iso(v) if isinstance(v, str) else None
-                if iso:
-                    datas[k] = iso
-            if datas:
-                doc_item["datas"] = datas
+            self._catalog_doc(ld)
+
+    def _catalog_doc(self, ld: LoadedDoc) -> None:
+        """Camada A para um documento do normalize: catálogo + índices base."""
+        folder = ld.path.parent.name
+        tipo = detect_doc_tipo(ld.data, fallback_folder=folder)
+        did = doc_id_for(ld.stage, tipo, ld.path)
+
+        # Indexa documento
+        doc_item: Dict[str, Any] = {
+            "doc_id": did,
+            "tipo_documento": tipo,
+            "source_path": str(ld.path),
+            "origin_stage": ld.stage,
+        }
 
-            anchors: List[Dict[str, Any]] = []
-            fonte = ld.data.get("fonte_documento_geral")
-            a = anchor_from_obj(fonte) if fonte else None
-            if a:
-                anchors.append(a)
-            if anchors:
-                doc_item["anchors"] = anchors
+        # tenta extrair operation_id
+        op_id = self._extract_operation_id(ld.data)
+        if op_id:
+            doc_item["operation_id"] = op_id
+
+        # property_ids
+        prop_ids = self._extract_property_ids(ld.data)
+        if prop_ids:
+            doc_item["property_ids"] = prop_ids
+
+        # party_ids
+        party_ids = self._extract_party_ids(ld.data)
+        if party_ids:
+            doc_item["party_ids"] = party_ids
+
+        # datas (quando existirem)
+        datas: Dict[str, Any] = {}
+        for k in ["data_assinatura", "data_registro", "data_efetiva"]:
+            v = ld.data.get(k)
+            iso = parse_date_to_iso(v) if isinstance(v, str) else None
+            if iso:
+                datas[k] = iso
+        if datas:
+            doc_item["datas"] = datas
+
+        anchors: List[Dict[str, Any]] = []
+        fonte = ld.data.get("fonte_documento_geral")
+        a = anchor_from_obj(fonte) if fonte else None
+        if a:
+            anchors.append(a)
+        if anchors:
+            doc_item["anchors"] = anchors
 
-            self.docs_catalog.append(doc_item)
+        self.docs_catalog.append(doc_item)
 
-            # alimenta índices de partes/imóveis/operacoes
-            self._index_partes_from_doc(ld.data, did)
-            self._index_imoveis_from_doc(ld.data, did)
-            self._index_operacoes_from_doc(ld.data, did)
+        # alimenta índices de partes/imóveis/operacoes
+        self._index_partes_from_doc(ld.data, did)
+        self._index_imoveis_from_doc(ld.data, did)
+        self._index_operacoes_from_doc(ld.data, did)
 
     def _index_monetary_docs(self) -> None:
         """
@@ -480,21 +638,50 @@ class CadObrReconciler:
           - operation_id
         """
         for ld in self.mon_docs:
-            data = ld.data
-            folder = ld.path.parent.name
-            tipo = detect_doc_tipo(data, fallback_folder=folder)
-
-            # matrícula
-            if tipo == "ESCRITURA_IMOVEL":
-                mat = digits_only(str(data.get("matricula") or ""))
-                if mat:
-                    self.mon_by_matricula[mat] = ld
-
-            # operation_id
-            op_id = self._extract_operation_id(data)
+            mat, op_id = self._monetary_keys(ld)
+            if mat:
+                self.mon_by_matricula[mat] = ld
             if op_id:
                 self.mon_by_operation[op_id] = ld
 
+    def _index_monetary_paths(self) -> None:
+        """
+        Como _index_monetary_docs, mas guarda só o caminho de cada doc do
+        stage 03 (lidos um por vez): o merge da camada B relê o arquivo.
+        """
+        for ld in iter_loaded_docs(
+            self.inputs.monetary_root,
+            self.inputs.pattern,
+            "03_monetary",
+            self.inputs.load_workers,
+            self.inputs.load_processes,
+        ):
+            mat, op_id = self._monetary_keys(ld)
+            if mat:
+                self.mon_path_by_matricula[mat] = ld.path
+            if op_id:
+                self.mon_path_by_operation[op_id] = ld.path
+
+    def _monetary_keys(self, ld: LoadedDoc) -> Tuple[Optional[str], Optional[str]]:
+        """(matrícula, operation_id) de um doc do stage 03."""
+        mat: Optional[str] = None
+        tipo = detect_doc_tipo(ld.data, fallback_folder=ld.path.parent.name)
+        if tipo == "ESCRITURA_IMOVEL":
+            mat = digits_only(str(ld.data.get("matricula") or ""))
+        return mat, self._extract_operation_id(ld.data)
+
+    def _monetary_doc_for_matricula(self, mat: str) -> Optional[Dict[str, Any]]:
+        ld = self.mon_by_matricula.get(mat)
+        if ld is not None:
+            return ld.data
+        path = self.mon_path_by_matricula.get(mat)
+        if path is None:
+            return None
+        try:
+            return load_json(path)
+        except Exception:
+            return None
+
     def _extract_property_ids(self, doc: Dict[str, Any]) -> List[str]:
         out: List[str] = []
 
@@ -773,140 +960,144 @@ class CadObrReconciler:
     def layer_b_build_onus_obrigacoes(self) -> None:
         # base: escritura_imovel no normalize
         for ld in self.norm_docs:
-            tipo = detect_doc_tipo(ld.data, fallback_folder=ld.path.parent.name)
-            if tipo != "ESCRITURA_IMOVEL":
-                continue
+            self._build_onus_from_doc(ld)
 
-            mat = digits_only(str(ld.data.get("matricula") or ""))
-            pid = property_id_from_matricula(str(ld.data.get("matricula") or ""))
-            if not pid or not mat:
-                continue
+    def _build_onus_from_doc(self, ld: LoadedDoc) -> None:
+        """Camada B para um documento: ônus da escritura_imovel + merge monetary."""
+        tipo = detect_doc_tipo(ld.data, fallback_folder=ld.path.parent.name)
+        if tipo != "ESCRITURA_IMOVEL":
+            return
 
-            did = doc_id_for(ld.stage, tipo, ld.path)
+        mat = digits_only(str(ld.data.get("matricula") or ""))
+        pid = property_id_from_matricula(str(ld.data.get("matricula") or ""))
+        if not pid or not mat:
+            return
 
-            # tenta merge com monetary (mesma matrícula)
-            mon = self.mon_by_matricula.get(mat)
-            mon_onus_by_reg: Dict[str, Dict[str, Any]] = {}
-            if mon and isinstance(mon.data.get("hipotecas_onus"), list):
-                for o in mon.data["hipotecas_onus"]:
-                    if isinstance(o, dict) and o.get("registro_ou_averbacao"):
-                        rr = registro_ref_norm(str(o.get("registro_ou_averbacao")))
-                        if rr:
-                            mon_onus_by_reg[rr] = o
+        did = doc_id_for(ld.stage, tipo, ld.path)
 
-            for o in ld.data.get("hipotecas_onus") or []:
-                if not isinstance(o, dict):
-                    continue
+        # tenta merge com monetary (mesma matrícula)
+        mon = self._monetary_doc_for_matricula(mat)
+        mon_onus_by_reg: Dict[str, Dict[str, Any]] = {}
+        if mon and isinstance(mon.get("hipotecas_onus"), list):
+            for o in mon["hipotecas_onus"]:
+                if isinstance(o, dict) and o.get("registro_ou_averbacao"):
+                    rr = registro_ref_norm(str(o.get("registro_ou_averbacao")))
+                    if rr:
+                        mon_onus_by_reg[rr] = o
 
-                rr = registro_ref_norm(str(o.get("registro_ou_averbacao") or ""))
-                if not rr:
-                    continue
+        for o in ld.data.get("hipotecas_onus") or []:
+            if not isinstance(o, dict):
+                continue
 
-                oid = onus_id(pid, rr)
-
-                # dates
-                d_ef = parse_date_to_iso(o.get("data_efetiva")) or None
-                d_rg = parse_date_to_iso(o.get("data_registro")) or None
-                d_bx = parse_date_to_iso(o.get("data_baixa")) or None
-                venc = parse_date_to_iso(o.get("vencimento")) or None
-
-                # status determinístico (regra registral):
-                # - BAIXADA: há baixa explícita (data_baixa / averbação de baixa / cancelada=True)
-                # - ATIVA: não há baixa explícita (independe de vencimento; ônus pode permanecer vigente mesmo vencido)
-                cancelada = o.get("cancelada")
-                averb_baixa = o.get("averbacao_baixa")
-                if d_bx or averb_baixa or cancelada is True:
-                    status = "BAIXADA"
-                else:
-                    # Por padrão, considera ATIVA quando existe registro e não há baixa/cancelamento.
-                    # Isso evita classificar como "INDETERMINADA" ônus que, pela ausência de baixa, permanecem vigentes.
-                    status = "ATIVA"
-
-                inicio = d_ef or d_rg
-                fim = d_bx or venc or None
-
-                if not inicio:
-                    # pendência: sem data para timeline
-                    self._pendencia(
-                        entity_type="ONUS",
-                        entity_id=oid,
-                        motivo="dados_insuficientes: janela_vigencia_inicio ausente (sem data_efetiva e sem data_registro)",
-                        evidencias=[{"source_path": str(ld.path)}],
-                        campos_faltantes=["data_efetiva", "data_registro"],
-                    )
-                    continue
+            rr = registro_ref_norm(str(o.get("registro_ou_averbacao") or ""))
+            if not rr:
+                continue
 
-                # valores (base)
-                val_orig = o.get("valor_divida_original")
-                val_str = o.get("valor_divida")
+            oid = onus_id(pid, rr)
 
-                val_num = o.get("valor_divida_num")
-                if not isinstance(val_num, int):
-                    val_num = parse_brl_to_centavos(val_str) or parse_brl_to_centavos(
-                        val_orig
-                    )
+            # dates
+            d_ef, d_rg, d_bx, venc = (
+                parse_date_to_iso(o.get(k))
+                for k in ("data_efetiva", "data_registro", "data_baixa", "vencimento")
+            )
 
-                # merge monetary por registro (valor_presente, meta)
-                valor_presente_num: Optional[int] = None
-                valor_presente_str: Optional[str] = None
-                monetary_meta: Optional[Dict[str, Any]] = None
-                if rr in mon_onus_by_reg:
-                    mo = mon_onus_by_reg[rr]
-                    vp_num = mo.get("valor_presente_num")
-                    if isinstance(vp_num, int):
-                        valor_presente_num = vp_num
-                        valor_presente_str = format_centavos_to_brl(vp_num)
-                    vp = mo.get("valor_presente")
-                    if isinstance(vp, str):
-                        valor_presente_num = (
-                            parse_brl_to_centavos(vp)
-                            if valor_presente_num is None
-                            else valor_presente_num
-                        )
-                        valor_presente_str = (
-                            vp if valor_presente_str is None else valor_presente_str
-                        )
-                    mm = mo.get("_monetary_meta")
-                    if isinstance(mm, dict):
-                        monetary_meta = mm
+            # status determinístico (regra registral):
+            # - BAIXADA: há baixa explícita (data_baixa / averbação de baixa / cancelada=True)
+            # - ATIVA: não há baixa explícita (independe de vencimento; ônus pode permanecer vigente mesmo vencido)
+            cancelada = o.get("cancelada")
+            averb_baixa = o.get("averbacao_baixa")
+            if d_bx or averb_baixa or cancelada is True:
+                status = "BAIXADA"
+            else:
+                # Por padrão, considera ATIVA quando existe registro e não há baixa/cancelamento.
+                # Isso evita classificar como "INDETERMINADA" ônus que, pela ausência de baixa, permanecem vigentes.
+                status = "ATIVA"
+
+            inicio = d_ef or d_rg
+            fim = d_bx or venc or None
+
+            if not inicio:
+                # pendência: sem data para timeline
+                self._pendencia(
+                    entity_type="ONUS",
+                    entity_id=oid,
+                    motivo="dados_insuficientes: janela_vigencia_inicio ausente (sem data_efetiva e sem data_registro)",
+                    evidencias=[{"source_path": str(ld.path)}],
+                    campos_faltantes=["data_efetiva", "data_registro"],
+                )
+                continue
 
-                cred_id = party_id_from_any(o.get("credor"))
-                dev_id = party_id_from_any(
-                    o.get("emitente_devedor")
-                ) or party_id_from_any(ld.data.get("emitente_devedor"))
+            # valores (base)
+            val_orig = o.get("valor_divida_original")
+            val_str = o.get("valor_divida")
 
-                item: Dict[str, Any] = {
-                    "onus_id": oid,
-                    "property_id": pid,
-                    "registro_ref": rr,
-                    "tipo_divida": str(o.get("tipo_divida") or "").strip() or "DIVIDA",
-                    "operation_id": digits_only(str(o.get("numero_contrato") or ""))
-                    if o.get("numero_contrato")
-                    else None,
-                    "credor_id": cred_id,
-                    "emitente_devedor_id": dev_id,
-                    "data_efetiva": d_ef,
-                    "data_registro": d_rg,
-                    "vencimento": venc,
-                    "data_baixa": d_bx,
-                    "status": status,
-                    "janela_vigencia_inicio": inicio,
-                    "janela_vigencia_fim": fim,
-                    "valor_divida_original": str(val_orig)
-                    if val_orig is not None
-                    else None,
-                    "valor_divida": format_centavos_to_brl(val_num)
-                    if isinstance(val_num, int)
-                    else (str(val_str) if isinstance(val_str, str) else None),
-                    "valor_divida_num": val_num if isinstance(val_num, int) else None,
-                    "valor_presente": valor_presente_str,
-                    "valor_presente_num": valor_presente_num,
-                    "monetary_meta": monetary_meta,
-                    "docs_origem": [did],
-                    "anchors": [{"source_path": str(ld.path)}],
-                }
+            val_num = o.get("valor_divida_num")
+            if not isinstance(val_num, int):
+                val_num = parse_brl_to_centavos(val_str) or parse_brl_to_centavos(
+                    val_orig
+                )
 
-                self.onus_list.append(item)
+            # merge monetary por registro (valor_presente, meta)
+            valor_presente_num: Optional[int] = None
+            valor_presente_str: Optional[str] = None
+            monetary_meta: Optional[Dict[str, Any]] = None
+            if rr in mon_onus_by_reg:
+                mo = mon_onus_by_reg[rr]
+                vp_num = mo.get("valor_presente_num")
+                if isinstance(vp_num, int):
+                    valor_presente_num = vp_num
+                    valor_presente_str = format_centavos_to_brl(vp_num)
+                vp = mo.get("valor_presente")
+                if isinstance(vp, str):
+                    valor_presente_num = (
+                        parse_brl_to_centavos(vp)
+                        if valor_presente_num is None
+                        else valor_presente_num
+                    )
+                    valor_presente_str = (
+                        vp if valor_presente_str is None else valor_presente_str
+                    )
+                mm = mo.get("_monetary_meta")
+                if isinstance(mm, dict):
+                    monetary_meta = mm
+
+            cred_id = party_id_from_any(o.get("credor"))
+            dev_id = party_id_from_any(
+                o.get("emitente_devedor")
+            ) or party_id_from_any(ld.data.get("emitente_devedor"))
+
+            item: Dict[str, Any] = {
+                "onus_id": oid,
+                "property_id": pid,
+                "registro_ref": rr,
+                "tipo_divida": str(o.get("tipo_divida") or "").strip() or "DIVIDA",
+                "operation_id": digits_only(str(o.get("numero_contrato") or ""))
+                if o.get("numero_contrato")
+                else None,
+                "credor_id": cred_id,
+                "emitente_devedor_id": dev_id,
+                "data_efetiva": d_ef,
+                "data_registro": d_rg,
+                "vencimento": venc,
+                "data_baixa": d_bx,
+                "status": status,
+                "janela_vigencia_inicio": inicio,
+                "janela_vigencia_fim": fim,
+                "valor_divida_original": str(val_orig)
+                if val_orig is not None
+                else None,
+                "valor_divida": format_centavos_to_brl(val_num)
+                if isinstance(val_num, int)
+                else (str(val_str) if isinstance(val_str, str) else None),
+                "valor_divida_num": val_num if isinstance(val_num, int) else None,
+                "valor_presente": valor_presente_str,
+                "valor_presente_num": valor_presente_num,
+                "monetary_meta": monetary_meta,
+                "docs_origem": [did],
+                "anchors": [{"source_path": str(ld.path)}],
+            }
+
+            self.onus_list.append(item)
 
     # ---------
     # Layer C: property_events (timeline)
@@ -914,6 +1105,13 @@ class CadObrReconciler:
 
     def layer_c_build_property_events(self) -> None:
         # 1) eventos de ônus (registro e baixa)
+        self._build_onus_events()
+
+        # 2) eventos de venda / anuência (da escritura_imovel)
+        for ld in self.norm_docs:
+            self._build_sale_events_from_doc(ld, self.events_list, self.pendencias_list)
+
+    def _build_onus_events(self) -> None:
         for o in self.onus_list:
             pid = o["property_id"]
             did = (o.get("docs_origem") or [""])[0]
@@ -947,20 +1145,11 @@ class CadObrReconciler:
                 # flag registro_posterior
                 d_rg = o.get("data_registro")
                 d_ef = o.get("data_efetiva")
-                if (
-                    isinstance(d_rg, str)
-                    and isinstance(d_ef, str)
-                    and is_iso_date(d_rg)
-                    and is_iso_date(d_ef)
-                ):
-                    try:
-                        dr = datetime.strptime(d_rg, "%Y-%m-%d").date()
-                        de = datetime.strptime(d_ef, "%Y-%m-%d").date()
-                        if dr > de:
-                            ev["flag_registro_posterior"] = True
-                            ev["delta_registro_efetiva_dias"] = (dr - de).days
-                    except Exception:
-                        pass
+                dr = parse_iso(d_rg)
+                de = parse_iso(d_ef)
+                if dr is not None and de is not None and dr > de:
+                    ev["flag_registro_posterior"] = True
+                    ev["delta_registro_efetiva_dias"] = (dr - de).days
 
                 self.events_list.append(ev)
 
@@ -986,64 +1175,74 @@ class CadObrReconciler:
                     }
                     self.events_list.append(evb)
 
-        # 2) eventos de venda / anuência (da escritura_imovel)
-        for ld in self.norm_docs:
-            tipo = detect_doc_tipo(ld.data, fallback_folder=ld.path.parent.name)
-            if tipo != "ESCRITURA_IMOVEL":
-                continue
-            did = doc_id_for(ld.stage, tipo, ld.path)
-            pid = property_id_from_matricula(str(ld.data.get("matricula") or ""))
-            if not pid:
-                continue
+    def _build_sale_events_from_doc(
+        self,
+        ld: LoadedDoc,
+        events: List[Dict[str, Any]],
+        pendencias: List[Dict[str, Any]],
+    ) -> None:
+        """
+        Camada C (vendas/anuências) para um documento. Eventos e pendências vão
+        para as listas recebidas: no modo streaming, ficam à parte até o fim da
+        passagem, para manter a ordem do modo em lote.
+        """
+        tipo = detect_doc_tipo(ld.data, fallback_folder=ld.path.parent.name)
+        if tipo != "ESCRITURA_IMOVEL":
+            return
+        did = doc_id_for(ld.stage, tipo, ld.path)
+        pid = property_id_from_matricula(str(ld.data.get("matricula") or ""))
+        if not pid:
+            return
 
-            tv = ld.data.get("transacoes_venda")
-            if not isinstance(tv, list):
-                continue
+        tv = ld.data.get("transacoes_venda")
+        if not isinstance(tv, list):
+            return
 
-            for t in tv:
-                if not isinstance(t, dict):
-                    continue
+        for t in tv:
+            if not isinstance(t, dict):
+                continue
 
-                # VENDA
-                d_ev = parse_date_to_iso(t.get("data_efetiva")) or parse_date_to_iso(
-                    t.get("data_registro")
-                )
-                if d_ev:
-                    evv: Dict[str, Any] = {
-                        "event_id": f"evt_{sha1_12(pid + '|VENDA|' + (t.get('registro') or t.get('tipo_transacao') or ''))}",
+            # VENDA
+            d_ev = parse_date_to_iso(t.get("data_efetiva")) or parse_date_to_iso(
+                t.get("data_registro")
+            )
+            if d_ev:
+                evv: Dict[str, Any] = {
+                    "event_id": f"evt_{sha1_12(pid + '|VENDA|' + (t.get('registro') or t.get('tipo_transacao') or ''))}",
+                    "property_id": pid,
+                    "event_type": "VENDA",
+                    "event_date": d_ev,
+                    "data_registro": parse_date_to_iso(t.get("data_registro")),
+                    "data_efetiva": parse_date_to_iso(t.get("data_efetiva")),
+                    "registro_ref": registro_ref_norm(t.get("registro"))
+                    if t.get("registro")
+                    else None,
+                    "source_doc_id": did,
+                    "anchors": [{"source_path": str(ld.path)}],
+                    "notes": normalize_ws(str(t.get("tipo_transacao") or ""))[:2000]
+                    if t.get("tipo_transacao")
+                    else None,
+                }
+                events.append(evv)
+
+            # ANUÊNCIA (se existir string)
+            anu = t.get("anuencia_credor")
+            if isinstance(anu, str) and anu.strip():
+                d_an = extract_first_date_from_text(anu)
+                if d_an:
+                    eva: Dict[str, Any] = {
+                        "event_id": f"evt_{sha1_12(pid + '|ANUENCIA|' + d_an)}",
                         "property_id": pid,
-                        "event_type": "VENDA",
-                        "event_date": d_ev,
-                        "data_registro": parse_date_to_iso(t.get("data_registro")),
-                        "data_efetiva": parse_date_to_iso(t.get("data_efetiva")),
-                        "registro_ref": registro_ref_norm(t.get("registro"))
-                        if t.get("registro")
-                        else None,
+                        "event_type": "ANUENCIA_BANCO",
+                        "event_date": d_an,
                         "source_doc_id": did,
                         "anchors": [{"source_path": str(ld.path)}],
-                        "notes": normalize_ws(str(t.get("tipo_transacao") or ""))[:2000]
-                        if t.get("tipo_transacao")
-                        else None,
+                        "notes": normalize_ws(anu)[:2000],
                     }
-                    self.events_list.append(evv)
-
-                # ANUÊNCIA (se existir string)
-                anu = t.get("anuencia_credor")
-                if isinstance(anu, str) and anu.strip():
-                    d_an = extract_first_date_from_text(anu)
-                    if d_an:
-                        eva: Dict[str, Any] = {
-                            "event_id": f"evt_{sha1_12(pid + '|ANUENCIA|' + d_an)}",
-                            "property_id": pid,
-                            "event_type": "ANUENCIA_BANCO",
-                            "event_date": d_an,
-                            "source_doc_id": did,
-                            "anchors": [{"source_path": str(ld.path)}],
-                            "notes": normalize_ws(anu)[:2000],
-                        }
-                        self.events_list.append(eva)
-                    else:
-                        self._pendencia(
+                    events.append(eva)
+                else:
+                    pendencias.append(
+                        self._pendencia_item(
                             entity_type="EVENT",
                             entity_id=f"{pid}|ANUENCIA",
                             motivo="anuencia_detectada_sem_data_parseavel",
@@ -1051,6 +1250,85 @@ class CadObrReconciler:
                                 {"source_path": str(ld.path), "trecho": anu[:200]}
                             ],
                         )
+                    )
+
+    # ---------
+    # Modo streaming: camadas A–C documento a documento
+    # ---------
+
+    def layers_abc_streaming(self, stop_after: str = "C") -> None:
+        """
+        Camadas A–C (até `stop_after`) sem carregar o corpus: os docs do
+        monetary são indexados só pelo caminho (por matrícula/operation_id) e
+        cada doc do normalize passa por A, B e C e é descartado.
+
+        As tabelas só de acréscimo (documentos, onus_obrigacoes, pendencias e
+        property_events) vão para o disco a cada documento; vendas/anuências
+        e suas pendências entram depois dos eventos de ônus (ordem do lote),
+        então passam por arquivos temporários copiados ao final. Em memória
+        ficam os índices (partes, imóveis, operações, usados pela camada D) e,
+        para a camada E, ônus e eventos de ônus reduzidos a NOVACAO_CAMPOS_*.
+        Saída idêntica à das camadas em lote.
+        """
+        self._index_monetary_paths()
+        out_dir = self.outputs.output_root / self.outputs.dataset_dirname
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+        tabelas = ["documentos", "onus_obrigacoes", "pendencias"]
+        if stop_after == "C":
+            tabelas.append("property_events")
+        onus_e: List[Dict[str, Any]] = []
+        eventos_e: List[Dict[str, Any]] = []
+        with ExitStack() as stack:
+            f = {
+                t: stack.enter_context((out_dir / f"{t}.jsonl").open("w", encoding="utf-8"))
+                for t in tabelas
+            }
+            vendas = stack.enter_context(tempfile.TemporaryFile("w+", encoding="utf-8"))
+            pend_vendas = stack.enter_context(tempfile.TemporaryFile("w+", encoding="utf-8"))
+
+            for ld in iter_loaded_docs(
+                self.inputs.normalize_root,
+                self.inputs.pattern,
+                "02_normalize",
+                self.inputs.load_workers,
+                self.inputs.load_processes,
+            ):
+                self._catalog_doc(ld)
+                if stop_after in ("B", "C"):
+                    self._build_onus_from_doc(ld)
+                if stop_after == "C":
+                    self._build_onus_events()
+                    sale_events: List[Dict[str, Any]] = []
+                    sale_pendencias: List[Dict[str, Any]] = []
+                    self._build_sale_events_from_doc(ld, sale_events, sale_pendencias)
+                    append_jsonl(vendas, sale_events)
+                    append_jsonl(pend_vendas, sale_pendencias)
+                    onus_e.extend(
+                        {k: o.get(k) for k in NOVACAO_CAMPOS_ONUS} for o in self.onus_list
+                    )
+                    eventos_e.extend(
+                        {k: ev.get(k) for k in NOVACAO_CAMPOS_EVENTO}
+                        for ev in self.events_list
+                    )
+                    append_jsonl(f["property_events"], self.events_list)
+                    self.events_list.clear()
+
+                append_jsonl(f["documentos"], self.docs_catalog)
+                append_jsonl(f["onus_obrigacoes"], self.onus_list)
+                append_jsonl(f["pendencias"], self.pendencias_list)
+                self.docs_catalog.clear()
+                self.onus_list.clear()
+                self.pendencias_list.clear()
+
+            if stop_after == "C":
+                for spool, t in [(vendas, "property_events"), (pend_vendas, "pendencias")]:
+                    spool.seek(0)
+                    shutil.copyfileobj(spool, f[t])
+
+        self.onus_list = onus_e
+        self.events_list = eventos_e
+        self.streamed_tables.update(f"{t}.jsonl" for t in tabelas)
 
     # ---------
     # Layer D: links + pendencias (mínimo determinístico)
@@ -1097,25 +1375,21 @@ class CadObrReconciler:
     # Layer E: novações (baixa -> nova dívida na mesma matrícula)
     # ---------
 
-    def layer_e_build_novacoes(self, janela_dias_max: int = 180) -> None:
+    def layer_e_build_novacoes(
+        self,
+        janela_dias_max: int = 180,
+        cached: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+    ) -> None:
+        """
+        cached: novações já calculadas por property_id (modo incremental),
+        reaproveitadas sem recomputar; as demais properties são recalculadas.
+        """
         # monta eventos por property
         by_prop: Dict[str, List[Dict[str, Any]]] = {}
         for ev in self.events_list:
             if ev.get("property_id") and ev.get("event_date"):
                 by_prop.setdefault(ev["property_id"], []).append(ev)
 
-        def to_dt(s: Any) -> Optional[date]:
-            if not isinstance(s, str):
-                return None
-
-            s = s.strip()
-            if not s or not is_iso_date(s):
-                return None
-            try:
-                return datetime.strptime(s, "%Y-%m-%d").date()
-            except Exception:
-                return None
-
         # index de onus por id (para bases de match)
         onus_by_id: Dict[str, Dict[str, Any]] = {
             o["onus_id"]: o for o in self.onus_list
@@ -1142,57 +1416,73 @@ class CadObrReconciler:
                 return False
             return True
 
+        # chaves de match por ônus, calculadas uma vez:
+        # (elegível, credor_id, emitente_devedor_id, operation_id)
+        match_keys: Dict[str, Tuple[bool, Any, Any, Any]] = {
+            oid: (
+                _novacao_elegivel(on),
+                on.get("credor_id"),
+                on.get("emitente_devedor_id"),
+                on.get("operation_id"),
+            )
+            for oid, on in onus_by_id.items()
+        }
+
         for pid, evs in by_prop.items():
+            if cached is not None and pid in cached:
+                self.novacoes_list.extend(cached[pid])
+                continue
             evs_sorted = sorted(evs, key=lambda x: x.get("event_date") or "")
+
+            # Datas em ordinal (parse uma vez). ONUS_REGISTRO ficam num array
+            # ordenado por (data, posição): as candidatas de uma baixa são as
+            # registradas depois dela, com data em [baixa, baixa + janela].
+            reg_keys: List[Tuple[int, int]] = []
+            reg_evs: List[Dict[str, Any]] = []
+            baixas: List[Tuple[int, int, Dict[str, Any]]] = []
             for i, ev in enumerate(evs_sorted):
-                if ev.get("event_type") != "ONUS_BAIXA":
-                    continue
-                db = to_dt(ev.get("event_date"))
-                if not db or not ev.get("onus_id"):
+                d = parse_iso(ev.get("event_date"))
+                if d is None:
                     continue
+                if ev.get("event_type") == "ONUS_REGISTRO":
+                    reg_keys.append((d.toordinal(), i))
+                    reg_evs.append(ev)
+                elif ev.get("event_type") == "ONUS_BAIXA" and ev.get("onus_id"):
+                    baixas.append((d.toordinal(), i, ev))
+            if not reg_keys:
+                continue
+            reg_ords = [k[0] for k in reg_keys]
 
-                # procura próximo ONUS_REGISTRO na janela
-                for j in range(i + 1, len(evs_sorted)):
-                    ev2 = evs_sorted[j]
-                    if ev2.get("event_type") != "ONUS_REGISTRO":
-                        continue
-                    dn = to_dt(ev2.get("event_date"))
-                    if not dn:
-                        continue
-                    delta = (dn - db).days
-                    if delta < 0:
-                        continue
-                    if delta > janela_dias_max:
-                        break
-
-                    o1 = onus_by_id.get(ev["onus_id"])
-                    o2 = onus_by_id.get(ev2.get("onus_id") or "")
-                    if not o1 or not o2:
-                        continue
+            for db, i, ev in baixas:
+                k1 = match_keys.get(ev["onus_id"])
+                # ARR. MERCANTIL e restrições judiciais não são elegíveis para novação automática.
+                if k1 is None or not k1[0]:
+                    continue
+                lo = bisect_right(reg_keys, (db, i))
+                hi = bisect_right(reg_ords, db + janela_dias_max, lo)
 
-                    # ARR. MERCANTIL e restrições judiciais não são elegíveis para novação automática.
-                    if not _novacao_elegivel(o1) or not _novacao_elegivel(o2):
+                for j in range(lo, hi):
+                    ev2 = reg_evs[j]
+                    k2 = match_keys.get(ev2.get("onus_id") or "")
+                    if k2 is None or not k2[0]:
                         continue
+                    delta = reg_ords[j] - db
 
                     basis: List[str] = ["JANELA_TEMPO"]
                     level = "C"
 
-                    if o1.get("credor_id") and o1.get("credor_id") == o2.get(
-                        "credor_id"
-                    ):
+                    if k1[1] and k1[1] == k2[1]:
                         basis.append("CREDOR")
                         level = "B"
-                    if o1.get("emitente_devedor_id") and o1.get(
-                        "emitente_devedor_id"
-                    ) == o2.get("emitente_devedor_id"):
+                    if k1[2] and k1[2] == k2[2]:
                         basis.append("DEVEDOR")
                         level = "B"
-                    if o1.get("operation_id") and o1.get("operation_id") == o2.get(
-                        "operation_id"
-                    ):
+                    if k1[3] and k1[3] == k2[3]:
                         basis.append("OPERACAO")
                         level = "A"
 
+                    o1 = onus_by_id[ev["onus_id"]]
+                    o2 = onus_by_id[ev2["onus_id"]]
                     nov = {
                         "novacao_id": f"nov_{sha1_12(ev['onus_id'] + '|' + (ev2.get('onus_id') or '') + '|' + str(delta))}",
                         "property_id": pid,
@@ -1207,10 +1497,217 @@ class CadObrReconciler:
                         + (o2.get("anchors") or []),
                     }
                     self.novacoes_list.append(nov)
-
                     # uma baixa pode ter múltiplas candidatas; mantém todas
                     # (se quiser, pode limitar a melhor por A>B>C depois)
 
+    # ---------
+    # Modo incremental: só documentos alterados
+    # ---------
+
+    def _doc_contribution(self, ld: LoadedDoc) -> Dict[str, Any]:
+        """Linhas que um documento do normalize gera em cada tabela (camadas A–C)."""
+        doc = CadObrReconciler(self.inputs, self.outputs)
+        doc.mon_path_by_matricula = self.mon_path_by_matricula
+        doc._catalog_doc(ld)
+        doc._build_onus_from_doc(ld)
+        doc._build_onus_events()
+        eventos_venda: List[Dict[str, Any]] = []
+        pendencias_venda: List[Dict[str, Any]] = []
+        doc._build_sale_events_from_doc(ld, eventos_venda, pendencias_venda)
+        return {
+            "documentos": doc.docs_catalog,
+            "partes": doc.partes_map,
+            "imoveis": doc.imoveis_map,
+            "contratos_operacoes": doc.operacoes_map,
+            "onus_obrigacoes": doc.onus_list,
+            "eventos_onus": doc.events_list,
+            "eventos_venda": eventos_venda,
+            "pendencias_onus": doc.pendencias_list,
+            "pendencias_venda": pendencias_venda,
+        }
+
+    def run_incremental(self) -> Path:
+        """
+        Atualiza o dataset a partir do estado da execução anterior
+        (incremental_state_dir): só os documentos cujo sha256 mudou (ou cujo
+        doc monetary da mesma matrícula mudou) são relidos e passam pelas
+        camadas A–C; as linhas dos demais vêm dos shards. A camada D é
+        refeita (derivada das operações) e as novações são recalculadas só
+        para as properties dos documentos alterados/removidos. Sem estado
+        válido, processa tudo. Saída idêntica à de run_all_layers.
+
+        Arquivos com mtime e tamanho iguais aos do índice não são re-hasheados;
+        sem documento alterado ou removido, o dataset não é regravado.
+        """
+        inputs = self.inputs
+        workers, processes = inputs.load_workers, inputs.load_processes
+        meta = incremental_meta(inputs)
+        state_dir = incremental_state_dir(self.outputs)
+        prev = load_incremental_state(state_dir, meta)
+        prev_mon: Dict[str, Any] = prev["monetary"] if prev else {}
+        prev_docs: Dict[str, Any] = prev["docs"] if prev else {}
+
+        def hash_all(
+            root: Path, prev_entries: Dict[str, Any]
+        ) -> List[Tuple[Path, Optional[str], Dict[str, int]]]:
+            paths = scan_json_files(root, inputs.pattern)
+            stats = [file_stat(p) for p in paths]
+
+            def intocado(p: Path, st: Dict[str, int]) -> bool:
+                entry = prev_entries.get(str(p))
+                return bool(st) and entry is not None and all(
+                    entry.get(k) == v for k, v in st.items()
+                )
+
+            mudados = [p for p, st in zip(paths, stats) if not intocado(p, st)]
+            shas = dict(
+                zip(mudados, map_ordered(build_manifest.sha256_file, mudados, workers, processes))
+            )
+            return [
+                (p, shas[p] if p in shas else prev_entries[str(p)]["sha256"], st)
+                for p, st in zip(paths, stats)
+            ]
+
+        def parse_changed(paths: List[Path], stage: str) -> Dict[str, Optional[LoadedDoc]]:
+            loaded = map_ordered(_load_json_or_none, paths, workers, processes)
+            return {
+                str(p): LoadedDoc(stage=stage, path=p, data=d) if d is not None else None
+                for p, d in zip(paths, loaded)
+            }
+
+        # 1) monetary: chaves por matrícula (só os alterados são parseados)
+        mon_files = hash_all(inputs.monetary_root, prev_mon)
+        mon_changed = parse_changed(
+            [p for p, sha, _ in mon_files if (prev_mon.get(str(p)) or {}).get("sha256") != sha],
+            "03_monetary",
+        )
+        mon_state: Dict[str, Dict[str, Any]] = {}
+        mon_sha_by_matricula: Dict[str, Optional[str]] = {}
+        for p, sha, st in mon_files:
+            key = str(p)
+            if key in mon_changed:
+                ld = mon_changed[key]
+                mat = self._monetary_keys(ld)[0] if ld is not None else None
+            else:
+                mat = prev_mon[key]["matricula"]
+            mon_state[key] = {"sha256": sha, "matricula": mat, **st}
+            if mat:
+                self.mon_path_by_matricula[mat] = p
+                mon_sha_by_matricula[mat] = sha
+
+        # 2) normalize: reprocessa o que mudou (entrada ou monetary da matrícula)
+        norm_files = hash_all(inputs.normalize_root, prev_docs)
+
+        def fresh(key: str, sha: Optional[str]) -> bool:
+            entry = prev_docs.get(key)
+            return (
+                entry is not None
+                and entry.get("sha256") == sha
+                and entry.get("monetary_sha256") == mon_sha_by_matricula.get(entry.get("matricula") or "")
+            )
+
+        norm_changed = parse_changed(
+            [p for p, sha, _ in norm_files if not fresh(str(p), sha)], "02_normalize"
+        )
+        docs_state: Dict[str, Dict[str, Any]] = {}
+        new_rows: Dict[str, Dict[str, Any]] = {}
+        affected: Set[str] = set()
+        for p, sha, st in norm_files:
+            key = str(p)
+            if key not in norm_changed:
+                docs_state[key] = {**prev_docs[key], **st}
+                continue
+            ld = norm_changed[key]
+            mat = digits_only(str(ld.data.get("matricula") or "")) if ld is not None else None
+            contrib = self._doc_contribution(ld) if ld is not None else {}
+            pids = sorted(set(_row_property_ids(contrib)))
+            docs_state[key] = {
+                "sha256": sha,
+                "matricula": mat,
+                "monetary_sha256": mon_sha_by_matricula.get(mat or ""),
+                "property_ids": pids,
+                "shard": doc_shard_name(key),
+                **st,
+            }
+            new_rows[key] = contrib
+            affected.update(pids)
+            if key in prev_docs:
+                affected.update(prev_docs[key]["property_ids"])
+        removed = prev_docs.keys() - docs_state.keys()
+        for key in removed:
+            affected.update(prev_docs[key]["property_ids"])
+
+        out_dir = self.outputs.output_root / self.outputs.dataset_dirname
+        index = {"meta": meta, "monetary": mon_state, "docs": docs_state}
+        self.incremental_stats = {
+            "documentos": len(norm_files),
+            "reprocessados": len(norm_changed),
+            "removidos": len(removed),
+            "monetary_reprocessados": len(mon_changed),
+            "properties_novacoes_recalculadas": 0,
+        }
+        if prev is not None and not new_rows and not removed and out_dir.is_dir():
+            # nada a regravar; o índice só guarda mtimes novos (e monetary)
+            if index != prev:
+                save_incremental_shard(state_dir, "index.json", index)
+            return out_dir
+
+        # 3) tabelas na ordem dos documentos (mesma ordem do modo em lote)
+        eventos_venda: List[Dict[str, Any]] = []
+        pendencias_venda: List[Dict[str, Any]] = []
+        for key, entry in docs_state.items():
+            rows = new_rows.get(key)
+            if rows is None:
+                rows = load_incremental_shard(state_dir, entry["shard"])
+            if not rows:
+                continue
+            self.docs_catalog.extend(rows["documentos"])
+            merge_index_fragment(self.partes_map, rows["partes"])
+            merge_index_fragment(self.imoveis_map, rows["imoveis"])
+            merge_index_fragment(self.operacoes_map, rows["contratos_operacoes"])
+            self.onus_list.extend(rows["onus_obrigacoes"])
+            self.events_list.extend(rows["eventos_onus"])
+            self.pendencias_list.extend(rows["pendencias_onus"])
+            eventos_venda.extend(rows["eventos_venda"])
+            pendencias_venda.extend(rows["pendencias_venda"])
+        self.events_list.extend(eventos_venda)
+        self.pendencias_list.extend(pendencias_venda)
+
+        # 4) camadas D e E (novações só das properties afetadas)
+        self.layer_d_build_links_and_pendencias()
+        cached = None
+        if prev is not None:
+            try:
+                prev_nov = load_incremental_shard(state_dir, "novacoes.json")
+            except Exception:
+                prev_nov = None
+            if isinstance(prev_nov, dict):
+                cached = {pid: rows for pid, rows in prev_nov.items() if pid not in affected}
+        self.layer_e_build_novacoes(cached=cached)
+
+        novacoes: Dict[str, List[Dict[str, Any]]] = {
+            ev["property_id"]: []
+            for ev in self.events_list
+            if ev.get("property_id") and ev.get("event_date")
+        }
+        for nov in self.novacoes_list:
+            novacoes[nov["property_id"]].append(nov)
+
+        out_dir = self.write_dataset()
+        # shards antes do índice: após uma falha no meio, o índice antigo
+        # aponta sha256s antigos e os documentos são refeitos
+        for key, rows in new_rows.items():
+            save_incremental_shard(state_dir, docs_state[key]["shard"], rows)
+        save_incremental_shard(state_dir, "novacoes.json", novacoes)
+        save_incremental_shard(state_dir, "index.json", index)
+        for key in removed:
+            (state_dir / prev_docs[key]["shard"]).unlink(missing_ok=True)
+
+        self.incremental_stats["properties_novacoes_recalculadas"] = (
+            len(affected) if cached is not None else len(novacoes)
+        )
+        return out_dir
+
     # -----------------------------
     # Escrita do dataset
     # -----------------------------
@@ -1219,26 +1716,26 @@ class CadObrReconciler:
         out_dir = self.outputs.output_root / self.outputs.dataset_dirname
         out_dir.mkdir(parents=True, exist_ok=True)
 
-        self._write_jsonl(out_dir / "documentos.jsonl", self.docs_catalog)
-        self._write_jsonl(out_dir / "partes.jsonl", list(self.partes_map.values()))
-        self._write_jsonl(out_dir / "imoveis.jsonl", list(self.imoveis_map.values()))
-        self._write_jsonl(
-            out_dir / "contratos_operacoes.jsonl", list(self.operacoes_map.values())
-        )
-        self._write_jsonl(out_dir / "onus_obrigacoes.jsonl", self.onus_list)
-        self._write_jsonl(out_dir / "property_events.jsonl", self.events_list)
-        self._write_jsonl(out_dir / "links.jsonl", self.links_list)
-        self._write_jsonl(out_dir / "pendencias.jsonl", self.pendencias_list)
-        self._write_jsonl(out_dir / "novacoes_detectadas.jsonl", self.novacoes_list)
+        tabelas: List[Tuple[str, List[Dict[str, Any]]]] = [
+            ("documentos.jsonl", self.docs_catalog),
+            ("partes.jsonl", list(self.partes_map.values())),
+            ("imoveis.jsonl", list(self.imoveis_map.values())),
+            ("contratos_operacoes.jsonl", list(self.operacoes_map.values())),
+            ("onus_obrigacoes.jsonl", self.onus_list),
+            ("property_events.jsonl", self.events_list),
+            ("links.jsonl", self.links_list),
+            ("pendencias.jsonl", self.pendencias_list),
+            ("novacoes_detectadas.jsonl", self.novacoes_list),
+        ]
+        for name, rows in tabelas:
+            # no streaming, as tabelas das camadas A–C já estão no disco
+            if name not in self.streamed_tables:
+                self._write_jsonl(out_dir / name, rows)
 
         return out_dir
 
     def _write_jsonl(self, path: Path, rows: List[Dict[str, Any]]) -> None:
-        with path.open("w", encoding="utf-8") as f:
-            for r in rows:
-                # remove chaves None para reduzir ruído
-                clean = {k: v for k, v in r.items() if v is not None}
-                f.write(json.dumps(clean, ensure_ascii=False) + "\n")
+        write_jsonl(path, rows)
 
     # -----------------------------
     # Pendências helper
@@ -1253,6 +1750,21 @@ class CadObrReconciler:
         campos_faltantes: Optional[List[str]] = None,
         candidatos: Optional[List[Dict[str, Any]]] = None,
     ) -> None:
+        self.pendencias_list.append(
+            self._pendencia_item(
+                entity_type, entity_id, motivo, evidencias, campos_faltantes, candidatos
+            )
+        )
+
+    def _pendencia_item(
+        self,
+        entity_type: str,
+        entity_id: str,
+        motivo: str,
+        evidencias: List[Dict[str, Any]],
+        campos_faltantes: Optional[List[str]] = None,
+        candidatos: Optional[List[Dict[str, Any]]] = None,
+    ) -> Dict[str, Any]:
         item: Dict[str, Any] = {
             "pendencia_id": f"pend_{sha1_12(entity_type + '|' + entity_id + '|' + motivo)}",
             "entity_type": entity_type,
@@ -1264,16 +1776,19 @@ class CadObrReconciler:
             item["campos_faltantes"] = campos_faltantes
         if candidatos:
             item["candidatos"] = candidatos
-        self.pendencias_list.append(item)
+        return item
 
     # -----------------------------
     # Runner (todas as camadas)
     # -----------------------------
 
-    def run_all_layers(self) -> Path:
-        self.layer_a_load_and_index()
-        self.layer_b_build_onus_obrigacoes()
-        self.layer_c_build_property_events()
+    def run_all_layers(self, streaming: bool = False) -> Path:
+        if streaming:
+            self.layers_abc_streaming()
+        else:
+            self.layer_a_load_and_index()
+            self.layer_b_build_onus_obrigacoes()
+            self.layer_c_build_property_events()
         self.layer_d_build_links_and_pendencias()
         self.layer_e_build_novacoes()
         return self.write_dataset()
@@ -1285,18 +1800,29 @@ def run_reconciler(
     output_root: str,
     dataset_dirname: str = "dataset_v1",
     pattern: str = "*.json",
+    streaming: bool = False,
+    load_workers: int = 1,
+    load_processes: bool = False,
+    incremental: bool = False,
 ) -> Path:
     """
     Função utilitária para ser chamada pelo CLI.
+    streaming=True: camadas A–C documento a documento (layers_abc_streaming).
+    load_workers/load_processes: leitura paralela dos JSON (ver map_ordered).
+    incremental=True: só documentos alterados desde a última execução (run_incremental).
     """
     inputs = ReconcilerInputs(
         normalize_root=Path(normalize_root),
         monetary_root=Path(monetary_root),
         pattern=pattern,
+        load_workers=load_workers,
+        load_processes=load_processes,
     )
     outputs = ReconcilerOutputs(
         output_root=Path(output_root),
         dataset_dirname=dataset_dirname,
     )
     recon = CadObrReconciler(inputs, outputs)
-    return recon.run_all_layers()
+    if incremental:
+        return recon.run_incremental()
+    return recon.run_all_layers(streaming=streaming)
@@ -0,0 +1,684 @@
+# pipelines/cad_obr/reconciler/reconciler_duckdb.py
+"""
+Backend DuckDB do reconciler CAD_OBR.
+
+Mesmo dataset do backend Python (reconciler_core.CadObrReconciler), gravado
+direto em artifacts/db/cad_obr_dataset_v1.duckdb (uma tabela por arquivo do
+dataset_v1, com os mesmos nomes), com export JSONL opcional.
+
+Divisão do trabalho:
+  - loader (Python, documento a documento): o que depende de texto livre
+    (pt-BR, party_id, registro_ref) reaproveita os métodos por documento do
+    reconciler: catálogo/índices da camada A, ônus da camada B sem o merge
+    monetary, vendas/anuências da camada C. As linhas vão para arquivos
+    NDJSON de staging e entram no DuckDB com read_json (schema explícito);
+    o corpus nunca fica inteiro em memória;
+  - SQL (em conjunto): merge monetary da camada B (doc vencedor por
+    matrícula, registro vencedor no doc), eventos de ônus da camada C,
+    links da camada D e novações da camada E (range join por property).
+
+Uso:
+  python3 pipelines/cad_obr/reconciler/reconciler_cli.py --backend duckdb ...
+"""
+
+from __future__ import annotations
+
+import json
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import duckdb
+except ImportError:  # opcional: sem duckdb, só o backend Python (reconciler_core)
+    duckdb = None
+
+from reconciler_core import (
+    CadObrReconciler,
+    build_manifest,
+    ReconcilerInputs,
+    ReconcilerOutputs,
+    iter_loaded_docs,
+    parse_brl_to_centavos,
+    registro_ref_norm,
+    write_jsonl,
+)
+
+DEFAULT_DUCKDB_PATH = Path("artifacts/db/cad_obr_dataset_v1.duckdb")
+
+# Procedência das tabelas gravadas por este backend: sha256 do JSONL exportado
+# na mesma execução (NULL sem --export-jsonl). O evidence_pack
+# (build_duckdb_views) só mantém a tabela se o JSONL atual tiver esse hash.
+PROVENANCE_TABLE = "__reconciler_tables"
+
+# Linhas lidas por vez no export JSONL.
+EXPORT_BATCH_ROWS = 10_000
+
+Schema = Sequence[Tuple[str, str]]
+
+# Tabelas do dataset (ordem de colunas = ordem das chaves no backend Python;
+# em partes e contratos_operacoes ela depende da linha, ver INDEX_KEY_ORDER).
+DOCUMENTOS: Schema = (
+    ("doc_id", "VARCHAR"),
+    ("tipo_documento", "VARCHAR"),
+    ("source_path", "VARCHAR"),
+    ("origin_stage", "VARCHAR"),
+    ("operation_id", "VARCHAR"),
+    ("property_ids", "VARCHAR[]"),
+    ("party_ids", "VARCHAR[]"),
+    ("datas", "JSON"),
+    ("anchors", "JSON"),
+)
+PARTES: Schema = (
+    ("party_id", "VARCHAR"),
+    ("roles", "VARCHAR[]"),
+    ("docs_origem", "VARCHAR[]"),
+    ("anchors", "JSON"),
+    ("nome", "VARCHAR"),
+    ("nome_norm", "VARCHAR"),
+    ("cpf", "VARCHAR"),
+    ("cnpj", "VARCHAR"),
+)
+IMOVEIS: Schema = (
+    ("property_id", "VARCHAR"),
+    ("matricula", "VARCHAR"),
+    ("docs_origem", "VARCHAR[]"),
+    ("anchors", "JSON"),
+)
+CONTRATOS_OPERACOES: Schema = (
+    ("operation_id", "VARCHAR"),
+    ("tipo_operacao", "VARCHAR"),
+    ("docs_origem", "VARCHAR[]"),
+    ("anchors", "JSON"),
+    ("property_ids", "VARCHAR[]"),
+    ("menciona_TR", "BOOLEAN"),
+    ("data_celebracao", "VARCHAR"),
+    ("vencimento", "VARCHAR"),
+    ("data_posicao", "VARCHAR"),
+    ("credor_id", "VARCHAR"),
+    ("emitente_devedor_id", "VARCHAR"),
+    ("garante_id", "VARCHAR"),
+    ("valor_base_num", "BIGINT"),
+    ("valor_base", "VARCHAR"),
+)
+ONUS_OBRIGACOES: Schema = (
+    ("onus_id", "VARCHAR"),
+    ("property_id", "VARCHAR"),
+    ("registro_ref", "VARCHAR"),
+    ("tipo_divida", "VARCHAR"),
+    ("operation_id", "VARCHAR"),
+    ("credor_id", "VARCHAR"),
+    ("emitente_devedor_id", "VARCHAR"),
+    ("data_efetiva", "VARCHAR"),
+    ("data_registro", "VARCHAR"),
+    ("vencimento", "VARCHAR"),
+    ("data_baixa", "VARCHAR"),
+    ("status", "VARCHAR"),
+    ("janela_vigencia_inicio", "VARCHAR"),
+    ("janela_vigencia_fim", "VARCHAR"),
+    ("valor_divida_original", "VARCHAR"),
+    ("valor_divida", "VARCHAR"),
+    ("valor_divida_num", "BIGINT"),
+    ("valor_presente", "VARCHAR"),
+    ("valor_presente_num", "BIGINT"),
+    ("monetary_meta", "JSON"),
+    ("docs_origem", "VARCHAR[]"),
+    ("anchors", "JSON"),
+)
+PROPERTY_EVENTS: Schema = (
+    ("event_id", "VARCHAR"),
+    ("property_id", "VARCHAR"),
+    ("event_type", "VARCHAR"),
+    ("event_date", "VARCHAR"),
+    ("data_baixa", "VARCHAR"),
+    ("data_registro", "VARCHAR"),
+    ("data_efetiva", "VARCHAR"),
+    ("onus_id", "VARCHAR"),
+    ("operation_id", "VARCHAR"),
+    ("registro_ref", "VARCHAR"),
+    ("credor_id", "VARCHAR"),
+    ("emitente_devedor_id", "VARCHAR"),
+    ("valor_divida_num", "BIGINT"),
+    ("valor_presente_num", "BIGINT"),
+    ("source_doc_id", "VARCHAR"),
+    ("anchors", "JSON"),
+    ("notes", "VARCHAR"),
+    ("flag_registro_posterior", "BOOLEAN"),
+    ("delta_registro_efetiva_dias", "BIGINT"),
+)
+PENDENCIAS: Schema = (
+    ("pendencia_id", "VARCHAR"),
+    ("entity_type", "VARCHAR"),
+    ("entity_id", "VARCHAR"),
+    ("motivo", "VARCHAR"),
+    ("evidencias", "JSON"),
+    ("campos_faltantes", "VARCHAR[]"),
+    ("candidatos", "JSON"),
+)
+
+# Índices da camada A (upserts): cada linha tem as chaves na ordem em que os
+# documentos as preencheram. O staging guarda essa ordem (_chaves) e o export
+# JSONL a reaplica: tabela -> (staging, chave de junção).
+INDEX_KEY_ORDER: Dict[str, Tuple[str, str]] = {
+    "partes": ("stg_partes", "party_id"),
+    "contratos_operacoes": ("stg_operacoes", "operation_id"),
+}
+STG_PARTES: Schema = tuple(PARTES) + (("_chaves", "VARCHAR[]"),)
+STG_OPERACOES: Schema = tuple(CONTRATOS_OPERACOES) + (("_chaves", "VARCHAR[]"),)
+
+# Staging do monetary: doc vencedor por matrícula e ônus por registro.
+STG_MON_DOCS: Schema = (("matricula", "VARCHAR"),)
+STG_MON_ONUS: Schema = (
+    ("_mon", "BIGINT"),
+    ("_item", "BIGINT"),
+    ("matricula", "VARCHAR"),
+    ("registro_ref", "VARCHAR"),
+    ("valor_presente_num", "BIGINT"),
+    ("valor_presente", "VARCHAR"),
+    ("valor_presente_parsed", "BIGINT"),
+    ("monetary_meta", "JSON"),
+)
+
+# Ordem das tabelas no arquivo .duckdb e no export (= write_dataset).
+DATASET_TABLES = (
+    "documentos",
+    "partes",
+    "imoveis",
+    "contratos_operacoes",
+    "onus_obrigacoes",
+    "property_events",
+    "links",
+    "pendencias",
+    "novacoes_detectadas",
+)
+
+# Formatação pt-BR de centavos (= format_centavos_to_brl) e chave de match
+# "truthy" do Python (None/"" não casam).
+_MACROS = """
+CREATE OR REPLACE TEMP MACRO brl(c) AS
+    replace(format('{:,}', abs(c) // 100), ',', '.') || ',' || lpad((abs(c) % 100)::VARCHAR, 2, '0');
+CREATE OR REPLACE TEMP MACRO sha12(s) AS left(sha1(s), 12);
+CREATE OR REPLACE TEMP MACRO casa(a, b) AS coalesce(a, '') <> '' AND a = b;
+"""
+
+# Camada B: merge monetary. Para cada matrícula vale o último doc do
+# monetary (ordem de varredura) e, nele, o último ônus de cada registro.
+_SQL_LAYER_B = """
+CREATE OR REPLACE TEMP TABLE mon_onus AS
+WITH vencedor AS (
+    SELECT matricula, max(_seq) AS _mon FROM stg_mon_docs GROUP BY matricula
+)
+SELECT o.*
+FROM stg_mon_onus o JOIN vencedor v USING (matricula, _mon)
+QUALIFY row_number() OVER (PARTITION BY o.matricula, o.registro_ref ORDER BY o._item DESC) = 1;
+
+CREATE OR REPLACE TEMP TABLE onus_b AS
+SELECT o.* REPLACE (
+    CASE WHEN m.valor_presente_num IS NOT NULL THEN brl(m.valor_presente_num)
+         ELSE m.valor_presente END AS valor_presente,
+    coalesce(m.valor_presente_num, m.valor_presente_parsed) AS valor_presente_num,
+    m.monetary_meta AS monetary_meta
+)
+FROM stg_onus o
+LEFT JOIN mon_onus m
+    ON m.matricula = substr(o.property_id, length('matricula:') + 1)
+   AND m.registro_ref = o.registro_ref;
+"""
+
+# Camada C: ONUS_REGISTRO/ONUS_BAIXA de cada ônus (na ordem dos ônus),
+# depois vendas/anuências (na ordem dos documentos).
+_SQL_LAYER_C = """
+CREATE OR REPLACE TEMP TABLE eventos AS
+WITH reg AS (
+    SELECT *, TRY_CAST(data_registro AS DATE) AS dr, TRY_CAST(data_efetiva AS DATE) AS de
+    FROM onus_b
+)
+SELECT 2 * _seq AS _seq,
+       'evt_' || sha12(onus_id || '|REG') AS event_id,
+       property_id,
+       'ONUS_REGISTRO' AS event_type,
+       coalesce(data_registro, data_efetiva, janela_vigencia_inicio) AS event_date,
+       NULL::VARCHAR AS data_baixa,
+       data_registro, data_efetiva, onus_id, operation_id, registro_ref,
+       credor_id, emitente_devedor_id, valor_divida_num, valor_presente_num,
+       docs_origem[1] AS source_doc_id,
+       anchors,
+       NULL::VARCHAR AS notes,
+       CASE WHEN dr > de THEN true END AS flag_registro_posterior,
+       CASE WHEN dr > de THEN date_diff('day', de, dr) END AS delta_registro_efetiva_dias
+FROM reg
+WHERE coalesce(data_registro, data_efetiva, janela_vigencia_inicio) IS NOT NULL
+UNION ALL
+SELECT 2 * _seq + 1,
+       'evt_' || sha12(onus_id || '|BAIXA'),
+       property_id,
+       'ONUS_BAIXA',
+       data_baixa,
+       data_baixa,
+       data_registro, data_efetiva, onus_id, operation_id, registro_ref,
+       credor_id, emitente_devedor_id, NULL, NULL,
+       docs_origem[1],
+       anchors,
+       NULL, NULL, NULL
+FROM onus_b
+WHERE status = 'BAIXADA' AND data_baixa IS NOT NULL
+UNION ALL
+SELECT (SELECT 2 * coalesce(max(_seq), 0) + 2 FROM onus_b) + _seq, * EXCLUDE (_seq)
+FROM stg_eventos_venda;
+"""
+
+# Camada D: operação -> imóveis (garantias), operação -> partes.
+_SQL_LAYER_D = """
+CREATE OR REPLACE TEMP TABLE links_tmp AS
+WITH ops AS (
+    SELECT *,
+           CASE WHEN json_array_length(anchors) > 0 THEN anchors
+                ELSE '[{"source_path":"unknown"}]'::JSON END AS evid
+    FROM stg_operacoes
+),
+imoveis AS (
+    SELECT _seq, evid, operation_id,
+           unnest(property_ids) AS to_id,
+           generate_subscripts(property_ids, 1) AS _pos
+    FROM ops
+),
+papeis(role_key, _pos) AS (
+    VALUES ('credor_id', 1), ('emitente_devedor_id', 2), ('garante_id', 3)
+),
+partes AS (
+    SELECT o._seq, o.evid, o.operation_id, p.role_key, p._pos,
+           CASE p.role_key WHEN 'credor_id' THEN o.credor_id
+                           WHEN 'emitente_devedor_id' THEN o.emitente_devedor_id
+                           ELSE o.garante_id END AS to_id
+    FROM ops o CROSS JOIN papeis p
+)
+SELECT _seq, 0 AS _grupo, _pos,
+       'lnk_' || sha12(operation_id || '|' || to_id) AS link_id,
+       'OPERATION' AS from_type, operation_id AS from_id,
+       'PROPERTY' AS to_type, to_id,
+       'A' AS match_level,
+       'operacao_original.numero vincula garantia (matricula) no documento' AS match_reason,
+       evid AS evidencias
+FROM imoveis
+UNION ALL
+SELECT _seq, 1, _pos,
+       'lnk_' || sha12(operation_id || '|' || to_id || '|' || role_key),
+       'OPERATION', operation_id, 'PARTY', to_id, 'B',
+       'parte vinculada à operação via campo ' || role_key,
+       evid
+FROM partes
+WHERE coalesce(to_id, '') <> '';
+"""
+
+# Camada E: baixa -> novo registro na mesma property em [0, janela] dias,
+# depois da baixa na timeline (data, ordem de entrada). Chaves de match do
+# último ônus de cada onus_id (como o dict onus_by_id do backend Python).
+_SQL_LAYER_E = """
+CREATE OR REPLACE TEMP TABLE novacoes_tmp AS
+WITH ev AS (
+    SELECT property_id, event_type, event_date, onus_id,
+           TRY_CAST(event_date AS DATE) AS d,
+           row_number() OVER (PARTITION BY property_id ORDER BY event_date, _seq) AS _pos,
+           min(_seq) OVER (PARTITION BY property_id) AS _prop
+    FROM eventos
+    WHERE coalesce(property_id, '') <> '' AND coalesce(event_date, '') <> ''
+),
+onus_k AS (
+    SELECT onus_id, credor_id, emitente_devedor_id, operation_id, anchors,
+           NOT regexp_matches(upper(coalesce(tipo_divida, '')), 'ARRENDAMENTO|PENHORA|BLOQUEIO')
+               AS elegivel
+    FROM onus_b
+    QUALIFY row_number() OVER (PARTITION BY onus_id ORDER BY _seq DESC) = 1
+),
+baixas AS (
+    SELECT ev.*, k.* EXCLUDE (onus_id)
+    FROM ev JOIN onus_k k USING (onus_id)
+    WHERE ev.event_type = 'ONUS_BAIXA' AND ev.d IS NOT NULL AND k.elegivel
+),
+registros AS (
+    SELECT ev.*, k.* EXCLUDE (onus_id)
+    FROM ev JOIN onus_k k USING (onus_id)
+    WHERE ev.event_type = 'ONUS_REGISTRO' AND ev.d IS NOT NULL AND k.elegivel
+),
+pares AS (
+    SELECT b._prop, b._pos AS _pos_b, r._pos AS _pos_r,
+           b.property_id,
+           b.onus_id AS onus_b, b.event_date AS data_b,
+           r.onus_id AS onus_r, r.event_date AS data_r,
+           date_diff('day', b.d, r.d) AS delta,
+           casa(b.credor_id, r.credor_id) AS m_credor,
+           casa(b.emitente_devedor_id, r.emitente_devedor_id) AS m_devedor,
+           casa(b.operation_id, r.operation_id) AS m_operacao,
+           b.anchors AS anchors_b, r.anchors AS anchors_r
+    FROM baixas b
+    JOIN registros r
+      ON r.property_id = b.property_id
+     AND r._pos > b._pos
+     AND r.d <= b.d + to_days(CAST($janela AS INTEGER))
+)
+SELECT _prop, _pos_b, _pos_r,
+       'nov_' || sha12(onus_b || '|' || onus_r || '|' || delta::VARCHAR) AS novacao_id,
+       property_id,
+       onus_b AS onus_id_baixado,
+       data_b AS data_baixa,
+       onus_r AS onus_id_novo,
+       data_r AS data_nova_divida,
+       list_filter(
+           ['JANELA_TEMPO',
+            CASE WHEN m_credor THEN 'CREDOR' END,
+            CASE WHEN m_devedor THEN 'DEVEDOR' END,
+            CASE WHEN m_operacao THEN 'OPERACAO' END],
+           x -> x IS NOT NULL
+       ) AS match_basis,
+       CASE WHEN m_operacao THEN 'A' WHEN m_credor OR m_devedor THEN 'B' ELSE 'C' END
+           AS match_level,
+       delta AS janela_dias,
+       to_json(list_concat(
+           CAST(anchors_b AS JSON[]), CAST(anchors_r AS JSON[])
+       )) AS evidencias
+FROM pares;
+"""
+
+
+class _Staging:
+    """Linhas do loader em NDJSON (uma tabela por arquivo), carregadas com read_json."""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self._files: Dict[str, Any] = {}
+        self._schemas: Dict[str, Schema] = {}
+        self._rows: Dict[str, int] = {}
+
+    def add(self, table: str, schema: Schema, row: Dict[str, Any]) -> int:
+        """Acrescenta a linha e devolve o seu _seq (ordem de chegada, a partir de 1)."""
+        f = self._files.get(table)
+        if f is None:
+            f = self._files[table] = (self.root / f"{table}.jsonl").open("w", encoding="utf-8")
+            self._schemas[table] = schema
+            self._rows[table] = 0
+        self._rows[table] += 1
+        out = {"_seq": self._rows[table]}
+        out.update((col, row.get(col)) for col, _ in schema)
+        if "_chaves" in out:
+            out["_chaves"] = list(row)
+        f.write(json.dumps(out, ensure_ascii=False) + "\n")
+        return out["_seq"]
+
+    def load(self, con: Any, table: str, schema: Schema) -> None:
+        """Cria a tabela temporária `table` (vazia se não houve linhas)."""
+        cols = (("_seq", "BIGINT"),) + tuple(schema)
+        f = self._files.pop(table, None)
+        if f is None:
+            ddl = ", ".join(f'"{c}" {t}' for c, t in cols)
+            con.execute(f"CREATE OR REPLACE TEMP TABLE {table} ({ddl})")
+            return
+        f.close()
+        spec = ", ".join(f"'{c}': '{t}'" for c, t in cols)
+        path = str(self.root / f"{table}.jsonl").replace("'", "''")
+        con.execute(
+            f"CREATE OR REPLACE TEMP TABLE {table} AS "
+            f"SELECT * FROM read_json('{path}', format = 'newline_delimited', "
+            f"columns = {{{spec}}}) ORDER BY _seq"
+        )
+
+    def close(self) -> None:
+        for f in self._files.values():
+            f.close()
+        self._files.clear()
+
+
+class DuckDbReconciler:
+    def __init__(
+        self,
+        inputs: ReconcilerInputs,
+        outputs: ReconcilerOutputs,
+        duckdb_path: Path = DEFAULT_DUCKDB_PATH,
+        janela_dias_max: int = 180,
+    ):
+        if duckdb is None:
+            raise RuntimeError("duckdb não instalado no ambiente (backend duckdb indisponível)")
+        self.inputs = inputs
+        self.outputs = outputs
+        self.duckdb_path = Path(duckdb_path)
+        self.janela_dias_max = janela_dias_max
+        self.counts: Dict[str, int] = {}
+
+    # ---------
+    # Loader: camadas A, B (sem merge) e vendas da C, documento a documento
+    # ---------
+
+    def _stage_inputs(self, stg: _Staging) -> CadObrReconciler:
+        """
+        Passa o corpus para o staging. Devolve o reconciler auxiliar com os
+        índices agregados da camada A (partes/imóveis/operações), que são
+        carregados depois, na ordem de inserção.
+        """
+        recon = CadObrReconciler(self.inputs, self.outputs)
+        ins = self.inputs
+
+        for ld in iter_loaded_docs(
+            ins.monetary_root, ins.pattern, "03_monetary", ins.load_workers, ins.load_processes
+        ):
+            mat = recon._monetary_keys(ld)[0]
+            if not mat:
+                continue
+            mon_seq = stg.add("stg_mon_docs", STG_MON_DOCS, {"matricula": mat})
+            onus = ld.data.get("hipotecas_onus")
+            for i, o in enumerate(onus if isinstance(onus, list) else []):
+                if not (isinstance(o, dict) and o.get("registro_ou_averbacao")):
+                    continue
+                rr = registro_ref_norm(str(o.get("registro_ou_averbacao")))
+                if not rr:
+                    continue
+                vp_num, vp, mm = (
+                    o.get("valor_presente_num"),
+                    o.get("valor_presente"),
+                    o.get("_monetary_meta"),
+                )
+                stg.add(
+                    "stg_mon_onus",
+                    STG_MON_ONUS,
+                    {
+                        "_mon": mon_seq,
+                        "_item": i,
+                        "matricula": mat,
+                        "registro_ref": rr,
+                        "valor_presente_num": vp_num if isinstance(vp_num, int) else None,
+                        "valor_presente": vp if isinstance(vp, str) else None,
+                        "valor_presente_parsed": parse_brl_to_centavos(vp)
+                        if isinstance(vp, str)
+                        else None,
+                        "monetary_meta": mm if isinstance(mm, dict) else None,
+                    },
+                )
+
+        # sem docs do monetary: o merge da camada B fica para o SQL
+        pendencias_venda: List[Dict[str, Any]] = []
+        eventos_venda: List[Dict[str, Any]] = []
+        for ld in iter_loaded_docs(
+            ins.normalize_root, ins.pattern, "02_normalize", ins.load_workers, ins.load_processes
+        ):
+            recon._catalog_doc(ld)
+            recon._build_onus_from_doc(ld)
+            recon._build_sale_events_from_doc(ld, eventos_venda, pendencias_venda)
+            for row in recon.docs_catalog:
+                stg.add("stg_documentos", DOCUMENTOS, row)
+            for row in recon.onus_list:
+                stg.add("stg_onus", ONUS_OBRIGACOES, row)
+            for row in recon.pendencias_list:
+                stg.add("stg_pendencias", PENDENCIAS, row)
+            for row in eventos_venda:
+                stg.add("stg_eventos_venda", PROPERTY_EVENTS, row)
+            recon.docs_catalog.clear()
+            recon.onus_list.clear()
+            recon.pendencias_list.clear()
+            eventos_venda.clear()
+
+        # pendências de vendas/anuências vêm depois das de ônus (ordem do lote)
+        for row in pendencias_venda:
+            stg.add("stg_pendencias", PENDENCIAS, row)
+        for name, schema, index in (
+            ("stg_partes", STG_PARTES, recon.partes_map),
+            ("stg_imoveis", IMOVEIS, recon.imoveis_map),
+            ("stg_operacoes", STG_OPERACOES, recon.operacoes_map),
+        ):
+            for row in index.values():
+                stg.add(name, schema, row)
+        return recon
+
+    # ---------
+    # Camadas B–E em SQL
+    # ---------
+
+    def run(self, export_jsonl: bool = False) -> Path:
+        """
+        Carrega o corpus e gera as tabelas do dataset em `duckdb_path`
+        (substituídas a cada execução). export_jsonl=True grava também o
+        dataset_v1 em JSONL (os mesmos bytes do backend Python).
+        Devolve o caminho do .duckdb.
+        """
+        self.duckdb_path.parent.mkdir(parents=True, exist_ok=True)
+        con = duckdb.connect(str(self.duckdb_path))
+        try:
+            with tempfile.TemporaryDirectory(
+                prefix="reconciler_stg_", dir=self.duckdb_path.parent
+            ) as tmp:
+                stg = _Staging(Path(tmp))
+                try:
+                    self._stage_inputs(stg)
+                    for table, schema in (
+                        ("stg_mon_docs", STG_MON_DOCS),
+                        ("stg_mon_onus", STG_MON_ONUS),
+                        ("stg_onus", ONUS_OBRIGACOES),
+                        ("stg_eventos_venda", PROPERTY_EVENTS),
+                        ("stg_pendencias", PENDENCIAS),
+                        ("stg_documentos", DOCUMENTOS),
+                        ("stg_partes", STG_PARTES),
+                        ("stg_imoveis", IMOVEIS),
+                        ("stg_operacoes", STG_OPERACOES),
+                    ):
+                        stg.load(con, table, schema)
+                finally:
+                    stg.close()
+
+            con.execute(_MACROS)
+            con.execute(_SQL_LAYER_B)
+            con.execute(_SQL_LAYER_C)
+            con.execute(_SQL_LAYER_D)
+            con.execute(_SQL_LAYER_E, {"janela": self.janela_dias_max})
+            self._persist(con)
+            self.counts = {
+                t: con.execute(f"SELECT count(*) FROM {t}").fetchone()[0]
+                for t in DATASET_TABLES
+            }
+            out_dir = self.export_jsonl(con) if export_jsonl else None
+            self._record_provenance(con, out_dir)
+        finally:
+            con.close()
+        return self.duckdb_path
+
+    def _persist(self, con: Any) -> None:
+        """Tabelas do dataset no arquivo (sem colunas internas, na ordem do lote)."""
+        selects = {
+            "documentos": "SELECT * EXCLUDE (_seq) FROM stg_documentos ORDER BY _seq",
+            "partes": "SELECT * EXCLUDE (_seq, _chaves) FROM stg_partes ORDER BY _seq",
+            "imoveis": "SELECT * EXCLUDE (_seq) FROM stg_imoveis ORDER BY _seq",
+            "contratos_operacoes": (
+                "SELECT * EXCLUDE (_seq, _chaves) FROM stg_operacoes ORDER BY _seq"
+            ),
+            "onus_obrigacoes": "SELECT * EXCLUDE (_seq) FROM onus_b ORDER BY _seq",
+            "property_events": "SELECT * EXCLUDE (_seq) FROM eventos ORDER BY _seq",
+            "links": (
+                "SELECT * EXCLUDE (_seq, _grupo, _pos) FROM links_tmp "
+                "ORDER BY _seq, _grupo, _pos"
+            ),
+            "pendencias": "SELECT * EXCLUDE (_seq) FROM stg_pendencias ORDER BY _seq",
+            "novacoes_detectadas": (
+                "SELECT * EXCLUDE (_prop, _pos_b, _pos_r) FROM novacoes_tmp "
+                "ORDER BY _prop, _pos_b, _pos_r"
+            ),
+        }
+        for table in DATASET_TABLES:
+            # views do evidence_pack (build_duckdb_views) sobre o JSONL antigo
+            con.execute(f"DROP VIEW IF EXISTS {table}")
+            con.execute(f"CREATE OR REPLACE TABLE {table} AS {selects[table]}")
+
+    def _record_provenance(self, con: Any, out_dir: Optional[Path]) -> None:
+        con.execute(
+            f"CREATE OR REPLACE TABLE {PROVENANCE_TABLE} "
+            "(table_name VARCHAR, jsonl_sha256 VARCHAR, rows BIGINT)"
+        )
+        con.executemany(
+            f"INSERT INTO {PROVENANCE_TABLE} VALUES (?, ?, ?)",
+            [
+                (
+                    t,
+                    build_manifest.sha256_file(out_dir / f"{t}.jsonl") if out_dir else None,
+                    self.counts[t],
+                )
+                for t in DATASET_TABLES
+            ],
+        )
+
+    # ---------
+    # Export JSONL (dataset_v1)
+    # ---------
+
+    def export_jsonl(self, con: Any) -> Path:
+        out_dir = self.outputs.output_root / self.outputs.dataset_dirname
+        out_dir.mkdir(parents=True, exist_ok=True)
+        for table in DATASET_TABLES:
+            write_jsonl(out_dir / f"{table}.jsonl", _iter_rows(con, table))
+        return out_dir
+
+
+def _iter_rows(con: Any, table: str) -> Iterator[Dict[str, Any]]:
+    """
+    Linhas de uma tabela do dataset como dicts (colunas JSON decodificadas),
+    com as chaves na ordem do backend Python (INDEX_KEY_ORDER).
+    """
+    desc = con.execute(f"DESCRIBE {table}").fetchall()
+    cols = [d[0] for d in desc]
+    json_cols = {d[0] for d in desc if d[1] == "JSON"}
+    sql = f"SELECT * FROM {table}"
+    if table in INDEX_KEY_ORDER:
+        stg, key = INDEX_KEY_ORDER[table]
+        cols.append("_chaves")
+        sql = f"SELECT t.*, s._chaves FROM {table} t JOIN {stg} s USING ({key}) ORDER BY s._seq"
+    cur = con.execute(sql)
+    while True:
+        batch = cur.fetchmany(EXPORT_BATCH_ROWS)
+        if not batch:
+            return
+        for values in batch:
+            row = dict(zip(cols, values))
+            for c in json_cols:
+                if row[c] is not None:
+                    row[c] = json.loads(row[c])
+            chaves = row.pop("_chaves", None)
+            if chaves:
+                row = {**{k: row[k] for k in chaves if k in row}, **row}
+            yield row
+
+
+def run_reconciler_duckdb(
+    normalize_root: str,
+    monetary_root: str,
+    output_root: str,
+    duckdb_path: str = str(DEFAULT_DUCKDB_PATH),
+    dataset_dirname: str = "dataset_v1",
+    pattern: str = "*.json",
+    export_jsonl: bool = False,
+    load_workers: int = 1,
+    load_processes: bool = False,
+) -> Path:
+    """Como reconciler_core.run_reconciler, com o backend DuckDB."""
+    inputs = ReconcilerInputs(
+        normalize_root=Path(normalize_root),
+        monetary_root=Path(monetary_root),
+        pattern=pattern,
+        load_workers=load_workers,
+        load_processes=load_processes,
+    )
+    outputs = ReconcilerOutputs(output_root=Path(output_root), dataset_dirname=dataset_dirname)
+    return DuckDbReconciler(inputs, outputs, Path(duckdb_path)).run(export_jsonl=export_jsonl)
@@ -4,12 +4,16 @@ from __future__ import annotations
 import argparse
 import json
 import re
+import sys
 from collections import Counter, defaultdict
 from dataclasses import dataclass
-from datetime import date, datetime
+from datetime import date
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+from scripts.ptbr_parse import parse_iso  # noqa: E402
+
 JSONL_FILES = [
     "documentos.jsonl",
     "partes.jsonl",
@@ -47,15 +51,7 @@ def is_iso_date(s: Any) -> bool:
 
 
 def to_date(s: Any) -> Optional[date]:
-    if not isinstance(s, str):
-        return None
-    s = s.strip()
-    if not s or not is_iso_date(s):
-        return None
-    try:
-        return datetime.strptime(s, "%Y-%m-%d").date()
-    except Exception:
-        return None
+    return parse_iso(s)
 
 
 def md_escape(s: Any) -> str:
@@ -0,0 +1,172 @@
+"""
+scripts/bench_collector.py
+
+Benchmark de vazão (documentos/minuto) do collector-cad_obr contra o
+stand-in local do provedor LLM (scripts/llm_standin_server.py).
+
+Roda `process_job` do agente de verdade (prompts, despacho concorrente,
+cache de contexto, trechos, pós-processamento e gravação), com o provedor
+trocado para "standin" e o cache de respostas desligado. Entrada: os .md de
+--input-dir ou --docs documentos sintéticos no formato do PDFTranscriber.
+
+Uso:
+  uv run python scripts/bench_collector.py --docs 40 --concurrency 8 \\
+      --latency-ms 1500 --jitter-ms 500 --rate-429 0.05 --rate-truncated 0.02
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from typing import Any, Dict
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+from scripts.llm_clients import configure_provider, reset  # noqa: E402
+from scripts.llm_standin_server import (  # noqa: E402
+    FaultPlan,
+    ReplayStore,
+    start_background,
+)
+
+AGENT_MAIN = os.path.join(PROJECT_ROOT, "agents", "collector-cad_obr", "main.py")
+
+
+def load_agent() -> Any:
+    spec = importlib.util.spec_from_file_location("collector_cad_obr_main", AGENT_MAIN)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def write_synthetic_docs(dest: str, n_docs: int, n_folhas: int) -> None:
+    os.makedirs(dest, exist_ok=True)
+    for d in range(n_docs):
+        lines = [
+            f"# Documento: matricula_{d:04d}.pdf",
+            f"**Total de Páginas:** {n_folhas}",
+            "---",
+        ]
+        for f in range(1, n_folhas + 1):
+            lines.append(f"\n\n## [[Folha {f}]]")
+            lines.append(
+                f"R.{f}/{d} - HIPOTECA. Credor: BANCO EXEMPLO S.A. "
+                f"Valor: R$ {1000 * f:,}.00. " + "Texto da matrícula. " * 80
+            )
+            lines.append("---")
+        with open(os.path.join(dest, f"matricula_{d:04d}.md"), "w", encoding="utf-8") as fp:
+            fp.write("\n".join(lines))
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    server = start_background(
+        store=ReplayStore(args.replay),
+        faults=FaultPlan(
+            latency_ms=args.latency_ms,
+            jitter_ms=args.jitter_ms,
+            rate_429=args.rate_429,
+            rate_truncated=args.rate_truncated,
+            seed=args.seed,
+        ),
+    )
+    configure_provider("standin", server.base_url)
+
+    try:
+        agent = load_agent()
+        agent._RESPONSE_CACHE = None
+        config = agent.load_config()
+        config["dispatch"] = {
+            **(config.get("dispatch") or {}),
+            "concurrency": args.concurrency,
+            "max_retries": args.max_retries,
+            "retry_backoff_seconds": args.retry_backoff,
+        }
+        if args.no_context_cache:
+            config["context_cache"] = {"enabled": False}
+
+        job = next(
+            (j for j in config.get("jobs", []) if j.get("id") == args.job), None
+        )
+        if job is None:
+            raise SystemExit(f"Job não encontrado: {args.job}")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            input_dir = args.input_dir
+            if not input_dir:
+                input_dir = os.path.join(tmp, "in")
+                write_synthetic_docs(input_dir, args.docs, args.folhas)
+            output_dir = os.path.join(tmp, "out")
+            job = {**job, "input_dir": os.path.abspath(input_dir), "output_dir": output_dir}
+            n_docs = len([f for f in os.listdir(input_dir) if f.endswith(".md")])
+
+            log = io.StringIO()
+            t0 = time.perf_counter()
+            with contextlib.redirect_stdout(sys.stdout if args.verbose else log):
+                agent.process_job(job, config, PROJECT_ROOT)
+            elapsed = time.perf_counter() - t0
+
+            outputs = os.listdir(output_dir) if os.path.isdir(output_dir) else []
+            errors = [f for f in outputs if f.endswith(".error.json")]
+            saved = [f for f in outputs if f.endswith(".json") and f not in errors]
+    finally:
+        server.shutdown()
+        server.server_close()
+        reset()
+
+    return {
+        "job": args.job,
+        "docs": n_docs,
+        "concurrency": args.concurrency,
+        "seconds": round(elapsed, 3),
+        "docs_per_min": round(n_docs / elapsed * 60, 2) if elapsed else None,
+        "saved": len(saved),
+        "errors": len(errors),
+        "server": asdict(server.stats),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Benchmark do collector-cad_obr (stand-in).")
+    ap.add_argument("--job", default="cad_obr-escritura-imovel", help="id do job no config.yaml")
+    ap.add_argument("--input-dir", help="Diretório de .md reais (senão, sintéticos).")
+    ap.add_argument("--docs", type=int, default=40)
+    ap.add_argument("--folhas", type=int, default=6)
+    ap.add_argument("--replay", help="Gravações JSONL do stand-in.")
+    ap.add_argument("--concurrency", type=int, default=4)
+    ap.add_argument("--max-retries", type=int, default=3)
+    ap.add_argument("--retry-backoff", type=float, default=0.5)
+    ap.add_argument("--no-context-cache", action="store_true")
+    ap.add_argument("--latency-ms", type=float, default=1000.0)
+    ap.add_argument("--jitter-ms", type=float, default=250.0)
+    ap.add_argument("--rate-429", type=float, default=0.0)
+    ap.add_argument("--rate-truncated", type=float, default=0.0)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--verbose", action="store_true", help="Mostra o log do agente.")
+    ap.add_argument("--json", action="store_true", help="Saída em JSON.")
+    args = ap.parse_args()
+
+    res = run(args)
+    if args.json:
+        print(json.dumps(res, ensure_ascii=False, indent=2))
+        return
+    srv = res["server"]
+    print(f"Job:          {res['job']} ({res['docs']} docs, concorrência {res['concurrency']})")
+    print(f"Tempo:        {res['seconds']:.2f}s")
+    print(f"Vazão:        {res['docs_per_min']} docs/min")
+    print(f"Saídas:       {res['saved']} ok, {res['errors']} erro(s)")
+    print(
+        f"Provedor:     {srv['requests']} requisições, {srv['throttled']} x 429, "
+        f"{srv['truncated']} truncada(s), {srv['cache_creates']} cache(s) de contexto"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+scripts/bench_monetary.py
+
+Benchmark do motor monetary (pipelines/cad_obr/monetary/monetary_core.py):
+aritmética float x aritmética exata (centavos inteiros + fatores Decimal em
+ponto fixo) sobre uma carteira sintética de ônus, item a item e em lote.
+
+Gera --onus ônus (padrão: 100.000) com datas, valores, taxas e índices
+(TR, IPCA, sem índice) variados, com uma TR e um IPCA sintéticos, e mede
+cada modo. Imprime o fator exato/float, quantos ônus diferem ao centavo
+entre os modos e o sha256 dos valores do modo exato: rodar em outra
+máquina deve dar o mesmo hash.
+
+Uso:
+  uv run python scripts/bench_monetary.py --onus 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, List
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "pipelines", "cad_obr", "monetary"))
+import monetary_core as mc  # noqa: E402
+import monetary_indices as mi  # noqa: E402
+
+TAXAS = [
+    "juros de 12,680% efetivos ao ano + TR",
+    "juros de 1,2% ao mês, corrigido pela TR",
+    "juros de 8,5% ao ano, correção pelo IPCA",
+    "juros de 6% ao ano",
+    "juros de 0,95% ao mês",
+]
+
+
+def carteira(n_onus: int, seed: int) -> List[Dict[str, Any]]:
+    """Documentos com 1 a 8 ônus cada, até somar n_onus."""
+    rnd = random.Random(seed)
+    docs: List[Dict[str, Any]] = []
+    total = 0
+    while total < n_onus:
+        k = min(rnd.randint(1, 8), n_onus - total)
+        onus = []
+        for _ in range(k):
+            a1 = rnd.randint(1991, 2015)
+            a2 = rnd.randint(a1, 2023)
+            onus.append(
+                {
+                    "tipo_divida": "HIPOTECA",
+                    "valor_divida_num": rnd.randint(1_000_00, 5_000_000_00),
+                    "data_efetiva": f"{a1}-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}",
+                    "data_baixa": f"{a2}-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}",
+                    "quitada": True,
+                    "taxas": rnd.choice(TAXAS),
+                }
+            )
+        docs.append({"hipotecas_onus": onus})
+        total += k
+    return docs
+
+
+def indices_sinteticos(seed: int) -> mi.IndexStore:
+    rnd = random.Random(seed)
+    tr = {(a, m): rnd.uniform(0.0, 0.008) for a in range(1991, 2024) for m in range(1, 13)}
+    ipca = {
+        (a, m): rnd.uniform(-0.004, 0.012) for a in range(1991, 2024) for m in range(1, 13)
+    }
+    store = mi.IndexStore()
+    store._series["TR"] = mi.SerieMensal(tr, "TR")
+    store._series["IPCA"] = mi.SerieMensal(ipca, "IPCA")
+    return store
+
+
+def medir(fn: Any, docs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    docs = copy.deepcopy(docs)
+    t0 = time.perf_counter()
+    fn(docs)
+    elapsed = time.perf_counter() - t0
+    valores = [o.get("valor_presente_num") for d in docs for o in d["hipotecas_onus"]]
+    return {"seconds": round(elapsed, 3), "valores": valores}
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    docs = carteira(args.onus, args.seed)
+    store = indices_sinteticos(args.seed)
+    tr = store.get("TR")
+    # aquece os prefixos (float e Decimal) fora da medição
+    for exato in (False, True):
+        mc.processar_onus_cad_obr(copy.deepcopy(docs[0]["hipotecas_onus"][0]), tr, store, exato)
+
+    def item_a_item(exato: bool) -> Any:
+        def fn(ds: List[Dict[str, Any]]) -> None:
+            for d in ds:
+                for o in d["hipotecas_onus"]:
+                    mc.processar_onus_cad_obr(o, tr_table=tr, indices=store, exato=exato)
+
+        return fn
+
+    def lote(ds: List[Dict[str, Any]]) -> None:
+        # sem CSV de TR: a TR sintética vem do store
+        mc.processar_lote_cad_obr(ds, tr_csv_path=os.devnull, indices=store)
+
+    res = {
+        "float": medir(item_a_item(False), docs),
+        "exato": medir(item_a_item(True), docs),
+    }
+    if mc.np is not None:
+        res["lote_float"] = medir(lote, docs)
+
+    v_float, v_exato = res["float"]["valores"], res["exato"]["valores"]
+    diferentes = sum(1 for a, b in zip(v_float, v_exato) if a != b)
+    return {
+        "onus": args.onus,
+        "modos": {
+            k: {"seconds": v["seconds"], "onus_por_s": round(args.onus / v["seconds"])}
+            for k, v in res.items()
+        },
+        "exato_sobre_float": round(res["exato"]["seconds"] / res["float"]["seconds"], 2),
+        "onus_diferentes_ao_centavo": diferentes,
+        "sha256_exato": hashlib.sha256(json.dumps(v_exato).encode()).hexdigest(),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Benchmark do motor monetary (float x exato).")
+    ap.add_argument("--onus", type=int, default=100_000)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--json", action="store_true", help="Saída em JSON.")
+    args = ap.parse_args()
+
+    res = run(args)
+    if args.json:
+        print(json.dumps(res, ensure_ascii=False, indent=2))
+        return
+    print(f"Ônus:         {res['onus']}")
+    for modo, m in res["modos"].items():
+        print(f"{modo + ':':<13} {m['seconds']:.2f}s ({m['onus_por_s']} ônus/s)")
+    print(f"Exato/float:  {res['exato_sobre_float']}x")
+    print(f"Diferenças:   {res['onus_diferentes_ao_centavo']} ônus com centavos diferentes")
+    print(f"sha256 exato: {res['sha256_exato']}")
+
+
+if __name__ == "__main__":
+    main()
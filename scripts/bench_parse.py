@@ -0,0 +1,109 @@
+"""
+scripts/bench_parse.py
+
+Microbenchmark do parsing pt-BR compartilhado (scripts/ptbr_parse.py).
+
+Gera --n textos (padrão: 200.000) sorteados de um vocabulário pequeno de
+datas e valores (--distintos textos de cada tipo), como nos documentos
+reais em que as mesmas "24 de Abril de 1.996" se repetem, e mede:
+  - sem_cache: o parser sem a memorização (função envolvida pelo LRU);
+  - lru: parse_data/parse_valor item a item (LRU aquecido na 1ª ocorrência);
+  - lote: parse_datas/parse_valores.
+
+Uso:
+  uv run python scripts/bench_parse.py --n 200000 --distintos 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from scripts import ptbr_parse as pp  # noqa: E402
+
+MESES = list(pp.MESES) + ["março", "Março", "JANEIRO"]
+
+
+def _data(rnd: random.Random) -> str:
+    dia, ano = rnd.randint(1, 28), rnd.randint(1985, 2023)
+    formato = rnd.randrange(3)
+    if formato == 0:
+        return f"{dia} de {rnd.choice(MESES).capitalize()} de {ano // 1000}.{ano % 1000:03d}"
+    if formato == 1:
+        return f"{dia:02d}/{rnd.randint(1, 12):02d}/{ano}"
+    return f"{ano}-{rnd.randint(1, 12):02d}-{dia:02d}"
+
+
+def _valor(rnd: random.Random) -> str:
+    centavos = rnd.randint(1_000_00, 50_000_000_00)
+    inteiro = f"{centavos // 100:,}".replace(",", ".")
+    return f"R${inteiro},{centavos % 100:02d}-(valor por extenso)"
+
+
+def amostras(n: int, distintos: int, seed: int) -> Dict[str, List[str]]:
+    rnd = random.Random(seed)
+    datas = [_data(rnd) for _ in range(distintos)]
+    valores = [_valor(rnd) for _ in range(distintos)]
+    return {
+        "datas": [rnd.choice(datas) for _ in range(n)],
+        "valores": [rnd.choice(valores) for _ in range(n)],
+    }
+
+
+def medir(fn: Callable[[], Any]) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return round(time.perf_counter() - t0, 4)
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    textos = amostras(args.n, args.distintos, args.seed)
+    datas, valores = textos["datas"], textos["valores"]
+    data_crua = pp._parse_data.__wrapped__
+    valor_cru = pp._parse_valor.__wrapped__
+
+    res: Dict[str, Dict[str, float]] = {}
+    pp.limpar_cache()
+    res["datas"] = {
+        "sem_cache": medir(lambda: [data_crua(s.strip(), True) for s in datas]),
+        "lru": medir(lambda: [pp.parse_data(s) for s in datas]),
+        "lote": medir(lambda: pp.parse_datas(datas)),
+    }
+    res["valores"] = {
+        "sem_cache": medir(lambda: [valor_cru(s.strip(), False) for s in valores]),
+        "lru": medir(lambda: [pp.parse_valor(s) for s in valores]),
+        "lote": medir(lambda: pp.parse_valores(valores)),
+    }
+    return {"n": args.n, "distintos": args.distintos, "segundos": res, "cache": pp.cache_info()}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Microbenchmark do parsing pt-BR (datas/valores).")
+    ap.add_argument("--n", type=int, default=200_000)
+    ap.add_argument("--distintos", type=int, default=500)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--json", action="store_true", help="Saída em JSON.")
+    args = ap.parse_args()
+
+    res = run(args)
+    if args.json:
+        print(json.dumps(res, ensure_ascii=False, indent=2))
+        return
+    print(f"Textos: {res['n']} ({res['distintos']} distintos por tipo)")
+    for tipo, modos in res["segundos"].items():
+        base = modos["sem_cache"]
+        partes = [
+            f"{modo} {seg:.3f}s ({base / seg:.1f}x)" if seg else f"{modo} {seg:.3f}s"
+            for modo, seg in modos.items()
+        ]
+        print(f"{tipo + ':':<9} " + ", ".join(partes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+scripts/bench_reconciler_load.py
+
+Benchmark do loader do reconciler (pipelines/cad_obr/reconciler/reconciler_core.py,
+iter_loaded_docs): leitura + parse dos JSON da camada A, serial x threads x
+processos, com o json da stdlib e com o orjson (quando instalado).
+
+Sem --input-dir, gera --files documentos sintéticos (escritura_imovel com
+--onus ônus cada) num diretório temporário. Reporta arquivos/s e MB/s de
+cada combinação e confere que a ordem dos documentos é a mesma do serial.
+
+Uso:
+  uv run python scripts/bench_reconciler_load.py --files 5000 --workers 1,4,8
+  uv run python scripts/bench_reconciler_load.py --input-dir outputs/cad_obr/02_normalize
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "pipelines", "cad_obr", "reconciler"))
+import reconciler_core as rc  # noqa: E402
+
+
+def gerar_corpus(base: Path, n_files: int, n_onus: int, seed: int) -> None:
+    rnd = random.Random(seed)
+    d = base / "escritura_imovel"
+    d.mkdir(parents=True, exist_ok=True)
+    for i in range(n_files):
+        doc = {
+            "matricula": f"{rnd.randint(1, 99)}.{rnd.randint(100, 999)}",
+            "hipotecas_onus": [
+                {
+                    "registro_ou_averbacao": f"R.{k + 1}",
+                    "tipo_divida": "HIPOTECA",
+                    "credor": "BANCO DO BRASIL S.A.",
+                    "data_efetiva": f"{rnd.randint(1990, 2015)}-0{rnd.randint(1, 9)}-1{rnd.randint(0, 9)}",
+                    "valor_divida": f"{rnd.randint(1, 999)}.{rnd.randint(0, 999):03d},00",
+                    "valor_divida_num": rnd.randint(100, 10**9),
+                    "taxas": "juros de 12,680% efetivos ao ano + TR",
+                    "observacoes": "texto livre " * rnd.randint(5, 40),
+                }
+                for k in range(n_onus)
+            ],
+        }
+        (d / f"doc_{i:06d}.json").write_text(
+            json.dumps(doc, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+
+
+def medir(root: Path, workers: int, processes: bool) -> Dict[str, Any]:
+    t0 = time.perf_counter()
+    paths = [ld.path for ld in rc.iter_loaded_docs(root, "*.json", "02_normalize", workers, processes)]
+    return {"seconds": time.perf_counter() - t0, "paths": paths}
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    tmp = None
+    if args.input_dir:
+        root = Path(args.input_dir)
+    else:
+        tmp = tempfile.TemporaryDirectory()
+        root = Path(tmp.name)
+        gerar_corpus(root, args.files, args.onus, args.seed)
+
+    files = rc.scan_json_files(root, "*.json")
+    mb = sum(p.stat().st_size for p in files) / 1e6
+    backends = ["json"] + (["orjson"] if rc.orjson is not None else [])
+    orjson_mod = rc.orjson
+
+    linhas: List[Dict[str, Any]] = []
+    referencia = None
+    for backend in backends:
+        rc.orjson = orjson_mod if backend == "orjson" else None
+        for workers in args.workers:
+            modos = [("serial", False)] if workers == 1 else [("threads", False), ("processos", True)]
+            for modo, processes in modos:
+                medir(root, workers, processes)  # aquece o cache de páginas do SO
+                m = medir(root, workers, processes)
+                if referencia is None:
+                    referencia = m["paths"]
+                linhas.append(
+                    {
+                        "backend": backend,
+                        "modo": modo,
+                        "workers": workers,
+                        "seconds": round(m["seconds"], 3),
+                        "arquivos_por_s": round(len(files) / m["seconds"]),
+                        "mb_por_s": round(mb / m["seconds"], 1),
+                        "mesma_ordem": m["paths"] == referencia,
+                    }
+                )
+    rc.orjson = orjson_mod
+    if tmp is not None:
+        tmp.cleanup()
+    return {"arquivos": len(files), "mb": round(mb, 1), "cpus": os.cpu_count(), "medidas": linhas}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Benchmark do loader JSON do reconciler.")
+    ap.add_argument("--input-dir", default=None, help="Diretório com JSON reais (ex.: 02_normalize).")
+    ap.add_argument("--files", type=int, default=5000)
+    ap.add_argument("--onus", type=int, default=8, help="Ônus por documento sintético.")
+    ap.add_argument("--workers", default="1,4,8", help="Lista de workers (ex.: 1,4,8).")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--json", action="store_true", help="Saída em JSON.")
+    args = ap.parse_args()
+    args.workers = [int(w) for w in args.workers.split(",") if w.strip()]
+
+    res = run(args)
+    if args.json:
+        print(json.dumps(res, ensure_ascii=False, indent=2))
+        return
+    print(f"Arquivos: {res['arquivos']} ({res['mb']} MB), CPUs: {res['cpus']}")
+    for m in res["medidas"]:
+        ordem = "" if m["mesma_ordem"] else "  ORDEM DIFERENTE"
+        print(
+            f"{m['backend']:<7} {m['modo']:<9} w={m['workers']:<3} {m['seconds']:.3f}s  "
+            f"{m['arquivos_por_s']:>7} arq/s  {m['mb_por_s']:>7} MB/s{ordem}"
+        )
+
+
+if __name__ == "__main__":
+    main()
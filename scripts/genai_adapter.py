@@ -6,8 +6,8 @@ from typing import Any, Dict
 
 import yaml  # <--- Nova importação
 from dotenv import load_dotenv
-from google import genai
-from google.genai import types
+
+from scripts.llm_clients import get_client, get_generate_config
 
 # Configuração básica de logs
 logging.basicConfig(
@@ -42,7 +42,8 @@ class GenAIAdapter:
         logger.info(
             f"Inicializando Agente com Modelo: {self.model_name} (Temp: {self.temperature})"
         )
-        self.client = genai.Client(api_key=api_key)
+        # Cliente compartilhado com os demais agentes do processo
+        self.client = get_client(api_key)
         self.schemas_dir = Path("schemas")
 
     def _load_config(self, path: str) -> Dict[str, Any]:
@@ -79,7 +80,7 @@ class GenAIAdapter:
             json_schema = self._load_schema(schema_filename)
 
             # Configuração
-            config = types.GenerateContentConfig(
+            config = get_generate_config(
                 response_mime_type="application/json",
                 response_json_schema=json_schema,
                 temperature=self.temperature,
@@ -0,0 +1,237 @@
+"""
+scripts/llm_cache.py
+
+Cache persistente de respostas do LLM, endereçado por conteúdo.
+
+Chave = sha256 de {modelo, config de geração, sha256 do prompt} e, fora do
+provedor padrão, do provedor ativo e do seu endpoint (llm_clients.
+active_provider): respostas do stand-in nunca servem uma execução contra o
+Gemini. Com
+temperatura 0 o mesmo prompt produz a mesma extração, então reexecutar um
+collector (ex.: depois de corrigir o pós-processamento) não precisa chamar a
+API de novo.
+
+Armazenamento: um arquivo SQLite (WAL), seguro para as threads do despacho
+concorrente. Só respostas com JSON válido são gravadas (os agentes pedem
+application/json): resposta truncada ou texto livre não fica presa no
+cache, e uma entrada assim já gravada conta como miss e é removida.
+
+Despejo (evict), aplicado ao abrir o cache:
+- max_age_days: remove entradas criadas há mais tempo que isso;
+- max_size_mb:  remove as menos acessadas recentemente até caber no limite.
+
+Config (seção `cache` do config.yaml do agente):
+  cache:
+    enabled: true
+    path: ".cache/llm_responses.sqlite"   # relativo à raiz do projeto
+    max_size_mb: 512
+    max_age_days: 30
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from scripts.llm_clients import DEFAULT_PROVIDER, active_provider
+
+DEFAULT_PATH = os.path.join(".cache", "llm_responses.sqlite")
+KEY_VERSION = "llm_cache.v1"
+
+
+def sha256_text(text: str) -> str:
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+def extract_json(text: str) -> str:
+    """Mesma regra de extract_json_from_text dos collectors (cercas ```json)."""
+    if not text:
+        return ""
+    text = text.replace("```json", "").replace("```", "").strip()
+    if text.startswith("{") and text.endswith("}"):
+        return text
+    match = re.search(r"(\{.*\})", text, re.DOTALL)
+    return match.group(1) if match else text
+
+
+def is_cacheable(response: str) -> bool:
+    """Resposta que os agentes aceitam: JSON válido depois de extract_json."""
+    try:
+        json.loads(extract_json(response))
+    except ValueError:
+        return False
+    return True
+
+
+def make_key(
+    model: str,
+    gen_params: Dict[str, Any],
+    prompt: str,
+    provider: Optional[Tuple[str, Optional[str]]] = None,
+) -> str:
+    """`provider` = (nome, base_url); None usa o provedor ativo."""
+    key: Dict[str, Any] = {
+        "v": KEY_VERSION,
+        "model": model,
+        "config": gen_params,
+        "prompt_sha256": sha256_text(prompt),
+    }
+    name, base_url = provider if provider is not None else active_provider()
+    # Gemini direto mantém as chaves já gravadas
+    if (name, base_url) != (DEFAULT_PROVIDER, None):
+        key["provider"] = name
+        key["base_url"] = base_url
+    payload = json.dumps(
+        key,
+        sort_keys=True,
+        ensure_ascii=False,
+        default=repr,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        path: str,
+        max_size_mb: Optional[float] = None,
+        max_age_days: Optional[float] = None,
+    ):
+        self.path = path
+        self.max_bytes = int(max_size_mb * 1024 * 1024) if max_size_mb else None
+        self.max_age_s = float(max_age_days) * 86400 if max_age_days else None
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT,
+                model_used TEXT,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._db.commit()
+        self.evict()
+
+    @classmethod
+    def from_config(
+        cls,
+        conf: Optional[Dict[str, Any]],
+        project_root: str,
+        disabled: bool = False,
+    ) -> Optional["ResponseCache"]:
+        """Abre o cache da seção `cache`; None se desativado (ou --no-cache)."""
+        conf = conf or {}
+        if disabled or conf.get("enabled") is False:
+            return None
+        path = str(conf.get("path") or DEFAULT_PATH)
+        if not os.path.isabs(path):
+            path = os.path.join(project_root, path)
+        return cls(
+            path,
+            max_size_mb=conf.get("max_size_mb"),
+            max_age_days=conf.get("max_age_days"),
+        )
+
+    def get(self, key: str) -> Optional[Tuple[str, Optional[str]]]:
+        """(response, model_used) ou None."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT response, model_used FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and not is_cacheable(row[0]):
+                # gravada antes da validação em put(): força nova chamada
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._db.commit()
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._db.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?",
+                (time.time(), key),
+            )
+            self._db.commit()
+            self.hits += 1
+            return row[0], row[1]
+
+    def put(
+        self,
+        key: str,
+        response: str,
+        model: Optional[str] = None,
+        model_used: Optional[str] = None,
+    ) -> None:
+        if not response or not is_cacheable(response):
+            return
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, model, model_used, response, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    model,
+                    model_used,
+                    response,
+                    len(response.encode("utf-8")),
+                    now,
+                    now,
+                ),
+            )
+            self._db.commit()
+
+    def evict(self) -> int:
+        """Aplica max_age_days e max_size_mb. Retorna quantas entradas saíram."""
+        removed = 0
+        with self._lock:
+            if self.max_age_s is not None:
+                cur = self._db.execute(
+                    "DELETE FROM responses WHERE created_at < ?",
+                    (time.time() - self.max_age_s,),
+                )
+                removed += cur.rowcount
+
+            if self.max_bytes is not None:
+                total = self._db.execute(
+                    "SELECT COALESCE(SUM(size), 0) FROM responses"
+                ).fetchone()[0]
+                if total > self.max_bytes:
+                    rows = self._db.execute(
+                        "SELECT key, size FROM responses ORDER BY accessed_at ASC"
+                    ).fetchall()
+                    victims = []
+                    for key, size in rows:
+                        if total <= self.max_bytes:
+                            break
+                        victims.append((key,))
+                        total -= size
+                    self._db.executemany("DELETE FROM responses WHERE key = ?", victims)
+                    removed += len(victims)
+
+            self._db.commit()
+        return removed
+
+    def stats_line(self) -> str:
+        return f"cache LLM: {self.hits} hit(s), {self.misses} miss(es) [{self.path}]"
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,261 @@
+"""
+scripts/llm_clients.py
+
+Registro compartilhado de clientes google-genai e de configs de geração.
+
+Os agentes (collector-cad_obr, collector-proc, evidence-agent) e o
+GenAIAdapter criavam um `genai.Client` e um `GenerateContentConfig` (com os
+quatro SafetySetting) a cada chamada: um handshake TLS e a montagem dos mesmos
+objetos por documento. Aqui:
+
+- get_client(api_key): um cliente por (api_key, pool), criado na primeira
+  chamada (sem api_key, resolve_api_key(); o stand-in dispensa chave) e reutilizado pelo processo inteiro (inclusive entre threads do
+  despacho concorrente). O httpx interno mantém as conexões vivas.
+- configure_pool(...): dimensiona o pool HTTP (conexões, keep-alive) dos
+  clientes criados depois da chamada.
+- get_generate_config(...): um GenerateContentConfig por combinação de
+  parâmetros, montado uma vez.
+
+Provedor plugável: get_client devolve o cliente do provedor ativo, que
+expõe a mesma interface usada pelos agentes (models.generate_content,
+caches.create/get/delete).
+- "gemini" (padrão): google-genai.
+- "standin": servidor HTTP local que reproduz respostas gravadas
+  (scripts/llm_standin_server.py), para testes de carga offline.
+O provedor vem de configure_provider(...) ou, sem isso, das variáveis
+LLM_PROVIDER / LLM_STANDIN_URL, o que redireciona qualquer agente sem editar
+os config.yaml. Outros provedores entram por register_provider(...).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_POOL: Dict[str, Any] = {
+    "max_connections": 16,
+    "max_keepalive_connections": 16,
+    "keepalive_expiry": 60.0,
+}
+
+_lock = threading.Lock()
+_pool: Dict[str, Any] = dict(DEFAULT_POOL)
+_clients: Dict[Tuple[Any, ...], Any] = {}
+_configs: Dict[str, Any] = {}
+_safety: Optional[List[Any]] = None
+
+DEFAULT_PROVIDER = "gemini"
+DEFAULT_STANDIN_URL = "http://127.0.0.1:8765"
+_provider: Dict[str, Optional[str]] = {"name": None, "base_url": None}
+# nome -> factory(api_key, base_url) -> cliente
+_factories: Dict[str, Callable[[str, Optional[str]], Any]] = {}
+
+
+def _genai() -> Tuple[Any, Any]:
+    try:
+        from google import genai  # type: ignore
+        from google.genai import types  # type: ignore
+    except ImportError as e:
+        raise RuntimeError(
+            "Dependência ausente: google-genai. Execute: pip install google-genai"
+        ) from e
+    return genai, types
+
+
+def configure_pool(
+    max_connections: Optional[int] = None,
+    max_keepalive_connections: Optional[int] = None,
+    keepalive_expiry: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Ajusta o pool HTTP dos próximos clientes. Retorna o pool vigente."""
+    with _lock:
+        for k, v in [
+            ("max_connections", max_connections),
+            ("max_keepalive_connections", max_keepalive_connections),
+            ("keepalive_expiry", keepalive_expiry),
+        ]:
+            if v is not None:
+                _pool[k] = v
+        return dict(_pool)
+
+
+def configure_pool_from_config(conf: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aplica a seção `http_pool` de um config.yaml (chaves de configure_pool)."""
+    conf = conf or {}
+    return configure_pool(
+        max_connections=conf.get("max_connections"),
+        max_keepalive_connections=conf.get("max_keepalive_connections"),
+        keepalive_expiry=conf.get("keepalive_expiry"),
+    )
+
+
+def register_provider(
+    name: str, factory: Callable[[str, Optional[str]], Any]
+) -> None:
+    """Registra um provedor: factory(api_key, base_url) -> cliente."""
+    with _lock:
+        _factories[name] = factory
+
+
+def configure_provider(
+    name: Optional[str] = None, base_url: Optional[str] = None
+) -> Tuple[str, Optional[str]]:
+    """Fixa o provedor dos próximos get_client. Retorna o provedor ativo."""
+    with _lock:
+        if name is not None:
+            _provider["name"] = name
+        if base_url is not None:
+            _provider["base_url"] = base_url
+    return active_provider()
+
+
+def active_provider() -> Tuple[str, Optional[str]]:
+    """(nome, base_url): configure_provider > LLM_PROVIDER/LLM_STANDIN_URL."""
+    name = _provider["name"] or os.getenv("LLM_PROVIDER") or DEFAULT_PROVIDER
+    base_url = _provider["base_url"]
+    if not base_url and name == "standin":
+        base_url = os.getenv("LLM_STANDIN_URL") or DEFAULT_STANDIN_URL
+    return name, base_url
+
+
+def _standin_client(api_key: str, base_url: Optional[str]) -> Any:
+    from scripts.llm_standin import StandInHTTPClient
+
+    return StandInHTTPClient(base_url or DEFAULT_STANDIN_URL)
+
+
+register_provider("standin", _standin_client)
+
+
+def resolve_api_key(
+    override: Optional[str] = None, env_name: Optional[str] = None
+) -> str:
+    """override > variável `env_name` > GEMINI_API_KEY > GOOGLE_API_KEY."""
+    return (
+        override
+        or (os.getenv(env_name) if env_name else None)
+        or os.getenv("GEMINI_API_KEY")
+        or os.getenv("GOOGLE_API_KEY")
+        or ""
+    )
+
+
+def _http_options(types: Any, pool: Dict[str, Any]) -> Any:
+    try:
+        import httpx  # dependência do google-genai
+
+        limits = httpx.Limits(
+            max_connections=pool["max_connections"],
+            max_keepalive_connections=pool["max_keepalive_connections"],
+            keepalive_expiry=pool["keepalive_expiry"],
+        )
+        return types.HttpOptions(client_args={"limits": limits})
+    except Exception:
+        # SDK sem client_args: fica com o pool padrão do httpx
+        return None
+
+
+def get_client(api_key: Optional[str] = None) -> Any:
+    """
+    Cliente compartilhado para a api_key (e o pool vigente).
+
+    Cada provedor decide se precisa de chave: o "gemini" cai em
+    resolve_api_key(api_key) e falha sem nenhuma; o "standin" não usa chave.
+    """
+    name, base_url = active_provider()
+    if name != DEFAULT_PROVIDER:
+        api_key = api_key or ""
+        with _lock:
+            factory = _factories.get(name)
+            if factory is None:
+                raise ValueError(f"Provedor LLM desconhecido: {name}")
+            key = (name, base_url, api_key)
+            client = _clients.get(key)
+            if client is None:
+                client = _clients[key] = factory(api_key, base_url)
+            return client
+
+    api_key = resolve_api_key(api_key)
+    if not api_key:
+        raise ValueError("GOOGLE_API_KEY não definida.")
+    genai, types = _genai()
+
+    with _lock:
+        key = (api_key, tuple(sorted(_pool.items())))
+        client = _clients.get(key)
+        if client is None:
+            http_options = _http_options(types, _pool)
+            if http_options is not None:
+                client = genai.Client(api_key=api_key, http_options=http_options)
+            else:
+                client = genai.Client(api_key=api_key)
+            _clients[key] = client
+        return client
+
+
+def block_none_safety_settings() -> List[Any]:
+    """Os quatro SafetySetting BLOCK_NONE usados pelos collectors."""
+    global _safety
+    _, types = _genai()
+    with _lock:
+        if _safety is None:
+            _safety = [
+                types.SafetySetting(
+                    category=category, threshold=types.HarmBlockThreshold.BLOCK_NONE
+                )
+                for category in (
+                    types.HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT,
+                    types.HarmCategory.HARM_CATEGORY_HATE_SPEECH,
+                    types.HarmCategory.HARM_CATEGORY_HARASSMENT,
+                    types.HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT,
+                )
+            ]
+        return _safety
+
+
+def get_generate_config(block_none_safety: bool = False, **params: Any) -> Any:
+    """
+    GenerateContentConfig compartilhado para `params` (os mesmos kwargs do
+    construtor do SDK). Parâmetros iguais devolvem o mesmo objeto, que não
+    deve ser alterado por quem o recebe.
+
+    Fora do provedor "gemini", devolve os parâmetros como dict (o SDK também
+    aceita dict; os SafetySetting não se aplicam).
+    """
+    name, _ = active_provider()
+    if name != DEFAULT_PROVIDER:
+        return dict(params)
+
+    _, types = _genai()
+    key = json.dumps(
+        {"block_none_safety": block_none_safety, **params},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=repr,
+    )
+    with _lock:
+        cfg = _configs.get(key)
+    if cfg is not None:
+        return cfg
+
+    if block_none_safety:
+        params = {**params, "safety_settings": block_none_safety_settings()}
+    cfg = types.GenerateContentConfig(**params)
+
+    with _lock:
+        return _configs.setdefault(key, cfg)
+
+
+def reset() -> None:
+    """Descarta clientes e configs (testes / troca de credenciais)."""
+    global _safety
+    with _lock:
+        _clients.clear()
+        _configs.clear()
+        _safety = None
+        _pool.clear()
+        _pool.update(DEFAULT_POOL)
+        _provider["name"] = None
+        _provider["base_url"] = None
@@ -0,0 +1,148 @@
+"""
+scripts/llm_context_cache.py
+
+Cache de contexto no provedor para o prefixo estático dos prompts.
+
+Nos collectors, todo prompt é:
+    base_prompt + schema + SKILL  (igual para todos os arquivos do job)
+    + documento                   (muda por arquivo)
+
+Em vez de reenviar o prefixo a cada arquivo, ele é registrado uma vez por job
+como cached content (client.caches.create) e cada chamada envia só o
+documento, referenciando o cache por nome (config.cached_content). Menos
+tokens de entrada faturados integralmente e menor tempo até o primeiro token.
+
+Se o prefixo for curto demais para o provedor (mínimo de tokens) ou a criação
+falhar, o job segue com o prompt completo, sem cache de contexto.
+
+Os configs são passados como dict (o SDK aceita `...OrDict`), então o mesmo
+código roda contra o cliente real ou contra o stand-in local
+(scripts/llm_standin.py).
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from scripts.llm_dispatch import estimate_tokens
+
+# Separador entre o prefixo estático e o documento (ver assemble_prompt).
+PREFIX_SEPARATOR = "\n"
+
+# Mínimo de tokens aceito pelo provedor para cached content (Gemini Flash).
+DEFAULT_MIN_TOKENS = 1024
+DEFAULT_TTL_SECONDS = 3600
+
+
+@dataclass
+class PrefixContext:
+    name: str
+    model: str
+    prefix: str
+
+    def split(self, prompt_text: str) -> Optional[str]:
+        """Parte variável do prompt, ou None se ele não começa com o prefixo."""
+        head = self.prefix + PREFIX_SEPARATOR
+        if prompt_text.startswith(head):
+            return prompt_text[len(head) :]
+        return None
+
+
+def open_prefix_cache(
+    client: Any,
+    model: str,
+    prefix: str,
+    ttl_seconds: int = DEFAULT_TTL_SECONDS,
+    min_tokens: int = DEFAULT_MIN_TOKENS,
+    display_name: Optional[str] = None,
+) -> Optional[PrefixContext]:
+    """Registra o prefixo no provedor; None se não couber/der erro."""
+    if estimate_tokens(prefix) < min_tokens:
+        print(
+            f"   [INFO] Cache de contexto não usado: prefixo < {min_tokens} tokens."
+        )
+        return None
+
+    config: Dict[str, Any] = {"contents": [prefix], "ttl": f"{int(ttl_seconds)}s"}
+    if display_name:
+        config["display_name"] = display_name
+
+    try:
+        cached = client.caches.create(model=model, config=config)
+    except Exception as e:
+        print(
+            f"   [AVISO] Falha ao criar cache de contexto ({e}); usando prompt completo."
+        )
+        return None
+
+    print(f"   [INFO] Cache de contexto criado: {cached.name}")
+    return PrefixContext(name=cached.name, model=model, prefix=prefix)
+
+
+def close_prefix_cache(client: Any, ctx: Optional[PrefixContext]) -> None:
+    """Remove o cache do job (o TTL cobre o caso de o processo morrer antes)."""
+    if ctx is None:
+        return
+    try:
+        client.caches.delete(name=ctx.name)
+    except Exception as e:
+        print(f"   [AVISO] Falha ao remover cache de contexto {ctx.name}: {e}")
+
+
+class LazyPrefixCache:
+    """
+    Cache de contexto de um job, criado só na primeira chamada que realmente
+    vai ao provedor (se todas as respostas vierem do cache local, nada é
+    criado). Seguro para as threads do despacho concorrente.
+    """
+
+    def __init__(
+        self,
+        client_factory: Callable[[], Any],
+        model: str,
+        prefix: str,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        min_tokens: int = DEFAULT_MIN_TOKENS,
+        display_name: Optional[str] = None,
+    ):
+        self._client_factory = client_factory
+        self.model = model
+        self.prefix = prefix
+        self.ttl_seconds = ttl_seconds
+        self.min_tokens = min_tokens
+        self.display_name = display_name
+        self._lock = threading.Lock()
+        self._attempted = False
+        self._client: Any = None
+        self._ctx: Optional[PrefixContext] = None
+        self._created: Optional[PrefixContext] = None
+
+    def get(self) -> Optional[PrefixContext]:
+        with self._lock:
+            if not self._attempted:
+                self._attempted = True
+                self._client = self._client_factory()
+                self._ctx = open_prefix_cache(
+                    self._client,
+                    self.model,
+                    self.prefix,
+                    ttl_seconds=self.ttl_seconds,
+                    min_tokens=self.min_tokens,
+                    display_name=self.display_name,
+                )
+                self._created = self._ctx
+            return self._ctx
+
+    def invalidate(self) -> None:
+        """Desiste do cache (ex.: expirou no provedor); segue com prompt completo."""
+        with self._lock:
+            self._ctx = None
+
+    def close(self) -> None:
+        with self._lock:
+            if self._client is not None:
+                close_prefix_cache(self._client, self._created)
+            self._ctx = None
+            self._created = None
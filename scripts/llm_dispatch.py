@@ -0,0 +1,184 @@
+"""
+scripts/llm_dispatch.py
+
+Despacho concorrente de chamadas ao LLM para os agentes collector.
+
+- TokenBucket / RateLimiter: limita requisições por minuto (RPM) e tokens por
+  minuto (TPM) compartilhados entre as threads de um processo.
+- dispatch_ordered: executa as chamadas em um pool de threads limitado e
+  devolve os resultados na ordem de entrada, para que o pós-processamento e a
+  gravação continuem determinísticos.
+- call_with_retry: repete chamadas recusadas por cota/sobrecarga (429/5xx)
+  com espera exponencial.
+
+As chamadas ao provedor são I/O de rede, então threads bastam (o GIL é
+liberado durante a espera).
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Heurística de tokens para texto pt-BR quando o provedor não informa a contagem.
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text or "") // CHARS_PER_TOKEN)
+
+
+class TokenBucket:
+    """
+    Balde de tokens com capacidade `per_minute`, reabastecido continuamente.
+    `acquire(n)` bloqueia até haver `n` tokens. Pedidos maiores que a
+    capacidade são limitados à capacidade (senão nunca seriam atendidos).
+    """
+
+    def __init__(
+        self,
+        per_minute: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if per_minute <= 0:
+            raise ValueError("per_minute deve ser > 0")
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0  # tokens por segundo
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._last) * self.rate
+        )
+        self._last = now
+
+    def acquire(self, n: float = 1.0) -> float:
+        """Consome `n` tokens; retorna o tempo total esperado (segundos)."""
+        n = min(float(n), self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= n:
+                    self._tokens -= n
+                    return waited
+                wait = (n - self._tokens) / self.rate
+            self._sleep(wait)
+            waited += wait
+
+
+class RateLimiter:
+    """
+    Limites RPM/TPM do provedor. Valores <= 0 (ou None) desativam o limite.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+    ):
+        rpm = requests_per_minute or 0
+        tpm = tokens_per_minute or 0
+        self.requests = TokenBucket(rpm) if rpm > 0 else None
+        self.tokens = TokenBucket(tpm) if tpm > 0 else None
+
+    @classmethod
+    def from_config(cls, dispatch_conf: Optional[Dict[str, Any]]) -> "RateLimiter":
+        conf = dispatch_conf or {}
+        return cls(
+            requests_per_minute=conf.get("requests_per_minute"),
+            tokens_per_minute=conf.get("tokens_per_minute"),
+        )
+
+    def acquire(self, prompt_text: str = "") -> None:
+        if self.requests is not None:
+            self.requests.acquire(1)
+        if self.tokens is not None:
+            self.tokens.acquire(estimate_tokens(prompt_text))
+
+
+def dispatch_ordered(
+    items: Iterable[T], fn: Callable[[T], R], concurrency: int = 1
+) -> Iterator[Tuple[T, R]]:
+    """
+    Aplica `fn` a cada item com até `concurrency` chamadas simultâneas e
+    devolve (item, resultado) na ordem de `items`, assim que cada resultado
+    (e todos os anteriores) estiver pronto. Com concurrency <= 1, é um laço
+    serial comum. Exceções de `fn` são propagadas na posição do item.
+    """
+    items = list(items)
+    if concurrency <= 1 or len(items) <= 1:
+        for it in items:
+            yield it, fn(it)
+        return
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures: List[Future] = [pool.submit(fn, it) for it in items]
+        try:
+            for it, fut in zip(items, futures):
+                yield it, fut.result()
+        finally:
+            # Saída antecipada (erro/consumidor parou): não inicia o restante.
+            for fut in futures:
+                fut.cancel()
+
+
+# Códigos HTTP que valem nova tentativa (cota, sobrecarga, indisponível).
+RETRYABLE_CODES = (429, 500, 502, 503, 504)
+
+
+def error_code(exc: BaseException) -> Optional[int]:
+    """Código HTTP de um erro do SDK (APIError.code) ou do stand-in."""
+    code = getattr(exc, "code", None) or getattr(exc, "status_code", None)
+    try:
+        return int(code) if code is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def call_with_retry(
+    fn: Callable[[], R],
+    max_retries: int = 3,
+    backoff_seconds: float = 2.0,
+    sleep: Callable[[float], None] = time.sleep,
+    before_attempt: Optional[Callable[[], Any]] = None,
+) -> R:
+    """
+    Chama `fn`; em erro com código em RETRYABLE_CODES, espera
+    backoff_seconds * 2**tentativa e tenta de novo, até `max_retries` vezes.
+    Outros erros (e o último erro retentável) são propagados.
+    `before_attempt` roda antes de cada tentativa (ex.: RateLimiter.acquire,
+    para que as novas tentativas também gastem RPM/TPM).
+    """
+    attempt = 0
+    while True:
+        try:
+            if before_attempt is not None:
+                before_attempt()
+            return fn()
+        except Exception as e:
+            if attempt >= max_retries or error_code(e) not in RETRYABLE_CODES:
+                raise
+            sleep(backoff_seconds * (2**attempt))
+            attempt += 1
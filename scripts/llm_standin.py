@@ -0,0 +1,283 @@
+"""
+scripts/llm_standin.py
+
+Provedor LLM local (stand-in) para testes offline.
+
+Emula a parte do google-genai usada pelos agentes:
+- client.models.generate_content(model=..., contents=..., config=...)
+- client.caches.create(model=..., config={"contents": [...], "ttl": "3600s"})
+- client.caches.get(name=...) / client.caches.delete(name=...)
+
+O "modelo" é uma função `responder(prompt) -> str` (default: devolve um JSON
+com o sha256 do prompt efetivo). Com cached_content, o prompt efetivo é o
+prefixo registrado + o conteúdo enviado, como no provedor real, e a resposta
+informa em usage_metadata quantos tokens vieram do cache. Cada chamada fica
+registrada em `client.calls`.
+
+StandInHTTPClient tem a mesma interface, mas fala HTTP com o servidor local
+(scripts/llm_standin_server.py); é o cliente do provedor "standin" em
+scripts/llm_clients.py.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import itertools
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from scripts.llm_context_cache import PREFIX_SEPARATOR
+from scripts.llm_dispatch import estimate_tokens
+
+
+class StandInError(Exception):
+    """Erro do stand-in (equivalente a um erro HTTP da API)."""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(f"{code} {message}")
+        self.code = code
+        self.message = message
+
+
+@dataclass
+class StandInUsage:
+    prompt_token_count: int = 0
+    cached_content_token_count: int = 0
+    candidates_token_count: int = 0
+
+
+@dataclass
+class StandInResponse:
+    text: str
+    usage_metadata: StandInUsage = field(default_factory=StandInUsage)
+    model_version: str = "standin"
+
+
+@dataclass
+class StandInCachedContent:
+    name: str
+    model: str
+    text: str
+    expire_at: float
+    usage_metadata: StandInUsage = field(default_factory=StandInUsage)
+
+
+def default_responder(prompt: str) -> str:
+    return json.dumps(
+        {"prompt_sha256": hashlib.sha256(prompt.encode("utf-8")).hexdigest()}
+    )
+
+
+def _cfg_get(config: Any, key: str) -> Any:
+    if config is None:
+        return None
+    if isinstance(config, dict):
+        return config.get(key)
+    return getattr(config, key, None)
+
+
+def _contents_text(contents: Any) -> str:
+    if isinstance(contents, str):
+        return contents
+    if isinstance(contents, (list, tuple)):
+        return "\n".join(_contents_text(c) for c in contents)
+    return str(contents)
+
+
+def _ttl_seconds(ttl: Any) -> float:
+    s = str(ttl or "3600s").strip()
+    return float(s[:-1] if s.endswith("s") else s)
+
+
+class _Caches:
+    def __init__(self, owner: "StandInClient"):
+        self._owner = owner
+        self._items: Dict[str, StandInCachedContent] = {}
+        self._seq = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def create(self, model: str, config: Any = None) -> StandInCachedContent:
+        text = _contents_text(_cfg_get(config, "contents") or "")
+        tokens = estimate_tokens(text)
+        if tokens < self._owner.min_cache_tokens:
+            raise StandInError(
+                400,
+                f"Cached content is too small: {tokens} < {self._owner.min_cache_tokens} tokens",
+            )
+        with self._lock:
+            name = f"cachedContents/standin-{next(self._seq)}"
+            item = StandInCachedContent(
+                name=name,
+                model=model,
+                text=text,
+                expire_at=time.time() + _ttl_seconds(_cfg_get(config, "ttl")),
+                usage_metadata=StandInUsage(prompt_token_count=tokens),
+            )
+            self._items[name] = item
+        return item
+
+    def get(self, name: str) -> StandInCachedContent:
+        with self._lock:
+            item = self._items.get(name)
+        if item is None or item.expire_at < time.time():
+            raise StandInError(404, f"CachedContent not found: {name}")
+        return item
+
+    def delete(self, name: str) -> None:
+        with self._lock:
+            self._items.pop(name, None)
+
+
+class _Models:
+    def __init__(self, owner: "StandInClient"):
+        self._owner = owner
+
+    def generate_content(
+        self, model: str, contents: Any, config: Any = None
+    ) -> StandInResponse:
+        owner = self._owner
+        sent = _contents_text(contents)
+        cached_tokens = 0
+        prompt = sent
+
+        cache_name = _cfg_get(config, "cached_content")
+        if cache_name:
+            cached = owner.caches.get(cache_name)
+            if cached.model != model:
+                raise StandInError(400, "Model does not match cached content")
+            prompt = cached.text + PREFIX_SEPARATOR + sent
+            cached_tokens = estimate_tokens(cached.text)
+
+        text = owner.responder(prompt)
+        usage = StandInUsage(
+            prompt_token_count=estimate_tokens(prompt),
+            cached_content_token_count=cached_tokens,
+            candidates_token_count=estimate_tokens(text),
+        )
+        with owner._lock:
+            owner.calls.append(
+                {
+                    "model": model,
+                    "sent_tokens": estimate_tokens(sent),
+                    "prompt_tokens": usage.prompt_token_count,
+                    "cached_tokens": cached_tokens,
+                }
+            )
+        return StandInResponse(text=text, usage_metadata=usage, model_version=model)
+
+
+class StandInClient:
+    def __init__(
+        self,
+        responder: Optional[Callable[[str], str]] = None,
+        min_cache_tokens: int = 1024,
+    ):
+        self.responder = responder or default_responder
+        self.min_cache_tokens = min_cache_tokens
+        self.calls: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self.models = _Models(self)
+        self.caches = _Caches(self)
+
+
+# --- Cliente HTTP (provedor "standin") ---
+
+API_PREFIX = "/v1beta"
+
+
+def _config_dict(config: Any) -> Dict[str, Any]:
+    if config is None:
+        return {}
+    if isinstance(config, dict):
+        return dict(config)
+    dump = getattr(config, "model_dump", None)
+    if callable(dump):
+        return dump(exclude_none=True)
+    return dict(vars(config))
+
+
+class _HTTPTransport:
+    def __init__(self, base_url: str, timeout: float):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def request(
+        self, method: str, path: str, body: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        data = None
+        headers = {}
+        if body is not None:
+            data = json.dumps(body, ensure_ascii=False, default=repr).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        req = urllib.request.Request(
+            self.base_url + API_PREFIX + path, data=data, method=method, headers=headers
+        )
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+                raw = resp.read()
+        except urllib.error.HTTPError as e:
+            try:
+                err = json.loads(e.read() or b"{}").get("error") or {}
+            except ValueError:
+                err = {}
+            raise StandInError(e.code, err.get("message") or str(e.reason)) from None
+        return json.loads(raw) if raw else {}
+
+
+class _HTTPModels:
+    def __init__(self, transport: _HTTPTransport):
+        self._t = transport
+
+    def generate_content(
+        self, model: str, contents: Any, config: Any = None
+    ) -> StandInResponse:
+        out = self._t.request(
+            "POST",
+            f"/models/{model}:generateContent",
+            {"contents": _contents_text(contents), "config": _config_dict(config)},
+        )
+        return StandInResponse(
+            text=out.get("text") or "",
+            usage_metadata=StandInUsage(**(out.get("usage_metadata") or {})),
+            model_version=out.get("model_version") or model,
+        )
+
+
+class _HTTPCaches:
+    def __init__(self, transport: _HTTPTransport):
+        self._t = transport
+
+    @staticmethod
+    def _item(out: Dict[str, Any]) -> StandInCachedContent:
+        return StandInCachedContent(
+            name=out["name"],
+            model=out.get("model") or "",
+            text="",
+            expire_at=float(out.get("expire_at") or 0),
+            usage_metadata=StandInUsage(**(out.get("usage_metadata") or {})),
+        )
+
+    def create(self, model: str, config: Any = None) -> StandInCachedContent:
+        cfg = _config_dict(config)
+        cfg["contents"] = _contents_text(cfg.get("contents") or "")
+        out = self._t.request("POST", "/cachedContents", {"model": model, "config": cfg})
+        return self._item(out)
+
+    def get(self, name: str) -> StandInCachedContent:
+        return self._item(self._t.request("GET", f"/{name}"))
+
+    def delete(self, name: str) -> None:
+        self._t.request("DELETE", f"/{name}")
+
+
+class StandInHTTPClient:
+    def __init__(self, base_url: str, timeout: float = 600.0):
+        transport = _HTTPTransport(base_url, timeout)
+        self.base_url = transport.base_url
+        self.models = _HTTPModels(transport)
+        self.caches = _HTTPCaches(transport)
@@ -0,0 +1,383 @@
+"""
+scripts/llm_standin_server.py
+
+Servidor HTTP local que faz o papel do provedor LLM (provedor "standin" de
+scripts/llm_clients.py), para medir vazão, concorrência e novas tentativas
+dos agentes sem chamar a API real.
+
+- Reproduz respostas gravadas (JSONL: {"prompt_sha256": ..., "response": ...},
+  chave = sha256 do prompt efetivo, com o prefixo do cache de contexto).
+- Prompt sem gravação: responde com o fallback (--fallback echo|file) ou 404.
+- --record: prompts sem gravação vão ao Gemini real (GOOGLE_API_KEY) e a
+  resposta é acrescentada ao arquivo de gravações.
+- Falhas injetadas por requisição: latência (--latency-ms, --jitter-ms), 429
+  (--rate-429) e JSON truncado (--rate-truncated). O sorteio depende só de
+  (seed, prompt, n-ésima vez que o prompt chega), então a sequência de falhas
+  se repete entre execuções, qualquer que seja a ordem das threads.
+
+Endpoints (JSON), consumidos por StandInHTTPClient (scripts/llm_standin.py):
+  POST   /v1beta/models/{model}:generateContent  {"contents", "config"}
+  POST   /v1beta/cachedContents                  {"model", "config"}
+  GET    /v1beta/cachedContents/{id}
+  DELETE /v1beta/cachedContents/{id}
+  GET    /stats
+
+Uso:
+  uv run python scripts/llm_standin_server.py --replay gravacoes.jsonl \\
+      --latency-ms 800 --jitter-ms 300 --rate-429 0.05
+  LLM_PROVIDER=standin LLM_STANDIN_URL=http://127.0.0.1:8765 \\
+      uv run python agents/collector-cad_obr/main.py --no-cache
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from scripts.llm_standin import (  # noqa: E402
+    API_PREFIX,
+    StandInClient,
+    StandInError,
+    default_responder,
+)
+
+DEFAULT_PORT = 8765
+
+
+def prompt_sha256(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+class ReplayStore:
+    """Respostas gravadas por sha256 do prompt (arquivo JSONL, só acréscimo)."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._items: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        rec = json.loads(line)
+                        self._items[rec["prompt_sha256"]] = rec["response"]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, sha: str) -> Optional[str]:
+        return self._items.get(sha)
+
+    def add(self, sha: str, response: str) -> None:
+        with self._lock:
+            self._items[sha] = response
+            if self.path:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    rec = {"prompt_sha256": sha, "response": response}
+                    f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+
+
+@dataclass
+class FaultPlan:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    rate_429: float = 0.0
+    rate_truncated: float = 0.0
+    seed: int = 0
+
+    def draw(self, key: str, nth: int) -> Tuple[float, Optional[str]]:
+        """(atraso em segundos, falha: None | "429" | "truncated")."""
+        rng = random.Random(f"{self.seed}:{key}:{nth}")
+        delay = max(0.0, self.latency_ms + rng.uniform(-1, 1) * self.jitter_ms)
+        roll = rng.random()
+        fault = None
+        if roll < self.rate_429:
+            fault = "429"
+        elif roll < self.rate_429 + self.rate_truncated:
+            fault = "truncated"
+        return delay / 1000.0, fault
+
+
+@dataclass
+class ServerStats:
+    requests: int = 0
+    ok: int = 0
+    replayed: int = 0
+    fallback: int = 0
+    missing: int = 0
+    throttled: int = 0
+    truncated: int = 0
+    cache_creates: int = 0
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        store: Optional[ReplayStore] = None,
+        faults: Optional[FaultPlan] = None,
+        fallback: Optional[Callable[[str], str]] = default_responder,
+        min_cache_tokens: int = 1024,
+    ):
+        super().__init__(address, _Handler)
+        self.store = store or ReplayStore()
+        self.faults = faults or FaultPlan()
+        self.fallback = fallback
+        self.stats = ServerStats()
+        self.client = StandInClient(
+            responder=self._respond, min_cache_tokens=min_cache_tokens
+        )
+        self._seen: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _count(self, field_name: str, key: Optional[str] = None) -> int:
+        with self._lock:
+            setattr(self.stats, field_name, getattr(self.stats, field_name) + 1)
+            if key is None:
+                return 0
+            nth = self._seen.get(key, 0)
+            self._seen[key] = nth + 1
+            return nth
+
+    def _respond(self, prompt: str) -> str:
+        sha = prompt_sha256(prompt)
+        text = self.store.get(sha)
+        if text is not None:
+            self._count("replayed")
+            return text
+        if self.fallback is None:
+            self._count("missing")
+            raise StandInError(404, f"Sem gravação para o prompt {sha[:12]}")
+        self._count("fallback")
+        return self.fallback(prompt)
+
+    def generate(self, model: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        contents = body.get("contents") or ""
+        config = body.get("config") or {}
+        key = prompt_sha256(f"{config.get('cached_content') or ''}\n{contents}")
+        nth = self._count("requests", key)
+
+        delay, fault = self.faults.draw(key, nth)
+        if delay:
+            time.sleep(delay)
+        if fault == "429":
+            self._count("throttled")
+            raise StandInError(429, "Resource has been exhausted (stand-in)")
+
+        resp = self.client.models.generate_content(
+            model=model, contents=contents, config=config
+        )
+        text = resp.text
+        if fault == "truncated":
+            self._count("truncated")
+            text = text[: len(text) // 2]
+        self._count("ok")
+        return {
+            "text": text,
+            "usage_metadata": asdict(resp.usage_metadata),
+            "model_version": resp.model_version,
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: StandInServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        pass
+
+    def _send(self, status: int, payload: Dict[str, Any], headers=None) -> None:
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _body(self) -> Dict[str, Any]:
+        n = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(n) or b"{}") if n else {}
+
+    def _dispatch(self, method: str) -> None:
+        srv = self.server
+        path = self.path
+        try:
+            body = self._body() if method == "POST" else {}
+            if method == "GET" and path == "/stats":
+                return self._send(200, asdict(srv.stats))
+            if not path.startswith(API_PREFIX + "/"):
+                raise StandInError(404, f"Rota desconhecida: {path}")
+            path = path[len(API_PREFIX) + 1 :]
+
+            if method == "POST" and path.startswith("models/"):
+                model, _, action = path[len("models/") :].partition(":")
+                if action != "generateContent":
+                    raise StandInError(404, f"Ação desconhecida: {action}")
+                return self._send(200, srv.generate(model, body))
+
+            if method == "POST" and path == "cachedContents":
+                item = srv.client.caches.create(
+                    model=body.get("model") or "", config=body.get("config") or {}
+                )
+                srv._count("cache_creates")
+                return self._send(200, _cached_payload(item))
+
+            if path.startswith("cachedContents/"):
+                if method == "GET":
+                    return self._send(200, _cached_payload(srv.client.caches.get(path)))
+                if method == "DELETE":
+                    srv.client.caches.delete(path)
+                    return self._send(200, {})
+
+            raise StandInError(404, f"Rota desconhecida: {method} {self.path}")
+        except StandInError as e:
+            headers = {"Retry-After": "1"} if e.code == 429 else None
+            self._send(e.code, {"error": {"code": e.code, "message": e.message}}, headers)
+        except Exception as e:
+            self._send(500, {"error": {"code": 500, "message": str(e)}})
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def do_DELETE(self) -> None:
+        self._dispatch("DELETE")
+
+
+def _cached_payload(item: Any) -> Dict[str, Any]:
+    return {
+        "name": item.name,
+        "model": item.model,
+        "expire_at": item.expire_at,
+        "usage_metadata": asdict(item.usage_metadata),
+    }
+
+
+def start_background(
+    host: str = "127.0.0.1", port: int = 0, **kwargs: Any
+) -> StandInServer:
+    """Sobe o servidor numa thread (port=0: porta livre). Encerrar com .shutdown()."""
+    server = StandInServer((host, port), **kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _gemini_recorder(store: ReplayStore, model: str) -> Callable[[str], str]:
+    """Fallback de gravação: prompt sem gravação vai ao Gemini e é gravado."""
+    from scripts.llm_clients import (
+        configure_provider,
+        get_client,
+        get_generate_config,
+        resolve_api_key,
+    )
+
+    configure_provider("gemini")  # nunca o próprio stand-in
+
+    def respond(prompt: str) -> str:
+        client = get_client(resolve_api_key())
+        resp = client.models.generate_content(
+            model=model,
+            contents=prompt,
+            config=get_generate_config(
+                temperature=0.0,
+                max_output_tokens=65536,
+                response_mime_type="application/json",
+                block_none_safety=True,
+            ),
+        )
+        text = resp.text or ""
+        store.add(prompt_sha256(prompt), text)
+        return text
+
+    return respond
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Stand-in HTTP do provedor LLM.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=DEFAULT_PORT)
+    ap.add_argument("--replay", help="Arquivo JSONL de respostas gravadas.")
+    ap.add_argument(
+        "--record",
+        action="store_true",
+        help="Prompts sem gravação vão ao Gemini real e são gravados em --replay.",
+    )
+    ap.add_argument("--record-model", default="gemini-2.5-flash")
+    ap.add_argument(
+        "--fallback",
+        choices=["echo", "file", "none"],
+        default="echo",
+        help="Resposta para prompt sem gravação (none = 404).",
+    )
+    ap.add_argument("--fallback-file", help="Resposta fixa (com --fallback file).")
+    ap.add_argument("--latency-ms", type=float, default=0.0)
+    ap.add_argument("--jitter-ms", type=float, default=0.0)
+    ap.add_argument("--rate-429", type=float, default=0.0)
+    ap.add_argument("--rate-truncated", type=float, default=0.0)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--min-cache-tokens", type=int, default=1024)
+    args = ap.parse_args()
+
+    store = ReplayStore(args.replay)
+    fallback: Optional[Callable[[str], str]] = default_responder
+    if args.record:
+        if not args.replay:
+            ap.error("--record exige --replay")
+        fallback = _gemini_recorder(store, args.record_model)
+    elif args.fallback == "file":
+        if not args.fallback_file:
+            ap.error("--fallback file exige --fallback-file")
+        with open(args.fallback_file, "r", encoding="utf-8") as f:
+            fixed = f.read()
+        fallback = lambda _prompt: fixed  # noqa: E731
+    elif args.fallback == "none":
+        fallback = None
+
+    server = StandInServer(
+        (args.host, args.port),
+        store=store,
+        faults=FaultPlan(
+            latency_ms=args.latency_ms,
+            jitter_ms=args.jitter_ms,
+            rate_429=args.rate_429,
+            rate_truncated=args.rate_truncated,
+            seed=args.seed,
+        ),
+        fallback=fallback,
+        min_cache_tokens=args.min_cache_tokens,
+    )
+    print(f"[standin] {server.base_url} ({len(store)} gravação(ões))")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"[standin] {asdict(server.stats)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+scripts/markdown_chunks.py
+
+Map-reduce de extração para documentos grandes.
+
+- split_at_folhas: divide o markdown do PDFTranscriber nas âncoras
+  "## [[Folha N]]" (e nos separadores "--- DOC: ... ---" do modo
+  consolidado), agrupando folhas consecutivas até `max_chars` por trecho. Uma
+  folha nunca é cortada ao meio; o cabeçalho do documento (antes da primeira
+  folha) é repetido em todos os trechos.
+- merge_partials: junta os JSONs parciais de cada trecho, na ordem dos
+  trechos. Listas com chave (ex.: hipotecas_onus por registro_ou_averbacao)
+  unem itens do mesmo registro que aparecem em dois trechos; nos demais
+  campos vale o primeiro valor não vazio.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import re
+from typing import Any, Dict, List, Optional, Sequence
+
+ANCHOR_RE = re.compile(r"(?m)^(?:## \[\[Folha \d+\]\]|--- DOC: .* ---$)")
+
+
+def split_at_folhas(markdown: str, max_chars: int) -> List[str]:
+    """Trechos de até ~max_chars; um único trecho se o documento já couber."""
+    if len(markdown) <= max_chars:
+        return [markdown]
+
+    starts = [m.start() for m in ANCHOR_RE.finditer(markdown)]
+    if not starts:
+        return [markdown]
+
+    preamble = markdown[: starts[0]]
+    sections = [
+        markdown[a:b] for a, b in zip(starts, starts[1:] + [len(markdown)])
+    ]
+
+    chunks: List[str] = []
+    cur = ""
+    budget = max(1, max_chars - len(preamble))
+    for sec in sections:
+        if cur and len(cur) + len(sec) > budget:
+            chunks.append(preamble + cur)
+            cur = ""
+        cur += sec
+    if cur:
+        chunks.append(preamble + cur)
+    return chunks
+
+
+def _is_empty(v: Any) -> bool:
+    return v is None or v == "" or v == [] or v == {}
+
+
+def _canon(v: Any) -> str:
+    return json.dumps(v, sort_keys=True, ensure_ascii=False)
+
+
+def _merge_dict(acc: Dict[str, Any], new: Dict[str, Any]) -> None:
+    for k, v in new.items():
+        if k not in acc or _is_empty(acc[k]):
+            acc[k] = copy.deepcopy(v)
+        elif isinstance(acc[k], dict) and isinstance(v, dict):
+            _merge_dict(acc[k], v)
+        elif isinstance(acc[k], list) and isinstance(v, list):
+            _merge_list(acc[k], v)
+
+
+def _merge_list(acc: List[Any], new: List[Any]) -> None:
+    seen = {_canon(x) for x in acc}
+    for x in new:
+        c = _canon(x)
+        if c not in seen:
+            acc.append(copy.deepcopy(x))
+            seen.add(c)
+
+
+def _item_key(item: Any, key_fields: Sequence[str]) -> Optional[str]:
+    if not isinstance(item, dict):
+        return None
+    for f in key_fields:
+        v = item.get(f)
+        if isinstance(v, str) and v.strip():
+            return re.sub(r"\s+", "", v).upper()
+    return None
+
+
+def _merge_keyed_list(
+    acc: List[Any], new: List[Any], key_fields: Sequence[str]
+) -> None:
+    index = {}
+    for item in acc:
+        k = _item_key(item, key_fields)
+        if k is not None:
+            index.setdefault(k, item)
+    seen = {_canon(x) for x in acc}
+
+    for item in new:
+        k = _item_key(item, key_fields)
+        if k is not None and k in index:
+            _merge_dict(index[k], item)
+            continue
+        c = _canon(item)
+        if c in seen:
+            continue
+        item = copy.deepcopy(item)
+        acc.append(item)
+        seen.add(c)
+        if k is not None:
+            index[k] = item
+
+
+def merge_partials(
+    partials: Sequence[Dict[str, Any]],
+    keyed_lists: Optional[Dict[str, Sequence[str]]] = None,
+) -> Dict[str, Any]:
+    """
+    Junta os parciais na ordem dada (determinístico). `keyed_lists` mapeia
+    campo de lista -> campos de identificação do item, em ordem de preferência.
+    """
+    keyed_lists = keyed_lists or {}
+    out: Dict[str, Any] = {}
+    for part in partials:
+        for k, v in part.items():
+            if k in keyed_lists and isinstance(v, list):
+                cur = out.setdefault(k, [])
+                if isinstance(cur, list):
+                    _merge_keyed_list(cur, v, keyed_lists[k])
+                    continue
+            if k not in out or _is_empty(out[k]):
+                out[k] = copy.deepcopy(v)
+            elif isinstance(out[k], dict) and isinstance(v, dict):
+                _merge_dict(out[k], v)
+            elif isinstance(out[k], list) and isinstance(v, list):
+                _merge_list(out[k], v)
+    return out
@@ -0,0 +1,267 @@
+"""
+scripts/ptbr_parse.py
+
+Parsing compartilhado de datas e valores monetários em pt-BR, usado por
+todos os estágios (collectors, normalize, monetary, reconciler).
+
+Formatos de data:
+  - ISO: "2001-03-29"
+  - numérico: "29/03/2001", "29-03-01"
+  - por extenso: "24 de Abril de 1.996", "14 de março de 2001."
+
+Valores: o PRIMEIRO valor do texto, em ordem de preferência pt-BR
+("93.354,27", "93354,27"), decimal por ponto ("93,354.27", "93354.27") e
+inteiro ("600000", "12.345"); o texto por extenso e demais ruídos são
+ignorados ("R$93.354,27-(noventa e três mil, ...)"). Um valor não termina
+no meio de dígitos: "1.234,567" não é 1.234,56.
+
+As mesmas regras valem para todos os estágios; só há duas escolhas, que
+mudam o significado do campo:
+  - parse_data(busca=False): o texto inteiro deve ser a data (normalize,
+    que reescreve o campo), em vez de procurá-la no meio do texto;
+  - parse_valor(so_brl=True): só o padrão pt-BR com vírgula decimal
+    (collector-cad_obr, monetary), sem os fallbacks de ponto e inteiro.
+Ano com 2 dígitos: <= PIVO_ANO vira 20xx, > PIVO_ANO vira 19xx.
+
+Ao juntar os parsers de cada estágio nestas regras, mudaram (fixado em
+tests/test_ptbr_parse.py):
+  - todos aceitam ISO, dd/mm/aa(aa) e dd-mm-aa(aa), além da data por
+    extenso com mês em qualquer caixa/acentuação ("24 DE ABRIL DE 1996");
+  - ano só com 2 ou 4 dígitos ("de 199" não é mais o ano 199; "de 96" é
+    1996, não o ano 96) e 2 dígitos pelo PIVO_ANO ("05/01/05" é 2005);
+  - "93354,27" é 93.354,27 no monetary (antes lia "354,27"); "93,354.27" é
+    93.354,27 no normalize/reconciler (antes 93,35) e vira None nos
+    estágios só pt-BR; "R$ 12.345" é 12.345 (antes 12,34 ou 12);
+  - collector-proc lê o primeiro valor como os demais (antes juntava todos
+    os dígitos do texto: "R$ 1.234" era 1,234).
+
+Os padrões são compilados uma vez e o resultado de cada texto é memorizado
+(LRU limitado a CACHE_SIZE entradas): os mesmos "24 de Abril de 1.996"
+aparecem milhares de vezes por execução. `date` e `Decimal` são imutáveis,
+então o valor em cache pode ser devolvido sem cópia. As APIs em lote
+(parse_datas, parse_valores) resolvem cada texto distinto uma única vez.
+
+Microbenchmark: scripts/bench_parse.py.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from datetime import date
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation, localcontext
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional
+
+# Entradas por cache (datas, ISO, valores).
+CACHE_SIZE = 8192
+
+MESES = {
+    "janeiro": 1,
+    "fevereiro": 2,
+    "marco": 3,
+    "abril": 4,
+    "maio": 5,
+    "junho": 6,
+    "julho": 7,
+    "agosto": 8,
+    "setembro": 9,
+    "outubro": 10,
+    "novembro": 11,
+    "dezembro": 12,
+}
+
+ISO_RE = re.compile(r"(\d{4})-(\d{2})-(\d{2})")
+DMY_RE = re.compile(r"(\d{1,2})[/-](\d{1,2})[/-](\d{2,4})")
+EXTENSO_RE = re.compile(
+    r"(\d{1,2})\s+de\s+([A-Za-z\u00C0-\u017F]+)\s+de\s+(\d[\d\.]{1,5})",
+    re.IGNORECASE,
+)
+# Variante para o texto inteiro (tolera ponto final: "... de 2001.")
+EXTENSO_INTEIRO_RE = re.compile(EXTENSO_RE.pattern + r"\s*\.?", re.IGNORECASE)
+
+VALOR_BRL_RE = re.compile(r"(\d{1,3}(?:\.\d{3})+,\d{2}|\d+,\d{2})(?!\d)")
+VALOR_PONTO_RE = re.compile(r"(\d{1,3}(?:,\d{3})+\.\d{2}|\d+\.\d{2})(?!\d)")
+VALOR_INTEIRO_RE = re.compile(r"(\d{1,3}(?:\.\d{3})+(?!\d)|\d+)")
+
+# Ano com 2 dígitos: <= PIVO_ANO vira 20xx; > PIVO_ANO vira 19xx.
+PIVO_ANO = 30
+
+_NAO_DIGITO_RE = re.compile(r"\D+")
+
+
+def sem_acentos(s: str) -> str:
+    s = unicodedata.normalize("NFD", s)
+    return "".join(ch for ch in s if unicodedata.category(ch) != "Mn")
+
+
+def _ano(txt: str) -> Optional[int]:
+    """Ano com 4 dígitos ("1.996" -> 1996) ou 2 dígitos (pelo PIVO_ANO)."""
+    digitos = _NAO_DIGITO_RE.sub("", txt)
+    if len(digitos) == 4:
+        return int(digitos)
+    if len(digitos) == 2:
+        yy = int(digitos)
+        return 2000 + yy if yy <= PIVO_ANO else 1900 + yy
+    return None
+
+
+def _montar(ano: Optional[int], mes: Optional[int], dia: int) -> Optional[date]:
+    if ano is None or mes is None:
+        return None
+    try:
+        return date(ano, mes, dia)
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse_data(s: str, busca: bool) -> Optional[date]:
+    m = ISO_RE.fullmatch(s)
+    if m:
+        return _montar(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+
+    m = DMY_RE.fullmatch(s)
+    if m:
+        return _montar(_ano(m.group(3)), int(m.group(2)), int(m.group(1)))
+
+    m = EXTENSO_RE.search(s) if busca else EXTENSO_INTEIRO_RE.fullmatch(s)
+    if m:
+        mes = MESES.get(sem_acentos(m.group(2)).lower())
+        return _montar(_ano(m.group(3)), mes, int(m.group(1)))
+    return None
+
+
+def parse_data(raw: Any, busca: bool = True) -> Optional[date]:
+    """
+    Data de um texto em pt-BR, ou None.
+
+    - busca: a data por extenso pode estar no meio do texto ("registrado em
+      24 de abril de 1.996, ..."); com False, o texto inteiro deve ser a data.
+    """
+    if not isinstance(raw, str):
+        return None
+    s = raw.strip()
+    if not s:
+        return None
+    return _parse_data(s, busca)
+
+
+def parse_data_iso(raw: Any, busca: bool = True) -> Optional[str]:
+    """Como parse_data, em "YYYY-MM-DD"."""
+    d = parse_data(raw, busca)
+    return d.isoformat() if d is not None else None
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse_iso(s: str) -> Optional[date]:
+    m = ISO_RE.fullmatch(s)
+    if not m:
+        return None
+    return _montar(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+
+
+def parse_iso(raw: Any) -> Optional[date]:
+    """Só "YYYY-MM-DD" (campos já normalizados); qualquer outro texto -> None."""
+    if not isinstance(raw, str):
+        return None
+    return _parse_iso(raw.strip())
+
+
+def _decimal(txt: str) -> Optional[Decimal]:
+    try:
+        return Decimal(txt)
+    except InvalidOperation:
+        return None
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse_valor(s: str, so_brl: bool) -> Optional[Decimal]:
+    m = VALOR_BRL_RE.search(s)
+    if m:
+        return Decimal(m.group(1).replace(".", "").replace(",", "."))
+    if so_brl:
+        return None
+
+    m = VALOR_PONTO_RE.search(s)
+    if m:
+        return Decimal(m.group(1).replace(",", ""))
+
+    m = VALOR_INTEIRO_RE.search(s)
+    if m:
+        return Decimal(m.group(1).replace(".", ""))
+    return None
+
+
+def parse_valor(raw: Any, so_brl: bool = False) -> Optional[Decimal]:
+    """
+    Primeiro valor monetário do texto, em Decimal (reais), ou None.
+
+    Números (int/float) passam direto. Com so_brl=True, só o padrão pt-BR com
+    vírgula decimal é aceito (sem os fallbacks de ponto/inteiro).
+    """
+    if raw is None:
+        return None
+    if isinstance(raw, (int, float)):
+        return _decimal(str(raw))
+    s = str(raw).strip()
+    if not s:
+        return None
+    return _parse_valor(s, so_brl)
+
+
+def parse_valor_centavos(raw: Any, so_brl: bool = False) -> Optional[int]:
+    """Como parse_valor, em centavos (int), arredondando HALF_UP."""
+    v = parse_valor(raw, so_brl)
+    if v is None:
+        return None
+    # precisão do contexto >= dígitos do valor: inteiros longos não estouram
+    with localcontext() as ctx:
+        ctx.prec = max(ctx.prec, len(v.as_tuple().digits) + 3)
+        return int(v.scaleb(2).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def _em_lote(valores: Iterable[Any], fn: Any, **kwargs: Any) -> List[Any]:
+    """Aplica fn a cada valor, resolvendo cada texto distinto uma única vez."""
+    vistos: Dict[Any, Any] = {}
+    out: List[Any] = []
+    for v in valores:
+        if isinstance(v, str):
+            try:
+                out.append(vistos[v])
+            except KeyError:
+                r = vistos[v] = fn(v, **kwargs)
+                out.append(r)
+        else:
+            out.append(fn(v, **kwargs))
+    return out
+
+
+def parse_datas(valores: Iterable[Any], busca: bool = True) -> List[Optional[date]]:
+    """parse_data em lote (mesma ordem da entrada)."""
+    return _em_lote(valores, parse_data, busca=busca)
+
+
+def parse_datas_iso(valores: Iterable[Any], busca: bool = True) -> List[Optional[str]]:
+    """parse_data_iso em lote (mesma ordem da entrada)."""
+    return _em_lote(valores, parse_data_iso, busca=busca)
+
+
+def parse_valores(valores: Iterable[Any], so_brl: bool = False) -> List[Optional[Decimal]]:
+    """parse_valor em lote (mesma ordem da entrada)."""
+    return _em_lote(valores, parse_valor, so_brl=so_brl)
+
+
+def cache_info() -> Dict[str, Any]:
+    """Estatísticas dos caches (acertos/faltas/tamanho), para diagnóstico."""
+    return {
+        "datas": _parse_data.cache_info()._asdict(),
+        "iso": _parse_iso.cache_info()._asdict(),
+        "valores": _parse_valor.cache_info()._asdict(),
+    }
+
+
+def limpar_cache() -> None:
+    _parse_data.cache_clear()
+    _parse_iso.cache_clear()
+    _parse_valor.cache_clear()
@@ -0,0 +1,109 @@
+"""
+scripts/transcriber_ocr.py
+
+Faixa de OCR do PDFTranscriber para páginas sem camada de texto (certidões
+digitalizadas): a página é rasterizada com pdf2image e lida pelo Tesseract
+(pytesseract), num pool de processos próprio e limitado. O pool de extração
+de texto segue livre; só a gravação da folha digitalizada espera o OCR.
+
+Dependências opcionais: pytesseract + o binário tesseract (com o idioma
+"por") e o poppler usado pelo pdf2image.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Optional, Set, Tuple
+
+# (arquivo, índice da página)
+PageKey = Tuple[int, int]
+
+
+@dataclass(frozen=True)
+class OcrSettings:
+    # páginas com menos caracteres (sem espaços) que isso vão para o OCR
+    min_chars: int = 20
+    dpi: int = 300
+    lang: str = "por"
+    workers: int = 2
+
+    def tag(self) -> str:
+        """Parte da chave do cache de páginas (texto com OCR é outro texto)."""
+        return f"ocr(tesseract,{self.lang},{self.dpi}dpi,<{self.min_chars})"
+
+    def needs_ocr(self, text: str) -> bool:
+        return len("".join((text or "").split())) < self.min_chars
+
+
+def ocr_available() -> Optional[str]:
+    """None se o OCR pode rodar; senão, o motivo."""
+    try:
+        import pdf2image  # noqa: F401
+        import pytesseract
+    except ImportError as e:
+        return f"Dependência ausente: {e.name}. Execute: pip install pytesseract pdf2image"
+    try:
+        pytesseract.get_tesseract_version()
+    except Exception as e:
+        return f"Tesseract indisponível: {e}"
+    return None
+
+
+def ocr_page(pdf_path: str, page_index: int, dpi: int, lang: str) -> Tuple[str, float]:
+    """(texto, segundos) de uma página (executa nos processos do pool de OCR)."""
+    from pdf2image import convert_from_path
+    import pytesseract
+
+    t0 = time.perf_counter()
+    images = convert_from_path(
+        pdf_path, dpi=dpi, first_page=page_index + 1, last_page=page_index + 1
+    )
+    text = pytesseract.image_to_string(images[0], lang=lang) if images else ""
+    return text, time.perf_counter() - t0
+
+
+class OcrLane:
+    """
+    Pool de OCR de uma conversão. `prefetch` agenda o OCR assim que o bloco
+    de texto da página fica pronto (antes de a gravação chegar nela); `take`
+    devolve o Future na hora de gravar, agendando se ainda não foi. Cada
+    página é lida uma única vez.
+    """
+
+    def __init__(self, settings: OcrSettings):
+        self.settings = settings
+        self._pool = ProcessPoolExecutor(max_workers=max(1, settings.workers))
+        self._lock = threading.Lock()
+        self._futures: Dict[PageKey, Future] = {}
+        self._taken: Set[PageKey] = set()
+        self._closed = False
+
+    def _submit(self, pdf_path: str, page_index: int) -> Future:
+        return self._pool.submit(
+            ocr_page, pdf_path, page_index, self.settings.dpi, self.settings.lang
+        )
+
+    def prefetch(self, key: PageKey, pdf_path: str) -> None:
+        with self._lock:
+            if self._closed or key in self._taken or key in self._futures:
+                return
+            self._futures[key] = self._submit(pdf_path, key[1])
+
+    def take(self, key: PageKey, pdf_path: str) -> Future:
+        with self._lock:
+            self._taken.add(key)
+            fut = self._futures.pop(key, None)
+            if fut is None:
+                fut = self._submit(pdf_path, key[1])
+            return fut
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            for fut in self._futures.values():
+                fut.cancel()
+            self._futures.clear()
+        self._pool.shutdown(wait=True)
@@ -1,96 +1,564 @@
+import hashlib
 import logging
+import os
+import re
+import shutil
+import sys
+import tempfile
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import (
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
 import fitz  # PyMuPDF
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from scripts.transcriber_ocr import OcrLane, OcrSettings  # noqa: E402
+from scripts.transcription_cache import (  # noqa: E402
+    COMMIT_EVERY,
+    STATUS_DONE,
+    PageCache,
+    missing_runs,
+    open_readonly,
+    sha256_file,
+)
+
 # Configuração de Logs
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - [TRANSCRIBER] %(message)s"
 )
 logger = logging.getLogger(__name__)
 
+# Páginas por tarefa do pool de processos: grande o bastante para amortizar a
+# abertura do PDF em cada processo, pequeno o bastante para dividir autos de
+# 1.000+ folhas entre todos os núcleos.
+PAGES_PER_TASK = 32
+
+# Blocos em andamento por processo: mantém o pool ocupado sem acumular em
+# memória páginas que ainda não podem ser gravadas (ordem das folhas).
+BLOCKS_IN_FLIGHT_PER_WORKER = 2
+
+# Identifica a forma de extração no cache de páginas: mudar a extração (não a
+# formatação do .md) exige outro valor.
+EXTRACTOR = f"pymupdf-{getattr(fitz, 'VersionBind', '?')}:get_text"
+
+# (texto da página, impressão digital da página ou None sem cache,
+#  página sem camada de texto que deve ir para o OCR,
+#  segundos de OCR quando o texto veio do cache já lido por OCR)
+PageText = Tuple[str, Optional[str], bool, Optional[float]]
+
+
+def extractor_tag(ocr: Optional[OcrSettings] = None) -> str:
+    """Valor de `extractor` do cache de páginas para esta configuração."""
+    return f"{EXTRACTOR}+{ocr.tag()}" if ocr is not None else EXTRACTOR
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+def _page_count(pdf_path: str) -> int:
+    doc = fitz.open(pdf_path)
+    try:
+        return len(doc)
+    finally:
+        doc.close()
+
+
+_REF = re.compile(rb"(\d+) 0 R")
+# Referências "para cima" (página-mãe, página da anotação): fora do conteúdo.
+_BACKREF = re.compile(rb"/(?:Parent|P)\s+\d+ 0 R")
+
+
+def _page_resources(doc, page) -> bytes:
+    """Dicionário /Resources da página, herdado da árvore de páginas se preciso."""
+    xref = page.xref
+    while xref:
+        kind, value = doc.xref_get_key(xref, "Resources")
+        if kind not in ("null", "undefined"):
+            return value.encode("utf-8")
+        kind, value = doc.xref_get_key(xref, "Parent")
+        xref = int(value.split()[0]) if kind == "xref" else 0
+    return b""
+
+
+def _page_fingerprint(doc, page, memo: Optional[Dict[int, bytes]] = None) -> str:
+    """
+    sha256 do conteúdo da própria página: geometria, stream de desenho e tudo
+    o que o dicionário /Resources alcança (Form XObjects e os recursos deles,
+    imagens, fontes), em profundidade. Cada objeto entra pelo digest do seu
+    conteúdo, com as referências a outros objetos trocadas pelo digest deles,
+    então a mesma folha em outro PDF (o mesmo auto reenviado com folhas
+    acrescentadas) tem a mesma impressão digital; páginas só com `q /Fx0 Do Q`
+    diferem pelo conteúdo do XObject.
+
+    `memo` (xref -> digest) é do documento: com o mesmo dict para todas as
+    páginas, fontes, imagens e XObjects compartilhados são lidos e hasheados
+    uma vez só. Uma referência circular entra como marcador fixo.
+    """
+    memo = {} if memo is None else memo
+    em_curso: Set[int] = set()
+
+    def canonico(texto: bytes) -> bytes:
+        return _REF.sub(lambda m: b"#" + digest(int(m.group(1))), _BACKREF.sub(b"", texto))
+
+    def digest(xref: int) -> bytes:
+        d = memo.get(xref)
+        if d is not None:
+            return d
+        if xref in em_curso:
+            return b"ciclo"
+        em_curso.add(xref)
+        h = hashlib.sha256(canonico(doc.xref_object(xref, compressed=True).encode("utf-8")))
+        if doc.xref_is_stream(xref):
+            h.update(b"|")
+            h.update(doc.xref_stream_raw(xref) or b"")
+        em_curso.discard(xref)
+        d = memo[xref] = h.hexdigest().encode("ascii")
+        return d
+
+    h = hashlib.sha256()
+    h.update(f"{page.rotation}|{tuple(page.rect)}|".encode("utf-8"))
+    h.update(page.read_contents() or b"")
+    h.update(canonico(_page_resources(doc, page)))
+    return h.hexdigest()
+
+
+def _extract_pages(
+    pdf_path: str,
+    indices: Sequence[int],
+    cache_path: Optional[str] = None,
+    extractor: str = EXTRACTOR,
+    ocr: Optional[OcrSettings] = None,
+) -> List[PageText]:
+    """
+    Texto das páginas `indices` (executa nos processos do pool). Com cache,
+    página já transcrita em outro PDF (mesma impressão digital) não é
+    extraída de novo. Com `ocr`, marca as páginas com pouco texto.
+    """
+    lookup = open_readonly(cache_path, extractor) if cache_path else None
+    doc = fitz.open(pdf_path)
+    try:
+        out: List[PageText] = []
+        memo: Dict[int, bytes] = {}
+        for i in indices:
+            page = doc[i]
+            fp = _page_fingerprint(doc, page, memo) if lookup is not None else None
+            hit = lookup.get_by_page_sha(fp) if lookup is not None else None
+            if hit is not None:
+                out.append((hit[0], fp, False, hit[1]))
+                continue
+            text = page.get_text()
+            out.append((text, fp, ocr is not None and ocr.needs_ocr(text), None))
+        return out
+    finally:
+        doc.close()
+
+
+class MarkdownWriter:
+    """
+    Grava o Markdown de um PDF página a página, num arquivo temporário na
+    mesma pasta, renomeado para o destino só ao final (os.replace, atômico).
+    Uma execução interrompida nunca deixa um .md pela metade que o
+    `transcrever` pularia como "já existe".
+
+        with MarkdownWriter(target, "autos.pdf", total_pages) as w:
+            for text in pages:
+                w.page(text)
+    """
+
+    def __init__(self, target_file: Path, name: str, total_pages: int):
+        self.target_file = Path(target_file)
+        self.name = name
+        self.total_pages = total_pages
+        self.pages_written = 0
+        # (folha, segundos) das páginas lidas por OCR, listadas no cabeçalho
+        self.ocr_times: List[Tuple[int, float]] = []
+        self._tmp_path: Optional[str] = None
+        self._f = None
+
+    def __enter__(self) -> "MarkdownWriter":
+        fd, self._tmp_path = tempfile.mkstemp(
+            prefix=f".{self.target_file.name}.",
+            suffix=".tmp",
+            dir=str(self.target_file.parent),
+        )
+        self._f = os.fdopen(fd, "w", encoding="utf-8")
+
+        # Cabeçalho do Documento
+        self._f.write(self._head())
+        self._f.write("---\n")
+        return self
+
+    def _head(self) -> str:
+        return f"# Documento: {self.name}**Total de Páginas:** {self.total_pages}\n"
+
+    def page(self, text: str, ocr_seconds: Optional[float] = None) -> None:
+        if ocr_seconds is not None:
+            self.ocr_times.append((self.pages_written, ocr_seconds))
+        # --- O PULO DO GATO DA ANCORAGEM ---
+        # Inserimos um marcador claro antes do texto da página
+        self._f.write(f"\n\n## [[Folha {self.pages_written}]]\n")
+        self._f.write(text)
+        self._f.write("\n---")  # Separador visual
+        self.pages_written += 1
+
+    def _rewrite_with_ocr_header(self) -> None:
+        # O cabeçalho é gravado antes das páginas; com OCR, o resumo só existe
+        # no final, então o arquivo é recopiado com ele (só nesses documentos).
+        total = sum(t for _, t in self.ocr_times)
+        lines = [f"**OCR:** {len(self.ocr_times)} página(s), {total:.2f}s\n"]
+        lines += [f"- Folha {i}: {t:.2f}s\n" for i, t in self.ocr_times]
+        fd, new_tmp = tempfile.mkstemp(
+            prefix=f".{self.target_file.name}.",
+            suffix=".tmp",
+            dir=str(self.target_file.parent),
+        )
+        try:
+            with os.fdopen(fd, "wb") as out, open(self._tmp_path, "rb") as body:
+                out.write((self._head() + "".join(lines)).encode("utf-8"))
+                body.seek(len(self._head().encode("utf-8")))
+                shutil.copyfileobj(body, out)
+        except BaseException:
+            os.unlink(new_tmp)
+            raise
+        os.unlink(self._tmp_path)
+        self._tmp_path = new_tmp
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._f.close()
+        if exc_type is None and self.pages_written == self.total_pages:
+            try:
+                if self.ocr_times:
+                    self._rewrite_with_ocr_header()
+                os.replace(self._tmp_path, self.target_file)
+            except BaseException:
+                os.unlink(self._tmp_path)
+                raise
+            return
+        os.unlink(self._tmp_path)
+        if exc_type is None:
+            raise RuntimeError(
+                f"{self.name}: {self.pages_written} de {self.total_pages} páginas gravadas"
+            )
+
+
+@dataclass
+class _FilePlan:
+    input_file: Path
+    target_file: Path
+    total: int
+    pdf_sha: Optional[str] = None
+    cached: Set[int] = field(default_factory=set)
+    # blocos de páginas a extrair (sem cache: todas)
+    runs: List[List[int]] = field(default_factory=list)
+
 
 class PDFTranscriber:
-    def __init__(self, output_dir: str = "data/anexos"):
+    def __init__(
+        self,
+        output_dir: str = "data/anexos",
+        cache: Optional[PageCache] = None,
+        ocr: Optional[OcrSettings] = None,
+    ):
         """
         Utilitário para converter PDFs em Markdown com paginação explícita.
 
         Args:
             output_dir: Pasta onde os arquivos .md serão salvos.
+            cache: Cache de páginas/journal (scripts/transcription_cache.py);
+                páginas já transcritas não são extraídas de novo e uma
+                conversão interrompida continua de onde parou. O `extractor`
+                do cache deve ser extractor_tag(ocr).
+            ocr: Páginas sem camada de texto vão para o OCR
+                (scripts/transcriber_ocr.py), num pool próprio.
         """
         self.output_path = Path(output_dir)
         self.output_path.mkdir(parents=True, exist_ok=True)
+        self.cache = cache
+        self.ocr = ocr
 
-    def convert(self, pdf_path: str, filename_output: Optional[str] = None) -> str:
+    def _extract_args(self) -> Tuple[Optional[str], str, Optional[OcrSettings]]:
+        if self.cache is None:
+            return None, extractor_tag(self.ocr), self.ocr
+        return self.cache.path, self.cache.extractor, self.ocr
+
+    def _target(self, input_file: Path, filename_output: Optional[str]) -> Path:
+        # Define nome de saída
+        if not filename_output:
+            filename_output = input_file.stem + ".md"
+        return self.output_path / filename_output
+
+    def _plan(self, pdf_path: str, filename_output: Optional[str]) -> _FilePlan:
+        input_file = Path(pdf_path)
+
+        if not input_file.exists():
+            raise FileNotFoundError(f"Arquivo não encontrado: {pdf_path}")
+
+        plan = _FilePlan(
+            input_file=input_file,
+            target_file=self._target(input_file, filename_output),
+            total=_page_count(str(input_file)),
+        )
+        if self.cache is not None:
+            plan.pdf_sha = sha256_file(str(input_file))
+            plan.cached = self.cache.cached_indices(plan.pdf_sha) & set(range(plan.total))
+            if plan.cached:
+                logger.info(
+                    f"'{input_file.name}': {len(plan.cached)} de {plan.total} "
+                    "página(s) já no cache."
+                )
+        plan.runs = missing_runs(plan.total, plan.cached, PAGES_PER_TASK)
+        return plan
+
+    def _pages(
+        self,
+        plan: _FilePlan,
+        fresh: Iterator[PageText],
+        idx: int = 0,
+        lane: Optional[OcrLane] = None,
+    ) -> Iterator[Tuple[str, Optional[float]]]:
+        """
+        (texto, segundos de OCR ou None) das páginas em ordem: do cache ou de
+        `fresh` (as não cacheadas, em ordem). Página marcada para OCR espera o
+        resultado da faixa de OCR. Com cache, cada página nova é gravada nele
+        (com o tempo de OCR, que volta ao cabeçalho nas próximas conversões),
+        salvo as de OCR que falhou, e o journal avança a cada COMMIT_EVERY páginas.
+        """
+        cache = self.cache
+        for i in range(plan.total):
+            hit = cache.get(plan.pdf_sha, i) if i in plan.cached else None
+            if hit is not None:
+                text, ocr_seconds = hit
+            else:
+                text, fp, low_text, ocr_seconds = next(fresh)
+                ocr_failed = False
+                if low_text and lane is not None:
+                    try:
+                        ocr_text, ocr_seconds = lane.take(
+                            (idx, i), str(plan.input_file)
+                        ).result()
+                        if ocr_text.strip():
+                            text = ocr_text
+                    except Exception as e:
+                        ocr_failed = True
+                        logger.warning(
+                            f"OCR falhou em '{plan.input_file.name}', folha {i}: {e}"
+                        )
+                # Falha de OCR não vai ao cache: a folha é tentada de novo na
+                # próxima conversão (aqui sai só a camada de texto).
+                if cache is not None and not ocr_failed:
+                    cache.put(plan.pdf_sha, i, text, fp, ocr_seconds)
+            if cache is not None and (i + 1) % COMMIT_EVERY == 0:
+                cache.journal_update(
+                    str(plan.target_file),
+                    str(plan.input_file),
+                    plan.pdf_sha,
+                    plan.total,
+                    i + 1,
+                )
+            yield text, ocr_seconds
+
+    def _write(
+        self,
+        plan: _FilePlan,
+        fresh: Iterator[PageText],
+        idx: int = 0,
+        lane: Optional[OcrLane] = None,
+    ) -> str:
+        with MarkdownWriter(plan.target_file, plan.input_file.name, plan.total) as w:
+            for text, ocr_seconds in self._pages(plan, fresh, idx, lane):
+                w.page(text, ocr_seconds)
+        if w.ocr_times:
+            logger.info(
+                f"'{plan.input_file.name}': {len(w.ocr_times)} página(s) lidas por OCR."
+            )
+        if self.cache is not None:
+            self.cache.journal_update(
+                str(plan.target_file),
+                str(plan.input_file),
+                plan.pdf_sha,
+                plan.total,
+                plan.total,
+                STATUS_DONE,
+            )
+        logger.info(f"Sucesso! Salvo em: {plan.target_file}")
+        return str(plan.target_file)
+
+    def convert(
+        self, pdf_path: str, filename_output: Optional[str] = None, workers: int = 1
+    ) -> str:
         """
         Converte um PDF para Markdown inserindo marcadores de folha.
 
+        Cada página é gravada assim que extraída (memória constante mesmo em
+        autos de milhares de folhas) e o .md só aparece no destino completo.
+
         Args:
             pdf_path: Caminho do arquivo PDF original.
             filename_output: Nome do arquivo de saída (opcional).
+            workers: Processos para extrair as páginas (1 = no próprio processo).
 
         Returns:
             Caminho do arquivo .md gerado.
         """
+        if workers > 1:
+            _, result = next(
+                self.convert_many([pdf_path], workers, [filename_output])
+            )
+            if isinstance(result, Exception):
+                raise result
+            return result
+
         input_file = Path(pdf_path)
 
         if not input_file.exists():
             raise FileNotFoundError(f"Arquivo não encontrado: {pdf_path}")
 
-        # Define nome de saída
-        if not filename_output:
-            filename_output = input_file.stem + ".md"
-
-        target_file = self.output_path / filename_output
-
         logger.info(f"Iniciando conversão de '{input_file.name}'...")
 
+        lane = OcrLane(self.ocr) if self.ocr is not None else None
         try:
-            # Abre o PDF
-            doc = fitz.open(input_file)
-            markdown_content = []
+            plan = self._plan(pdf_path, filename_output)
+            return self._write(plan, self._serial_blocks(plan, lane), 0, lane)
+        except Exception as e:
+            logger.error(f"Erro ao converter {input_file.name}: {e}")
+            raise e
+        finally:
+            if lane is not None:
+                lane.close()
+
+    def _serial_blocks(
+        self, plan: _FilePlan, lane: Optional[OcrLane]
+    ) -> Iterator[PageText]:
+        """Blocos de PAGES_PER_TASK páginas extraídos no próprio processo."""
+        pdf_path = str(plan.input_file)
+        for run in plan.runs:
+            block = _extract_pages(pdf_path, run, *self._extract_args())
+            if lane is not None:
+                for i, (_, _, low_text, _) in zip(run, block):
+                    if low_text:
+                        lane.prefetch((0, i), pdf_path)
+            yield from block
+
+    def convert_many(
+        self,
+        pdf_paths: Sequence[str],
+        workers: Optional[int] = None,
+        filenames_output: Optional[Sequence[Optional[str]]] = None,
+    ) -> Iterator[Tuple[str, Union[str, Exception]]]:
+        """
+        Converte vários PDFs num único pool de processos, dividindo cada PDF em
+        blocos de PAGES_PER_TASK páginas: o pool fica ocupado tanto com um
+        PDF enorme quanto com muitos PDFs pequenos.
 
-            # Cabeçalho do Documento
-            markdown_content.append(f"# Documento: {input_file.name}")
-            markdown_content.append(f"**Total de Páginas:** {len(doc)}\n")
-            markdown_content.append("---\n")
+        Os blocos são enviados em ordem, com no máximo
+        workers * BLOCKS_IN_FLIGHT_PER_WORKER em andamento, e gravados assim
+        que o bloco anterior do mesmo arquivo foi gravado (MarkdownWriter).
+        Os arquivos são devolvidos na ordem de `pdf_paths`, como
+        (pdf_path, caminho do .md) ou (pdf_path, exceção) — a falha de um
+        arquivo não interrompe os demais.
+        """
+        workers = workers or default_workers()
+        names = list(filenames_output or [None] * len(pdf_paths))
+        window = max(1, workers * BLOCKS_IN_FLIGHT_PER_WORKER)
 
-            # Itera sobre as páginas para extrair texto mantendo a referência da folha
-            for page_number in range(len(doc)):
-                page = doc[page_number]
-                text = page.get_text()
+        extract_args = self._extract_args()
+        lane = OcrLane(self.ocr) if self.ocr is not None else None
 
-                # --- O PULO DO GATO DA ANCORAGEM ---
-                # Inserimos um marcador claro antes do texto da página
-                header = f"\n\n## [[Folha {page_number}]]\n"
+        def prefetch_ocr(idx: int, run: List[int]):
+            # Agenda o OCR assim que o bloco de texto fica pronto, sem esperar a
+            # gravação chegar nele; o pool de texto segue com os próximos blocos.
+            def done(fut: Future) -> None:
+                if fut.cancelled() or fut.exception() is not None:
+                    return
+                for i, (_, _, low_text, _) in zip(run, fut.result()):
+                    if low_text:
+                        lane.prefetch((idx, i), str(pdf_paths[idx]))
 
-                markdown_content.append(header)
-                markdown_content.append(text)
-                markdown_content.append("\n---")  # Separador visual
+            return done
 
-            # Salva o arquivo
-            with open(target_file, "w", encoding="utf-8") as f:
-                f.write("".join(markdown_content))
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                # Fila de blocos (arquivo, páginas) na ordem de gravação; com cache,
+                # só as páginas que ainda não estão nele.
+                tasks: Deque[Tuple[int, List[int]]] = deque()
+                plans: List[Union[_FilePlan, Exception]] = []
+                for idx, pdf_path in enumerate(pdf_paths):
+                    try:
+                        plan = self._plan(pdf_path, names[idx])
+                    except Exception as e:
+                        plans.append(e)
+                        continue
+                    plans.append(plan)
+                    tasks.extend((idx, run) for run in plan.runs)
 
-            logger.info(f"Sucesso! Salvo em: {target_file}")
-            return str(target_file)
+                in_flight: Deque[Tuple[int, Future]] = deque()
 
-        except Exception as e:
-            logger.error(f"Erro ao converter {input_file.name}: {e}")
-            raise e
+                def refill() -> None:
+                    while tasks and len(in_flight) < window:
+                        idx, run = tasks.popleft()
+                        fut = pool.submit(
+                            _extract_pages, str(pdf_paths[idx]), run, *extract_args
+                        )
+                        if lane is not None:
+                            fut.add_done_callback(prefetch_ocr(idx, run))
+                        in_flight.append((idx, fut))
+
+                def blocks_of(idx: int) -> Iterator[PageText]:
+                    # Páginas do arquivo `idx`, na ordem, à medida que os blocos chegam
+                    while in_flight and in_flight[0][0] == idx:
+                        _, fut = in_flight.popleft()
+                        refill()
+                        yield from fut.result()
+
+                refill()
+                for idx, pdf_path in enumerate(pdf_paths):
+                    input_file = Path(pdf_path)
+                    plan = plans[idx]
+                    try:
+                        if isinstance(plan, Exception):
+                            raise plan
+                        logger.info(
+                            f"Iniciando conversão de '{input_file.name}' ({plan.total} páginas)..."
+                        )
+                        yield pdf_path, self._write(plan, blocks_of(idx), idx, lane)
+                    except Exception as e:
+                        # descarta os blocos restantes do arquivo que falhou
+                        while in_flight and in_flight[0][0] == idx:
+                            in_flight.popleft()[1].cancel()
+                            refill()
+                        logger.error(f"Erro ao converter {input_file.name}: {e}")
+                        yield pdf_path, e
         finally:
-            if "doc" in locals():
-                doc.close()
+            if lane is not None:
+                lane.close()
 
-    def batch_convert(self, input_folder: str):
+    def batch_convert(self, input_folder: str, workers: int = 1):
         """Converte todos os PDFs de uma pasta."""
         p = Path(input_folder)
-        pdfs = list(p.glob("*.pdf"))
+        pdfs = sorted(p.glob("*.pdf"))
         logger.info(f"Encontrados {len(pdfs)} PDFs para processar em {input_folder}.")
 
-        for pdf in pdfs:
-            self.convert(str(pdf))
+        if workers <= 1:
+            for pdf in pdfs:
+                self.convert(str(pdf))
+            return
+
+        for _, result in self.convert_many([str(pdf) for pdf in pdfs], workers):
+            if isinstance(result, Exception):
+                raise result
 
 
 # Teste rápido
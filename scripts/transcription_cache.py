@@ -0,0 +1,277 @@
+"""
+scripts/transcription_cache.py
+
+Cache de páginas transcritas e diário (journal) de transcrição.
+
+Páginas: texto extraído de cada página, por (sha256 do PDF, índice da
+página, extrator). Cada entrada guarda também a impressão digital da página
+(conteúdo da própria página, ver transcriber_util._page_fingerprint), então
+um PDF reenviado com folhas acrescentadas reaproveita as páginas antigas
+mesmo tendo outro sha256: só as novas são extraídas.
+
+Journal: estado de cada .md de destino (PDF de origem, sha256, páginas
+gravadas, status). Uma execução interrompida continua da última página
+concluída (as anteriores já estão no cache) e o `transcrever` sabe se um
+.md existente corresponde ao PDF atual.
+
+Armazenamento: um arquivo SQLite (WAL), como o cache de respostas do LLM
+(scripts/llm_cache.py). Os processos do pool só leem (open_readonly).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+DEFAULT_PATH = os.path.join(".cache", "transcriber_pages.sqlite")
+
+# Páginas acumuladas antes de gravar no SQLite (e avançar o journal).
+COMMIT_EVERY = 32
+
+# (texto, segundos de OCR quando a página foi lida por OCR)
+CachedPage = Tuple[str, Optional[float]]
+
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+
+
+def sha256_file(path: str, chunk_size: int = 1024 * 1024) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    pdf_sha TEXT NOT NULL,
+    page_index INTEGER NOT NULL,
+    extractor TEXT NOT NULL,
+    page_sha TEXT,
+    text TEXT NOT NULL,
+    ocr_seconds REAL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (pdf_sha, page_index, extractor)
+);
+CREATE INDEX IF NOT EXISTS pages_by_page_sha ON pages (page_sha, extractor);
+CREATE TABLE IF NOT EXISTS journal (
+    target TEXT PRIMARY KEY,
+    pdf_path TEXT NOT NULL,
+    pdf_sha TEXT NOT NULL,
+    total_pages INTEGER NOT NULL,
+    pages_done INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+class PageCache:
+    def __init__(self, path: str = DEFAULT_PATH, extractor: str = "text"):
+        self.path = path
+        self.extractor = extractor
+        self.hits = 0
+        self.stored = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self._db.commit()
+        self._pending: List[
+            Tuple[str, int, str, Optional[str], str, Optional[float], float]
+        ] = []
+
+    # --- páginas ---
+
+    def cached_indices(self, pdf_sha: str) -> Set[int]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT page_index FROM pages WHERE pdf_sha = ? AND extractor = ?",
+                (pdf_sha, self.extractor),
+            ).fetchall()
+        return {r[0] for r in rows}
+
+    def get(self, pdf_sha: str, page_index: int) -> Optional[CachedPage]:
+        """(texto, segundos de OCR ou None) ou None."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT text, ocr_seconds FROM pages "
+                "WHERE pdf_sha = ? AND page_index = ? AND extractor = ?",
+                (pdf_sha, page_index, self.extractor),
+            ).fetchone()
+        if row is None:
+            return None
+        self.hits += 1
+        return row[0], row[1]
+
+    def put(
+        self,
+        pdf_sha: str,
+        page_index: int,
+        text: str,
+        page_sha: Optional[str] = None,
+        ocr_seconds: Optional[float] = None,
+    ) -> None:
+        """Enfileira a página; grava a cada COMMIT_EVERY (ou em flush)."""
+        with self._lock:
+            self._pending.append(
+                (
+                    pdf_sha,
+                    page_index,
+                    self.extractor,
+                    page_sha,
+                    text,
+                    ocr_seconds,
+                    time.time(),
+                )
+            )
+            self.stored += 1
+            full = len(self._pending) >= COMMIT_EVERY
+        if full:
+            self.flush()
+
+    def _write_pending(self) -> None:
+        if self._pending:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO pages "
+                "(pdf_sha, page_index, extractor, page_sha, text, ocr_seconds, "
+                "created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                self._pending,
+            )
+            self._pending = []
+
+    def flush(self) -> None:
+        with self._lock:
+            self._write_pending()
+            self._db.commit()
+
+    # --- journal ---
+
+    def journal_entry(self, target: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT pdf_path, pdf_sha, total_pages, pages_done, status "
+                "FROM journal WHERE target = ?",
+                (os.path.abspath(target),),
+            ).fetchone()
+        if row is None:
+            return None
+        keys = ("pdf_path", "pdf_sha", "total_pages", "pages_done", "status")
+        return dict(zip(keys, row))
+
+    def journal_update(
+        self,
+        target: str,
+        pdf_path: str,
+        pdf_sha: str,
+        total_pages: int,
+        pages_done: int,
+        status: str = STATUS_RUNNING,
+    ) -> None:
+        """Grava o progresso junto com as páginas pendentes (mesmo commit)."""
+        with self._lock:
+            self._write_pending()
+            self._db.execute(
+                "INSERT OR REPLACE INTO journal "
+                "(target, pdf_path, pdf_sha, total_pages, pages_done, status, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    os.path.abspath(target),
+                    os.path.abspath(pdf_path),
+                    pdf_sha,
+                    total_pages,
+                    pages_done,
+                    status,
+                    time.time(),
+                ),
+            )
+            self._db.commit()
+
+    def is_current(self, target: str, pdf_sha: str) -> bool:
+        """O .md existe e foi concluído a partir deste mesmo PDF."""
+        entry = self.journal_entry(target)
+        return (
+            os.path.exists(target)
+            and entry is not None
+            and entry["status"] == STATUS_DONE
+            and entry["pdf_sha"] == pdf_sha
+        )
+
+    def stats_line(self) -> str:
+        return (
+            f"cache de páginas: {self.hits} reaproveitada(s), "
+            f"{self.stored} nova(s) [{self.path}]"
+        )
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            self._db.close()
+
+
+def _lookup_page_sha(
+    db: sqlite3.Connection, lock: threading.Lock, page_sha: str, extractor: str
+) -> Optional[CachedPage]:
+    with lock:
+        row = db.execute(
+            "SELECT text, ocr_seconds FROM pages "
+            "WHERE page_sha = ? AND extractor = ? LIMIT 1",
+            (page_sha, extractor),
+        ).fetchone()
+    return (row[0], row[1]) if row is not None else None
+
+
+class ReadOnlyPageLookup:
+    """Consulta por impressão digital nos processos do pool (sem escrita)."""
+
+    def __init__(self, path: str, extractor: str):
+        self.extractor = extractor
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if os.path.exists(path):
+            uri = f"file:{os.path.abspath(path)}?mode=ro"
+            self._db = sqlite3.connect(uri, uri=True, check_same_thread=False)
+
+    def get_by_page_sha(self, page_sha: str) -> Optional[CachedPage]:
+        if self._db is None:
+            return None
+        try:
+            return _lookup_page_sha(self._db, self._lock, page_sha, self.extractor)
+        except sqlite3.Error:
+            return None
+
+
+_readonly: Dict[Tuple[str, str], ReadOnlyPageLookup] = {}
+
+
+def open_readonly(path: str, extractor: str) -> ReadOnlyPageLookup:
+    """Uma conexão só-leitura por processo e cache."""
+    key = (path, extractor)
+    lookup = _readonly.get(key)
+    if lookup is None:
+        lookup = _readonly[key] = ReadOnlyPageLookup(path, extractor)
+    return lookup
+
+
+def missing_runs(total: int, cached: Iterable[int], size: int) -> List[List[int]]:
+    """Índices não cacheados de [0, total), em blocos de até `size` páginas."""
+    cached = set(cached)
+    runs: List[List[int]] = []
+    cur: List[int] = []
+    for i in range(total):
+        if i in cached:
+            continue
+        cur.append(i)
+        if len(cur) >= size:
+            runs.append(cur)
+            cur = []
+    if cur:
+        runs.append(cur)
+    return runs
@@ -0,0 +1,132 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+ORCHESTRATOR = ROOT / "pipelines" / "cad_obr.py"
+
+DOC_IMOVEL = {
+    "matricula": "7.546",
+    "hipotecas_onus": [
+        {
+            "registro_ou_averbacao": "R.5",
+            "tipo_divida": "HIPOTECA",
+            "credor": "BANCO DO BRASIL S.A.",
+            "valor_divida": "CR$15.276.818,18",
+            "data_efetiva": "24 de Abril de 1.996",
+            "data_baixa": "10/05/2005",
+            "quitada": True,
+            "numero_contrato": "176.700.530",
+            "taxas": "juros de 12,680% efetivos ao ano",
+        }
+    ],
+    "transacoes_venda": [
+        {
+            "registro": "R.3",
+            "valor": "R$ 60.000,00",
+            "compradores": ["JOÃO DA SILVA, casado"],
+            "vendedores": ["Sr. José Pereira e sua mulher"],
+        }
+    ],
+}
+
+DOC_HIPOTECARIA = {
+    "numero_documento": "123.456",
+    "credor": {"nome": "Banco X", "cnpj": "00.000.000/0001-91"},
+    "emitente_devedor": {"nome": "EMPRESA Y LTDA", "cnpj": "11.111.111/0001-11"},
+    "data_assinatura": "12 de Abril de 1.998",
+}
+
+
+def _seed(base: Path) -> None:
+    for tipo, doc in [
+        ("escritura_imovel", DOC_IMOVEL),
+        ("escritura_hipotecaria", DOC_HIPOTECARIA),
+        ("contrato_social", {"razao_social": "EMPRESA Y LTDA", "cnpj": "1.1"}),
+    ]:
+        d = base / "01_collector" / tipo
+        d.mkdir(parents=True)
+        with (d / f"collector_out_{tipo}_1.json").open("w", encoding="utf-8") as f:
+            json.dump(doc, f, ensure_ascii=False, indent=2)
+
+
+def _run(base: Path, *extra: str) -> str:
+    proc = subprocess.run(
+        [sys.executable, str(ORCHESTRATOR), "--base-out", str(base), *extra],
+        check=True,
+        capture_output=True,
+        cwd=base,
+        text=True,
+    )
+    return proc.stdout
+
+
+def _tree(base: Path) -> dict:
+    return {
+        str(p.relative_to(base)): p.read_bytes()
+        for p in sorted(base.rglob("*.json"))
+        if "01_collector" not in p.parts and "_build" not in p.parts
+    }
+
+
+def test_in_process_matches_subprocess_outputs(tmp_path):
+    sub = tmp_path / "sub"
+    inproc = tmp_path / "inproc"
+    _seed(sub)
+    _seed(inproc)
+
+    _run(sub)
+    _run(inproc, "--in-process")
+
+    expected = _tree(sub)
+    assert expected, "modo subprocess não gerou saídas"
+    assert _tree(inproc) == expected
+
+
+def test_parallel_jobs_match_sequential_outputs(tmp_path):
+    seq = tmp_path / "seq"
+    _seed(seq)
+    _run(seq)
+    expected = _tree(seq)
+
+    for name, extra in [("par_sub", ()), ("par_inproc", ("--in-process",))]:
+        base = tmp_path / name
+        _seed(base)
+        _run(base, "--jobs", "3", *extra)
+        assert _tree(base) == expected, name
+
+
+def test_incremental_skips_unchanged_documents(tmp_path):
+    ref = tmp_path / "ref"
+    inc = tmp_path / "inc"
+    _seed(ref)
+    _seed(inc)
+    _run(ref)
+
+    _run(inc, "--incremental")
+    assert _tree(inc) == _tree(ref)
+
+    out = _run(inc, "--incremental")
+    assert "Gravados em 02_normalize: 1" not in out
+    assert out.count("Inalterados (pulados): 02 1, 03 1") == 3
+
+    src = inc / "01_collector" / "contrato_social" / "collector_out_contrato_social_1.json"
+    src.write_text(json.dumps({"razao_social": "OUTRA LTDA"}), encoding="utf-8")
+    out = _run(inc, "--incremental")
+    assert out.count("Inalterados (pulados): 02 1, 03 1") == 2
+    assert "Inalterados (pulados): 02 0, 03 0" in out
+
+
+def test_incremental_drops_removed_inputs_from_manifest(tmp_path):
+    _seed(tmp_path)
+    out = _run(tmp_path, "--incremental")
+    assert "[AVISO] --incremental implica --in-process." in out
+
+    tipo = "contrato_social"
+    manifest = tmp_path / "_build" / "02_normalize" / f"{tipo}.json"
+    assert json.loads(manifest.read_text(encoding="utf-8"))["entries"]
+
+    (tmp_path / "01_collector" / tipo / f"collector_out_{tipo}_1.json").unlink()
+    _run(tmp_path, "--incremental", "--in-process")
+    assert json.loads(manifest.read_text(encoding="utf-8"))["entries"] == {}
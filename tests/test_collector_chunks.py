@@ -0,0 +1,134 @@
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("google.genai")
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _collector():
+    spec = importlib.util.spec_from_file_location(
+        "collector_cad_obr_main", ROOT / "agents" / "collector-cad_obr" / "main.py"
+    )
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def _job(tmp_path):
+    (tmp_path / "in").mkdir()
+    for nome in ["prompt.md", "skill.md", "schema.json"]:
+        (tmp_path / nome).write_text("x", encoding="utf-8")
+    folhas = "".join(f"\n\n## [[Folha {i}]]\nR.{i} HIPOTECA\n---" for i in range(4))
+    (tmp_path / "in" / "m.md").write_text("# Documento: m.pdf" + folhas, encoding="utf-8")
+    config = {
+        "paths": {"prompt_file": "prompt.md"},
+        "skills_map": {"outro": "skill.md"},
+        "chunking": {"enabled": True, "max_chars": 60},
+    }
+    job = {
+        "name": "t",
+        "input_dir": "in",
+        "output_dir": "out",
+        "schema_file": "schema.json",
+        "skill_key": "outro",
+    }
+    return config, job
+
+
+def test_failed_chunk_is_not_saved_as_success(tmp_path, monkeypatch):
+    mod = _collector()
+    config, job = _job(tmp_path)
+    chamadas = []
+
+    def fake(prompt, *_):
+        chamadas.append(prompt)
+        if "## [[Folha 1]]" in prompt:
+            return json.dumps({"error": "503 UNAVAILABLE"})
+        return json.dumps({"hipotecas_onus": [{"registro_ou_averbacao": "R.0"}]})
+
+    monkeypatch.setattr(mod, "call_llm_provider", fake)
+    mod.process_job(job, config, str(tmp_path))
+
+    assert len(chamadas) > 1
+    out = tmp_path / "out"
+    assert not (out / "m.json").exists()
+    erro = json.loads((out / "m.md.error.json").read_text(encoding="utf-8"))
+    assert len(erro["raw_chunks"]) == len(chamadas)
+    assert any("503" in r for r in erro["raw_chunks"])
+
+
+def test_cache_hit_does_not_use_rate_limit(monkeypatch):
+    mod = _collector()
+
+    class Hit:
+        def get(self, key):
+            return '{"ok": 1}', None
+
+    class Limiter:
+        def acquire(self, prompt_text=""):
+            raise AssertionError("hit do cache não deve consumir RPM/TPM")
+
+    monkeypatch.setattr(mod, "_RESPONSE_CACHE", Hit())
+    assert mod.call_llm_provider("prompt", {}, None, Limiter()) == '{"ok": 1}'
+
+
+def test_standin_needs_no_api_key(tmp_path, monkeypatch):
+    from scripts import llm_clients
+    from scripts.llm_standin_server import FaultPlan, ReplayStore, prompt_sha256, start_background
+
+    mod = _collector()
+    for var in ["GOOGLE_API_KEY", "GEMINI_API_KEY"]:
+        monkeypatch.delenv(var, raising=False)
+    monkeypatch.setattr(mod, "_RESPONSE_CACHE", None)
+    store = ReplayStore(str(tmp_path / "gravacoes.jsonl"))
+    store.add(prompt_sha256("prompt gravado"), '{"ok": 1}')
+    srv = start_background(store=store, faults=FaultPlan(), fallback=None)
+    try:
+        llm_clients.configure_provider("standin", srv.base_url)
+        assert mod.call_llm_provider("prompt gravado", {}) == '{"ok": 1}'
+        llm_clients.configure_provider("gemini")
+        with pytest.raises(ValueError, match="GOOGLE_API_KEY"):
+            llm_clients.get_client()
+    finally:
+        srv.shutdown()
+        srv.server_close()
+        llm_clients.reset()
+
+
+def test_each_retry_spends_rate_limit_on_sent_contents(monkeypatch):
+    mod = _collector()
+    enviados, cobrados = [], []
+
+    class Throttled(Exception):
+        code = 429
+
+    class Models:
+        def generate_content(self, model, contents, config):
+            enviados.append(contents)
+            if len(enviados) == 1:
+                raise Throttled("429 RESOURCE_EXHAUSTED")
+            return type("R", (), {"text": '{"ok": 1}'})()
+
+    class Ctx:
+        name = "cachedContents/x"
+
+        def split(self, prompt_text):
+            return prompt_text[len("prefixo "):]
+
+    class Prefix:
+        def get(self):
+            return Ctx()
+
+    class Limiter:
+        def acquire(self, prompt_text=""):
+            cobrados.append(prompt_text)
+
+    monkeypatch.setattr(mod, "_RESPONSE_CACHE", None)
+    monkeypatch.setattr(mod, "get_client", lambda *_: type("C", (), {"models": Models()})())
+    config = {"dispatch": {"max_retries": 1, "retry_backoff_seconds": 0.001}}
+    assert mod.call_llm_provider("prefixo documento", config, Prefix(), Limiter()) == '{"ok": 1}'
+    assert enviados == cobrados == ["documento", "documento"]
@@ -0,0 +1,68 @@
+import json
+import sqlite3
+
+from scripts.llm_cache import ResponseCache, make_key
+
+
+def test_cache_roundtrip_and_size_eviction(tmp_path):
+    db = str(tmp_path / "llm.sqlite")
+    params = {"temperature": 0.0, "max_output_tokens": 65536}
+
+    cache = ResponseCache(db)
+    k1 = make_key("gemini-2.5-flash", params, "prompt A")
+    assert k1 != make_key("gemini-2.5-flash", {**params, "temperature": 0.1}, "prompt A")
+    assert k1 != make_key("gemini-2.5-flash", params, "prompt B")
+    assert k1 != make_key("gemini-2.0-flash", params, "prompt A")
+
+    assert cache.get(k1) is None
+    cache.put(k1, '{"ok": 1}', model="gemini-2.5-flash")
+    cache.put("vazio", "")
+    assert cache.get(k1) == ('{"ok": 1}', None)
+    assert cache.get("vazio") is None
+    cache.put("grande", json.dumps({"texto": "x" * 2 * 1024 * 1024}))
+    assert cache.get(k1) is not None
+    cache.close()
+
+    # reabrir com limite de 1 MB despeja a entrada menos acessada recentemente
+    cache = ResponseCache(db, max_size_mb=1)
+    assert cache.get("grande") is None
+    assert cache.get(k1) is not None
+
+
+def test_only_json_responses_are_cached(tmp_path):
+    db = str(tmp_path / "llm.sqlite")
+    cache = ResponseCache(db)
+    cache.put("truncada", '{"hipotecas_onus": [{"registro_ou_averbacao": "R.1"')
+    cache.put("texto", "Desculpe, não consegui extrair.")
+    cache.put("cercada", '```json\n{"ok": 1}\n```')
+    assert cache.get("truncada") is None and cache.get("texto") is None
+    assert cache.get("cercada") == ('```json\n{"ok": 1}\n```', None)
+
+    # entrada inválida de antes da validação: miss, e sai do arquivo
+    con = sqlite3.connect(db)
+    con.execute(
+        "INSERT INTO responses VALUES ('antiga', NULL, NULL, '{\"a\": ', 6, 0, 0)"
+    )
+    con.commit()
+    con.close()
+    assert cache.get("antiga") is None
+    assert cache.misses == 3
+    cache.close()
+    con = sqlite3.connect(db)
+    restantes = con.execute("SELECT key FROM responses").fetchall()
+    assert ("antiga",) not in restantes
+    con.close()
+
+
+def test_key_depends_on_provider(monkeypatch):
+    params = {"temperature": 0.0}
+    monkeypatch.delenv("LLM_PROVIDER", raising=False)
+    gemini = make_key("gemini-2.5-flash", params, "prompt A")
+    assert gemini == make_key("gemini-2.5-flash", params, "prompt A", ("gemini", None))
+
+    monkeypatch.setenv("LLM_PROVIDER", "standin")
+    monkeypatch.setenv("LLM_STANDIN_URL", "http://127.0.0.1:8765")
+    standin = make_key("gemini-2.5-flash", params, "prompt A")
+    assert standin != gemini
+    monkeypatch.setenv("LLM_STANDIN_URL", "http://127.0.0.1:9999")
+    assert make_key("gemini-2.5-flash", params, "prompt A") not in (standin, gemini)
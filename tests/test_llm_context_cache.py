@@ -0,0 +1,43 @@
+from scripts.llm_context_cache import PREFIX_SEPARATOR, LazyPrefixCache
+from scripts.llm_standin import StandInClient
+
+MODEL = "gemini-2.5-flash"
+
+
+def _generate(client, prefix_cache, prompt):
+    ctx = prefix_cache.get()
+    doc = ctx.split(prompt) if ctx else None
+    if doc is None:
+        return client.models.generate_content(model=MODEL, contents=prompt)
+    return client.models.generate_content(
+        model=MODEL, contents=doc, config={"cached_content": ctx.name}
+    )
+
+
+def test_prefix_sent_once_and_model_sees_same_prompt():
+    client = StandInClient(min_cache_tokens=100)
+    prefix = "# SCHEMA E REGRAS\n" + "regra fixa do job. " * 100
+    docs = [f"## [[Folha {i}]]\nR.{i} - HIPOTECA" for i in range(3)]
+    prompts = [prefix + PREFIX_SEPARATOR + d for d in docs]
+
+    full = [
+        client.models.generate_content(model=MODEL, contents=p).text for p in prompts
+    ]
+
+    pc = LazyPrefixCache(lambda: client, MODEL, prefix, min_tokens=100)
+    cached = [_generate(client, pc, p).text for p in prompts]
+    pc.close()
+
+    assert cached == full
+    calls = client.calls[len(prompts):]
+    assert all(c["cached_tokens"] > 0 for c in calls)
+    assert all(c["sent_tokens"] < c["prompt_tokens"] // 10 for c in calls)
+    assert client.caches._items == {}
+
+
+def test_short_prefix_falls_back_to_full_prompt():
+    client = StandInClient(min_cache_tokens=1024)
+    pc = LazyPrefixCache(lambda: client, MODEL, "curto", min_tokens=1024)
+    assert pc.get() is None
+    assert _generate(client, pc, "curto\ndoc").text
+    assert client.calls[0]["cached_tokens"] == 0
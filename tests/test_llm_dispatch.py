@@ -0,0 +1,26 @@
+import random
+import time
+
+from scripts.llm_dispatch import TokenBucket, dispatch_ordered
+
+
+def test_dispatch_ordered_keeps_input_order():
+    def slow(i):
+        time.sleep(random.random() * 0.01)
+        return i * i
+
+    items = list(range(20))
+    out = list(dispatch_ordered(items, slow, concurrency=8))
+    assert out == [(i, i * i) for i in items]
+
+
+def test_token_bucket_waits_for_refill():
+    now = [0.0]
+
+    def sleep(s):
+        now[0] += s
+
+    bucket = TokenBucket(60, clock=lambda: now[0], sleep=sleep)  # 1 token/s
+    assert bucket.acquire(60) == 0.0
+    assert bucket.acquire(2) == 2.0
+    assert now[0] == 2.0
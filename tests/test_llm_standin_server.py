@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+from scripts import llm_clients
+from scripts.llm_dispatch import call_with_retry
+from scripts.llm_standin import StandInError
+from scripts.llm_standin_server import (
+    FaultPlan,
+    ReplayStore,
+    prompt_sha256,
+    start_background,
+)
+
+MODEL = "gemini-2.5-flash"
+
+
+@pytest.fixture
+def standin(tmp_path):
+    store = ReplayStore(str(tmp_path / "gravacoes.jsonl"))
+    store.add(prompt_sha256("prompt gravado"), '{"matricula": "123"}')
+    servers = []
+
+    def start(**faults):
+        srv = start_background(
+            store=ReplayStore(store.path), faults=FaultPlan(**faults), fallback=None
+        )
+        servers.append(srv)
+        llm_clients.configure_provider("standin", srv.base_url)
+        return srv, llm_clients.get_client("")
+
+    yield start
+    for srv in servers:
+        srv.shutdown()
+        srv.server_close()
+    llm_clients.reset()
+
+
+def test_replay_through_provider_interface(standin):
+    srv, client = standin()
+    cfg = llm_clients.get_generate_config(temperature=0.0)
+    assert cfg == {"temperature": 0.0}
+
+    resp = client.models.generate_content(model=MODEL, contents="prompt gravado", config=cfg)
+    assert json.loads(resp.text) == {"matricula": "123"}
+
+    with pytest.raises(StandInError) as e:
+        client.models.generate_content(model=MODEL, contents="sem gravação")
+    assert e.value.code == 404
+    assert (srv.stats.replayed, srv.stats.missing) == (1, 1)
+
+
+def test_injected_faults_and_retry(standin):
+    srv, client = standin(rate_truncated=1.0)
+    text = client.models.generate_content(model=MODEL, contents="prompt gravado").text
+    with pytest.raises(json.JSONDecodeError):
+        json.loads(text)
+
+    srv, client = standin(rate_429=1.0)
+    waits = []
+    with pytest.raises(StandInError) as e:
+        call_with_retry(
+            lambda: client.models.generate_content(model=MODEL, contents="prompt gravado"),
+            max_retries=2,
+            backoff_seconds=0.5,
+            sleep=waits.append,
+        )
+    assert e.value.code == 429
+    assert waits == [0.5, 1.0]
+    assert srv.stats.throttled == 3
@@ -0,0 +1,48 @@
+from scripts.markdown_chunks import merge_partials, split_at_folhas
+
+
+def _doc(n_folhas, body="texto " * 40):
+    head = f"# Documento: m.pdf\n**Total de Páginas:** {n_folhas}\n---"
+    folhas = "".join(f"\n\n## [[Folha {i}]]\n{body}\n---" for i in range(1, n_folhas + 1))
+    return head + folhas
+
+
+def test_split_keeps_folhas_whole_and_repeats_header():
+    doc = _doc(6)
+    assert split_at_folhas(doc, len(doc)) == [doc]
+
+    chunks = split_at_folhas(doc, 700)
+    assert len(chunks) > 1
+    header = doc[: doc.index("## [[Folha 1]]")]
+    for c in chunks:
+        assert c.startswith(header)
+    # cada folha aparece exatamente uma vez, em ordem
+    joined = "".join(c[len(header):] for c in chunks)
+    assert joined == doc[len(header):]
+
+
+def test_merge_partials_unites_records_across_chunks():
+    keyed = {"hipotecas_onus": ("registro_ou_averbacao",)}
+    a = {
+        "matricula": "123",
+        "proprietarios": [],
+        "hipotecas_onus": [
+            {"registro_ou_averbacao": "R.5", "valor": "100", "data_baixa": None},
+        ],
+    }
+    b = {
+        "matricula": "",
+        "proprietarios": [{"nome": "JOAO"}],
+        "hipotecas_onus": [
+            {"registro_ou_averbacao": "r. 5", "data_baixa": "01/02/2010"},
+            {"registro_ou_averbacao": "R.7", "valor": "50"},
+        ],
+    }
+    merged = merge_partials([a, b], keyed)
+    assert merged["matricula"] == "123"
+    assert merged["proprietarios"] == [{"nome": "JOAO"}]
+    assert merged["hipotecas_onus"] == [
+        {"registro_ou_averbacao": "R.5", "valor": "100", "data_baixa": "01/02/2010"},
+        {"registro_ou_averbacao": "R.7", "valor": "50"},
+    ]
+    assert merge_partials([a, b], keyed) == merged
@@ -0,0 +1,82 @@
+import copy
+import json
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "pipelines" / "cad_obr" / "monetary"))
+
+import monetary_core as mc  # noqa: E402
+import monetary_indices as mi  # noqa: E402
+
+pytest.importorskip("numpy")
+
+
+def _store(tmp_path):
+    rnd = random.Random(5)
+    linhas = ["data;valor"] + [
+        f"01/{m:02d}/{a};{rnd.uniform(-0.3, 1.2):.4f}".replace(".", ",")
+        for a in range(1995, 2024)
+        for m in range(1, 13)
+        if (a, m) != (2003, 6)
+    ]
+    (tmp_path / "ipca.csv").write_text("\n".join(linhas), encoding="utf-8")
+    return mi.IndexStore({"IPCA": str(tmp_path / "ipca.csv")})
+
+
+def _docs():
+    rnd = random.Random(9)
+    taxas = [
+        "juros de 12,5% ao ano + TR",
+        "juros de 1,2% ao mês",
+        "IPCA + 8% ao ano",
+        "INPC e juros de 6% ao ano",
+        "sem taxa",
+    ]
+    docs = []
+    for _ in range(200):
+        onus = []
+        for _ in range(rnd.randint(0, 5)):
+            a1 = rnd.randint(1990, 2020)
+            onus.append(
+                {
+                    "tipo_divida": rnd.choice(["HIPOTECA", "HIPOTECA", "LEASING"]),
+                    "valor_divida_num": rnd.randint(10_000, 10**9),
+                    "data_efetiva": f"{a1}-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}",
+                    "data_baixa": rnd.choice(
+                        [f"{rnd.randint(a1, 2023)}-{rnd.randint(1, 12):02d}-15", None]
+                    ),
+                    "quitada": True,
+                    "taxas": rnd.choice(taxas),
+                }
+            )
+        docs.append({"hipotecas_onus": onus})
+    return docs
+
+
+def test_lote_igual_ao_item_a_item(tmp_path):
+    tr = {(a, m): 0.001 * ((a + m) % 7) for a in range(1991, 2021) for m in range(1, 13)}
+    del tr[(2001, 3)]
+    tr_csv = tmp_path / "tr.csv"
+    tr_csv.write_text(
+        "Ano," + ",".join(f"{m:02d}" for m in range(1, 13)) + "\n"
+        + "\n".join(
+            f"{a}," + ",".join(str(tr.get((a, m), "")) for m in range(1, 13))
+            for a in range(1991, 2021)
+        ),
+        encoding="utf-8",
+    )
+    store = _store(tmp_path)
+
+    docs = _docs()
+    um_a_um = copy.deepcopy(docs)
+    for doc in um_a_um:
+        mc.processar_documento_cad_obr(doc, tr_csv_path=str(tr_csv), indices=store)
+    lote = mc.processar_lote_cad_obr(copy.deepcopy(docs), tr_csv_path=str(tr_csv), indices=store)
+
+    assert json.dumps(lote, ensure_ascii=False) == json.dumps(um_a_um, ensure_ascii=False)
+    metas = [o["_monetary_meta"] for d in lote for o in d["hipotecas_onus"]]
+    assert any(m.get("tr_motivo") == "tr_aplicada_com_meses_sem_indice" for m in metas)
+    assert any(m.get("indice_aplicado") for m in metas)
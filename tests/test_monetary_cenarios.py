@@ -0,0 +1,103 @@
+import copy
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "pipelines" / "cad_obr" / "monetary"))
+
+import monetary_cenarios as mcen  # noqa: E402
+import monetary_core as mc  # noqa: E402
+
+DOC = {
+    "hipotecas_onus": [
+        {
+            "registro_ou_averbacao": "R.5",
+            "tipo_divida": "HIPOTECA",
+            "valor_divida": "R$ 60.000,00",
+            "data_efetiva": "24 de Abril de 1.996",
+            "data_baixa": "2005-05-10",
+            "quitada": True,
+            "taxas": "juros de 12,680% efetivos ao ano",
+        },
+        {
+            "registro_ou_averbacao": "R.7",
+            "tipo_divida": "HIPOTECA",
+            "valor_divida": "R$ 10.000,00",
+            "data_efetiva": "1999-01-10",
+            "quitada": False,
+            "taxas": "juros de 1% ao mês",
+        },
+    ]
+}
+
+
+def test_cenario_recalcula_so_selecionados_sem_alterar_documento():
+    doc = copy.deepcopy(DOC)
+    cenario = mcen.Cenario(nome="baixa", data_baixa="2010-01-10", onus=["R.7"])
+    linhas = mcen.simular_documento(doc, [cenario], nome_documento="m.json")
+
+    assert doc == DOC
+    assert [(ln.onus, ln.cenario) for ln in linhas] == [("R.7", "baixa")]
+    ln = linhas[0]
+    assert ln.valor_original_centavos is None
+    assert ln.motivo_original.startswith("R6")
+    # 11 anos de 1% a.m. (mês comercial de 30 dias)
+    esperado = round(10_000 * 1.01 ** (4018 / 30.0) * 100)
+    assert ln.valor_cenario_centavos == esperado
+
+
+def test_cenario_taxa_e_regime_delta():
+    doc = copy.deepcopy(DOC)
+    original = mc.processar_onus_cad_obr(copy.deepcopy(doc["hipotecas_onus"][0]))
+    cenario = mcen.Cenario(taxa_percentual=6.0, onus=["#1"])
+    (ln,) = mcen.simular_documento(doc, [cenario])
+
+    assert ln.valor_original_centavos == original["valor_presente_num"]
+    assert ln.delta_centavos < 0
+    assert "R.5" in mcen.formatar_tabela([ln])
+
+    with pytest.raises(ValueError):
+        mcen.Cenario(indice="XYZ")
+
+
+def test_cenario_exato():
+    onus = {
+        "tipo_divida": "HIPOTECA",
+        "valor_divida_num": 6_000_000,
+        "data_efetiva": "2020-01-15",
+        "data_baixa": "2020-02-14",
+        "quitada": True,
+        "taxas": "juros de 1% ao mês + TR",
+    }
+    tr = mc.TRMensal({(2020, 1): 0.005, (2020, 2): 0.005})
+    (ln,) = mcen.simular_documento(
+        {"hipotecas_onus": [onus]}, [mcen.Cenario(onus=["#1"])], tr_table=tr, exato=True
+    )
+    # 61.207,515 exatos: meio centavo para cima, nos dois lados
+    assert ln.valor_original_centavos == ln.valor_cenario_centavos == 6_120_752
+
+
+def test_cli_onus_sem_cenario_nao_grava(tmp_path, monkeypatch, capsys):
+    import monetary_cli
+
+    (tmp_path / "m.json").write_text(json.dumps(DOC), encoding="utf-8")
+    out = tmp_path / "out"
+    for extra in (["--onus", "R.5"], ["--json"]):
+        argv = ["monetary_cli.py", "--input-dir", str(tmp_path), "--output-dir", str(out)]
+        monkeypatch.setattr(sys, "argv", argv + extra)
+        with pytest.raises(SystemExit) as exc:
+            monetary_cli.main()
+        assert exc.value.code == 2
+        assert "--cenario" in capsys.readouterr().err
+    assert not out.exists()
+
+
+def test_cenario_taxa_aceita_virgula():
+    assert mcen.Cenario.from_dict({"taxa_percentual": "1,2"}).taxa_percentual == 1.2
+    assert mcen.Cenario.from_dict({"taxa_percentual": " 0,5 % "}).taxa_percentual == 0.5
+    assert mcen.Cenario(taxa_percentual=2).taxa_percentual == 2.0
+    for ruim in ["um por cento", [1.2], True]:
+        with pytest.raises(ValueError, match="taxa_percentual"):
+            mcen.Cenario.from_dict({"taxa_percentual": ruim})
@@ -0,0 +1,39 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "pipelines" / "cad_obr" / "monetary"))
+
+import monetary_core as mc  # noqa: E402
+
+
+def _onus(**kw):
+    base = {
+        "tipo_divida": "HIPOTECA",
+        "valor_divida_num": 6_000_000,
+        "data_efetiva": "2020-01-15",
+        "data_baixa": "2020-02-14",
+        "quitada": True,
+        "taxas": "juros de 1% ao mês + TR",
+    }
+    base.update(kw)
+    return base
+
+
+def test_exato_arredonda_meio_centavo_para_cima():
+    tr = mc.TRMensal({(2020, 1): 0.005, (2020, 2): 0.005})
+    # 60.000,00 x 1,01 x 1,005² = 61.207,515 exatos
+    out = mc.processar_onus_cad_obr(_onus(), tr_table=tr, exato=True)
+    assert out["valor_presente_num"] == 6_120_752
+    assert out["valor_presente"] == "61.207,52"
+    det = out["_monetary_meta"]["detalhes_calculo"]
+    assert det["tr_fator_total"] == 1.010025
+    assert det["aritmetica"] == "exata_centavos_fator_12_casas"
+
+
+def test_exato_proximo_do_float_em_periodos_longos():
+    tr = mc.TRMensal({(a, m): 0.001 * (m % 5) for a in range(1995, 2016) for m in range(1, 13)})
+    for taxas in ("juros de 12,68% efetivos ao ano + TR", "juros de 0,95% ao mês"):
+        kw = dict(data_efetiva="1996-04-24", data_baixa="2015-05-10", taxas=taxas)
+        f = mc.processar_onus_cad_obr(_onus(**kw), tr_table=tr)
+        e = mc.processar_onus_cad_obr(_onus(**kw), tr_table=tr, exato=True)
+        assert abs(e["valor_presente_num"] - f["valor_presente_num"]) <= 1
@@ -0,0 +1,59 @@
+import sys
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "pipelines" / "cad_obr" / "monetary"))
+
+import monetary_core as mc  # noqa: E402
+import monetary_indices as mi  # noqa: E402
+
+
+def test_detectar_indice():
+    assert mi.detectar_indice("juros de 12% ao ano + TR") == "TR"
+    assert mi.detectar_indice("correção pelo IGP-M, juros de 1% ao mês") == "IGPM"
+    assert mi.detectar_indice("IPCA + 6% a.a., capitalização trimestral") == "IPCA"
+    assert mi.detectar_indice("índices da caderneta de poupança") == "POUPANCA"
+    assert mi.detectar_indice("juros de 12,680% efetivos ao ano") is None
+
+
+def test_sgs_csv_and_pro_rata(tmp_path):
+    csv_path = tmp_path / "ipca.csv"
+    csv_path.write_text(
+        "data;valor\n01/01/2020;0,21\n01/02/2020;0,25\n01/04/2020;-0,31\n",
+        encoding="utf-8",
+    )
+    serie = mi.carregar_serie_mensal(str(csv_path), "IPCA", "percentual")
+    assert serie[(2020, 2)] == 0.0025
+
+    fator, sem_dado = serie.fator_periodo(date(2020, 1, 1), date(2020, 4, 30))
+    assert sem_dado == ["2020-03"]
+    assert abs(fator - 1.0021 * 1.0025 * 0.9969) < 1e-12
+
+    # 16/01 a 11/02: 16 dias de janeiro (de 31) e 10 de fevereiro (de 29)
+    fator, sem_dado = serie.fator_periodo(date(2020, 1, 16), date(2020, 2, 11), pro_rata=True)
+    assert sem_dado == []
+    assert abs(fator - 1.0021 ** (16 / 31) * 1.0025 ** (10 / 29)) < 1e-12
+
+
+def test_processar_onus_com_ipca(tmp_path):
+    csv_path = tmp_path / "ipca.csv"
+    csv_path.write_text("data;valor\n01/2020;1,00\n02/2020;1,00\n", encoding="utf-8")
+    store = mi.IndexStore({"IPCA": str(csv_path), "IGPM": str(tmp_path / "ausente.csv")})
+    onus = {
+        "tipo_divida": "HIPOTECA",
+        "valor_divida": "R$ 1.000,00",
+        "data_efetiva": "2020-01-01",
+        "data_baixa": "2020-03-01",
+        "quitada": True,
+        "taxas": "juros de 1% ao mês, corrigido pelo IPCA",
+    }
+    out = mc.processar_onus_cad_obr(dict(onus), indices=store)
+    meta = out["_monetary_meta"]
+    assert meta["indice_correcao"] == "IPCA" and meta["indice_aplicado"] is True
+    assert meta["detalhes_calculo"]["indice_fator_total"] == round(1.01 * 1.01, 10)
+
+    onus["taxas"] = "juros de 1% ao mês, corrigido pelo IGP-M"
+    meta = mc.processar_onus_cad_obr(onus, indices=store)["_monetary_meta"]
+    assert meta["indice_aplicado"] is False
+    assert meta["indice_motivo"] == "indice_csv_nao_encontrado"
+    assert meta["calculado"] is True
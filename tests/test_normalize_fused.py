@@ -0,0 +1,60 @@
+import copy
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "pipelines" / "cad_obr" / "normalize"))
+
+import normalize_fused as nf  # noqa: E402
+import normalize_partes as np_  # noqa: E402
+import normalize_titularidade as nt  # noqa: E402
+import normalize_valores as nv  # noqa: E402
+
+DOC = {
+    "cnpj": "N/A",
+    "razao_social": "EMPRESA Y LTDA",
+    "data_assinatura": "5 de Março de 1.998.",
+    "socios": [{"nome": "Sr. Fulano", "tipo_documento": "CPF", "documento": "123.456.789-01"}],
+    "credor": {"nome": "Banco X", "CNPJ": "00.000.000/0001-91", "fonte": {"ancora": " p1 "}},
+    "hipotecas_onus": [
+        {
+            "valor_divida_original": "CR$ 15.276.818,18",
+            "valor_divida": "R$ 1,00",
+            "data_efetiva": "24/04/96",
+            "numero_contrato": "176.700.530",
+            "credor": "BANCO DO BRASIL S.A.",
+            "historico_aditivos": [{"data": "2001-02-30", "numero": "96/70042-4"}],
+        },
+        "ruído",
+        {"valor_divida": "sem número", "cpf": "   "},
+    ],
+    "transacoes_venda": [
+        {"valor": "R$ 60.000,00", "compradores": ["JOÃO, casado"], "vendedores": []},
+        {"valor": ""},
+    ],
+    "historico_titularidade": [{"proprietarios": ["Maria e seu marido"], "data": "1/2/2003"}],
+}
+
+
+def _chained(doc, valores, titularidade, partes):
+    stats = nf.FusedStats()
+    if valores:
+        nv.normalize_document(doc, stats.valores)
+    if titularidade:
+        doc = nt.normalize_object(doc, stats.titularidade)
+    if partes:
+        doc, st = np_.normalize_document(doc)
+        stats.partes = st
+    return doc, stats
+
+
+def test_fused_matches_chained_stages():
+    for flags in [(True, True, True), (True, False, True), (False, True, True), (True, True, False)]:
+        expected, exp_stats = _chained(copy.deepcopy(DOC), *flags)
+        stats = nf.FusedStats()
+        got = nf.normalize_document(copy.deepcopy(DOC), stats, *flags)
+
+        assert json.dumps(got, ensure_ascii=False, indent=2) == json.dumps(
+            expected, ensure_ascii=False, indent=2
+        ), flags
+        assert stats == exp_stats, flags
@@ -0,0 +1,163 @@
+import importlib.util
+import sys
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "pipelines" / "cad_obr" / "monetary"))
+sys.path.insert(0, str(ROOT / "pipelines" / "cad_obr" / "normalize"))
+sys.path.insert(0, str(ROOT / "pipelines" / "cad_obr" / "reconciler"))
+
+import monetary_core as mc  # noqa: E402
+import normalize_titularidade as nt  # noqa: E402
+import normalize_valores as nv  # noqa: E402
+import reconciler_core as rc  # noqa: E402
+from scripts import ptbr_parse as pp  # noqa: E402
+
+
+def _agente(nome):
+    spec = importlib.util.spec_from_file_location(
+        nome.replace("-", "_"), ROOT / "agents" / nome / "main.py"
+    )
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+@pytest.mark.parametrize(
+    "texto,esperado",
+    [
+        ("24 de Abril de 1.996", date(1996, 4, 24)),
+        ("14 de MARÇO de 2.001.", date(2001, 3, 14)),
+        ("registrado em 3 de marco de 94, conforme", date(1994, 3, 3)),
+        ("2001-03-29", date(2001, 3, 29)),
+        ("29/03/2001", date(2001, 3, 29)),
+        ("2001-02-30", None),
+        ("31 de fevereiro de 2001", None),
+        ("sem data", None),
+        (None, None),
+    ],
+)
+def test_parse_data(texto, esperado):
+    assert pp.parse_data(texto) == esperado
+
+
+@pytest.mark.parametrize(
+    "texto,brl,qualquer",
+    [
+        ("R$60.000,00-(sessenta mil reais)", Decimal("60000.00"), Decimal("60000.00")),
+        ("93354,27", Decimal("93354.27"), Decimal("93354.27")),
+        ("93,354.27", None, Decimal("93354.27")),
+        ("600000", None, Decimal("600000")),
+        ("sem valor", None, None),
+    ],
+)
+def test_parse_valor(texto, brl, qualquer):
+    assert pp.parse_valor(texto, so_brl=True) == brl
+    assert pp.parse_valor(texto) == qualquer
+
+
+DATAS = [
+    "24 de Abril de 1.996",
+    "24 DE ABRIL DE 1996",
+    "2001-02-30",
+    "29/03/2001",
+    "29-03-01",
+    "05/01/05",
+    "em 3 de abríl de 96, fls",
+    "  14   de março de 2.001. ",
+    "1 de maio de 199",
+]
+VALORES = [
+    "R$60.000,00-(sessenta mil reais)",
+    "93354,27",
+    "93,354.27",
+    "1.234",
+    "R$ 12.345",
+    "600000",
+    "sem valor",
+]
+
+
+def test_estagios_usam_as_mesmas_regras():
+    iso = [pp.parse_data_iso(t) for t in DATAS]
+    assert iso == [
+        "1996-04-24", "1996-04-24", None, "2001-03-29", "2001-03-29",
+        "2005-01-05", "1996-04-03", "2001-03-14", None,
+    ]
+    assert [rc.parse_date_to_iso(t) for t in DATAS] == iso
+    assert [mc.parse_data_ptbr(t) for t in DATAS] == [pp.parse_data(t) for t in DATAS]
+    # normalize: o texto inteiro deve ser a data
+    assert [nt.parse_date_to_iso(t) for t in DATAS] == iso[:6] + [None] + iso[7:]
+
+    D = Decimal
+    qualquer = [D("60000.00"), D("93354.27"), D("93354.27"), D("1234"), D("12345"), D("600000"), None]
+    assert [pp.parse_valor(t) for t in VALORES] == qualquer
+    assert [nv.parse_monetary_value(t) for t in VALORES] == qualquer
+    assert [rc.parse_brl_to_centavos(t) for t in VALORES] == [
+        None if v is None else int(v * 100) for v in qualquer
+    ]
+    # monetary: só pt-BR com vírgula decimal
+    assert [mc.parse_valor_brl(t) for t in VALORES] == [60000.0, 93354.27] + [None] * 5
+    assert rc.parse_brl_to_centavos("1" * 40) == int("1" * 40) * 100
+
+
+def test_collectors_usam_as_mesmas_regras():
+    pytest.importorskip("google.genai")
+    cad = _agente("collector-cad_obr")
+    proc = _agente("collector-proc")
+    assert [cad.parse_date_ptbr(t) for t in DATAS] == [pp.parse_data(t) for t in DATAS]
+    assert [cad.parse_monetary_value(t) for t in VALORES] == [60000.0, 93354.27] + [None] * 5
+    assert [proc.parse_monetary_value(t) for t in VALORES] == [
+        60000.0, 93354.27, 93354.27, 1234.0, 12345.0, 600000.0, 0.0,
+    ]
+
+
+@pytest.mark.parametrize(
+    "fn,texto,antes,agora",
+    [
+        # mudanças de comportamento ao juntar os parsers (ver scripts/ptbr_parse.py)
+        (mc.parse_data_ptbr, "24 DE ABRIL DE 1996", None, date(1996, 4, 24)),
+        (mc.parse_data_ptbr, "29/03/2001", None, date(2001, 3, 29)),
+        (rc.parse_date_to_iso, "05/01/05", "1905-01-05", "2005-01-05"),
+        (rc.parse_date_to_iso, "2001-02-30", "2001-02-30", None),
+        (rc.parse_date_to_iso, "1 de maio de 199", "0199-05-01", None),
+        (mc.parse_valor_brl, "93354,27", 354.27, 93354.27),
+        (nv.parse_monetary_value, "93,354.27", Decimal("93.35"), Decimal("93354.27")),
+        (rc.parse_brl_to_centavos, "R$ 12.345", 1234, 1234500),
+    ],
+)
+def test_mudancas_documentadas(fn, texto, antes, agora):
+    assert fn(texto) == agora != antes
+
+
+def test_lote_nos_estagios():
+    onus = [
+        {"valor_divida": "R$ 1.000,00"},
+        {"valor_divida_original": "CR$ 2.750,00", "valor_divida": "x"},
+        {"valor_divida": "R$ 1.000,00"},
+        {"valor_divida": "sem valor"},
+        "lixo",
+    ]
+    stats = nv.NormalizeStats()
+    assert nv.normalize_onus_list(onus, stats)
+    assert [o["valor_divida_num"] for o in onus[:3]] == [100000, 100, 100000]
+    assert (stats.onus_total, stats.onus_normalized, stats.onus_skipped_parse_fail) == (4, 3, 1)
+
+
+def test_lote_igual_item_a_item():
+    textos = ["24 de Abril de 1.996", "2001-03-29", None, 7, "24 de Abril de 1.996", "x"]
+    assert pp.parse_datas(textos) == [pp.parse_data(t) for t in textos]
+    assert pp.parse_valores(textos) == [pp.parse_valor(t) for t in textos]
+    assert pp.parse_valor_centavos("R$ 1.234,56") == 123456
+    assert pp.parse_valor_centavos(12.345) == 1235
+
+
+def test_cache_limitado():
+    pp.limpar_cache()
+    for i in range(pp.CACHE_SIZE + 100):
+        pp.parse_data(f"{i % 28 + 1} de maio de {1900 + i % 120}-{i}")
+    assert pp.cache_info()["datas"]["currsize"] == pp.CACHE_SIZE
@@ -0,0 +1,106 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("duckdb")
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "pipelines" / "cad_obr" / "reconciler"))
+sys.path.insert(0, str(ROOT / "pipelines" / "cad_obr" / "evidence_pack"))
+
+import evidence_pack_core as epc  # noqa: E402
+import reconciler_core as rc  # noqa: E402
+import reconciler_duckdb as rdb  # noqa: E402
+from test_reconciler_streaming import _dataset, corpus  # noqa: E402,F401
+
+
+def _linhas(dataset):
+    return {nome: [json.loads(x) for x in b.splitlines()] for nome, b in dataset.items()}
+
+
+def test_duckdb_backend_matches_python(corpus):
+    (corpus / "02_normalize" / "escritura_imovel" / "novacao.json").write_text(
+        json.dumps(
+            {
+                "matricula": "9.999",
+                "hipotecas_onus": [
+                    {"registro_ou_averbacao": "R.1", "tipo_divida": "HIPOTECA", "credor": "BANCO A",
+                     "data_registro": "2000-01-10", "data_baixa": "2001-01-01", "numero_contrato": "1"},
+                    {"registro_ou_averbacao": "R.2", "tipo_divida": "HIPOTECA", "credor": "BANCO A",
+                     "data_registro": "2001-01-01", "numero_contrato": "1"},
+                    {"registro_ou_averbacao": "R.3", "tipo_divida": "PENHORA", "data_registro": "2001-02-01"},
+                    {"registro_ou_averbacao": "R.4", "tipo_divida": "HIPOTECA", "data_registro": "2001-06-30"},
+                ],
+            }
+        ),
+        encoding="utf-8",
+    )
+    # mesma parte/operação em dois documentos: as chaves do segundo vêm por último
+    hip = corpus / "02_normalize" / "escritura_hipotecaria"
+    for nome, doc in [
+        ("op_1.json", {"numero_documento": "555", "credor": {"cpf": "123.456.789-01"}}),
+        (
+            "op_2.json",
+            {
+                "numero_documento": "555",
+                "credor": {"cpf": "12345678901", "nome": "FULANO"},
+                "divida_confessada": {"data_posicao": "02/01/1999"},
+            },
+        ),
+    ]:
+        (hip / nome).write_text(json.dumps(doc), encoding="utf-8")
+    _, lote = _dataset(corpus, "lote", streaming=False)
+
+    backend = rdb.DuckDbReconciler(
+        rc.ReconcilerInputs(corpus / "02_normalize", corpus / "03_monetary"),
+        rc.ReconcilerOutputs(corpus / "04_reconciler", "duck"),
+        corpus / "db" / "cad_obr_dataset_v1.duckdb",
+    )
+    backend.run(export_jsonl=True)
+    out = corpus / "04_reconciler" / "duck"
+    duck = {p.name: p.read_bytes() for p in sorted(out.glob("*.jsonl"))}
+
+    assert _linhas(duck) == _linhas(lote)
+    # inclusive a ordem das chaves, que em partes/operações depende da linha
+    assert duck == lote
+    assert backend.counts["novacoes_detectadas"] == 2
+    assert backend.counts["onus_obrigacoes"] == len(lote["onus_obrigacoes.jsonl"].splitlines())
+
+
+def test_evidence_pack_replaces_stale_backend_tables(corpus):
+    import duckdb
+
+    db = corpus / "db" / "cad_obr_dataset_v1.duckdb"
+    inputs = rc.ReconcilerInputs(corpus / "02_normalize", corpus / "03_monetary")
+    outputs = rc.ReconcilerOutputs(corpus / "04_reconciler", "dataset_v1")
+    dataset = corpus / "04_reconciler" / "dataset_v1"
+
+    rdb.DuckDbReconciler(inputs, outputs, db).run(export_jsonl=True)
+    res = epc.build_duckdb_views(dataset, db)
+    assert "onus_obrigacoes" in res["tables"] and res["views"] == []
+
+    # JSONL regenerado pelo backend Python com um ônus a mais
+    (corpus / "02_normalize" / "escritura_imovel" / "extra.json").write_text(
+        json.dumps(
+            {
+                "matricula": "8.888",
+                "hipotecas_onus": [
+                    {"registro_ou_averbacao": "R.1", "tipo_divida": "HIPOTECA",
+                     "data_registro": "2003-05-02"}
+                ],
+            }
+        ),
+        encoding="utf-8",
+    )
+    rc.CadObrReconciler(inputs, outputs).run_all_layers()
+    res = epc.build_duckdb_views(dataset, db)
+    assert "onus_obrigacoes" in res["views"] and "onus_obrigacoes" not in res["tables"]
+
+    con = duckdb.connect(str(db))
+    n = con.execute("SELECT count(*) FROM onus_obrigacoes").fetchone()[0]
+    assert n == len((dataset / "onus_obrigacoes.jsonl").read_bytes().splitlines())
+    restantes = con.execute("SELECT table_name FROM __reconciler_tables").fetchall()
+    assert sorted(t for (t,) in restantes) == sorted(res["tables"])
+    con.close()
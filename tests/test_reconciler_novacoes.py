@@ -0,0 +1,38 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "pipelines" / "cad_obr" / "reconciler"))
+
+import reconciler_core as rc  # noqa: E402
+
+
+def _ev(tipo, data, oid, pid="matricula:1"):
+    return {"property_id": pid, "event_type": tipo, "event_date": data, "onus_id": oid}
+
+
+def test_novacoes_janela_e_elegibilidade():
+    onus = [
+        {"onus_id": "R.1", "tipo_divida": "HIPOTECA", "credor_id": "c1", "operation_id": "9"},
+        {"onus_id": "R.2", "tipo_divida": "HIPOTECA", "credor_id": "c1", "operation_id": "9"},
+        {"onus_id": "R.3", "tipo_divida": "HIPOTECA", "credor_id": "c2"},
+        {"onus_id": "R.4", "tipo_divida": "PENHORA"},
+        {"onus_id": "R.5", "tipo_divida": "HIPOTECA"},
+    ]
+    events = [
+        _ev("ONUS_REGISTRO", "2000-01-10", "R.1"),
+        _ev("ONUS_BAIXA", "2001-01-01", "R.1"),
+        _ev("ONUS_REGISTRO", "2001-01-01", "R.2"),  # mesmo dia, depois da baixa
+        _ev("ONUS_REGISTRO", "2001-06-30", "R.3"),  # 180 dias: limite da janela
+        _ev("ONUS_REGISTRO", "2001-02-01", "R.4"),  # penhora: não elegível
+        _ev("ONUS_REGISTRO", "2001-07-01", "R.5"),  # 181 dias: fora da janela
+        _ev("ONUS_REGISTRO", "2001-01-01", "R.5", pid="matricula:2"),  # outro imóvel
+    ]
+    recon = rc.CadObrReconciler(
+        rc.ReconcilerInputs(Path("02"), Path("03")), rc.ReconcilerOutputs(Path("04"))
+    )
+    recon.onus_list, recon.events_list = onus, events
+    recon.layer_e_build_novacoes()
+
+    got = [(n["onus_id_novo"], n["janela_dias"], n["match_level"]) for n in recon.novacoes_list]
+    assert got == [("R.2", 0, "A"), ("R.3", 180, "C")]
+    assert recon.novacoes_list[0]["match_basis"] == ["JANELA_TEMPO", "CREDOR", "OPERACAO"]
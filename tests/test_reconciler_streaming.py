@@ -0,0 +1,181 @@
+import json
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "pipelines" / "cad_obr" / "reconciler"))
+
+import reconciler_core as rc  # noqa: E402
+
+MESES = ["janeiro", "Março", "abril", "junho", "setembro", "dezembro"]
+
+
+def _data(rnd):
+    return f"{rnd.randint(1, 28)} de {rnd.choice(MESES)} de {rnd.randint(1990, 2015)}"
+
+
+def _imovel(rnd, mat):
+    onus = []
+    for k in range(rnd.randint(1, 5)):
+        o = {
+            "registro_ou_averbacao": f"R.{k + 1}",
+            "tipo_divida": rnd.choice(["HIPOTECA", "ARRENDAMENTO MERCANTIL", "PENHORA"]),
+            "credor": rnd.choice(["BANCO A", "BANCO B", {"nome": "BANCO C", "cnpj": "1" * 14}]),
+            "data_efetiva": rnd.choice([_data(rnd), None]),
+            "data_registro": _data(rnd),
+            "valor_divida": f"R$ {rnd.randint(1, 999)}.{rnd.randint(0, 999):03d},00",
+            "numero_contrato": rnd.choice([None, "176.700.530", "99.1"]),
+        }
+        if rnd.random() < 0.6:
+            o["data_baixa"] = _data(rnd)
+        onus.append(o)
+    vendas = [
+        {
+            "registro": f"R.{10 + k}",
+            "data_registro": _data(rnd),
+            "compradores": ["JOÃO DA SILVA"],
+            "vendedores": ["JOSÉ PEREIRA"],
+            "anuencia_credor": rnd.choice([None, "anuência em " + _data(rnd), "com anuência"]),
+        }
+        for k in range(rnd.randint(0, 2))
+    ]
+    return {"matricula": mat, "hipotecas_onus": onus, "transacoes_venda": vendas}
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    rnd = random.Random(5)
+    norm = tmp_path / "02_normalize"
+    mon = tmp_path / "03_monetary"
+    for i in range(30):
+        mat = f"{rnd.randint(1, 12)}.{rnd.randint(100, 999)}"
+        doc = _imovel(rnd, mat)
+        for root, suffix in [(norm, ""), (mon, "_monetary")]:
+            d = root / "escritura_imovel"
+            d.mkdir(parents=True, exist_ok=True)
+            out = json.loads(json.dumps(doc))
+            if suffix:
+                for o in out["hipotecas_onus"]:
+                    o["valor_presente_num"] = rnd.randint(100, 10**8)
+            (d / f"doc_{i:02d}{suffix}.json").write_text(json.dumps(out), encoding="utf-8")
+    d = norm / "escritura_hipotecaria"
+    d.mkdir()
+    (d / "hip.json").write_text(
+        json.dumps(
+            {
+                "numero_documento": "123.456",
+                "credor": {"nome": "Banco X", "cnpj": "00.000.000/0001-91"},
+                "divida_confessada": {"valor": "R$ 1.000,00", "data_posicao": "02/01/1999"},
+                "garantias": [{"matricula": "7.546"}],
+            }
+        ),
+        encoding="utf-8",
+    )
+    (d / "quebrado.json").write_text("{", encoding="utf-8")
+    return tmp_path
+
+
+def _dataset(base, name, streaming, **load):
+    recon = rc.CadObrReconciler(
+        rc.ReconcilerInputs(base / "02_normalize", base / "03_monetary", **load),
+        rc.ReconcilerOutputs(base / "04_reconciler", name),
+    )
+    out = recon.run_all_layers(streaming=streaming)
+    return recon, {p.name: p.read_bytes() for p in sorted(out.glob("*.jsonl"))}
+
+
+def test_streaming_matches_batch(corpus):
+    _, lote = _dataset(corpus, "lote", streaming=False)
+    recon, stream = _dataset(corpus, "stream", streaming=True)
+    assert stream == lote
+    assert any(b'"valor_presente_num"' in line for line in lote["onus_obrigacoes.jsonl"].splitlines())
+    # nada do corpus fica retido: só caminhos do monetary
+    assert recon.norm_docs == [] and recon.mon_docs == []
+    assert all(isinstance(p, Path) for p in recon.mon_path_by_matricula.values())
+    # tabelas A–C vão para o disco; para a camada E ficam só os campos de match
+    assert recon.docs_catalog == [] and recon.pendencias_list == []
+    assert recon.onus_list and all(set(o) == set(rc.NOVACAO_CAMPOS_ONUS) for o in recon.onus_list)
+    assert all(set(ev) == set(rc.NOVACAO_CAMPOS_EVENTO) for ev in recon.events_list)
+
+
+@pytest.mark.parametrize("stop_after", ["A", "B"])
+def test_streaming_stop_after_matches_batch(corpus, stop_after):
+    def dataset(name, streaming):
+        recon = rc.CadObrReconciler(
+            rc.ReconcilerInputs(corpus / "02_normalize", corpus / "03_monetary"),
+            rc.ReconcilerOutputs(corpus / "04_reconciler", name),
+        )
+        if streaming:
+            recon.layers_abc_streaming(stop_after=stop_after)
+        else:
+            recon.layer_a_load_and_index()
+            if stop_after == "B":
+                recon.layer_b_build_onus_obrigacoes()
+        out = recon.write_dataset()
+        return {p.name: p.read_bytes() for p in sorted(out.glob("*.jsonl"))}
+
+    assert dataset("stream", True) == dataset("lote", False)
+
+
+@pytest.mark.parametrize("processes", [False, True])
+@pytest.mark.parametrize("streaming", [False, True])
+def test_parallel_load_keeps_order(corpus, processes, streaming):
+    _, serial = _dataset(corpus, "serial", streaming=False)
+    _, paralelo = _dataset(
+        corpus, "paralelo", streaming, load_workers=3, load_processes=processes
+    )
+    assert paralelo == serial
+
+
+def test_map_ordered_window():
+    itens = list(range(200))
+    assert list(rc.map_ordered(lambda x: x * x, itens, workers=4)) == [x * x for x in itens]
+
+
+def test_incremental_matches_full_rebuild(corpus, monkeypatch):
+    def incremental():
+        recon = rc.CadObrReconciler(
+            rc.ReconcilerInputs(corpus / "02_normalize", corpus / "03_monetary"),
+            rc.ReconcilerOutputs(corpus / "04_reconciler", "inc"),
+        )
+        out = recon.run_incremental()
+        return recon.incremental_stats, {p.name: p.read_bytes() for p in sorted(out.glob("*.jsonl"))}
+
+    stats, inc = incremental()
+    assert stats["reprocessados"] == stats["documentos"]
+    assert inc == _dataset(corpus, "full", streaming=False)[1]
+
+    state = corpus / "04_reconciler" / "_build" / "inc"
+    assert len(list((state / "docs").glob("*.json"))) == stats["documentos"]
+
+    # arquivos intocados (mtime/tamanho) não são re-hasheados; nada é regravado
+    hashed = []
+    sha256_file = rc.build_manifest.sha256_file
+    monkeypatch.setattr(
+        rc.build_manifest, "sha256_file", lambda p: hashed.append(p) or sha256_file(p)
+    )
+    dataset = corpus / "04_reconciler" / "inc"
+    mtimes = {p.name: p.stat().st_mtime_ns for p in dataset.glob("*.jsonl")}
+    stats, inc = incremental()
+    assert stats["reprocessados"] == 0 and stats["properties_novacoes_recalculadas"] == 0
+    assert hashed == []
+    assert {p.name: p.stat().st_mtime_ns for p in dataset.glob("*.jsonl")} == mtimes
+
+    norm = sorted((corpus / "02_normalize" / "escritura_imovel").glob("*.json"))
+    doc = json.loads(norm[3].read_text(encoding="utf-8"))
+    doc["hipotecas_onus"][0]["data_baixa"] = "2001-01-01"
+    norm[3].write_text(json.dumps(doc), encoding="utf-8")
+    norm[0].unlink()
+    # monetary alterado: reprocessa o doc do normalize da mesma matrícula
+    mon = sorted((corpus / "03_monetary" / "escritura_imovel").glob("*.json"))[7]
+    doc = json.loads(mon.read_text(encoding="utf-8"))
+    for o in doc["hipotecas_onus"]:
+        o["valor_presente_num"] = 1
+    mon.write_text(json.dumps(doc), encoding="utf-8")
+
+    stats, inc = incremental()
+    assert (stats["reprocessados"], stats["removidos"], stats["monetary_reprocessados"]) == (2, 1, 1)
+    assert inc == _dataset(corpus, "full2", streaming=False)[1]
+    assert len(list((state / "docs").glob("*.json"))) == stats["documentos"]
@@ -0,0 +1,66 @@
+import random
+import sys
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "pipelines" / "cad_obr" / "monetary"))
+
+import monetary_core as mc  # noqa: E402
+import monetary_indices as mi  # noqa: E402
+
+
+def _loop(tabela, inicio, fim):
+    """Acumulação mês a mês (comportamento anterior ao índice)."""
+    fator, sem_dado = 1.0, []
+    for ano, mes in mc.iter_meses_periodo(inicio, fim):
+        tr = tabela.get((ano, mes))
+        if tr is None:
+            sem_dado.append(f"{ano}-{mes:02d}")
+            continue
+        fator *= 1.0 + tr
+    return round(fator, 10), sem_dado
+
+
+@pytest.fixture
+def tabela():
+    rnd = random.Random(7)
+    tab = {
+        (ano, mes): rnd.uniform(0.0, 0.012)
+        for ano in range(1991, 2021)
+        for mes in range(1, 13)
+    }
+    for ano, mes in [(1994, 7), (1999, 1), (1999, 2), (2010, 12)]:
+        del tab[(ano, mes)]
+    return tab
+
+
+@pytest.mark.parametrize("com_numpy", [True, False])
+def test_fator_periodo_matches_monthly_loop(tabela, com_numpy, monkeypatch):
+    if not com_numpy:
+        monkeypatch.setattr(mi, "np", None)
+    indice = mc.TRMensal(tabela)
+    rnd = random.Random(11)
+    for _ in range(500):
+        inicio = date(rnd.randint(1988, 2022), rnd.randint(1, 12), 1)
+        fim = date(rnd.randint(inicio.year, 2024), rnd.randint(1, 12), 28)
+        fator, sem_dado = indice.fator_periodo(inicio, fim)
+        assert (round(fator, 10), sem_dado) == _loop(tabela, inicio, fim)
+
+
+def test_processar_onus_tr_details(tabela):
+    onus = {
+        "tipo_divida": "HIPOTECA",
+        "valor_divida": "R$ 100.000,00",
+        "data_efetiva": "1998-06-15",
+        "data_baixa": "2018-06-15",
+        "quitada": True,
+        "taxas": "juros de 8,5% ao ano + TR",
+    }
+    out = mc.processar_onus_cad_obr(onus, tr_table=mc.TRMensal(tabela))
+    det = out["_monetary_meta"]["detalhes_calculo"]
+    fator, sem_dado = _loop(tabela, date(1998, 6, 15), date(2018, 6, 15))
+    assert det["tr_fator_total"] == fator
+    assert det["tr_meses_sem_dado"] == sem_dado == ["1999-01", "1999-02", "2010-12"]
+    assert det["tr_periodo"]["total_meses"] == 241
@@ -0,0 +1,149 @@
+import pytest
+
+fitz = pytest.importorskip("fitz")
+
+from scripts import transcriber_util  # noqa: E402
+from scripts.transcriber_util import PDFTranscriber  # noqa: E402
+
+
+def _make_pdf(path, n_pages):
+    doc = fitz.open()
+    for i in range(n_pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"R.{i} - HIPOTECA pagina {i}")
+    doc.save(str(path))
+    doc.close()
+
+
+def test_parallel_convert_matches_serial(tmp_path, monkeypatch):
+    monkeypatch.setattr(transcriber_util, "PAGES_PER_TASK", 3)
+    pdfs = []
+    for name, n in [("a.pdf", 10), ("b.pdf", 1), ("c.pdf", 7)]:
+        _make_pdf(tmp_path / name, n)
+        pdfs.append(str(tmp_path / name))
+
+    serial = PDFTranscriber(output_dir=str(tmp_path / "serial"))
+    expected = [open(serial.convert(p), encoding="utf-8").read() for p in pdfs]
+
+    parallel = PDFTranscriber(output_dir=str(tmp_path / "parallel"))
+    results = list(parallel.convert_many(pdfs + [str(tmp_path / "x.pdf")], workers=2))
+    assert [p for p, _ in results] == pdfs + [str(tmp_path / "x.pdf")]
+    assert isinstance(results[-1][1], FileNotFoundError)
+    got = [open(r, encoding="utf-8").read() for _, r in results[:-1]]
+    assert got == expected
+
+
+def test_interrupted_write_leaves_no_markdown(tmp_path):
+    target = tmp_path / "autos.md"
+    with pytest.raises(KeyboardInterrupt):
+        with transcriber_util.MarkdownWriter(target, "autos.pdf", 3) as w:
+            w.page("folha 0")
+            raise KeyboardInterrupt
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_ocr_timings_go_to_header(tmp_path):
+    target = tmp_path / "certidao.md"
+    with transcriber_util.MarkdownWriter(target, "certidao.pdf", 2) as w:
+        w.page("texto")
+        w.page("lido por OCR", ocr_seconds=1.5)
+    assert target.read_text(encoding="utf-8") == (
+        "# Documento: certidao.pdf**Total de Páginas:** 2\n"
+        "**OCR:** 1 página(s), 1.50s\n"
+        "- Folha 1: 1.50s\n"
+        "---\n"
+        "\n\n## [[Folha 0]]\ntexto\n---"
+        "\n\n## [[Folha 1]]\nlido por OCR\n---"
+    )
+
+
+def _make_form_pdf(path, textos):
+    # cada folha só desenha um Form XObject: stream da página igual em todas
+    src = fitz.open()
+    for t in textos:
+        src.new_page().insert_text((72, 72), t)
+    doc = fitz.open()
+    for i in range(len(textos)):
+        page = doc.new_page()
+        page.show_pdf_page(page.rect, src, i)
+    doc.save(str(path))
+    doc.close()
+
+
+def test_form_xobject_pages_do_not_share_cached_text(tmp_path):
+    from scripts.transcription_cache import PageCache
+
+    _make_form_pdf(tmp_path / "v1.pdf", ["FOLHA ORIGINAL 0", "FOLHA ORIGINAL 1"])
+    _make_form_pdf(tmp_path / "v2.pdf", ["FOLHA ORIGINAL 0", "FOLHA ORIGINAL 1", "FOLHA NOVA 2"])
+    cache = PageCache(str(tmp_path / "pages.sqlite"), extractor=transcriber_util.EXTRACTOR)
+    t = PDFTranscriber(output_dir=str(tmp_path / "out"), cache=cache)
+    t.convert(str(tmp_path / "v1.pdf"))
+    md = open(t.convert(str(tmp_path / "v2.pdf")), encoding="utf-8").read()
+    cache.close()
+    for texto in ["FOLHA ORIGINAL 0", "FOLHA ORIGINAL 1", "FOLHA NOVA 2"]:
+        assert md.count(texto) == 1
+
+    fps = {}
+    for nome in ["v1.pdf", "v2.pdf"]:
+        doc = fitz.open(str(tmp_path / nome))
+        fps[nome] = [transcriber_util._page_fingerprint(doc, p) for p in doc]
+        doc.close()
+    # folhas distintas, mas a mesma folha reenviada segue reaproveitável
+    assert len(set(fps["v2.pdf"])) == 3
+    assert fps["v2.pdf"][:2] == fps["v1.pdf"]
+
+
+def test_fingerprint_reads_shared_objects_once(tmp_path):
+    # garbage=4 funde objetos iguais: a fonte vira um objeto só, de todas as folhas
+    doc = fitz.open()
+    for i in range(6):
+        doc.new_page().insert_text((72, 72), f"R.{i} - HIPOTECA pagina {i}")
+    doc.save(str(tmp_path / "a.pdf"), garbage=4)
+    doc.close()
+    doc = fitz.open(str(tmp_path / "a.pdf"))
+    lidos = []
+
+    class _Contador:
+        def __getattr__(self, nome):
+            return getattr(doc, nome)
+
+        def xref_object(self, xref, **kw):
+            lidos.append(xref)
+            return doc.xref_object(xref, **kw)
+
+    sem_memo = [transcriber_util._page_fingerprint(_Contador(), p) for p in doc]
+    assert len(lidos) > len(set(lidos))
+
+    lidos.clear()
+    memo = {}
+    com_memo = [transcriber_util._page_fingerprint(_Contador(), p, memo) for p in doc]
+    doc.close()
+    assert com_memo == sem_memo
+    assert len(set(com_memo)) == 6
+    assert len(lidos) == len(set(lidos)) == len(memo)
+
+
+def test_failed_ocr_page_is_not_cached(tmp_path):
+    from concurrent.futures import Future
+    from pathlib import Path
+
+    from scripts.transcription_cache import PageCache
+
+    class _LaneQueFalha:
+        def take(self, key, pdf_path):
+            fut = Future()
+            fut.set_exception(RuntimeError("tesseract caiu"))
+            return fut
+
+    cache = PageCache(str(tmp_path / "pages.sqlite"), extractor="ocr")
+    t = PDFTranscriber(output_dir=str(tmp_path), cache=cache)
+    plan = transcriber_util._FilePlan(
+        input_file=Path("scan.pdf"), target_file=tmp_path / "scan.md", total=2, pdf_sha="abc"
+    )
+    fresh = iter([("", "fp0", True, None), ("texto", "fp1", False, None)])
+    assert [text for text, _ in t._pages(plan, fresh, lane=_LaneQueFalha())] == ["", "texto"]
+    cache.flush()
+    # a folha sem OCR volta a ser extraída (e lida) na próxima conversão
+    assert cache.get("abc", 0) is None
+    assert cache.get("abc", 1) is not None
+    cache.close()
@@ -0,0 +1,33 @@
+from scripts.transcription_cache import (
+    STATUS_DONE,
+    PageCache,
+    missing_runs,
+    open_readonly,
+)
+
+
+def test_pages_journal_and_fingerprint_lookup(tmp_path):
+    db = str(tmp_path / "pages.sqlite")
+    target = tmp_path / "autos.md"
+
+    cache = PageCache(db, extractor="x")
+    for i in range(3):
+        cache.put("sha-v1", i, f"folha {i}", page_sha=f"fp{i}", ocr_seconds=i or None)
+    cache.journal_update(str(target), "autos.pdf", "sha-v1", 5, 3)
+    assert cache.journal_entry(str(target))["pages_done"] == 3
+
+    # outra versão do PDF: nada pelo sha, mas as folhas antigas pela impressão digital
+    assert cache.cached_indices("sha-v1") == {0, 1, 2}
+    assert cache.cached_indices("sha-v2") == set()
+    assert open_readonly(db, "x").get_by_page_sha("fp1") == ("folha 1", 1.0)
+    assert cache.get("sha-v1", 0) == ("folha 0", None)
+    assert open_readonly(db, "outro-extrator").get_by_page_sha("fp1") is None
+    assert missing_runs(5, {0, 1, 2}, size=32) == [[3, 4]]
+    assert missing_runs(5, set(), size=2) == [[0, 1], [2, 3], [4]]
+
+    target.write_text("md")
+    assert not cache.is_current(str(target), "sha-v1")
+    cache.journal_update(str(target), "autos.pdf", "sha-v1", 5, 5, STATUS_DONE)
+    assert cache.is_current(str(target), "sha-v1")
+    assert not cache.is_current(str(target), "sha-v2")
+    cache.close()